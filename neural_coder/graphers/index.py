@@ -0,0 +1,330 @@
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# single-pass, ast-based index of the code files, cached per file content
+# so that repeated enabling (e.g. superbench trying many features) analyzes each file once
+
+import ast
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from .. import globals
+from ..utils.line_operation import get_line_indent_level
+from ..utils.line_operation import multi_line_comment_detection
+from ..utils.line_operation import of_definition_format
+from ..utils.line_operation import single_line_comment_or_empty_line_detection
+from .code_line import CodeLine, _scan_code_lines
+from .function import _scan_func_wrap_pair
+
+logging.basicConfig(level=globals.logging_level,
+                    format='%(asctime)s %(levelname)s %(message)s',
+                    datefmt='%a, %d %b %Y %H:%M:%S +0000')
+logger = logging.getLogger(__name__)
+
+# files to (re)index before a process pool is worth starting
+PARALLEL_MIN_FILES = 8
+# number of distinct file contents kept in the cache
+CACHE_SIZE = 4096
+
+
+class ClassRecord:
+    def __init__(self, class_name, class_def_line_idx, class_end_line_idx, parent_class_name):
+        self.class_name = class_name
+        self.class_def_line_idx = class_def_line_idx
+        self.class_end_line_idx = class_end_line_idx  # first line after the class
+        self.parent_class_name = parent_class_name
+
+
+class FunctionRecord:
+    def __init__(self, func_name, func_def_line_idx, func_end_line_idx):
+        self.func_name = func_name
+        self.func_def_line_idx = func_def_line_idx
+        self.func_end_line_idx = func_end_line_idx  # first line after the function
+        self.func_return_idx = -1
+        self.return_item = ""
+
+
+class FileIndex:
+    """symbol table of one file content: class definitions (with parents),
+    ( [function name] : [return_item] ) wrap pairs and per-line info (CodeLine)
+    """
+
+    def __init__(self, digest, code_lines, classes, func_wrap_pairs, parsed):
+        self.digest = digest
+        self.code_lines = code_lines  # CodeLine instances without file_path
+        self.classes = classes  # list of ClassRecord
+        self.func_wrap_pairs = func_wrap_pairs  # list of (function name, return item)
+        self.parsed = parsed  # False when the line-based fallback was used
+        self._code_lines_by_path = {}
+
+    def get_code_lines(self, path) -> List:
+        """CodeLine instances of this content located at path (read-only, shared between calls)"""
+        list_code_line = self._code_lines_by_path.get(path)
+        if list_code_line is None:
+            list_code_line = []
+            for cl in self.code_lines:
+                path_cl = CodeLine.__new__(CodeLine)
+                path_cl.__dict__.update(cl.__dict__)
+                path_cl.file_path = path
+                list_code_line.append(path_cl)
+            self._code_lines_by_path[path] = list_code_line
+        return list_code_line
+
+
+def _dotted_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        value = _dotted_name(node.value)
+        return value + "." + node.attr if value is not None else None
+    return None
+
+
+def _end_line_idx(node):
+    end_lineno = getattr(node, "end_lineno", None)
+    if end_lineno is None:  # python < 3.8
+        end_lineno = max(getattr(n, "lineno", 0) for n in ast.walk(node))
+    return end_lineno
+
+
+def _wrap_items(value):
+    """return items of "return xxx()", "return xxx" and "return xxx, yyy"
+    (functions w/o class prefix or instances), like the line-based scan
+    """
+    if isinstance(value, ast.Call) and isinstance(value.func, ast.Name):
+        return [value.func.id]
+    if isinstance(value, ast.Name):
+        return [value.id]
+    if isinstance(value, ast.Tuple) and value.elts and all(isinstance(e, ast.Name) for e in value.elts):
+        return [e.id for e in value.elts]
+    return []
+
+
+class _Indexer:
+    def __init__(self, lines):
+        self.lines = lines
+        self.classes = []
+        self.functions = []
+        self.func_wrap_pairs = []
+        self.line_class = [None] * len(lines)  # innermost class of each line
+        self.line_func = [None] * len(lines)  # outermost function of each line
+        self.is_multi_line_comment = []
+        self.is_single_line_comment_or_empty = []
+        is_multi_line_comment = False
+        end_multi_line_comment_flag = False
+        for line in lines:
+            is_multi_line_comment, end_multi_line_comment_flag = multi_line_comment_detection(
+                line, is_multi_line_comment, end_multi_line_comment_flag)
+            self.is_multi_line_comment.append(is_multi_line_comment)
+            self.is_single_line_comment_or_empty.append(single_line_comment_or_empty_line_detection(line))
+
+    def end_line_idx(self, node):
+        """first code line after the node, like the line-based scan the comments and empty lines
+        following a class or function still belong to it
+        """
+        end_line_idx = _end_line_idx(node)
+        while end_line_idx < len(self.lines) and (self.is_multi_line_comment[end_line_idx] or
+                                                  self.is_single_line_comment_or_empty[end_line_idx]):
+            end_line_idx += 1
+        return end_line_idx
+
+    def visit(self, node, func):
+        # func: outermost function of the node, the returns of its nested defs are its own
+        # like in the line-based scan
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                record = ClassRecord(
+                    class_name=child.name,
+                    class_def_line_idx=child.lineno - 1,
+                    class_end_line_idx=self.end_line_idx(child),
+                    parent_class_name=[n for n in map(_dotted_name, child.bases) if n is not None],
+                )
+                self.classes.append(record)
+                for idx in range(record.class_def_line_idx, record.class_end_line_idx):
+                    self.line_class[idx] = record
+                self.visit(child, func)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if func is None:  # only consider outermost function, not consider def(def())
+                    record = FunctionRecord(child.name, child.lineno - 1, self.end_line_idx(child))
+                    self.functions.append(record)
+                    for idx in range(record.func_def_line_idx, record.func_end_line_idx):
+                        self.line_func[idx] = record
+                    self.visit(child, record)
+                else:
+                    self.visit(child, func)
+            elif not isinstance(child, (ast.stmt, ast.excepthandler)) and \
+                    type(child).__name__ != "match_case":
+                # expressions can not contain def, class or return statements
+                continue
+            else:
+                if isinstance(child, ast.Return) and func is not None:
+                    line = self.lines[child.lineno - 1]
+                    func.func_return_idx = child.lineno - 1
+                    func.return_item = line[line.find("return") + 7:].strip()
+                    if child.value is not None:
+                        for return_item in _wrap_items(child.value):
+                            self.func_wrap_pairs.append((func.func_name, return_item))
+                self.visit(child, func)
+
+    def code_lines(self):
+        list_code_line = []
+        for line_idx, line in enumerate(self.lines):
+            CL = CodeLine()
+            CL.line_idx = line_idx
+            CL.line_content = line
+            CL.indent_level = get_line_indent_level(line)
+            CL.is_multi_line_comment = self.is_multi_line_comment[line_idx]
+            CL.is_single_line_comment_or_empty = self.is_single_line_comment_or_empty[line_idx]
+
+            cls = self.line_class[line_idx]
+            CL.is_class_def_line = cls is not None and cls.class_def_line_idx == line_idx
+            CL.is_in_class = cls is not None
+            CL.class_name = cls.class_name if cls is not None else ""
+            CL.parent_class_name = cls.parent_class_name if cls is not None else []
+            CL.class_def_line_idx = cls.class_def_line_idx if cls is not None else -1
+            CL.class_end_line_idx = cls.class_end_line_idx if cls is not None else -1
+
+            func = self.line_func[line_idx]
+            CL.is_func_def_line = func is not None and func.func_def_line_idx == line_idx
+            CL.is_in_func = func is not None
+            CL.func_name = func.func_name if func is not None else ""
+            CL.func_return_idx = func.func_return_idx if func is not None else -1
+            CL.return_item = func.return_item if func is not None else ""
+            CL.func_def_line_idx = func.func_def_line_idx if func is not None else -1
+            CL.func_end_line_idx = func.func_end_line_idx if func is not None else -1
+
+            list_code_line.append(CL)
+        return list_code_line
+
+
+def build_file_index(code, digest=None) -> FileIndex:
+    lines = code.split('\n')
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        # not parsable by the running python (e.g. python 2 code), use line-based scan
+        code_lines = _scan_code_lines(None, code)
+        classes = [
+            ClassRecord(cl.class_name, cl.class_def_line_idx, cl.class_end_line_idx, cl.parent_class_name)
+            for cl in code_lines if cl.is_class_def_line
+        ]
+        func_wrap_pairs = _scan_func_wrap_pair(code)
+        parsed = False
+    else:
+        indexer = _Indexer(lines)
+        indexer.visit(tree, None)
+        code_lines = indexer.code_lines()
+        classes = indexer.classes
+        func_wrap_pairs = indexer.func_wrap_pairs
+        parsed = True
+
+    for cl in code_lines:
+        if not cl.is_multi_line_comment and not cl.is_single_line_comment_or_empty:
+            cl.definition = of_definition_format(cl.line_content)
+        else:
+            cl.definition = (False, "", "")
+
+    return FileIndex(digest, code_lines, classes, func_wrap_pairs, parsed)
+
+
+class _IndexCache:
+    """FileIndex cache keyed by file content hash, with (mtime, size) of each path
+    remembered so that unchanged files are not even read again
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._stats = {}  # path -> (mtime_ns, size, digest)
+        self._indexes = OrderedDict()  # digest -> FileIndex
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+            self._indexes.clear()
+
+    def _get(self, digest):
+        file_index = self._indexes.get(digest)
+        if file_index is not None:
+            self._indexes.move_to_end(digest)
+        return file_index
+
+    def _put(self, digest, file_index):
+        self._indexes[digest] = file_index
+        self._indexes.move_to_end(digest)
+        while len(self._indexes) > self.maxsize:
+            self._indexes.popitem(last=False)
+
+    def index_files(self, paths) -> List[FileIndex]:
+        result = [None] * len(paths)
+        to_build = OrderedDict()  # digest -> (code, [positions in paths])
+        with self._lock:
+            for pos, path in enumerate(paths):
+                stat = os.stat(path)
+                cached = self._stats.get(path)
+                if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                    file_index = self._get(cached[2])
+                    if file_index is not None:
+                        result[pos] = file_index
+                        continue
+                code = open(path, 'r').read()
+                digest = hashlib.sha256(code.encode("utf-8", "surrogateescape")).hexdigest()
+                self._stats[path] = (stat.st_mtime_ns, stat.st_size, digest)
+                file_index = self._get(digest)
+                if file_index is not None:
+                    result[pos] = file_index
+                elif digest in to_build:
+                    to_build[digest][1].append(pos)
+                else:
+                    to_build[digest] = (code, [pos])
+
+        if to_build:
+            logger.debug(f"Indexing {len(to_build)} of {len(paths)} files ...")
+            digests = list(to_build)
+            codes = [to_build[digest][0] for digest in digests]
+            built = _build_file_indexes(codes, digests)
+            with self._lock:
+                for digest, file_index in zip(digests, built):
+                    self._put(digest, file_index)
+                    for pos in to_build[digest][1]:
+                        result[pos] = file_index
+        return result
+
+
+def _build_file_indexes(codes, digests) -> List[FileIndex]:
+    try:
+        cpu_count = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on all platforms
+        cpu_count = os.cpu_count() or 1
+    workers = min(len(codes), cpu_count)
+    if len(codes) >= PARALLEL_MIN_FILES and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(build_file_index, codes, digests, chunksize=4))
+        except (OSError, RuntimeError) as e:  # e.g. no permission to start processes
+            logger.debug(f"Parallel indexing is not available ({e}), indexing sequentially ...")
+    return [build_file_index(code, digest) for code, digest in zip(codes, digests)]
+
+
+index_cache = _IndexCache()
+
+
+def index_files(paths) -> List[FileIndex]:
+    """get FileIndex of each path, (re)building only files whose content is not cached"""
+    return index_cache.index_files(paths)
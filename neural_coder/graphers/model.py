@@ -15,7 +15,7 @@
 # FOR PYTORCH ONLY
 
 from .function import get_all_wrap_children
-from ..utils.line_operation import get_line_indent_level, of_definition_format
+from ..utils.line_operation import get_line_indent_level
 from typing import List
 from .. import globals
 import logging
@@ -62,11 +62,13 @@ class ModelDefinition:
 # search nnModule classes
 def register_nnModule_class():
     logger.info(f"Analyzing nn.Module class definitions in all files ...")
+    list_class_def_line = [cl for cl in globals.list_code_line_instance if cl.is_class_def_line]
+
     # search raw nnModule class (e.g. class ClassName(nn.Module):)
-    for cl in globals.list_code_line_instance:
+    for cl in list_class_def_line:
         parent_class_has_nnModule = list(set(cl.parent_class_name) & set(
             ["nn.Module", "torch.nn.Module", "nn.Sequential", "torch.Sequential", "_BaseAutoModelClass"])) != []
-        if cl.is_class_def_line and parent_class_has_nnModule:
+        if parent_class_has_nnModule:
             CD = ClassDefinition(
                 class_name=cl.class_name,
                 file_path=cl.file_path,
@@ -84,10 +86,10 @@ def register_nnModule_class():
     do_search = True
     while do_search:
         list_child_class_name = []
-        for cl in globals.list_code_line_instance:
+        for cl in list_class_def_line:
             parent_class_has_nnModule = list(
                 set(cl.parent_class_name) & set(search_scope)) != []
-            if cl.is_class_def_line and parent_class_has_nnModule:
+            if parent_class_has_nnModule:
                 CD = ClassDefinition(
                     class_name=cl.class_name,
                     file_path=cl.file_path,
@@ -118,7 +120,7 @@ def register_nnModule_instance_definition():
     def_cl = []
     for cl in globals.list_code_line_instance:
         if not cl.is_multi_line_comment and not cl.is_single_line_comment_or_empty:
-            is_def, lhs, rhs = of_definition_format(cl.line_content)
+            is_def, lhs, rhs = cl.definition
             stripped = cl.line_content.replace(" ", "")
             if is_def and \
                rhs in globals.list_class_name + ["Module", "Sequential"] and \
@@ -147,7 +149,7 @@ def register_nnModule_instance_definition():
     list_line_idx = []
     list_func_def_line_idx = []
     for cl in def_cl:
-        is_def, lhs, rhs = of_definition_format(cl.line_content)
+        is_def, lhs, rhs = cl.definition
         list_lhs.append(lhs)
         list_rhs.append(rhs)
         list_is_in_func.append(cl.is_in_func)
@@ -215,7 +217,7 @@ def register_nnModule_instance_definition():
     # register function_name like "xxx" in "def xxx() ... model = some_wrapper_function() ... return model"
     for cl in globals.list_code_line_instance:
         if cl.is_in_func and not cl.is_multi_line_comment and not cl.is_single_line_comment_or_empty:
-            is_def, lhs, rhs = of_definition_format(cl.line_content)
+            is_def, lhs, rhs = cl.definition
             if is_def and \
                rhs in globals.list_wrapper_all_function_name and \
                cl.class_name not in globals.list_class_name and \
@@ -240,7 +242,7 @@ def register_nnModule_instance_definition():
 
     for cl in globals.list_code_line_instance:
         if not cl.is_multi_line_comment and not cl.is_single_line_comment_or_empty and cl.func_name != "__init__":
-            is_def, lhs, rhs = of_definition_format(cl.line_content)
+            is_def, lhs, rhs = cl.definition
             if is_def and \
                 rhs in globals.list_wrapper_all_function_name and \
                 rhs not in ["self.model", "model", "self.call", "call"] and \
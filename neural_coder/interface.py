@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
 import subprocess
 import logging
@@ -69,6 +70,7 @@ def enable(
     use_inc=False,
     use_modular=False,
     modular_item="",
+    core_list="",  # cores (e.g. "0,1,2,3") to pin the benchmark to, all cores if empty
 ):
     """enable a feature or a couple of features for the code
 
@@ -503,6 +505,7 @@ def enable(
             ncore_per_instance=ncore_per_instance,  # only for "self_defined" mode
             ninstances=ninstances,  # only for "self_defined" mode
             bench_batch_size=bench_batch_size,  # only for "self_defined" mode
+            core_list=core_list,
         )
 
         return bench_performance, bench_mode, bench_ws_path
@@ -519,6 +522,7 @@ def bench(
     ncore_per_instance=-1,  # only for "self_defined" mode
     ninstances=-1,  # only for "self_defined" mode
     bench_batch_size=-1,  # only for "self_defined" mode
+    core_list="",  # cores (e.g. "0,1,2,3") to pin the benchmark to, all cores if empty
 ):
     """benchmark on either "optimized code", or "patch" + "original code"
     it does not enable benchmark code lines, or enable change of batch size
@@ -640,7 +644,7 @@ def bench(
 
     args = [args]
     numa_launcher.exec_launcher(
-        ncore_per_instance, ninstances, entry_code, args, bench_log_path)
+        ncore_per_instance, ninstances, entry_code, args, bench_log_path, core_list=core_list or None)
 
     # get performance (throughput and latency)
     bench_log = open(bench_log_path, "r", encoding='unicode_escape').read().split('\n')
@@ -754,6 +758,9 @@ def superbench(
     bench_batch_size=-1,  # only for "self_defined" mode
     use_inc=False,
     auto_quant=False,
+    parallel_sweep=True,  # sweep features concurrently, one NUMA node per optimization set
+    max_parallel_sweep=-1,  # max number of NUMA nodes used by the parallel sweep, all if -1
+    prune_threshold=0,  # skip combinations with a feature below this ratio of the original performance, 0 is off
 ):
 
     # set up workspace
@@ -869,7 +876,8 @@ def superbench(
                 if jit_feature_count <= 1:
                     standalones.append(list(item))  # only appends the item with one JIT feature in it
 
-        dry_run = True
+        # optimization sets to sweep
+        list_features_to_sweep = []
         for backend in backends:
             for standalone in standalones:
                 features = []
@@ -904,14 +912,35 @@ def superbench(
                 if features[0] == "" and len(features) > 1:
                     features = features[1:]  # remove ""
 
-                if dry_run:
-                    t_start = time.time()
+                list_features_to_sweep.append(features)
+
+        from .utils.parallel_sweep import ParallelSweep, sweep_features
+        sweep = ParallelSweep(code, entry_code, ws_path, logger, max_parallel=max_parallel_sweep)
+        ncores_needed = ncore_per_instance * ninstances if mode == "self_defined" else 0
+        if parallel_sweep and sweep.available(ncores_needed):
+            logger.info(f"Sweeping on {sweep.max_parallel} NUMA nodes in parallel ...")
+            sweep.prepare()
+            enable_kwargs = dict(
+                args=args,
+                mode=mode,
+                cpu_set_env=cpu_set_env,
+                ncore_per_instance=ncore_per_instance,
+                ninstances=ninstances,
+                bench_batch_size=bench_batch_size,
+                use_inc=use_inc,
+            )
+
+            def run_features(features, num_benchmark_iteration, slot_idx):
+                return sweep.run_features(features, num_benchmark_iteration, slot_idx, enable_kwargs)
 
-                bench_performance, bench_mode, bench_ws_path = enable(
+            max_parallel = sweep.max_parallel
+        else:
+            def run_features(features, num_benchmark_iteration, slot_idx):
+                return enable(
                     code=code,
                     entry_code=entry_code,
                     args=args,
-                    features=features,
+                    features=list(features),
                     mode=mode,
                     run_bench=True,
                     num_benchmark_iteration=num_benchmark_iteration,
@@ -922,62 +951,78 @@ def superbench(
                     use_inc=use_inc,
                 )
 
-                if dry_run:
-                    t_end = time.time()
-                    if iteration_dynamic_adjust:
-                        num_benchmark_iteration = max(int(300 / (t_end - t_start)), 5)
-                        logger.debug(
-                            f"Adjusted number of benchmark iterations after dry-run is {num_benchmark_iteration}")
-                    dry_run = False
+            max_parallel = 1
 
-                def remove_if_have(list, element):
-                    if element in list:
-                        list.remove(element)
-                    return list
+        sweep_result = sweep_features(
+            list_features_to_sweep,
+            run_features,
+            num_benchmark_iteration,
+            iteration_dynamic_adjust=iteration_dynamic_adjust,
+            prune_threshold=prune_threshold,
+            max_parallel=max_parallel,
+            logger=logger,
+        )
 
-                features = remove_if_have(features, "pytorch_benchmark")
-                features = remove_if_have(features, "pytorch_change_batch_size")
-                features = remove_if_have(features, "pytorch_cuda_to_cpu")
+        for features, bench_performance, bench_mode, bench_ws_path in sweep_result:
+            features = list(features)
 
-                if auto_quant:
-                    # convert feature name to display name for better user experience
-                    if features == ['pytorch_inc_dynamic_quant']:
-                        features_display = "Intel INT8 (Dynamic)"
-                    elif features == ['pytorch_inc_static_quant_fx']:
-                        features_display = "Intel INT8 (Static)"
-                    elif features == ['pytorch_inc_static_quant_ipex']:
-                        features_display = "Intel INT8 (IPEX)"
-                    elif features == ['pytorch_inc_bf16']:
-                        features_display = "Intel BF16"
-                    elif features == []:
-                        features_display = "The Original Model"
-
-                    logger.info(
-                        f"Benchmark result (performance) of {features_display}"
-                        f" is {bench_performance[0]} (FPS)")
-                    logger.info(
-                        f"Benchmark result (accuracy delta) of {features_display} is {bench_performance[5]} %")
-                else:
-                    logger.info(
-                        f"Benchmark result (performance) of optimization set [{features}]"
-                        f" is [{bench_performance[0]}] (FPS)")
-                    logger.info(
-                        f"Benchmark result (accuracy delta) of optimization set [{features}]"
-                        f" is [{bench_performance[5]}] %")
-
-                d = {}  # initialize dict
-                d["features"] = features
-                d["FPS"] = bench_performance[0]
-                d["accuracy"] = bench_performance[5]
-                d["mode"] = bench_mode
-                d["workspace_path"] = bench_ws_path
-                result.append(d)
-
-                list_FPS.append(bench_performance[0])
-                list_accuracy.append(bench_performance[5])
-                list_features.append(features)
-                list_mode.append(bench_mode)
-                list_ws_path.append(bench_ws_path)
+            def remove_if_have(list, element):
+                if element in list:
+                    list.remove(element)
+                return list
+
+            features = remove_if_have(features, "pytorch_benchmark")
+            features = remove_if_have(features, "pytorch_change_batch_size")
+            features = remove_if_have(features, "pytorch_cuda_to_cpu")
+
+            if bench_performance is None:
+                logger.warning(f"Optimization set [{features}] failed and is left out of the ranking")
+                result.append({"features": features, "failed": True})
+                continue
+
+            if auto_quant:
+                # convert feature name to display name for better user experience
+                if features == ['pytorch_inc_dynamic_quant']:
+                    features_display = "Intel INT8 (Dynamic)"
+                elif features == ['pytorch_inc_static_quant_fx']:
+                    features_display = "Intel INT8 (Static)"
+                elif features == ['pytorch_inc_static_quant_ipex']:
+                    features_display = "Intel INT8 (IPEX)"
+                elif features == ['pytorch_inc_bf16']:
+                    features_display = "Intel BF16"
+                elif features == []:
+                    features_display = "The Original Model"
+
+                logger.info(
+                    f"Benchmark result (performance) of {features_display}"
+                    f" is {bench_performance[0]} (FPS)")
+                logger.info(
+                    f"Benchmark result (accuracy delta) of {features_display} is {bench_performance[5]} %")
+            else:
+                logger.info(
+                    f"Benchmark result (performance) of optimization set [{features}]"
+                    f" is [{bench_performance[0]}] (FPS)")
+                logger.info(
+                    f"Benchmark result (accuracy delta) of optimization set [{features}]"
+                    f" is [{bench_performance[5]}] %")
+
+            d = {}  # initialize dict
+            d["features"] = features
+            d["FPS"] = bench_performance[0]
+            d["accuracy"] = bench_performance[5]
+            d["mode"] = bench_mode
+            d["workspace_path"] = bench_ws_path
+            result.append(d)
+
+            list_FPS.append(bench_performance[0])
+            list_accuracy.append(bench_performance[5])
+            list_features.append(features)
+            list_mode.append(bench_mode)
+            list_ws_path.append(bench_ws_path)
+
+        # structured result of all benchmarked optimization sets
+        with open(ws_path + "superbench_result.json", "w") as f:
+            json.dump(result, f, indent=4)
 
         # print result
         print(f"Superbench result of sweeping [{sweep_objective}] printed below with sorted FPS: ")
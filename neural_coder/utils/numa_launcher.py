@@ -734,7 +734,7 @@ def parse_args():
     return parser.parse_args()
 
 
-def exec_launcher(ncore_per_instance, ninstances, program, program_args, log_path):
+def exec_launcher(ncore_per_instance, ninstances, program, program_args, log_path, core_list=None):
     env_before = set(os.environ.keys())
     if platform.system() == "Windows":
         raise RuntimeError("Windows platform is not supported!!!")
@@ -747,7 +747,7 @@ def exec_launcher(ncore_per_instance, ninstances, program, program_args, log_pat
         ccl_worker_count=4, master_addr='127.0.0.1', master_port=29500, hostfile='hostfile', more_mpi_params='',
         ncore_per_instance=ncore_per_instance, ninstances=ninstances, instance_idx=-1, latency_mode=False,
         throughput_mode=False, node_id=-1,
-        use_logical_core=False, disable_numactl=False, core_list=None, log_path=log_path, log_file_prefix='run',
+        use_logical_core=False, disable_numactl=False, core_list=core_list, log_path=log_path, log_file_prefix='run',
         program=program, program_args=program_args)
 
     # if args.log_path:
@@ -0,0 +1,292 @@
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# feature sweep of superbench:
+# optimization sets are benchmarked concurrently, each one in its own copy of the user code
+# and pinned to its own NUMA node, and combinations of clearly dominated features are pruned
+
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+# feature added for device conversion only, not an optimization
+DEVICE_FEATURES = ["pytorch_cuda_to_cpu"]
+
+
+def get_sweep_slots(cpuinfo=None) -> List:
+    """physical cores of each NUMA node, one slot per node"""
+    if cpuinfo is None:
+        from .numa_launcher import CPUinfo
+        cpuinfo = CPUinfo()
+    slots = []
+    for node_id in range(cpuinfo.node_nums()):
+        cores = sorted(cpuinfo.get_node_physical_cores(node_id))
+        if len(cores) > 0:
+            slots.append(cores)
+    return slots
+
+
+# entries of the user code directory that are never linked into a copy
+IGNORED_NAMES = ["neural_coder_workspace", "__pycache__"]
+IGNORED_SUFFIX = "_nc_enabled.py"
+
+
+def copy_code_workspace(src_root, dst_root, files):
+    """isolated copy of the benchmarked files, so that concurrent enabling/patching do not interfere
+    only the files are copied, every other entry of the directories on their way from src_root is linked,
+    so that imports and relative paths of the copies still resolve
+    """
+    files = [os.path.abspath(f) for f in files]
+    dirs_on_path = set()
+    for f in files:
+        d = os.path.dirname(f)
+        while True:
+            dirs_on_path.add(d)
+            if d == src_root or os.path.dirname(d) == d:
+                break
+            d = os.path.dirname(d)
+
+    os.makedirs(dst_root, exist_ok=True)
+    for d in sorted(dirs_on_path):
+        dst_dir = relocate_path(d, src_root, dst_root)
+        os.makedirs(dst_dir, exist_ok=True)
+        for name in os.listdir(d):
+            src = os.path.join(d, name)
+            dst = os.path.join(dst_dir, name)
+            if name in IGNORED_NAMES or name.endswith(IGNORED_SUFFIX):
+                continue
+            if src in files:
+                shutil.copy2(src, dst)
+            elif src not in dirs_on_path and not os.path.lexists(dst):
+                os.symlink(src, dst)
+
+
+def get_code_root(paths):
+    return os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+
+
+def relocate_path(path, src_root, dst_root):
+    return os.path.join(dst_root, os.path.relpath(os.path.abspath(path), src_root))
+
+
+def optimization_features(features):
+    return [f for f in features if f not in DEVICE_FEATURES]
+
+
+def is_dominated(performance, baseline_performance, prune_threshold):
+    """whether a single feature is clearly worse than the original model (or failed)"""
+    if performance is None or performance[0] == 0:
+        return True
+    return performance[0] < prune_threshold * baseline_performance[0]
+
+
+def sweep_features(
+    list_features,
+    run_features,
+    num_benchmark_iteration,
+    iteration_dynamic_adjust=True,
+    prune_threshold=0,
+    max_parallel=1,
+    logger=None,
+):
+    """benchmark optimization sets in 3 stages:
+    1. the original model (dry-run, adjusts the number of benchmark iterations)
+    2. every single optimization feature
+    3. combinations, except those containing a feature that alone does not reach
+       prune_threshold * (performance of the original model)
+    run_features(features, num_benchmark_iteration, slot_idx) returns (bench_performance, bench_mode, bench_ws_path)
+    and is called concurrently by up to max_parallel threads (slot_idx in range(max_parallel))
+    returns list of (features, bench_performance, bench_mode, bench_ws_path) in the order of list_features,
+    bench_performance is None for the failed runs
+    """
+    results = {}
+
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    def run(idx, slot_idx, num_iteration):
+        try:
+            results[idx] = run_features(list_features[idx], num_iteration, slot_idx)
+        except Exception as e:
+            logger.error(f"Benchmark of optimization set {list_features[idx]} failed: {e}")
+            results[idx] = (None, None, None)  # failed, not benchmarked
+
+    def run_all(list_idx, num_iteration):
+        if max_parallel <= 1 or len(list_idx) <= 1:
+            for idx in list_idx:
+                run(idx, 0, num_iteration)
+            return
+        free_slots = queue.Queue()
+        for slot_idx in range(max_parallel):
+            free_slots.put(slot_idx)
+
+        def run_on_free_slot(idx):
+            slot_idx = free_slots.get()
+            try:
+                run(idx, slot_idx, num_iteration)
+            finally:
+                free_slots.put(slot_idx)
+
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            list(executor.map(run_on_free_slot, list_idx))
+
+    single_idx = [i for i, f in enumerate(list_features) if len(optimization_features(f)) <= 1]
+    combination_idx = [i for i, f in enumerate(list_features) if len(optimization_features(f)) > 1]
+    baseline_idx = [i for i in single_idx if optimization_features(list_features[i]) == []]
+
+    # dry-run
+    if len(baseline_idx) > 0:
+        dry_run_idx = baseline_idx[0]
+    else:
+        dry_run_idx = (single_idx + combination_idx)[0]
+    t_start = time.time()
+    run(dry_run_idx, 0, num_benchmark_iteration)
+    t_end = time.time()
+    if iteration_dynamic_adjust:
+        num_benchmark_iteration = max(int(300 / (t_end - t_start)), 5)
+        if logger is not None:
+            logger.debug(f"Adjusted number of benchmark iterations after dry-run is {num_benchmark_iteration}")
+
+    run_all([i for i in single_idx if i != dry_run_idx], num_benchmark_iteration)
+
+    # prune combinations with dominated features
+    if prune_threshold > 0 and len(baseline_idx) > 0 and results[baseline_idx[0]][0] is not None \
+            and results[baseline_idx[0]][0][0] != 0:
+        baseline_performance = results[baseline_idx[0]][0]
+        single_performance = {}
+        for idx in single_idx:
+            features = optimization_features(list_features[idx])
+            if len(features) == 1:
+                single_performance[features[0]] = results[idx][0]
+        list_dominated = [
+            feature for feature, performance in single_performance.items()
+            if is_dominated(performance, baseline_performance, prune_threshold)
+        ]
+        if len(list_dominated) > 0 and logger is not None:
+            logger.info(f"Skipping combinations with dominated optimization features: {list_dominated}")
+        combination_idx = [
+            i for i in combination_idx
+            if dry_run_idx == i or not set(optimization_features(list_features[i])) & set(list_dominated)
+        ]
+
+    run_all([i for i in combination_idx if i != dry_run_idx], num_benchmark_iteration)
+
+    return [(list_features[i],) + tuple(results[i]) for i in range(len(list_features)) if i in results]
+
+
+class ParallelSweep:
+    """runs enable(run_bench=True) of each optimization set in a subprocess,
+    on a copy of the user code and with the benchmark pinned to the cores of one NUMA node
+    """
+
+    def __init__(self, code, entry_code, ws_path, logger, max_parallel=-1, slots=None):
+        self.code = code
+        self.entry_code = entry_code
+        self.ws_path = os.path.abspath(ws_path)
+        self.logger = logger
+        if slots is None:
+            try:
+                slots = get_sweep_slots()
+            except Exception as e:  # e.g. lscpu is not available
+                logger.debug(f"NUMA information is not available ({e}), sweeping sequentially ...")
+                slots = []
+        if max_parallel > 0:
+            slots = slots[:max_parallel]
+        self.slots = slots
+        self.code_roots = []
+
+    @property
+    def max_parallel(self):
+        return len(self.slots)
+
+    def available(self, ncores_needed=0):
+        code_paths = self.code if type(self.code) == list else [self.code]
+        if "github.com" in str(self.code) or not all(os.path.isfile(p) for p in code_paths):
+            return False
+        return len(self.slots) > 1 and all(len(cores) >= ncores_needed for cores in self.slots)
+
+    def prepare(self):
+        code_paths = self.code if type(self.code) == list else [self.code]
+        src_root = get_code_root(code_paths + [self.entry_code])
+        self.code_roots = []
+        for slot_idx in range(len(self.slots)):
+            dst_root = os.path.join(self.ws_path, "sweep_node" + str(slot_idx), os.path.basename(src_root))
+            copy_code_workspace(src_root, dst_root, code_paths + [self.entry_code])
+            self.code_roots.append((src_root, dst_root))
+
+    def run_features(self, features, num_benchmark_iteration, slot_idx, enable_kwargs):
+        src_root, dst_root = self.code_roots[slot_idx]
+        if type(self.code) == list:
+            code = [relocate_path(p, src_root, dst_root) for p in self.code]
+        else:
+            code = relocate_path(self.code, src_root, dst_root)
+        task_path = os.path.join(self.ws_path, "sweep_task_" + uuid.uuid4().hex + ".json")
+        result_path = task_path[:-5] + "_result.json"
+        task = {
+            "code": code,
+            "entry_code": relocate_path(self.entry_code, src_root, dst_root),
+            "features": list(features),
+            "num_benchmark_iteration": num_benchmark_iteration,
+            "core_list": ",".join(str(core) for core in self.slots[slot_idx]),
+            "enable_kwargs": enable_kwargs,
+            "result_path": result_path,
+        }
+        with open(task_path, "w") as f:
+            json.dump(task, f)
+
+        self.logger.info(
+            f"Benchmarking optimization set [{features}] on cores [{task['core_list']}] ...")
+        env = dict(os.environ)
+        package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env["PYTHONPATH"] = package_root + os.pathsep + env.get("PYTHONPATH", "")
+        with open(task_path[:-5] + ".log", "w") as log_file:
+            subprocess.run(
+                [sys.executable, "-m", "neural_coder.utils.parallel_sweep", task_path],
+                env=env, stdout=log_file, stderr=subprocess.STDOUT, check=False)  # nosec
+
+        if not os.path.exists(result_path):
+            raise RuntimeError(f"no result, see {task_path[:-5] + '.log'}")
+        with open(result_path, "r") as f:
+            result = json.load(f)
+        return result["performance"], result["mode"], result["workspace_path"]
+
+
+def run_sweep_task(task_path):
+    """entry of the sweep subprocess"""
+    from ..interface import enable
+    with open(task_path, "r") as f:
+        task = json.load(f)
+    bench_performance, bench_mode, bench_ws_path = enable(
+        code=task["code"],
+        entry_code=task["entry_code"],
+        features=task["features"],
+        run_bench=True,
+        num_benchmark_iteration=task["num_benchmark_iteration"],
+        core_list=task["core_list"],
+        **task["enable_kwargs"],
+    )
+    with open(task["result_path"], "w") as f:
+        json.dump({"performance": bench_performance, "mode": bench_mode, "workspace_path": bench_ws_path}, f)
+
+
+if __name__ == "__main__":
+    run_sweep_task(sys.argv[1])
@@ -19,7 +19,7 @@ from .benchmark import Benchmark
 from .version import __version__
 from .contrib import *
 # we need to set a global 'NA' backend, or Model can't be used
-from .utils.utility import set_random_seed, set_tensorboard, set_workspace
+from .utils.utility import set_random_seed, set_tensorboard, set_workspace, set_profiling
 from .utils import options
 from .conf.config import conf
 from .conf.pythonic_config import config
@@ -47,6 +47,9 @@ class Adaptor(object):
 
     '''
 
+    # the threads set by predictor are of the process, so all the instances share them
+    predictor_threads_shared = False
+
     def __init__(self, framework_specific_info):
         pass
 
@@ -152,6 +155,22 @@ class Adaptor(object):
         '''
         raise NotImplementedError
 
+    def predictor(self, model, num_threads=None, inter_num_threads=None):
+        '''The function is used by the server scenario benchmark to create a model instance.
+
+           Args:
+               model (object): The model to run.
+               num_threads (int, optional): The number of threads running an inference.
+               inter_num_threads (int, optional): The number of threads running independent
+                                                  ops in parallel.
+
+           Return:
+               A callable running the model on one batch of inputs, instances created by
+               different calls can run concurrently. With predictor_threads_shared, they
+               share the threads of the process.
+        '''
+        raise NotImplementedError
+
     def quantize_input(self, model):
         ''' quantize the model to be able to take quantized input
 
@@ -28,9 +28,12 @@ from importlib.util import find_spec
 from neural_compressor.adaptor.adaptor import adaptor_registry, Adaptor
 from neural_compressor.adaptor.query import QueryBackendCapability
 from neural_compressor.adaptor.ox_utils.util import PROVIDERS, ONNXRT_BACKENDS
+from neural_compressor.adaptor.ox_utils.session_pool import SessionPool
+from neural_compressor.adaptor.ox_utils.io_binding import IOBindingRunner
 from neural_compressor.utils.utility import LazyImport, dump_elapsed_time, \
                                             GLOBAL_STATE, MODE
 from neural_compressor.utils.utility import Statistics
+from neural_compressor.utils.tracing import current_span, span, traced
 from neural_compressor.experimental.data.dataloaders.base_dataloader import BaseDataLoader
 from neural_compressor.conf.dotdict import deep_get
 from neural_compressor.utils.utility import CpuInfo
@@ -117,6 +120,8 @@ class ONNXRUNTIMEAdaptor(Adaptor):
             self.dynamic = False
 
         self.evaluate_nums = 0
+        # sessions of the models evaluated or calibrated in the tuning run, e.g. the fp32 model
+        self.session_pool = SessionPool()
 
         self.fp32_results = []
         self.fp32_preds_as_label = False
@@ -374,13 +379,15 @@ class ONNXRUNTIMEAdaptor(Adaptor):
             model = ONNXModel(model)
         black_nodes = [node for node in quantize_config if quantize_config[node]=='fp32']
         white_nodes = [node for node in quantize_config if quantize_config[node]!='fp32']
-        augment = ONNXRTAugment(model, \
-                  data_loader, self.quantizable_op_types, \
-                  black_nodes=black_nodes, white_nodes=white_nodes, \
-                  iterations=list(range(0, quantize_config['calib_iteration'])),
-                  backend=self.backend, reduce_range=self.reduce_range)
-        self.min_max = augment.dump_minmax()
-        quantize_params = augment.dump_calibration(quantize_config)
+        with span('calibration', 'adaptor', ops=len(white_nodes)):
+            augment = ONNXRTAugment(model, \
+                      data_loader, self.quantizable_op_types, \
+                      black_nodes=black_nodes, white_nodes=white_nodes, \
+                      iterations=list(range(0, quantize_config['calib_iteration'])),
+                      backend=self.backend, reduce_range=self.reduce_range,
+                      session_pool=self.session_pool)
+            self.min_max = augment.dump_minmax()
+            quantize_params = augment.dump_calibration(quantize_config)
         return quantize_params
 
     def inspect_tensor(self, model, dataloader, op_list=[],
@@ -393,7 +400,7 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         '''
         from neural_compressor.adaptor.ox_utils.calibration import ONNXRTAugment
         from neural_compressor.model.onnx_model import ONNXModel
-        from neural_compressor.utils.utility import dump_data_to_local
+        from neural_compressor.utils.tensor_store import TensorStore
         if not isinstance(model, ONNXModel):
             model = ONNXModel(model)
 
@@ -402,13 +409,19 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         augment = ONNXRTAugment(model, dataloader, [], \
                   iterations=iteration_list,
                   white_nodes=op_list,
-                  backend=self.backend)
-        tensors = augment.dump_tensor(activation=(inspect_type!='weight'),
-                                      weight=(inspect_type!='activation'))
+                  backend=self.backend,
+                  session_pool=self.session_pool)
         if save_to_disk:
+            # the tensors are written during the inference and read back lazily
             if not save_path:
                 save_path = self.work_space
-            dump_data_to_local(tensors, save_path, 'inspect_result.pkl')
+            with TensorStore(os.path.join(save_path, 'inspect_result'), 'w') as store:
+                tensors = augment.dump_tensor(activation=(inspect_type!='weight'),
+                                              weight=(inspect_type!='activation'),
+                                              store=store)
+        else:
+            tensors = augment.dump_tensor(activation=(inspect_type!='weight'),
+                                          weight=(inspect_type!='activation'))
         return tensors
 
     def set_tensor(self, model, tensor_dict):
@@ -477,6 +490,7 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         new_bias_data = (bias_data / bias_scale).round().astype(np.int32)
         return new_bias_data
 
+    @traced('pre_optimize', 'adaptor')
     def _pre_optimize(self, model, level=1):
         from neural_compressor.adaptor.ox_utils.util import \
             remove_init_from_model_input, split_shared_bias
@@ -524,6 +538,7 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         model = split_shared_bias(model)
         model.topological_sort()
         self.pre_optimized_model = copy.deepcopy(model)
+        current_span().add('ops', len(model.model.graph.node))
 
     def _revert_conv_add_fusion(self, model):
         from onnx import numpy_helper
@@ -775,6 +790,9 @@ class ONNXRUNTIMEAdaptor(Adaptor):
                     last_quantizable_node.append(node.name)
                     all_conv_matmul.append(node)
 
+        # the ops of an op type share its capability, which is not changed by the tuning space
+        fallback_optype_wise = {op_type: [cap for cap in op_caps if 'quant_mode' not in cap['activation']] \
+            for op_type, op_caps in optype_wise.items()}
         for _, node in enumerate(self.pre_optimized_model.nodes()):
             # for TRT EP, only insert Q/DQ to inputs of Add nodes followed by ReduceMean
             if node.op_type == 'Add' and self.backend == 'TensorrtExecutionProvider':
@@ -787,12 +805,9 @@ class ONNXRUNTIMEAdaptor(Adaptor):
             if node.op_type in optype_wise:
                 if (exclude_first_quantizable_op and node.name in first_quantizable_node) \
                      or (exclude_last_quantizable_op and node.name in last_quantizable_node):
-                    tmp_cfg = copy.deepcopy(optype_wise[node.op_type])
-                    tmp_cfg = list(filter(lambda x:'quant_mode' not in x['activation'], tmp_cfg))
-                    op_wise.update({(node.name, node.op_type): tmp_cfg})
+                    op_wise.update({(node.name, node.op_type): fallback_optype_wise[node.op_type]})
                     continue
-                op_wise.update(
-                    {(node.name, node.op_type): copy.deepcopy(optype_wise[node.op_type])})
+                op_wise.update({(node.name, node.op_type): optype_wise[node.op_type]})
 
         if exclude_pre_post_process:
             from collections import deque
@@ -808,22 +823,16 @@ class ONNXRUNTIMEAdaptor(Adaptor):
                     backbone_queue_extra.append(conv_or_matmul.name)
                     backbone_nodes = self.pre_optimized_model.get_nodes_chain(backbone_queue_extra, 
                                                     first_quantizable_node, backbone_nodes)
-            backbone_nodes += [i for i in first_quantizable_node]
+            backbone_nodes = set(backbone_nodes + first_quantizable_node)
 
             for _, node in enumerate(self.pre_optimized_model.nodes()):
                 if node.op_type in optype_wise:
                     # nodes not in backbone are not quantized
                     if node.name not in backbone_nodes:
-                        tmp_cfg = copy.deepcopy(optype_wise[node.op_type])
-                        tmp_cfg = list(filter(lambda x:'quant_mode' not in x['activation'], tmp_cfg))
-                        op_wise.update({(node.name, node.op_type): tmp_cfg})
+                        op_wise.update({(node.name, node.op_type): fallback_optype_wise[node.op_type]})
                         continue
-                    if (node.name, node.op_type) in op_wise:
-                        op_wise.update(
-                            {(node.name, node.op_type): copy.deepcopy(op_wise[(node.name, node.op_type)])})
-                    else: # pragma: no cover
-                        op_wise.update(
-                            {(node.name, node.op_type): copy.deepcopy(optype_wise[node.op_type])})
+                    if (node.name, node.op_type) not in op_wise: # pragma: no cover
+                        op_wise.update({(node.name, node.op_type): optype_wise[node.op_type]})
 
         return {'optypewise': optype_wise, 'opwise': op_wise}
 
@@ -871,6 +880,7 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         quantizable_op_types = self.query_handler.get_op_types_by_precision(precision='int8')
         return quantizable_op_types
 
+    @traced('model_evaluate', 'adaptor')
     def evaluate(self, input_graph, dataloader, postprocess=None,
                  metrics=None, measurer=None, iteration=-1,
                  tensorboard=False, fp32_baseline=False):
@@ -889,30 +899,21 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         Returns:
             (float) evaluation results. acc, f1 e.g.
         """
-        if input_graph.large_size: # pragma: no cover
-            onnx.save_model(input_graph.model,
-                            self.work_space + 'eval.onnx',
-                            save_as_external_data=True,
-                            all_tensors_to_one_file=True,
-                            location="weights.pb",
-                            convert_attribute=False)
-        sess_options = ort.SessionOptions()
+        from neural_compressor import options
+        session_options = dict(options.onnxrt.session_options)
         if self.backend == 'TensorrtExecutionProvider':
-            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL 
+            session_options['graph_optimization_level'] = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
         if measurer:
             # https://github.com/microsoft/onnxruntime/issues/7347
             cores_per_instance = int(os.environ.get('CORES_PER_INSTANCE'))
             assert cores_per_instance > 0, "benchmark cores_per_instance should greater than 0"
-            sess_options.intra_op_num_threads = cores_per_instance
-        if sys.version_info < (3,10) and find_spec('onnxruntime_extensions'): # pragma: no cover
-            from onnxruntime_extensions import get_library_path
-            sess_options.register_custom_ops_library(get_library_path())
-        session = ort.InferenceSession(self.work_space + 'eval.onnx',
-                                       sess_options,
-                                       providers=[self.backend]) if input_graph.large_size else \
-                  ort.InferenceSession(input_graph.model.SerializeToString(),
-                                       sess_options,
-                                       providers=[self.backend])
+            session_options['intra_op_num_threads'] = cores_per_instance
+        with span('create_session', 'adaptor'):
+            session = self.session_pool.get_session(
+                input_graph.model,
+                [self.backend],
+                model_path=self.work_space + 'eval.onnx' if input_graph.large_size else None,
+                **session_options)
         results = []
         if metrics:
             for metric in metrics:
@@ -923,6 +924,10 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         ort_inputs = {}
         len_inputs = len(session.get_inputs())
         inputs_names = [session.get_inputs()[i].name for i in range(len_inputs)]
+        # outputs of fixed-shape batches are written into reused buffers
+        runner = IOBindingRunner(session) if IOBindingRunner.is_supported(session) else None
+        run = runner.run if runner is not None else lambda inputs: session.run(None, inputs)
+        evaluate_span = current_span()
 
         def eval_func(dataloader):
             for idx, (inputs, labels) in enumerate(dataloader):
@@ -948,10 +953,10 @@ class ONNXRUNTIMEAdaptor(Adaptor):
 
                 if measurer is not None:
                     measurer.start()
-                    predictions = session.run(None, ort_inputs)
+                    predictions = run(ort_inputs)
                     measurer.end()
                 else:
-                    predictions = session.run(None, ort_inputs)
+                    predictions = run(ort_inputs)
 
                 if self.fp32_preds_as_label:
                     self.fp32_results.append(predictions) if fp32_baseline else \
@@ -964,6 +969,9 @@ class ONNXRUNTIMEAdaptor(Adaptor):
                         if not hasattr(metric, "compare_label") or \
                             (hasattr(metric, "compare_label") and metric.compare_label):
                             metric.update(predictions, labels)
+                # release the outputs so that their buffers can be reused
+                predictions = None
+                evaluate_span.add('batches')
                 if idx + 1 == iteration:
                     break
 
@@ -994,6 +1002,48 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         acc = 0 if metrics is None else [metric.result() for metric in metrics]
         return acc if not isinstance(acc, list) or len(acc) > 1 else acc[0]
 
+    def predictor(self, model, num_threads=None, inter_num_threads=None):
+        """Create an inference session of its own to run the model for the server scenario.
+
+        Args:
+            model (ModelProto): onnx model to run.
+            num_threads (int, optional): intra op threads of the session. Defaults to None.
+            inter_num_threads (int, optional): inter op threads of the session, more than 1
+                runs independent nodes in parallel. Defaults to None.
+
+        Returns:
+            A callable running a batch of inputs and returning the outputs.
+        """
+        from neural_compressor import options
+        session_options = dict(options.onnxrt.session_options)
+        if self.backend == 'TensorrtExecutionProvider':
+            session_options['graph_optimization_level'] = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        if num_threads is not None:
+            session_options['intra_op_num_threads'] = num_threads
+        if inter_num_threads is not None:
+            session_options['inter_op_num_threads'] = inter_num_threads
+            if inter_num_threads > 1:
+                session_options['execution_mode'] = ort.ExecutionMode.ORT_PARALLEL
+        # a pool of one session builds a new session for each instance
+        session = SessionPool(max_size=1).get_session(
+            model.model,
+            [self.backend],
+            model_path=self.work_space + 'eval.onnx' if model.large_size else None,
+            **session_options)
+        inputs_names = [i.name for i in session.get_inputs()]
+
+        def predict(inputs):
+            if isinstance(inputs, dict):
+                ort_inputs = inputs
+            elif len(inputs_names) == 1:
+                ort_inputs = {inputs_names[0]: inputs}
+            else:
+                assert len(inputs_names) == len(inputs), \
+                    'number of input tensors must align with graph inputs'
+                ort_inputs = {name: np.asarray(inp) for name, inp in zip(inputs_names, inputs)}
+            return session.run(None, ort_inputs)
+        return predict
+
     def diagnosis_helper(self, fp32_model, int8_model, tune_cfg=None, save_path=None):
         from neural_compressor.utils.utility import dump_data_to_local
         from neural_compressor.adaptor.ox_utils.util import find_by_name
@@ -24,7 +24,6 @@
 
 import copy
 import logging
-import sys
 
 import numpy as np
 import onnx
@@ -32,8 +31,9 @@ import onnxruntime
 import onnx.numpy_helper as numpy_helper
 from onnx import helper, TensorProto, shape_inference
 from packaging.version import Version
-from importlib.util import find_spec
 from neural_compressor.model.onnx_model import ONNXModel
+from neural_compressor.adaptor.ox_utils.session_pool import SessionPool
+from neural_compressor.utils.tracing import span, traced
 from neural_compressor.adaptor.ox_utils.util import make_dquant_node, is_B_transposed, \
     _get_qrange_for_qType, calculate_scale_zp
 
@@ -51,7 +51,8 @@ class ONNXRTAugment:
                  white_nodes=[],
                  iterations=[],
                  backend=['CPUExecutionProvider'],
-                 reduce_range=False):
+                 reduce_range=False,
+                 session_pool=None):
         """Initialization.
 
         Args:
@@ -63,6 +64,8 @@ class ONNXRTAugment:
             iterations (list, optional): tensor of which iteration will be collected. Defaults to [].
             backend (list, optional): execution provider for onnxruntime. Defaults to ['CPUExecutionProvider'].
             reduce_range (bool, optional): use 7 bit or not. Defaults to False.
+            session_pool (SessionPool, optional): pool to get the inference session from, the
+                sessions of unchanged augmented models are reused. Defaults to None.
         """
         self.model_wrapper = model_wrapper
         self.model = model_wrapper.model
@@ -83,7 +86,9 @@ class ONNXRTAugment:
         self.dynamically_quantized = False
         self.ort_version = Version(onnxruntime.__version__)
         self.reduce_range = reduce_range
+        self.session_pool = session_pool if session_pool is not None else SessionPool()
 
+    @traced('augment_graph', 'calibration')
     def augment_graph(self, activation_only=False, weight_only=False):
         """Augment_graph.
         
@@ -196,30 +201,24 @@ class ONNXRTAugment:
         model.graph.output.extend(added_outputs) # pylint: disable=no-member
 
         self.augmented_model = model
-        if self.model_wrapper.large_size: # pragma: no cover
-            onnx.save_model(model,
-                            self.model_wrapper.model_path + '_augment.onnx',
-                            save_as_external_data=True,
-                            all_tensors_to_one_file=True,
-                            location="weights.pb",
-                            convert_attribute=False)
-
-    def get_intermediate_outputs(self, calib_mode=None):
-        """Gather intermediate model outputs after running inference."""
+
+    def get_intermediate_outputs(self, calib_mode=None, output_handler=None):
+        """Gather intermediate model outputs after running inference.
+
+        Args:
+            calib_mode (str, optional): 'naive' to gather the min and max of the outputs only.
+            output_handler (callable, optional): called with the iteration, output name and output
+                instead of gathering the outputs.
+        """
         # conduct inference session and get intermediate outputs
-        so = onnxruntime.SessionOptions()
-        if sys.version_info < (3,10) and find_spec('onnxruntime_extensions'): # pragma: no cover
-            from onnxruntime_extensions import get_library_path
-            so.register_custom_ops_library(get_library_path())
-
-        session = onnxruntime.InferenceSession(
-                    self.augmented_model.SerializeToString(),
-                    so,
-                    provider=self.backend) if not self.model_wrapper.large_size else \
-                  onnxruntime.InferenceSession(
-                    self.model_wrapper.model_path  + '_augment.onnx',
-                    so,
-                    provider=self.backend)
+        from neural_compressor import options
+        with span('create_session', 'calibration'):
+            session = self.session_pool.get_session(
+                        self.augmented_model,
+                        self.backend if isinstance(self.backend, list) else [self.backend],
+                        model_path=self.model_wrapper.model_path + '_augment.onnx' \
+                            if self.model_wrapper.large_size else None,
+                        **options.onnxrt.session_options)
 
         intermediate_outputs = []
         len_inputs = len(session.get_inputs())
@@ -230,42 +229,44 @@ class ONNXRTAugment:
                              else self.dequantized_output[output.name] \
                              for output in session.get_outputs()]
 
-        for idx, (inputs, labels) in enumerate(self.dataloader):
-            ort_inputs = {}
-            if len_inputs == 1:
-                ort_inputs.update(
-                    inputs if isinstance(inputs, dict) else {inputs_names[0]: inputs}
-                )
-            else:
-                assert len_inputs == len(inputs), \
-                    'number of input tensors must align with graph inputs'
-                if isinstance(inputs, dict):  # pragma: no cover
-                    ort_inputs.update(inputs)
+        num_iterations = 0
+        with span('inference', 'calibration') as inference_span:
+            for idx, (inputs, labels) in enumerate(self.dataloader):
+                ort_inputs = {}
+                if len_inputs == 1:
+                    ort_inputs.update(
+                        inputs if isinstance(inputs, dict) else {inputs_names[0]: inputs}
+                    )
                 else:
-                    for i in range(len_inputs):
-                        if not isinstance(inputs[i], np.ndarray): # pragma: no cover
-                            ort_inputs.update({inputs_names[i]: np.array(inputs[i])})
-                        else:
-                            ort_inputs.update({inputs_names[i]: inputs[i]})
-            if self.iterations != []:
-                if idx > max(self.iterations):
-                    break
-                if idx in self.iterations:
-                    for output_idx, output in enumerate(session.run(None, ort_inputs)): 
-                        if calib_mode == 'naive' and output.size != 0:
-                            output_dicts.setdefault(node_output_names[output_idx], \
-                                []).append([output.min(), output.max()])
-                        elif calib_mode == None:
-                            output_dicts.setdefault(node_output_names[output_idx], \
-                                []).append(output)
-            else:
-                for output_idx, output in enumerate(session.run(None, ort_inputs)): 
+                    assert len_inputs == len(inputs), \
+                        'number of input tensors must align with graph inputs'
+                    if isinstance(inputs, dict):  # pragma: no cover
+                        ort_inputs.update(inputs)
+                    else:
+                        for i in range(len_inputs):
+                            if not isinstance(inputs[i], np.ndarray): # pragma: no cover
+                                ort_inputs.update({inputs_names[i]: np.array(inputs[i])})
+                            else:
+                                ort_inputs.update({inputs_names[i]: inputs[i]})
+                if self.iterations != []:
+                    if idx > max(self.iterations):
+                        break
+                    if idx not in self.iterations:
+                        continue
+                outputs = session.run(None, ort_inputs)
+                if inference_span:
+                    inference_span.add('batches')
+                    inference_span.add('bytes', sum(output.nbytes for output in outputs))
+                for output_idx, output in enumerate(outputs):
                     if calib_mode == 'naive' and output.size != 0:
                         output_dicts.setdefault(node_output_names[output_idx], \
                             []).append([output.min(), output.max()])
+                    elif calib_mode == None and output_handler is not None:
+                        output_handler(num_iterations, node_output_names[output_idx], output)
                     elif calib_mode == None:
                         output_dicts.setdefault(node_output_names[output_idx], \
                             []).append(output)
+                num_iterations += 1
 
         return list(output_dicts.keys()), output_dicts
 
@@ -438,19 +439,18 @@ class ONNXRTAugment:
 
         return quantization_params
 
-    def dump_tensor(self, activation=True, weight=False):
-        """Dump activation or weight or both from the model."""
-        if "QuantizeLinear" in [node.op_type for node in self.model.graph.node] or \
-            "DynamicQuantizeLinear" in [node.op_type for node in self.model.graph.node]:
-            self.augment_nodes = ["DequantizeLinear"]
-            self.already_quantized = True
-            self.dynamically_quantized = \
-                "DynamicQuantizeLinear" in [node.op_type for node in self.model.graph.node]
-        self.augment_graph(activation_only=not weight, weight_only=not activation)
-        _, output_dicts = self.get_intermediate_outputs()
-        iters = len(list(output_dicts.values())[-1])
-        map_node_activation = [{} for _ in range(iters)]
-        map_node_weight = {}
+    def _get_dump_map(self, output_names):
+        """Map the outputs of the augmented model to the white nodes.
+
+        Args:
+            output_names (list): output names of the augmented model.
+
+        Returns:
+            activation_map (dict): {node_name: output_name} of activations.
+            weight_map (dict): {node_name: [output_name, ...]} of weights.
+        """
+        activation_map = {}
+        weight_map = {}
         self.white_nodes = [node.replace('_quant', '') for node in self.white_nodes]
         augmengted_wrapper = ONNXModel(self.augmented_model)
         map_output = augmengted_wrapper.output_name_to_node
@@ -458,7 +458,7 @@ class ONNXRTAugment:
         model_output_names = [t.name for t in self.model.graph.output]
         model_input_names = [t.name for t in self.model.graph.input]
         model_initializer_names = [t.name for t in self.model.graph.initializer]
-        for tensor_name, tensors in output_dicts.items():
+        for tensor_name in output_names:
             if tensor_name.replace('_dequantized', '_quantized') in model_initializer_names:
                 nodes = [node for node in map_input[tensor_name] \
                     if node.name.replace('_quant', '') in self.white_nodes]
@@ -475,16 +475,70 @@ class ONNXRTAugment:
                     node_name = node.name.replace('_quant', '')
                 if node_name not in self.white_nodes:
                     continue
-                if node_name not in map_node_weight:
-                    map_node_weight[node_name] = {}
+                if node_name not in weight_map:
+                    weight_map[node_name] = []
                 if tensor_name not in model_initializer_names:
-                    for i in range(iters):
-                        map_node_activation[i][node_name] = \
-                                               {tensor_name.replace('_quantized', ''): tensors[i]}
+                    activation_map[node_name] = tensor_name
                 else:
-                    map_node_weight[node_name].update({tensor_name.replace('_quantized', ''): \
-                                                                                      tensors[0]})
+                    weight_map[node_name].append(tensor_name)
+        return activation_map, weight_map
+
+    def dump_tensor(self, activation=True, weight=False, store=None):
+        """Dump activation or weight or both from the model.
+
+        Args:
+            activation (bool, optional): dump activations. Defaults to True.
+            weight (bool, optional): dump weights. Defaults to False.
+            store (TensorStore, optional): if given, the tensors are written to the store during the inference
+                instead of being kept in memory, and the returned dicts read them lazily from the store.
+        """
+        if "QuantizeLinear" in [node.op_type for node in self.model.graph.node] or \
+            "DynamicQuantizeLinear" in [node.op_type for node in self.model.graph.node]:
+            self.augment_nodes = ["DequantizeLinear"]
+            self.already_quantized = True
+            self.dynamically_quantized = \
+                "DynamicQuantizeLinear" in [node.op_type for node in self.model.graph.node]
+        self.augment_graph(activation_only=not weight, weight_only=not activation)
         dumped_tensors_map = {}
+        if store is not None:
+            output_names = [output.name if output.name not in self.dequantized_output \
+                            else self.dequantized_output[output.name] \
+                            for output in self.augmented_model.graph.output]
+            activation_map, weight_map = self._get_dump_map(output_names)
+            output_to_activations = {}
+            for node_name, tensor_name in activation_map.items():
+                output_to_activations.setdefault(tensor_name, []).append(node_name)
+            output_to_weights = {}
+            for node_name, tensor_names in weight_map.items():
+                store.put('weight', node_name, {})
+                for tensor_name in tensor_names:
+                    output_to_weights.setdefault(tensor_name, []).append(node_name)
+            iters = [0]
+
+            def output_handler(iteration, tensor_name, output):
+                iters[0] = iteration + 1
+                for node_name in output_to_activations.get(tensor_name, []):
+                    store.put(iteration, node_name, {tensor_name.replace('_quantized', ''): output})
+                if iteration == 0:
+                    for node_name in output_to_weights.get(tensor_name, []):
+                        store.put('weight', node_name, {tensor_name.replace('_quantized', ''): output})
+
+            self.get_intermediate_outputs(output_handler=output_handler)
+            store.flush()
+            if weight:
+                dumped_tensors_map.update({"weight": store.load('weight')})
+            if activation:
+                dumped_tensors_map.update({"activation": [store.load(i) for i in range(iters[0])]})
+            return dumped_tensors_map
+
+        _, output_dicts = self.get_intermediate_outputs()
+        iters = len(list(output_dicts.values())[-1])
+        activation_map, weight_map = self._get_dump_map(list(output_dicts.keys()))
+        map_node_activation = [{node_name: {tensor_name.replace('_quantized', ''): output_dicts[tensor_name][i]} \
+                                for node_name, tensor_name in activation_map.items()} for i in range(iters)]
+        map_node_weight = {node_name: {tensor_name.replace('_quantized', ''): output_dicts[tensor_name][0] \
+                                       for tensor_name in tensor_names} \
+                           for node_name, tensor_names in weight_map.items()}
         if weight:
             dumped_tensors_map.update({"weight": map_node_weight})
         if activation:
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Run ONNX Runtime sessions with IOBinding."""
+
+import logging
+import sys
+
+import numpy as np
+
+logger = logging.getLogger("neural_compressor")
+
+
+class IOBindingRunner:
+    """Run a session with IOBinding, writing the outputs into reusable buffers.
+
+    The inputs are bound without copies. The first batch of given input shapes runs with outputs
+    allocated by onnxruntime, and the following batches of the same shapes write their outputs
+    straight into buffers allocated once for those shapes. The returned outputs are these buffers,
+    so a buffer still referenced after a batch, e.g. kept by a metric, is replaced by a new one
+    instead of being overwritten.
+
+    Args:
+        session (onnxruntime.InferenceSession): the session, see is_supported().
+    """
+
+    def __init__(self, session):
+        """Init an IOBindingRunner."""
+        self.session = session
+        self.io_binding = session.io_binding()
+        self.output_names = [output.name for output in session.get_outputs()]
+        self.reuse_outputs = True
+        self._input_shapes = None
+        self._buffers = []
+
+    @staticmethod
+    def is_supported(session):
+        """Check if all inputs and outputs of the session are tensors."""
+        return all([value.type.startswith('tensor(') for value in \
+            session.get_inputs() + session.get_outputs()])
+
+    def _bind_outputs(self):
+        """Bind the outputs to the reusable buffers."""
+        for index, name in enumerate(self.output_names):
+            # referenced only by self._buffers and the argument of getrefcount
+            if sys.getrefcount(self._buffers[index]) > 2:
+                self._buffers[index] = np.empty_like(self._buffers[index])
+            buffer = self._buffers[index]
+            self.io_binding.bind_output(name, 'cpu', 0, buffer.dtype.type, buffer.shape,
+                                        buffer.ctypes.data)
+
+    def run(self, inputs):
+        """Run a batch.
+
+        Args:
+            inputs (dict): input name and value.
+
+        Returns:
+            list: the outputs.
+        """
+        inputs = {name: np.ascontiguousarray(value) for name, value in inputs.items()}
+        self.io_binding.clear_binding_inputs()
+        for name, value in inputs.items():
+            self.io_binding.bind_cpu_input(name, value)
+        self.io_binding.clear_binding_outputs()
+        input_shapes = [(name, value.shape) for name, value in inputs.items()]
+        if self.reuse_outputs and input_shapes == self._input_shapes:
+            self._bind_outputs()
+            try:
+                self.session.run_with_iobinding(self.io_binding)
+                return list(self._buffers)
+            except Exception as e:
+                # the output shapes depend on the input data
+                logger.debug("Stop reusing output buffers due to {}.".format(str(e)))
+                self.reuse_outputs = False
+                self.io_binding.clear_binding_outputs()
+
+        for name in self.output_names:
+            self.io_binding.bind_output(name, 'cpu')
+        self.session.run_with_iobinding(self.io_binding)
+        self._input_shapes = input_shapes
+        self._buffers = self.io_binding.copy_outputs_to_cpu()
+        return list(self._buffers)
@@ -40,6 +40,7 @@ from neural_compressor.adaptor.ox_utils.util import __producer__, __version__
 from neural_compressor.adaptor.ox_utils.util import quantize_data, dtype_mapping, support_pair, ValueInfo
 from neural_compressor import options
 from neural_compressor.model.onnx_model import ONNXModel
+from neural_compressor.utils.tracing import current_span, traced
 from neural_compressor.adaptor.ox_utils.operators import OPERATORS
 
 logger = logging.getLogger("neural_compressor")
@@ -138,6 +139,7 @@ class Quantizer:
         else:
             return False
 
+    @traced('quantize_model', 'adaptor')
     def quantize_model(self):
         """Quantize onnx model."""
         # step 1: insert q-dq, cast-cast pairs
@@ -155,6 +157,7 @@ class Quantizer:
 
         self.model.model.producer_name = __producer__
         self.model.model.producer_version = __version__
+        current_span().add('ops', len(self.model.model.graph.node))
 
         return self.model.model
 
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Pool of ONNX Runtime inference sessions."""
+
+import hashlib
+import logging
+import sys
+from collections import OrderedDict
+from importlib.util import find_spec
+
+from neural_compressor.utils.utility import LazyImport
+
+onnx = LazyImport("onnx")
+ort = LazyImport("onnxruntime")
+
+logger = logging.getLogger("neural_compressor")
+
+SESSION_OPTIONS = ['graph_optimization_level', 'intra_op_num_threads', 'inter_op_num_threads',
+                   'enable_mem_pattern', 'enable_cpu_mem_arena', 'execution_mode']
+
+
+class SessionPool:
+    """Inference sessions keyed by model fingerprint and session options.
+
+    The fingerprint of a model is the hash of its serialized bytes, computed at every get_session(), so
+    any edit of a model in place (an attribute, a rewired input, the data of an initializer) gets a new
+    session, and a session built for a model is reused for an equal model, e.g. the same augmented model
+    built in another trial. The bytes are also used to build the session, so a model is serialized once.
+    Models over 2GB can not be serialized, their sessions are not pooled.
+
+    Args:
+        max_size (int, optional): the maximum number of kept sessions, the least recently used
+            session is released first. Defaults to 4.
+    """
+
+    def __init__(self, max_size=4):
+        """Init a SessionPool."""
+        self.max_size = max_size
+        self._sessions = OrderedDict()
+
+    def get_session(self, model, providers, model_path=None, **session_options):
+        """Get the inference session of a model, building it if it is not in the pool.
+
+        Args:
+            model (ModelProto): the onnx model.
+            providers (list): execution providers.
+            model_path (str, optional): for models larger than 2GB, the path the model is saved to
+                with external data to build the session. Defaults to None.
+            session_options: values of SESSION_OPTIONS, None keeps the default of onnxruntime.
+
+        Returns:
+            onnxruntime.InferenceSession: the session.
+        """
+        assert set(session_options).issubset(SESSION_OPTIONS), \
+            "Supported session options are {}.".format(SESSION_OPTIONS)
+        if model_path is None:
+            model_bytes = model.SerializeToString()
+            key = (hashlib.sha256(model_bytes).hexdigest(), tuple(providers),
+                   tuple(session_options.get(name) for name in SESSION_OPTIONS))
+            if key in self._sessions:
+                self._sessions.move_to_end(key)
+                return self._sessions[key]
+
+        sess_options = ort.SessionOptions()
+        for name, value in session_options.items():
+            if value is not None:
+                setattr(sess_options, name, value)
+        if sys.version_info < (3,10) and find_spec('onnxruntime_extensions'): # pragma: no cover
+            from onnxruntime_extensions import get_library_path
+            sess_options.register_custom_ops_library(get_library_path())
+        if model_path is not None: # pragma: no cover
+            onnx.save_model(model,
+                            model_path,
+                            save_as_external_data=True,
+                            all_tensors_to_one_file=True,
+                            location="weights.pb",
+                            convert_attribute=False)
+            # not pooled, see the class docstring
+            return ort.InferenceSession(model_path, sess_options, providers=providers)
+        session = ort.InferenceSession(model_bytes, sess_options, providers=providers)
+        logger.debug("Create an inference session, {} sessions in the pool.".format(
+            len(self._sessions) + 1))
+        self._sessions[key] = session
+        while len(self._sessions) > self.max_size:
+            self._sessions.popitem(last=False)
+        return session
+
+    def clear(self):
+        """Release all sessions."""
+        self._sessions.clear()
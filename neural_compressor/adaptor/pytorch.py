@@ -741,6 +741,9 @@ class TemplateAdaptor(Adaptor):
     Args:
         framework_specific_info (dict): dictionary of tuning configure from yaml file.
     """
+    # torch threads are set for the whole process
+    predictor_threads_shared = True
+
     def __init__(self, framework_specific_info):
         super(TemplateAdaptor, self).__init__(framework_specific_info)
         import torch.quantization as tq
@@ -950,6 +953,34 @@ class TemplateAdaptor(Adaptor):
                     break
         return results
 
+    def predictor(self, model, num_threads=None, inter_num_threads=None):
+        """Create a callable running the model for the server scenario.
+
+        Args:
+            model (object): model to run.
+            num_threads (int, optional): the number of torch threads, which are shared by
+                all instances in the process. Defaults to None.
+            inter_num_threads (int, optional): the number of torch inter op threads, which
+                can only be set before torch runs any inter op work. Defaults to None.
+
+        Returns:
+            A callable running a batch of inputs and returning the outputs.
+
+        Raises:
+            RuntimeError: if inter_num_threads can not be set any more.
+        """
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+        if inter_num_threads is not None and inter_num_threads != torch.get_num_interop_threads():
+            torch.set_num_interop_threads(inter_num_threads)
+        model = model._model
+        model.eval()
+
+        def predict(inputs):
+            with torch.no_grad():
+                return pytorch_forward_wrapper(model, inputs, device=self.device)
+        return predict
+
     def model_eval(self,
                    model,
                    dataloader,
@@ -2007,6 +2038,9 @@ class PyTorchAdaptor(TemplateAdaptor):
         self.evaluate(new_model, dataloader, iteration=iterations)
         observer_dict = {}
         ret = {}
+        if save_to_disk:
+            from neural_compressor.utils.tensor_store import TensorStore
+            store = TensorStore(os.path.join(self.workspace_path, 'dump_tensor'), 'w')
         if inspect_type == 'activation' or inspect_type == 'all':
             from torch.quantization import get_observer_dict
             ret['activation'] = []
@@ -2074,9 +2108,8 @@ class PyTorchAdaptor(TemplateAdaptor):
                                             }
 
                 if save_to_disk:
-                    dump_dir = os.path.join(self.workspace_path, 'dump_tensor')
-                    os.makedirs(dump_dir, exist_ok=True)
-                    np.savez(os.path.join(dump_dir, 'activation_iter{}.npz'.format(i)), **summary)
+                    for op_name, tensors in summary.items():
+                        store.put(i, op_name, tensors)
 
                 ret['activation'].append(summary)
 
@@ -2126,10 +2159,13 @@ class PyTorchAdaptor(TemplateAdaptor):
                                     break
 
             if save_to_disk:
-                np.savez(os.path.join(dump_dir, 'weight.npz'), **ret['weight'])
+                for op_name, tensors in ret['weight'].items():
+                    store.put('weight', op_name, tensors)
         else:
             ret['weight'] = None
 
+        if save_to_disk:
+            store.close()
         return ret
 
     def set_tensor(self, model, tensor_dict):
@@ -105,6 +105,10 @@ class TensorFlowAdaptor(Adaptor):
 
         self._last_dequantize_ops = None
 
+        # calibration results reused by the quantization of the same model
+        self._calib_cache = {}
+        self._calib_cache_model = None
+
     def _log_histogram(self, writer, tag, values, step=0, bins=1000):
         """Writes a histogram for later analysis."""
         import tensorflow as tf
@@ -546,6 +550,7 @@ class TensorFlowAdaptor(Adaptor):
         logger.debug("Dump quantization configurations:")
         logger.debug(self.quantize_config)
         from .tf_utils.graph_converter import GraphConverter
+        calib_cache = self._get_calib_cache(model)
         calib_sampling_size = tune_cfg.get('calib_sampling_size', 1)
         if isinstance(data_loader, BaseDataLoader):
             batch_size = data_loader.batch_size
@@ -572,7 +577,8 @@ class TensorFlowAdaptor(Adaptor):
                                         qdq_enabled=self.qdq_enabled,
                                         new_api=self.new_api,
                                         performance_only = self.performance_only,
-                                        use_bf16=self.use_bf16).convert()
+                                        use_bf16=self.use_bf16,
+                                        calib_cache=calib_cache).convert()
             except Exception: # pragma: no cover
                 from .tf_utils.util import get_model_input_shape
                 batch_size = get_model_input_shape(model)
@@ -591,7 +597,8 @@ class TensorFlowAdaptor(Adaptor):
                                         qdq_enabled=self.qdq_enabled,
                                         new_api=self.new_api,
                                         performance_only = self.performance_only,
-                                        use_bf16=self.use_bf16).convert()
+                                        use_bf16=self.use_bf16,
+                                        calib_cache=calib_cache).convert()
         else: # pragma: no cover
             if hasattr(data_loader, 'batch_size') and \
               calib_sampling_size % data_loader.batch_size != 0:
@@ -612,7 +619,8 @@ class TensorFlowAdaptor(Adaptor):
                                 qdq_enabled=self.qdq_enabled,
                                 new_api=self.new_api,
                                 performance_only = self.performance_only,
-                                use_bf16=self.use_bf16).convert()
+                                use_bf16=self.use_bf16,
+                                calib_cache=calib_cache).convert()
         #just save framework_specific_info feature for recover
         converted_model.q_config.update({'framework_specific_info': \
                                             self.framework_specific_info})
@@ -621,6 +629,13 @@ class TensorFlowAdaptor(Adaptor):
 
         return converted_model
 
+    def _get_calib_cache(self, model):
+        """Get the calibration cache of the model, a new model resets the cache."""
+        if model is not self._calib_cache_model:
+            self._calib_cache = {}
+            self._calib_cache_model = model
+        return self._calib_cache
+
     def _dump_model_op_stats(self, model_graphdef):
         """Dump the whole model's OPs statistics information for analysis."""
         fp32_op_list_uint8 = copy.deepcopy(
@@ -723,9 +738,15 @@ class TensorFlowAdaptor(Adaptor):
 
         valid_precision = self.query_handler.get_mixed_precision_combination()
         op_capability = self.query_handler.get_quantization_capability()
+        # the ops share these capabilities except the pattern, the tuning space does not change them
         conv_config = copy.deepcopy(op_capability['uint8']['Conv2D'])
         conv3d_config = copy.deepcopy(op_capability['uint8']['Conv3D']) if 'Conv3D' in op_capability['uint8'] else None
         matmul_config = copy.deepcopy(op_capability['uint8']['MatMul'])
+        # TODO enable the sym mode once the tf fixed the mkldequantize_op.cc bug.
+        # is_positive_input = self.pre_optimizer_handle.has_positive_input(node_name)
+        # matmul_scheme = 'sym' if is_positive_input else 'asym'
+        matmul_scheme = ['asym']
+        matmul_config['activation']['scheme'] = matmul_scheme
         other_config = copy.deepcopy(op_capability['uint8']['default'])
         
         self.quantizable_op_details = OrderedDict()
@@ -754,32 +775,24 @@ class TensorFlowAdaptor(Adaptor):
                     continue
                 self._init_op_stat[node_op].append(node_name)
                 if self.unify_op_type_mapping[node_op].find("conv2d") != -1:
-                    conv2d_int8_config = copy.deepcopy(conv_config)
-                    conv2d_int8_config['pattern'] = pattern_info
+                    conv2d_int8_config = dict(conv_config, pattern=pattern_info)
                     self.quantizable_op_details[(
                         node_name, self.unify_op_type_mapping[node_op]
                     )] = [conv2d_int8_config, fp32_common_config]
                 elif self.unify_op_type_mapping[node_op].find("conv3d") != -1:
-                    conv3d_int8_config = copy.deepcopy(conv3d_config)
-                    conv3d_int8_config['pattern'] = pattern_info
+                    conv3d_int8_config = dict(conv3d_config, pattern=pattern_info)
                     self.quantizable_op_details[(
                         node_name, self.unify_op_type_mapping[node_op]
                     )] = [conv3d_int8_config, fp32_common_config]
                 elif self.unify_op_type_mapping[node_op].find("matmul") != -1:
-                    matmul_int8_config = copy.deepcopy(matmul_config)
-                    matmul_int8_config['pattern'] = pattern_info
-                    # TODO enable the sym mode once the tf fixed the mkldequantize_op.cc bug.
-                    # is_positive_input = self.pre_optimizer_handle.has_positive_input(node_name)
-                    # matmul_scheme = 'sym' if is_positive_input else 'asym'
-                    matmul_scheme = ['asym']
-                    matmul_int8_config['activation']['scheme'] = matmul_scheme
+                    matmul_int8_config = dict(matmul_config, pattern=pattern_info)
                     self.quantizable_op_details[(
                         node_name, self.unify_op_type_mapping[node_op]
                     )] = [matmul_int8_config, fp32_common_config]
                 else:
                     self.quantizable_op_details[(
                         node_name, self.unify_op_type_mapping[node_op]
-                    )] = [copy.deepcopy(other_config), fp32_common_config]
+                    )] = [other_config, fp32_common_config]
                 if ('bf16' in valid_precision and CpuInfo().bf16) or os.getenv('FORCE_BF16') == '1':
                     self.quantizable_op_details[(
                         node_name, self.unify_op_type_mapping[node_op]
@@ -862,9 +875,9 @@ class TensorFlowAdaptor(Adaptor):
         bf16_patterns = self.query_handler.get_bf16_patterns()
         matched_nodes = self.pre_optimizer_handle.get_matched_nodes(patterns)
         matched_bf16_nodes = self.pre_optimizer_handle.get_matched_nodes(bf16_patterns)
-        original_graph_node_name = [i.name for i in model.graph_def.node]
+        original_graph_node_index = {node.name: index for index, node in enumerate(model.graph_def.node)}
         matched_nodes = sorted(matched_nodes, reverse=True, key=lambda i: (
-            original_graph_node_name.index(i[0]), len(i[-1])))
+            original_graph_node_index[i[0]], len(i[-1])))
 
         def check_match(patterns, input_pattern):
             for i in patterns:
@@ -879,31 +892,21 @@ class TensorFlowAdaptor(Adaptor):
         else:
             self._filter_unquantizable_concat(matched_nodes)
 
-        copied_matched_nodes = copy.deepcopy(matched_nodes)
-        for i in copied_matched_nodes:
-            if i[-1][0] in self.query_handler.get_op_types()['int8']:
-                continue
-
-            if not self.pre_optimizer_handle.has_positive_input(i[0]) and \
-                not check_match(self.query_handler.get_fuse_patterns()['int8'], i[-1]):
-                matched_nodes.remove(i)
-
-        del copied_matched_nodes
-
-        copied_matched_nodes = copy.deepcopy(matched_bf16_nodes)
-        for i in copied_matched_nodes:
-            for j in matched_nodes:
-                if i[0] == j[0] and i in matched_bf16_nodes:
-                    matched_bf16_nodes.remove(i)
+        int8_op_types = self.query_handler.get_op_types()['int8']
+        int8_fuse_patterns = self.query_handler.get_fuse_patterns()['int8']
+        matched_nodes = [i for i in matched_nodes if i[-1][0] in int8_op_types or \
+            self.pre_optimizer_handle.has_positive_input(i[0]) or check_match(int8_fuse_patterns, i[-1])]
 
-        del copied_matched_nodes
+        matched_node_names = set([i[0] for i in matched_nodes])
+        matched_bf16_nodes = [i for i in matched_bf16_nodes if i[0] not in matched_node_names]
 
         self._query_quantizable_ops(matched_nodes)
         self._query_bf16_ops(matched_bf16_nodes)
         capability = {
             'optypewise': self.get_optype_wise_ability(),
         }
-        capability['opwise'] = copy.deepcopy(self.quantizable_op_details)
+        # the op capabilities are shared with the adaptor, the tuning space does not change them
+        capability['opwise'] = OrderedDict(self.quantizable_op_details)
         capability['opwise'].update(self.bf16_op_details)
         logger.debug("Dump framework quantization capability:")
         logger.debug(capability)
@@ -1702,6 +1705,7 @@ class Tensorflow_ITEXAdaptor(TensorFlowAdaptor):
         logger.debug('Dump quantization configurations:')
         logger.debug(self.quantize_config)
         from .tf_utils.graph_converter import GraphConverter
+        calib_cache = self._get_calib_cache(model)
         calib_sampling_size = tune_cfg.get('calib_sampling_size', 1)
         if isinstance(data_loader, BaseDataLoader):
             batch_size = data_loader.batch_size
@@ -1729,7 +1733,8 @@ class Tensorflow_ITEXAdaptor(TensorFlowAdaptor):
                                     qdq_enabled=self.qdq_enabled,
                                     new_api=self.new_api,
                                     performance_only = self.performance_only,
-                                    use_bf16=self.use_bf16).convert()
+                                    use_bf16=self.use_bf16,
+                                    calib_cache=calib_cache).convert()
             except Exception: # pragma: no cover
                 from .tf_utils.util import get_model_input_shape
                 batch_size = get_model_input_shape(model)
@@ -1749,7 +1754,8 @@ class Tensorflow_ITEXAdaptor(TensorFlowAdaptor):
                                 qdq_enabled=self.qdq_enabled,
                                 new_api=self.new_api,
                                 performance_only = self.performance_only,
-                                use_bf16=self.use_bf16).convert()
+                                use_bf16=self.use_bf16,
+                                calib_cache=calib_cache).convert()
         else: # pragma: no cover
             if hasattr(data_loader, 'batch_size') and \
               calib_sampling_size % data_loader.batch_size != 0:
@@ -1771,7 +1777,8 @@ class Tensorflow_ITEXAdaptor(TensorFlowAdaptor):
                                    qdq_enabled=self.qdq_enabled,
                                    new_api=self.new_api,
                                    performance_only = self.performance_only,
-                                   use_bf16=self.use_bf16).convert()
+                                   use_bf16=self.use_bf16,
+                                   calib_cache=calib_cache).convert()
 
         self._dump_model_op_stats(converted_model.graph_def)
 
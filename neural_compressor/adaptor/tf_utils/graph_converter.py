@@ -92,7 +92,8 @@ class GraphConverter:
                  qdq_enabled=False,
                  new_api=False,
                  performance_only=False,
-                 use_bf16=False):
+                 use_bf16=False,
+                 calib_cache=None):
         """Convert graph.
 
         :param model: input tensorflow model.
@@ -101,6 +102,8 @@ class GraphConverter:
         :param bf16_ops: fall back to bf16 dtype op list
         :param data_loader: for calibration phase used dataloader
         :param fake_quant: for quantization-aware training model conversion to default model
+        :param calib_cache: dict shared by the conversions of the same model to reuse the
+                            calibration results of the nodes whose settings are unchanged
         """
         self.model = model
         #(TODO) does it right to make the internal model format as graph_def
@@ -156,6 +159,7 @@ class GraphConverter:
         self.performance_only = performance_only
         self.use_bf16 = use_bf16
         self.exclude_node_names = []
+        self.calib_cache = calib_cache if calib_cache is not None else {}
 
     # pylint: disable=no-member
     def _inference(self, model):
@@ -481,36 +485,9 @@ class GraphConverter:
                 self._fuse_requantize_with_fused_quantized_node()
             else:
                 if self._enable_kl_op_names:
-                    self._get_fp32_print_node_names(self._enable_kl_op_names)
-                    self._generate_calibration_data(self._fp32_logged_model_path,
-                                                    self._fp32_print_data,
-                                                    True)
-
-                output_tensor_names = copy.deepcopy(self.model.output_tensor_names)
-                sampling_graph_def = copy.deepcopy(self._fp32_model.graph_def)
-                # TODO: this is a workaround to make Min/Max node be completly eliminated in int8 graph 
-                # after enabling pad+conv2d in new API.
-                
-                non_pad_ops = list(list(set(self.fp32_ops).union(set(self.bf16_ops))))
-                sampling_graph_def = FusePadWithFP32Conv2DOptimizer(
-                    sampling_graph_def,
-                    non_pad_ops,
-                    self._tmp_model.input_node_names,
-                    self.op_wise_config,
-                    self.new_api).do_transformation()
-
-                for i in self.quantized_node_info:
-                    sampling_graph_def, output_names = InsertPrintMinMaxNode(
-                        sampling_graph_def, i[0], i[-1], self.new_api).do_transformation()
-                    output_tensor_names.extend(output_names)
-                if self.quantized_node_info:
-                    sampling_graph_def.library.CopyFrom(self.model.graph_def.library)
-                    self._sampling_model.graph_def = sampling_graph_def
-                    self._sampling_model.output_tensor_names = output_tensor_names
-                    tmp_dump_file = tempfile.mkstemp(suffix='.log')[1]
-                    with CaptureOutputToFile(tmp_dump_file):
-                        self._inference(self._sampling_model)
-                    self._calibration_data = Helper.gen_valid_sampling_log(tmp_dump_file)
+                    self._generate_kl_calibration_data()
+
+                self._generate_sampling_data()
 
                 if len(self._calibration_data) > 0:
                     self._freeze_requantization_ranges(self._kl_op_dict)
@@ -610,6 +587,95 @@ class GraphConverter:
                 else:
                     self._kl_op_dict[key] = combine_histogram(self._kl_op_dict[key], fp32_data)
 
+    def _get_calib_settings(self):
+        """Get the calibration settings the cached calibration results depend on."""
+        return (self.calib_iteration, id(self.data_loader),
+                getattr(self.data_loader, 'batch_size', None), self.new_api, self.itex_mode)
+
+    def _generate_kl_calibration_data(self):
+        """Generate the KL histograms of the kl ops, reusing the cached ones."""
+        settings = self._get_calib_settings()
+        node_name_mapping = {node.name: node for node in self._tmp_graph_def.node}
+        uncached_keys = {}
+        for op_name in self._enable_kl_op_names:
+            quantized_node = node_name_mapping.get(op_name + '_eightbit_quantized_conv')
+            key = ('kl', op_name, quantized_node.op if quantized_node else None, settings)
+            if key not in self.calib_cache:
+                uncached_keys[op_name] = key
+            elif self.calib_cache[key] is not None:
+                self._kl_op_dict[op_name + '_eightbit_requant_range'] = self.calib_cache[key]
+        if not uncached_keys:
+            logger.debug("Reuse the cached KL histograms of all kl ops.")
+            return
+
+        self._get_fp32_print_node_names(list(uncached_keys))
+        self._generate_calibration_data(self._fp32_logged_model_path,
+                                        self._fp32_print_data,
+                                        True)
+        # the ops without a logged fp32 output are cached too, as they have no histogram
+        for op_name, key in uncached_keys.items():
+            self.calib_cache[key] = self._kl_op_dict.get(op_name + '_eightbit_requant_range')
+
+    def _generate_sampling_data(self, itex_qdq_mode=False):
+        """Sample the min/max of the quantized nodes, reusing the cached results.
+
+        The results are cached per node feeding the print nodes, keyed by its quantized node
+        patterns, its inputs in the sampling graph and the calibration settings, so only the
+        nodes whose quantization changed since the last conversion are sampled.
+        """
+        output_tensor_names = copy.deepcopy(self.model.output_tensor_names)
+        sampling_graph_def = copy.deepcopy(self._fp32_model.graph_def)
+        # TODO: this is a workaround to make Min/Max node be completly eliminated in int8 graph
+        # after enabling pad+conv2d in new API.
+        non_pad_ops = list(list(set(self.fp32_ops).union(set(self.bf16_ops))))
+        sampling_graph_def = FusePadWithFP32Conv2DOptimizer(
+                                    sampling_graph_def,
+                                    non_pad_ops,
+                                    self._tmp_model.input_node_names,
+                                    self.op_wise_config,
+                                    self.new_api,
+                                    itex_qdq_mode).do_transformation()
+
+        pre_node_info = OrderedDict()
+        for i in self.quantized_node_info:
+            pre_node_info.setdefault(i[0], []).append(tuple(i))
+        node_inputs = {node.name: tuple(node.input) for node in sampling_graph_def.node}
+        settings = self._get_calib_settings()
+        calibration_data = []
+        uncached_keys = {}
+        for pre_node_name, node_info in pre_node_info.items():
+            key = ('min_max', pre_node_name, tuple(node_info),
+                   node_inputs.get(pre_node_name), settings)
+            if key in self.calib_cache:
+                calibration_data.extend(self.calib_cache[key])
+                continue
+            uncached_keys[pre_node_name] = key
+            for i in node_info:
+                sampling_graph_def, output_names = InsertPrintMinMaxNode(
+                    sampling_graph_def, i[0], i[-1], self.new_api).do_transformation()
+                output_tensor_names.extend(output_names)
+        if pre_node_info:
+            logger.info("Reuse the calibration data of {} of {} quantized nodes.".format(
+                len(pre_node_info) - len(uncached_keys), len(pre_node_info)))
+
+        if uncached_keys:
+            sampling_graph_def.library.CopyFrom(self.model.graph_def.library)
+            self._sampling_model.graph_def = sampling_graph_def
+            self._sampling_model.output_tensor_names = output_tensor_names
+            tmp_dump_file = tempfile.mkstemp(suffix='.log')[1]
+            with CaptureOutputToFile(tmp_dump_file):
+                self._inference(self._sampling_model)
+            sampling_data = Helper.gen_valid_sampling_log(tmp_dump_file)
+            # each line starts with ';{pre_node_name}_eightbit_'
+            node_sampling_data = {key: [] for key in uncached_keys.values()}
+            for line in sampling_data:
+                key = uncached_keys.get(line[1:].split('_eightbit_')[0])
+                if key is not None:
+                    node_sampling_data[key].append(line)
+            self.calib_cache.update(node_sampling_data)
+            calibration_data.extend(sampling_data)
+        self._calibration_data = calibration_data
+
     def _freeze_requantization_ranges(self, additional_data=None):
         """Freeze requantization ranges after doing quantization."""
         self._tmp_graph_def, quantizev2_max = FreezeValueTransformer(
@@ -773,39 +839,10 @@ class GraphConverter:
             self.quantized_node_info.extend(self._search_y_pattern_for_itex())
 
         if self._enable_kl_op_names:
-            self._get_fp32_print_node_names(self._enable_kl_op_names)
-            self._generate_calibration_data(self._fp32_logged_model_path,
-                                            self._fp32_print_data,
-                                            True)
+            self._generate_kl_calibration_data()
 
         # Calibration using sampling model
-        output_tensor_names = copy.deepcopy(self.model.output_tensor_names)
-        sampling_graph_def = copy.deepcopy(self._fp32_model.graph_def)
-        # TODO: this is a workaround to make Min/Max node be completly eliminated in int8 graph
-        # after enabling pad+conv2d in new API.
-        non_pad_ops = list(list(set(self.fp32_ops).union(set(self.bf16_ops))))
-        sampling_graph_def = FusePadWithFP32Conv2DOptimizer(
-                                    sampling_graph_def,
-                                    non_pad_ops,
-                                    self._tmp_model.input_node_names,
-                                    self.op_wise_config,
-                                    self.new_api,
-                                    True).do_transformation()
-
-        for i in self.quantized_node_info:
-            sampling_graph_def, output_names = InsertPrintMinMaxNode(
-                sampling_graph_def, i[0], i[-1], self.new_api).do_transformation()
-            output_tensor_names.extend(output_names)
-
-
-        if self.quantized_node_info:
-            sampling_graph_def.library.CopyFrom(self.model.graph_def.library)
-            self._sampling_model.graph_def = sampling_graph_def
-            self._sampling_model.output_tensor_names = output_tensor_names
-            tmp_dump_file = tempfile.mkstemp(suffix='.log')[1]
-            with CaptureOutputToFile(tmp_dump_file):
-                self._inference(self._sampling_model)
-            self._calibration_data = Helper.gen_valid_sampling_log(tmp_dump_file)
+        self._generate_sampling_data(itex_qdq_mode=True)
 
         # Insert QDQ pattern
         self._tmp_graph_def = GenerateGraphWithQDQPattern(
@@ -72,7 +72,14 @@ class HessianTrace:
             self.model = fuse_fx(model.model)
         self.dataloader = dataloader
         self.max_iter = 500
-        self.tolerance = 1e-5
+        self.tolerance = 1e-5  ## convergence of the activation traces, see get_act_traces
+        self.num_probes = 8  ## probes sharing one forward and backward pass
+        self.layer_tolerance = 0.1  ## relative standard error of the trace estimate of each layer
+        ## batches whose gradient graphs (create_graph=True) are kept and reused across probes, each one
+        ## holds the activations of a forward pass and the graph of its backward pass, so the peak memory
+        ## grows with every cached batch while each of them saves a forward and backward pass per round
+        self.max_cached_batches = 1
+        self._grad_cache = []
         self.eps = 1e-6
         self.index = 0
         self.device = self.get_device(self.model)
@@ -222,6 +229,7 @@ class HessianTrace:
         params = [p for n, p in self.model.named_parameters() if p.requires_grad]  ##keep bias
         self.weight_names = weight_names
         self.params = params
+        self._param_index = {id(p): i for i, p in enumerate(params)}
 
     def _forward_backward(self, model, data, create_graph=False, return_w_grad=True):
         model.zero_grad()
@@ -261,48 +269,109 @@ class HessianTrace:
     def _sample_normal_like_params(self):
         return [torch.randn(p.size(), device=self.device) for p in self.params]
 
-    def get_vtHv_weight(self, params, num_samples):
-        """Get vtHv weight."""
-        v = self._sample_rademacher(params)
-        H_v=self._sample_normal_like_params()
+    def _get_gradients(self, data):
+        input = data[0].to(self.device)
+        target = data[1].to(self.device)
+        loss = self.criterion(self.model(input), target)
+        return torch.autograd.grad(loss, self.params, create_graph=True, allow_unused=True)
+
+    def _get_batch_gradients(self, num_samples):
+        """Yield the batch size and the gradients of self.params with their graphs for each batch.
+
+        The gradients of the first max_cached_batches batches are cached, so that the later probes skip
+        their forward and backward passes. The other batches are recomputed in each round and their graphs
+        are freed once probed, which bounds the peak memory to max_cached_batches + 1 gradient graphs.
+        """
         cnt = 0
+        for batch_size, gradients in self._grad_cache:
+            yield batch_size, gradients
+            cnt += batch_size
+            if cnt >= num_samples:
+                return
         for step, data in enumerate(self.dataloader):
+            if step < len(self._grad_cache):
+                continue
             batch_size = data[0].shape[0]
+            gradients = self._get_gradients(data)
+            if step < self.max_cached_batches:
+                self._grad_cache.append((batch_size, gradients))
+            yield batch_size, gradients
             cnt += batch_size
-            gradients = self._forward_backward(self.model, data, create_graph=True)
-            H_v_one = torch.autograd.grad(gradients, params, v, only_inputs=True, retain_graph=False)
-            H_v = [pre + cur * float(batch_size) for cur, pre in zip(H_v_one, H_v)]
             if cnt >= num_samples:
-                break
+                return
+
+    def get_vtHv_weight(self, params, num_samples, num_probes=1):
+        """Get vtHv weight.
+
+        All probes of a batch are computed with the same gradient graph.
+
+        Args:
+            params (list): parameters to estimate.
+            num_samples (int): sample number.
+            num_probes (int): number of Rademacher probes.
+
+        Returns:
+            v_t_H_v (tensor): vtHv of each probe and parameter divided by the size of the parameter,
+                in shape (num_probes, len(params)).
+        """
+        v_t_H_v = torch.zeros(num_probes, len(params), device=self.device)
+        cnt = 0
+        for batch_size, gradients in self._get_batch_gradients(num_samples):
+            # parameters whose gradients do not depend on any parameter have zero hessian
+            index = [i for i, p in enumerate(params) if gradients[self._param_index[id(p)]] is not None and
+                     gradients[self._param_index[id(p)]].requires_grad]
+            grads = [gradients[self._param_index[id(params[i])]] for i in index]
+            inputs = [params[i] for i in index]
+            for probe in range(num_probes):
+                v = self._sample_rademacher(inputs)
+                H_v = torch.autograd.grad(grads, inputs, v, retain_graph=True, allow_unused=True)
+                v_t_H_v[probe, index] += torch.stack([
+                    torch.sum(h_v * v_t) / h_v.numel() if h_v is not None else torch.zeros([], device=self.device)
+                    for (h_v, v_t) in zip(H_v, v)]).detach() * float(batch_size)
+            cnt += batch_size
         if cnt > 0:
-            H_v = [item / cnt for item in H_v]
-        v_t_H_v = torch.stack([torch.sum(h_v * v_t)/h_v.size().numel() for (h_v, v_t) in zip(H_v, v)])
+            v_t_H_v /= cnt
         return v_t_H_v
 
     def get_weight_traces(self, num_samples):
         """Get op names to trace.
 
+        The trace of each weight is estimated separately, a weight stops being probed once the standard
+        error of its estimate is less than layer_tolerance of the estimate (or of the average trace).
+
         Args:
             num_samples (int): sample number.
 
         Returns:
             op_name_to_trace (dict): op names to trace.
         """
-        layer_traces_per_iter = []
-        prev_avg_model_trace = 0
-        for iter in tqdm.tqdm(range(self.max_iter)):
-            layer_traces = self.get_vtHv_weight(self.params, num_samples)
-            layer_traces_per_iter.append(layer_traces)
-            layer_traces_estimate = torch.mean(torch.stack(layer_traces_per_iter), dim=0)
-            model_trace = torch.sum(layer_traces_estimate)
-            diff_ratio = abs(model_trace - prev_avg_model_trace) / (prev_avg_model_trace + self.eps)
-            logger.info("diff_ratio:"+str(diff_ratio)+"|"+str(self.tolerance))
-            if diff_ratio < self.tolerance:  ##TODO magic number and iter>10
-                logger.info("End of hessian computation!")
-                break
-            # if iter == 20:  ##TODO for debugging
-            #     break
-            prev_avg_model_trace = model_trace
+        trace_sums = torch.zeros(len(self.params), dtype=torch.float64)
+        trace_square_sums = torch.zeros(len(self.params), dtype=torch.float64)
+        probe_cnts = torch.zeros(len(self.params), dtype=torch.float64)
+        # only the traces of the ops' weights are used
+        active = [i for i, weight_name in enumerate(self.weight_names) if weight_name in self.weight_to_op]
+        try:
+            for iter in tqdm.tqdm(range(int(np.ceil(self.max_iter / self.num_probes)))):
+                v_t_H_v = self.get_vtHv_weight([self.params[i] for i in active], num_samples,
+                                               self.num_probes).cpu().double()
+                trace_sums[active] += v_t_H_v.sum(dim=0)
+                trace_square_sums[active] += v_t_H_v.pow(2).sum(dim=0)
+                probe_cnts[active] += self.num_probes
+                layer_traces_estimate = trace_sums / probe_cnts.clamp(min=1)
+                if iter == 0:
+                    continue
+                variance = (trace_square_sums / probe_cnts - layer_traces_estimate.pow(2)).clamp(min=0)
+                std_error = (variance / (probe_cnts - 1)).sqrt()
+                # traces much smaller than the others only need to be accurate at the scale of the others
+                scale = layer_traces_estimate[active].abs().mean()
+                active = [i for i in active if std_error[i] >=
+                          self.layer_tolerance * max(abs(layer_traces_estimate[i]), scale) + self.eps]
+                logger.info("unconverged layers:" + str(len(active)) + "|" + str(self.layer_tolerance))
+                if len(active) == 0:
+                    logger.info("End of hessian computation!")
+                    break
+        finally:
+            self._grad_cache = []
         weight_name_to_traces = {}
         layer_traces = layer_traces_estimate
         for weight_name, trace in zip(self.weight_names, layer_traces):
@@ -690,10 +690,153 @@ def get_fallback_order(adaptor, fp32_model, dataloader, tune_cfg,
                 order_dict[name] = order_dict.get(name, 0) + len(order_dict) - i
     return ordered_ops
 
+class FakeQuantToggle:
+    """Simulate the quantization of a fp32 model with fake quantization switched on and off per op.
+
+    The model is calibrated once with the observers of the ops' qconfigs. Quantizing an op then fake-quantizes
+    its weight, input and output in place through forward hooks, so the sensitivity of an op costs one forward
+    pass instead of a full prepare_fx/convert_fx.
+
+    Args:
+        model (torch.nn.Module): fp32 model.
+        qconfigs (dict): qconfig of each op which can be quantized.
+        example_inp (object): example inputs for calibration.
+        output_op_name (str): name of the op whose output is compared.
+        dynamic (bool): whether the activations are quantized dynamically.
+    """
+    def __init__(self, model, qconfigs, example_inp, output_op_name, dynamic=False):
+        """Initialize and calibrate the observers."""
+        self.model = model
+        self.example_inp = example_inp
+        self.dynamic = dynamic
+        self.reduce_range = not CpuInfo().vnni
+        self.quantized = set()
+        # the ops whose activations are kept in fp32, e.g. Embedding
+        self.fp32_activations = set()
+        self.qparams = {}
+        self.handles = []
+        self.output = None
+        self.calibrating = True
+        self.modules = {name: fetch_module(model, name) for name in qconfigs}
+        self.observers = {}
+        for name, qconfig in qconfigs.items():
+            weight = getattr(self.modules[name], 'weight', None)
+            activation = qconfig.activation() if not dynamic else None
+            if isinstance(activation, torch.quantization.PlaceholderObserver):
+                # a placeholder calculates no qparams, the activations are fp32 or quantized dynamically
+                if activation.dtype == torch.float:
+                    self.fp32_activations.add(name)
+                activation = None
+            self.observers[name] = {
+                'weight': qconfig.weight() if isinstance(weight, torch.Tensor) else None,
+                'input': activation,
+                'output': copy.deepcopy(activation)}
+            self.handles.append(self.modules[name].register_forward_pre_hook(self._pre_hook(name)))
+            self.handles.append(self.modules[name].register_forward_hook(self._hook(name)))
+        self.handles.append(fetch_module(model, output_op_name).register_forward_hook(self._output_hook))
+
+        with torch.no_grad():
+            for name, observers in self.observers.items():
+                if observers['weight'] is not None:
+                    weight = self.modules[name].weight
+                    observers['weight'](weight.detach())
+                    self.qparams[name] = {'weight': _fake_quantize_tensor(weight.detach(), observers['weight'])}
+                else:
+                    self.qparams[name] = {'weight': None}
+        # record the fp32 output and calibrate the activations
+        self.output_fp32 = self.forward()
+        self.calibrating = False
+
+    def _pre_hook(self, name):
+        def pre_hook(module, input):
+            observer = self.observers[name]['input']
+            if self.calibrating:
+                if observer is not None and _is_float_tensor(input[0]):
+                    observer(input[0].detach())
+                return None
+            if name not in self.quantized:
+                return None
+            if self.qparams[name]['weight'] is not None:
+                self.qparams[name]['fp32_weight'] = module.weight.data
+                module.weight.data = self.qparams[name]['weight']
+            if name in self.fp32_activations or not _is_float_tensor(input[0]):
+                return None
+            if observer is None:
+                observer = torch.quantization.MinMaxObserver(reduce_range=self.reduce_range)
+                observer(input[0].detach())
+            return (_fake_quantize_tensor(input[0], observer),) + tuple(input[1:])
+        return pre_hook
+
+    def _hook(self, name):
+        def hook(module, input, output):
+            observer = self.observers[name]['output']
+            if self.calibrating:
+                if observer is not None and _is_float_tensor(output):
+                    observer(output.detach())
+                return None
+            if name not in self.quantized:
+                return None
+            if self.qparams[name]['weight'] is not None:
+                module.weight.data = self.qparams[name].pop('fp32_weight')
+            if observer is None or not _is_float_tensor(output):
+                return None
+            return _fake_quantize_tensor(output, observer)
+        return hook
+
+    def _output_hook(self, module, input, output):
+        self.output = output
+
+    def forward(self):
+        """Run the model and get the output of the compared op."""
+        simple_inference(self.model, self.example_inp)
+        output = self.output
+        return output.dequantize() if output.dtype == torch.quint8 else output
+
+    def set_quantized(self, op_name, quantized=True):
+        """Switch an op between fp32 and int8."""
+        if quantized:
+            self.quantized.add(op_name)
+        else:
+            self.quantized.discard(op_name)
+
+    def get_mse(self):
+        """Get the MSE of the compared op's output between the fp32 model and the current quantization."""
+        return (self.output_fp32 - self.forward()).pow(2).sum()
+
+    def remove(self):
+        """Remove all hooks from the model."""
+        for handle in self.handles:
+            handle.remove()
+        self.handles = []
+
+
+def _is_float_tensor(tensor):
+    """Check if an object is a floating point tensor."""
+    return isinstance(tensor, torch.Tensor) and tensor.is_floating_point()
+
+
+def _fake_quantize_tensor(tensor, observer):
+    """Quantize and dequantize a tensor with the qparams calculated by an observer."""
+    scale, zero_point = observer.calculate_qparams()
+    quant_min, quant_max = observer.quant_min, observer.quant_max
+    if quant_min is None or quant_max is None:
+        info = torch.iinfo(observer.dtype)
+        quant_min, quant_max = info.min, info.max
+    if observer.qscheme == torch.per_channel_affine_float_qparams:
+        # the zero points are float, quantize like the weights of the quantized Embedding
+        return torch.quantize_per_channel(tensor, scale, zero_point, observer.ch_axis, observer.dtype).dequantize()
+    if observer.qscheme in [torch.per_channel_affine, torch.per_channel_symmetric]:
+        return torch.fake_quantize_per_channel_affine(tensor, scale.to(tensor.dtype), zero_point.to(torch.int32),
+                                                      observer.ch_axis, quant_min, quant_max)
+    return torch.fake_quantize_per_tensor_affine(tensor, float(scale), int(zero_point), quant_min, quant_max)
+
+
 op_cfg_mapping = {}
 def get_mse_order_per_fp32(adaptor, model, example_inp, tune_cfg):
     """This is a helper method to check the mse influence to last module after QDQ(quant/dequant).
 
+    The quantization is simulated by FakeQuantToggle, each op is switched to fp32 in turn.
+
     Args:
         model (torch.fx.GraphModule/torch.nn.Module): A torch model.
         example_inp (object): example inputs.
@@ -702,116 +845,51 @@ def get_mse_order_per_fp32(adaptor, model, example_inp, tune_cfg):
     Returns:
         fallback_order (dict/list): The fallback order for strategy.
     """
-    inner_output = None
-    def output_hook(self, input, output):
-        nonlocal inner_output
-        inner_output = output
-        return output
-
     op_type_dict = {}
     for k, v in tune_cfg['op'].keys():
         op_type_dict[k] = v
 
-    from ..pytorch import _cfg_to_qconfig, _cfgs_to_fx_cfgs, PyTorch_FXAdaptor
+    from ..pytorch import _cfg_to_qconfig
     op_cfgs = _cfg_to_qconfig(tune_cfg, tune_cfg["approach"])
-    # insert hook to get output tesnor from last module
     last_module_name = list(op_cfgs.keys())[-1]
-    module = fetch_module(model, last_module_name) # get last module
-    module.register_forward_hook(output_hook)
-    # record fp32 model output tensor at first
-    output_fp32 = simple_inference(model, example_inp)
-    inner_output_fp32 = inner_output
+    global op_cfg_mapping
+    for op_name, qconfig in op_cfgs.items():
+        if op_name != 'bf16_ops_list' and op_name not in op_cfg_mapping:
+            op_cfg_mapping[op_name] = qconfig
+    qconfigs = {op_name: qconfig for op_name, qconfig in op_cfgs.items() if op_name != 'bf16_ops_list' and qconfig}
+    toggle = FakeQuantToggle(model, qconfigs, example_inp, last_module_name,
+                             tune_cfg["approach"] == 'post_training_dynamic_quant')
+    for op_name in qconfigs:
+        toggle.set_quantized(op_name)
 
-    fx_op_cfgs = {}
     fallback_order = {}
     logger.info('Evaluate the sensitivity for each int8 operation')
-    for op_name, qconfig in tqdm(op_cfgs.items()):
-        global op_cfg_mapping
-        if op_name not in op_cfg_mapping:
-            op_cfg_mapping[op_name] = qconfig
-        tmp_model = copy.deepcopy(model)
-        if not qconfig:
-            continue
-        op_cfgs[op_name] = None
-        fx_op_cfgs = _cfgs_to_fx_cfgs(op_cfgs, tune_cfg["approach"])
-        op_cfgs[op_name] = qconfig
-        from torch.quantization.quantize_fx import prepare_fx,convert_fx
-        # do quantization
-        if adaptor.sub_module_list is None:
-            if adaptor.version.release >= Version("1.13.0").release:  # pragma: no cover
-                tmp_model = prepare_fx(tmp_model, fx_op_cfgs, example_inp)
-            else:
-                tmp_model = prepare_fx(tmp_model, fx_op_cfgs,)
-        else:
-            PyTorch_FXAdaptor.prepare_sub_graph(adaptor.sub_module_list, fx_op_cfgs, \
-                                                tmp_model, prefix='')
-        simple_inference(tmp_model, example_inp)
-        if adaptor.sub_module_list is None:
-            tmp_model = convert_fx(tmp_model)
-        else:
-            PyTorch_FXAdaptor.convert_sub_graph(adaptor.sub_module_list, \
-                                                tmp_model, prefix='')
-
-        # insert hook to get output tesnor from last module
-        module = fetch_module(tmp_model, list(op_cfgs.keys())[-1]) # get last module
-        module.register_forward_hook(output_hook)
-        output_qdq = simple_inference(tmp_model, example_inp)
-        inner_output_int8 = inner_output.dequantize() if \
-          inner_output.dtype == torch.quint8 else inner_output
-        mse_val = (inner_output_fp32 - inner_output_int8).pow(2).sum()
-        fallback_order[(op_name, op_type_dict[op_name])] = mse_val
-
-    ordered_ops = sorted(fallback_order.keys(), key=lambda key: fallback_order[key], \
-                                    reverse=False)
-    min_mse, max_mse = fallback_order[ordered_ops[0]], fallback_order[ordered_ops[-1]]
-
-    if min_mse < 0.8 * max_mse:
-        return ordered_ops
-
-
-    double_check_list = []
-    for op_name in ordered_ops:
-        if min_mse <= fallback_order[op_name] <= (max_mse - min_mse) * 0.1 + min_mse:
-            double_check_list.append(op_name)
-
-    check_num = min(len(ordered_ops)//10, 5)
-    double_check_list = ordered_ops[:check_num]
-    worst_op_name = ordered_ops[-1]
-    op_cfgs[worst_op_name[0]] = None # fallback worst module first
-    new_fallback_order = {}
-
-    logger.info('Evaluate the sensitivity gradient for selected operations')
-    for op_name, op_type in tqdm(double_check_list):
-        tmp_model = copy.deepcopy(model)
-        qconfig = op_cfgs[op_name]
-        op_cfgs[op_name] = None
-        fx_op_cfgs = _cfgs_to_fx_cfgs(op_cfgs, tune_cfg["approach"])
-        op_cfgs[op_name] = qconfig
-        from torch.quantization.quantize_fx import prepare_fx,convert_fx
-        # do quantization
-        if adaptor.sub_module_list is None:
-            if adaptor.version.release >= Version("1.13.0").release:  # pragma: no cover
-                tmp_model = prepare_fx(tmp_model, fx_op_cfgs, example_inp)
-            else:
-                tmp_model = prepare_fx(tmp_model, fx_op_cfgs,)
-        else:
-            PyTorch_FXAdaptor.prepare_sub_graph(adaptor.sub_module_list, fx_op_cfgs, \
-                                                tmp_model, prefix='')
-        simple_inference(tmp_model, example_inp)
-        if adaptor.sub_module_list is None:
-            tmp_model = convert_fx(tmp_model)
-        else:
-            PyTorch_FXAdaptor.convert_sub_graph(adaptor.sub_module_list, \
-                                                tmp_model, prefix='')
-
-        # insert hook to get output tesnor from last module
-        module = fetch_module(tmp_model, last_module_name) # get last module
-        module.register_forward_hook(output_hook)
-        output_qdq = simple_inference(tmp_model, example_inp)
-        inner_output_int8 = inner_output.dequantize() if \
-          inner_output.dtype == torch.quint8 else inner_output
-        mse_val = (inner_output_fp32 - inner_output_int8).pow(2).sum()
-        new_fallback_order[(op_name, op_type_dict[op_name])] = mse_val
+    try:
+        for op_name in tqdm(qconfigs):
+            toggle.set_quantized(op_name, False)
+            fallback_order[(op_name, op_type_dict[op_name])] = toggle.get_mse()
+            toggle.set_quantized(op_name)
+
+        ordered_ops = sorted(fallback_order.keys(), key=lambda key: fallback_order[key], \
+                                        reverse=False)
+        min_mse, max_mse = fallback_order[ordered_ops[0]], fallback_order[ordered_ops[-1]]
+
+        if min_mse < 0.8 * max_mse:
+            return ordered_ops
+
+        check_num = min(len(ordered_ops)//10, 5)
+        double_check_list = ordered_ops[:check_num]
+        worst_op_name = ordered_ops[-1]
+        toggle.set_quantized(worst_op_name[0], False) # fallback worst module first
+        new_fallback_order = {}
+
+        logger.info('Evaluate the sensitivity gradient for selected operations')
+        for op_name, op_type in tqdm(double_check_list):
+            toggle.set_quantized(op_name, False)
+            new_fallback_order[(op_name, op_type_dict[op_name])] = toggle.get_mse()
+            toggle.set_quantized(op_name)
+    finally:
+        toggle.remove()
 
     ordered_ops = sorted(new_fallback_order.keys(), key=lambda key: new_fallback_order[key], \
                                     reverse=False)
@@ -821,6 +899,8 @@ def get_mse_order_per_fp32(adaptor, model, example_inp, tune_cfg):
 def get_mse_order_per_int8(adaptor, fp32_model, example_input, tune_cfg):
     """This is a helper method to check the mse influence to last module after QDQ(quant/dequant).
 
+    The quantization is simulated by FakeQuantToggle, each fp32 op is switched to int8 in turn.
+
     Args:
         model (torch.fx.GraphModule/torch.nn.Module): A torch model.
         example_inp (object): example inputs.
@@ -829,26 +909,12 @@ def get_mse_order_per_int8(adaptor, fp32_model, example_input, tune_cfg):
     Returns:
         fallback_order (dict/list): The fallback order for strategy.
     """
-    inner_output = None
-    def output_hook(self, input, output):
-        nonlocal inner_output
-        inner_output = output
-        return output
-
     op_type_dict = {}
     for k, v in tune_cfg['op'].keys():
         op_type_dict[k] = v
 
-    example_inp = example_input
-
     from ..pytorch import _cfg_to_qconfig
     op_cfgs = _cfg_to_qconfig(tune_cfg, tune_cfg["approach"])
-    module = fetch_module(fp32_model, list(op_cfgs.keys())[-1]) # get last module
-    # insert hook to get output tesnor from last module
-    module.register_forward_hook(output_hook)
-    # record fp32 model output tensor at first
-    output_fp32 = simple_inference(fp32_model, example_inp)
-    inner_output_fp32 = inner_output
 
     quant_list = []
     for k, v in tune_cfg['op'].items():
@@ -856,45 +922,28 @@ def get_mse_order_per_int8(adaptor, fp32_model, example_input, tune_cfg):
             continue
         if v['weight']['dtype'] == 'fp32':
             quant_list.append(k)
+    quant_list = [(op_name, op_type) for op_name, op_type in quant_list if op_name in op_cfg_mapping]
+    qconfigs = {op_name: qconfig for op_name, qconfig in op_cfgs.items() if op_name != 'bf16_ops_list' and qconfig}
+    int8_ops = list(qconfigs)
+    for op_name, op_type in quant_list:
+        if op_cfg_mapping[op_name]:
+            qconfigs[op_name] = op_cfg_mapping[op_name]
+    toggle = FakeQuantToggle(fp32_model, qconfigs, example_input, list(op_cfgs.keys())[-1],
+                             tune_cfg["approach"] == 'post_training_dynamic_quant')
+    for op_name in int8_ops:
+        toggle.set_quantized(op_name)
+
     fallback_order = {}
     logger.info('Evaluate the sensitivity for each fp32 operation')
-    for op_name, op_type in tqdm(quant_list):
-        if op_name in op_cfg_mapping:
-            tmp_model = copy.deepcopy(fp32_model)
-            from ..pytorch import _cfg_to_qconfig, _cfgs_to_fx_cfgs, PyTorch_FXAdaptor
-            op_cfgs[op_name] = op_cfg_mapping[op_name]
-            fx_op_cfgs = _cfgs_to_fx_cfgs(op_cfgs, tune_cfg["approach"])
-            from torch.quantization.quantize_fx import prepare_fx,convert_fx
-            # do quantization
-            if adaptor.sub_module_list is None:
-                if adaptor.version.release >= Version("1.13.0").release:  # pragma: no cover
-                    tmp_model = prepare_fx(tmp_model, fx_op_cfgs, example_inp)
-                else:
-                    tmp_model = prepare_fx(tmp_model, fx_op_cfgs,)
-            else:
-                PyTorch_FXAdaptor.prepare_sub_graph(adaptor.sub_module_list, fx_op_cfgs, \
-                                                    tmp_model, prefix='')
-            simple_inference(tmp_model, example_inp)
-            if adaptor.sub_module_list is None:
-                tmp_model = convert_fx(tmp_model)
-            else:
-                PyTorch_FXAdaptor.convert_sub_graph(adaptor.sub_module_list, \
-                                                    tmp_model, prefix='')
-
-
-            # record int8 model output tensor
-            module = fetch_module(tmp_model, list(op_cfgs.keys())[-1]) # get last module
-            module.register_forward_hook(output_hook)
-            output_qdq = simple_inference(tmp_model, example_inp)
-            inner_output_int8 = inner_output
-            if inner_output_fp32.dtype == torch.quint8:
-                inner_output_fp32 = inner_output_fp32.dequantize()
-            if inner_output_int8.dtype == torch.quint8:
-                inner_output_int8 = inner_output_int8.dequantize()
-
-            mse_val = (inner_output_fp32 - inner_output_int8).pow(2).sum()
-            fallback_order[(op_name, op_type_dict[op_name])] = mse_val
+    try:
+        for op_name, op_type in tqdm(quant_list):
+            quantized = op_name in qconfigs
+            toggle.set_quantized(op_name, quantized)
+            fallback_order[(op_name, op_type_dict[op_name])] = toggle.get_mse()
             # re-insert fp32 module into model
+            toggle.set_quantized(op_name, False)
+    finally:
+        toggle.remove()
     ordered_ops = sorted(fallback_order.keys(), key=lambda key: fallback_order[key], \
                                             reverse=False)
     return ordered_ops
@@ -114,8 +114,20 @@ def fit(model, config=None, b_dataloader=None, b_func=None):
         b_dataloader:             The dataloader for frameworks.
         b_func:                   customized benchmark function. if user passes the dataloader,
                                   then b_func is not needed.
+
+    Returns:
+        The results of benchmark, the server scenario results are in the 'server' item if
+        config.server_scenario is set, and the autotuned settings are in the 'autotune' item
+        if config.autotune is set.
     """
+    mode = 'performance'
     if isinstance(config, BenchmarkConfig):
+        assert config.server_scenario is None or config.autotune is None, \
+            'server_scenario and autotune can not be set at the same time'
+        if config.server_scenario is not None:
+            mode = 'server'
+        elif config.autotune is not None:
+            mode = 'autotune'
         config = Config(benchmark=config)
     benchmarker = ExpBenchmark(config)
     benchmarker.model = model
@@ -123,5 +135,5 @@ def fit(model, config=None, b_dataloader=None, b_func=None):
         benchmarker.b_func = b_func
     if b_dataloader is not None:
         benchmarker.b_dataloader = b_dataloader
-    benchmarker()
+    benchmarker(mode)
     return benchmarker.results
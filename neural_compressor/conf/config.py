@@ -90,7 +90,8 @@ class PrunerV2:
                  start_step=None, end_step=None, pruning_scope=None, pruning_frequency=None,
                  min_sparsity_ratio_per_op=None, max_sparsity_ratio_per_op=None,
                  sparsity_decay_type=None, pruning_op_types=None, reg_type=None,
-                 criterion_reduce_type=None, parameters=None, resume_from_pruned_checkpoint=None):
+                 criterion_reduce_type=None, parameters=None, resume_from_pruned_checkpoint=None,
+                 global_threshold_type=None, global_threshold_error=None):
         self.pruner_config = DotDict({
             'target_sparsity': target_sparsity,
             'pruning_type': pruning_type,
@@ -108,7 +109,9 @@ class PrunerV2:
             'reg_type': reg_type,
             'criterion_reduce_type': criterion_reduce_type,
             'parameters': parameters,
-            'resume_from_pruned_checkpoint': resume_from_pruned_checkpoint
+            'resume_from_pruned_checkpoint': resume_from_pruned_checkpoint,
+            'global_threshold_type': global_threshold_type,
+            'global_threshold_error': global_threshold_error
         })
 
 
@@ -471,12 +474,14 @@ postprocess_schema = Schema({
         'vocab_file': str,
         Optional('do_lower_case', default='True'): bool,
         Optional('max_seq_length', default=384): int,
+        Optional('num_workers'): int,
     },
     Optional('SquadV1ModelZoo'): {
         'label_file': str,
         'vocab_file': str,
         Optional('do_lower_case', default='True'): bool,
         Optional('max_seq_length', default=384): int,
+        Optional('num_workers'): int,
     },
 })
 
@@ -637,6 +642,22 @@ configs_schema = Schema({
     Optional('kmp_affinity', default='granularity=fine,verbose,compact,1,0'): str,
 })
 
+server_schema = Schema({
+    Optional('target_qps', default=[]): And(list, lambda s: all(i > 0 for i in s)),
+    Optional('trace', default=None): Or(None, str, list),
+    Optional('num_queries', default=1000): And(int, lambda s: s > 0),
+    Optional('latency_slo', default=None): Or(None, And(Or(int, float), lambda s: s > 0)),
+    Optional('slo_percentile', default=99): And(Or(int, float), lambda s: 0 < s <= 100),
+})
+
+autotune_schema = Schema({
+    Optional('batch_size', default=[1, 8, 32, 64]): And(list, lambda s: all(i > 0 for i in s)),
+    Optional('num_of_instance', default=None): Or(None, And(list, lambda s: all(i > 0 for i in s))),
+    Optional('inter_num_of_threads', default=[1]): And(list, lambda s: all(i > 0 for i in s)),
+    Optional('min_iteration', default=4): And(int, lambda s: s > 0),
+    Optional('reduction_factor', default=2): And(int, lambda s: s >= 2),
+})
+
 optimizer_schema = Schema({
     Optional('SGD'): {
         'learning_rate': Use(float),
@@ -756,6 +777,8 @@ weight_compression_v2_schema = Schema({
     Optional('pruning_op_types', default=['Conv', 'Linear']): list,
     Optional('reg_type', default=None): str,
     Optional('criterion_reduce_type', default="mean"): str,
+    Optional('global_threshold_type', default="exact"): And(str, lambda s: s in ["exact", "approximate"]),
+    Optional('global_threshold_error', default=0.001): float,
     Optional('parameters', default={"reg_coeff": 0.0}): dict,
     Optional('resume_from_pruned_checkpoint', default=False): str,
     Optional('pruners'): And(list, \
@@ -914,7 +937,7 @@ schema = Schema({
         'accuracy_criterion': {'relative': 0.01, 'higher_is_better': True},
         'objective': 'performance',
         'exit_policy': {'timeout': 0, 'max_trials': 100, 'performance_only': False},
-        'random_seed': 1978, 'tensorboard': False,
+        'random_seed': 1978, 'tensorboard': False, 'profiling': False,
         'workspace': {'path': default_workspace},
         'diagnosis': False,
         }): {
@@ -927,6 +950,7 @@ schema = Schema({
             Optional('latency_weight', default=1.0): float,
             Optional('confidence_batches', default=2): int,
             Optional('hawq_v2_loss', default=None): object,
+            Optional('fallback_mode', default='one_by_one'): And(str, lambda s: s in ['one_by_one', 'group']),
         } ,
         Hook('accuracy_criterion', handler=_valid_accuracy_field): object,
         Optional('accuracy_criterion', default={'relative': 0.01}): {
@@ -952,6 +976,7 @@ schema = Schema({
         },
         Optional('random_seed', default=1978): int,
         Optional('tensorboard', default=False): And(bool, lambda s: s in [True, False]),
+        Optional('profiling', default=False): bool,
         Optional('workspace', default={'path': default_workspace}): {
             Optional('path', default=None): str,
             Optional('resume'): str
@@ -1015,7 +1040,9 @@ schema = Schema({
                 },
                 Optional('Accuracy'): Or({}, None),
                 Optional('Loss'): Or({}, None),
-                Optional('BLEU'): Or({}, None),
+                Optional('BLEU'): Or({
+                    Optional('num_workers'): And(int, lambda s: s >= 0)
+                }, None),
                 Optional('SquadF1'): Or({}, None),
                 Optional('F1'): Or({}, None),
                 Optional('mIOU'): {
@@ -1064,7 +1091,9 @@ schema = Schema({
                 },
                 Optional('Accuracy'): Or({}, None),
                 Optional('Loss'): Or({}, None),
-                Optional('BLEU'): Or({}, None),
+                Optional('BLEU'): Or({
+                    Optional('num_workers'): And(int, lambda s: s >= 0)
+                }, None),
                 Optional('SquadF1'): Or({}, None),
                 Optional('F1'): Or({}, None),
                 Optional('mIOU'): {
@@ -1088,6 +1117,8 @@ schema = Schema({
             Optional('warmup', default=5): int,
             Optional('iteration', default=-1): int,
             Optional('configs'): configs_schema,
+            Optional('server'): server_schema,
+            Optional('autotune'): autotune_schema,
             Optional('dataloader'): dataloader_schema,
             Optional('postprocess'): {
                 Optional('transform'): postprocess_schema
@@ -1149,6 +1180,8 @@ schema = Schema({
             Optional("population", default=50): int,
             Optional("num_evals", default=100000): int,
             Optional("results_csv_path", default=None): str,
+            Optional("results_db_path", default=None): str,
+            Optional("screen_ratio", default=1.0): And(Or(int, float), lambda s: 0.0 < s <= 1.0),
             Optional("dataset_path", default=None): str,
             Optional("supernet_ckpt_path", default=None): str,
             Optional("batch_size", default=64): int,
@@ -1422,7 +1455,7 @@ class Conf(object):
             if pythonic_config.quantization.strategy_kwargs:
                 st_kwargs = pythonic_config.quantization.strategy_kwargs
                 for st_key in ['sigopt_api_token', 'sigopt_project_id', 'sigopt_experiment_name', \
-                    'accuracy_weight', 'latency_weight', 'hawq_v2_loss']:
+                    'accuracy_weight', 'latency_weight', 'hawq_v2_loss', 'confidence_batches', 'fallback_mode']:
 
                     if st_key in st_kwargs:
                         st_val =  st_kwargs[st_key]
@@ -1449,6 +1482,7 @@ class Conf(object):
                 'tuning.workspace.path': pythonic_config.options.workspace,
                 'tuning.workspace.resume': pythonic_config.options.resume_from,
                 'tuning.tensorboard': pythonic_config.options.tensorboard,
+                'tuning.profiling': pythonic_config.options.profiling,
             })
         if pythonic_config.benchmark is not None:
             if pythonic_config.benchmark.inputs != []:
@@ -1476,6 +1510,26 @@ class Conf(object):
                 'evaluation.accuracy.configs.intra_num_of_threads':
                     pythonic_config.benchmark.intra_num_of_threads,
             })
+            server_scenario = pythonic_config.benchmark.server_scenario
+            if server_scenario is not None:
+                mapping.update({
+                    'evaluation.performance.server.target_qps': server_scenario.target_qps,
+                    'evaluation.performance.server.trace': server_scenario.trace,
+                    'evaluation.performance.server.num_queries': server_scenario.num_queries,
+                    'evaluation.performance.server.latency_slo': server_scenario.latency_slo,
+                    'evaluation.performance.server.slo_percentile':
+                        server_scenario.slo_percentile,
+                })
+            autotune = pythonic_config.benchmark.autotune
+            if autotune is not None:
+                mapping.update({
+                    'evaluation.performance.autotune.batch_size': autotune.batch_size,
+                    'evaluation.performance.autotune.num_of_instance': autotune.num_of_instance,
+                    'evaluation.performance.autotune.inter_num_of_threads':
+                        autotune.inter_num_of_threads,
+                    'evaluation.performance.autotune.min_iteration': autotune.min_iteration,
+                    'evaluation.performance.autotune.reduction_factor': autotune.reduction_factor,
+                })
 
         if "model.backend" not in mapping:
             mapping.update({
@@ -196,13 +196,16 @@ class PyTorch(MXNet):
 
 class DyNASConfig:
     def __init__(self, supernet=None, metrics=None, population=50, num_evals=100000,
-                 results_csv_path=None, dataset_path=None, batch_size=64):
+                 results_csv_path=None, results_db_path=None, screen_ratio=1.0,
+                 dataset_path=None, batch_size=64):
         self.config = {
             'supernet': supernet,
             'metrics': metrics,
             'population': population,
             'num_evals': num_evals,
             'results_csv_path': results_csv_path,
+            'results_db_path': results_db_path,
+            'screen_ratio': screen_ratio,
             'dataset_path': dataset_path,
             'batch_size': batch_size,
         }
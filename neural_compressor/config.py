@@ -86,12 +86,13 @@ def check_value(name, src, supported_type, supported_value=[]):
 class Options:
     """Option Class for configs."""
     def __init__(self, random_seed=1978, workspace=default_workspace,
-                 resume_from=None, tensorboard=False):
+                 resume_from=None, tensorboard=False, profiling=False):
         """Init an Option object."""
         self.random_seed = random_seed
         self.workspace = workspace
         self.resume_from = resume_from
         self.tensorboard = tensorboard
+        self.profiling = profiling
 
     @property
     def random_seed(self):
@@ -137,10 +138,192 @@ class Options:
         if check_value('tensorboard', tensorboard, bool):
             self._tensorboard = tensorboard
 
+    @property
+    def profiling(self):
+        """Get profiling."""
+        return self._profiling
+
+    @profiling.setter
+    def profiling(self, profiling):
+        """Set profiling."""
+        if check_value('profiling', profiling, bool):
+            self._profiling = profiling
+
 
 options = Options()
 
 
+class ServerScenarioConfig:
+    """Config Class for the server scenario of Benchmark.
+
+    The queries are sent to in-process model instances at the target rates, by a Poisson
+    process or by replaying a trace, and the latencies include the time queued.
+
+    Args:
+        target_qps (float or list): the queries per second of each latency measurement.
+        trace (list or str, optional): the arrival timestamps in seconds or the path to a
+            file of them, rescaled to each target rate. Defaults to None, a Poisson process.
+        num_queries (int, optional): the number of queries of each measurement.
+        latency_slo (float, optional): the tail latency objective in milliseconds, the
+            maximum queries per second meeting it is searched if it is set.
+        slo_percentile (float, optional): the latency percentile of the objective.
+    """
+    def __init__(self,
+                 target_qps=[],
+                 trace=None,
+                 num_queries=1000,
+                 latency_slo=None,
+                 slo_percentile=99):
+        """Init a ServerScenarioConfig object."""
+        self.target_qps = target_qps
+        self.trace = trace
+        self.num_queries = num_queries
+        self.latency_slo = latency_slo
+        self.slo_percentile = slo_percentile
+
+    @property
+    def target_qps(self):
+        """Get target_qps."""
+        return self._target_qps
+
+    @target_qps.setter
+    def target_qps(self, target_qps):
+        """Set target_qps."""
+        if not isinstance(target_qps, list):
+            target_qps = [target_qps]
+        if check_value('target_qps', target_qps, (int, float)):
+            self._target_qps = [float(qps) for qps in target_qps]
+
+    @property
+    def trace(self):
+        """Get trace."""
+        return self._trace
+
+    @trace.setter
+    def trace(self, trace):
+        """Set trace."""
+        if trace is None or isinstance(trace, str) or check_value('trace', trace, (int, float)):
+            self._trace = trace
+
+    @property
+    def num_queries(self):
+        """Get num_queries."""
+        return self._num_queries
+
+    @num_queries.setter
+    def num_queries(self, num_queries):
+        """Set num_queries."""
+        if check_value('num_queries', num_queries, int):
+            self._num_queries = num_queries
+
+    @property
+    def latency_slo(self):
+        """Get latency_slo."""
+        return self._latency_slo
+
+    @latency_slo.setter
+    def latency_slo(self, latency_slo):
+        """Set latency_slo."""
+        if latency_slo is None or check_value('latency_slo', latency_slo, (int, float)):
+            self._latency_slo = latency_slo
+
+    @property
+    def slo_percentile(self):
+        """Get slo_percentile."""
+        return self._slo_percentile
+
+    @slo_percentile.setter
+    def slo_percentile(self, slo_percentile):
+        """Set slo_percentile."""
+        if check_value('slo_percentile', slo_percentile, (int, float)):
+            self._slo_percentile = slo_percentile
+
+
+class AutotuneConfig:
+    """Config Class for the autotune of Benchmark.
+
+    The combinations of the batch sizes, the instance layouts and the inter op threads are
+    measured with in-process model instances and pruned by successive halving, the settings
+    of the best throughput and the best latency are reported.
+
+    Args:
+        batch_size (list, optional): the batch sizes b_dataloader is re-batched to.
+        num_of_instance (list, optional): the numbers of instances sharing all physical
+            cores, None uses the divisors of the number of cores.
+        inter_num_of_threads (list, optional): the numbers of inter op threads.
+        min_iteration (int, optional): the iterations of the first round.
+        reduction_factor (int, optional): the rate the candidates shrink and the iterations
+            grow in each round.
+    """
+    def __init__(self,
+                 batch_size=[1, 8, 32, 64],
+                 num_of_instance=None,
+                 inter_num_of_threads=[1],
+                 min_iteration=4,
+                 reduction_factor=2):
+        """Init an AutotuneConfig object."""
+        self.batch_size = batch_size
+        self.num_of_instance = num_of_instance
+        self.inter_num_of_threads = inter_num_of_threads
+        self.min_iteration = min_iteration
+        self.reduction_factor = reduction_factor
+
+    @property
+    def batch_size(self):
+        """Get batch_size."""
+        return self._batch_size
+
+    @batch_size.setter
+    def batch_size(self, batch_size):
+        """Set batch_size."""
+        if check_value('batch_size', batch_size, int):
+            self._batch_size = batch_size
+
+    @property
+    def num_of_instance(self):
+        """Get num_of_instance."""
+        return self._num_of_instance
+
+    @num_of_instance.setter
+    def num_of_instance(self, num_of_instance):
+        """Set num_of_instance."""
+        if num_of_instance is None or check_value('num_of_instance', num_of_instance, int):
+            self._num_of_instance = num_of_instance
+
+    @property
+    def inter_num_of_threads(self):
+        """Get inter_num_of_threads."""
+        return self._inter_num_of_threads
+
+    @inter_num_of_threads.setter
+    def inter_num_of_threads(self, inter_num_of_threads):
+        """Set inter_num_of_threads."""
+        if check_value('inter_num_of_threads', inter_num_of_threads, int):
+            self._inter_num_of_threads = inter_num_of_threads
+
+    @property
+    def min_iteration(self):
+        """Get min_iteration."""
+        return self._min_iteration
+
+    @min_iteration.setter
+    def min_iteration(self, min_iteration):
+        """Set min_iteration."""
+        if check_value('min_iteration', min_iteration, int):
+            self._min_iteration = min_iteration
+
+    @property
+    def reduction_factor(self):
+        """Get reduction_factor."""
+        return self._reduction_factor
+
+    @reduction_factor.setter
+    def reduction_factor(self, reduction_factor):
+        """Set reduction_factor."""
+        if check_value('reduction_factor', reduction_factor, int):
+            self._reduction_factor = reduction_factor
+
+
 class BenchmarkConfig:
     """Config Class for Benchmark."""
     def __init__(self,
@@ -152,7 +335,9 @@ class BenchmarkConfig:
                  cores_per_instance=None,
                  num_of_instance=None,
                  inter_num_of_threads=None,
-                 intra_num_of_threads=None):
+                 intra_num_of_threads=None,
+                 server_scenario=None,
+                 autotune=None):
         """Init a BenchmarkConfig object."""
         self.inputs = inputs
         self.outputs = outputs
@@ -163,6 +348,8 @@ class BenchmarkConfig:
         self.num_of_instance = num_of_instance
         self.inter_num_of_threads = inter_num_of_threads
         self.intra_num_of_threads = intra_num_of_threads
+        self.server_scenario = server_scenario
+        self.autotune = autotune
 
     @property
     def backend(self):
@@ -267,6 +454,29 @@ class BenchmarkConfig:
                                                        intra_num_of_threads, int):
             self._intra_num_of_threads = intra_num_of_threads
 
+    @property
+    def server_scenario(self):
+        """Get server_scenario."""
+        return self._server_scenario
+
+    @server_scenario.setter
+    def server_scenario(self, server_scenario):
+        """Set server_scenario."""
+        if server_scenario is None or check_value('server_scenario', server_scenario,
+                                                  ServerScenarioConfig):
+            self._server_scenario = server_scenario
+
+    @property
+    def autotune(self):
+        """Get autotune."""
+        return self._autotune
+
+    @autotune.setter
+    def autotune(self, autotune):
+        """Set autotune."""
+        if autotune is None or check_value('autotune', autotune, AutotuneConfig):
+            self._autotune = autotune
+
 
 class AccuracyCriterion:
     """Class of Accuracy Criterion."""
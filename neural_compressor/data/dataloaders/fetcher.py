@@ -18,6 +18,7 @@
 """Definitions of the methods to fetch data from an iterable-style or list-style dataset."""
 
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 class Fetcher(object):    # pragma: no cover
     """Base class for different fetchers."""
@@ -47,7 +48,7 @@ class Fetcher(object):    # pragma: no cover
 class IterableFetcher(Fetcher):    # pragma: no cover
     """Iterate to get next batch-size samples as a batch."""
 
-    def __init__(self, dataset, collate_fn, drop_last, distributed):
+    def __init__(self, dataset, collate_fn, drop_last, distributed, num_workers=0):
         """Initialize IterableFetcher.
 
         Args:
@@ -55,6 +56,8 @@ class IterableFetcher(Fetcher):    # pragma: no cover
             collate_fn (callable): merge data with outer dimension batch size
             drop_last (bool): whether to drop the last batch if it is incomplete
             distributed (bool): whether the dataloader is distributed
+            num_workers (int, optional): unused, the samples of an iterable dataset are read in order.
+                Defaults to 0.
 
         """
         super(IterableFetcher, self).__init__(dataset, collate_fn, drop_last)
@@ -100,7 +103,7 @@ class IterableFetcher(Fetcher):    # pragma: no cover
 class IndexFetcher(Fetcher):    # pragma: no cover
     """Take single index or a batch of indices to fetch samples as a batch."""
 
-    def __init__(self, dataset, collate_fn, drop_last, distributed):
+    def __init__(self, dataset, collate_fn, drop_last, distributed, num_workers=0):
         """Initialize IndexFetcher.
 
         Args:
@@ -108,8 +111,12 @@ class IndexFetcher(Fetcher):    # pragma: no cover
             collate_fn (callable): merge data with outer dimension batch size
             drop_last (bool): whether to drop the last batch if it is incomplete
             distributed (bool): whether the dataloader is distributed
+            num_workers (int, optional): number of threads getting the samples of a batch, the
+                transforms of cv2 and numpy release the GIL. Defaults to 0, getting them in order.
         """
         super(IndexFetcher, self).__init__(dataset, collate_fn, drop_last)
+        self.num_workers = num_workers
+        self.executor = None
 
     def __call__(self, batched_indices):
         """Fetch data.
@@ -118,7 +125,12 @@ class IndexFetcher(Fetcher):    # pragma: no cover
             batched_indices (list): fetch data according to batched_indices
 
         """
-        data = [self.dataset[idx] for idx in batched_indices]
+        if self.num_workers and self.num_workers > 1 and len(batched_indices) > 1:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.num_workers)
+            data = list(self.executor.map(self.dataset.__getitem__, batched_indices))
+        else:
+            data = [self.dataset[idx] for idx in batched_indices]
         return self.collate_fn(data)
 
 FETCHERS = {"index": IndexFetcher, "iter": IterableFetcher, }
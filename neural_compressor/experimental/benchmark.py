@@ -24,6 +24,7 @@ import numpy as np
 import subprocess
 import signal
 import psutil
+import yaml
 from ..adaptor import FRAMEWORKS
 from ..objective import MultiObjective
 from ..conf.config import BenchmarkConf
@@ -41,6 +42,9 @@ from .common import Metric as NCMetric
 from .common import Postprocess as NCPostprocess
 from .common import _generate_common_dataloader
 from ..model.model import get_model_fwk_name
+from .load_generator import LoadGenerator
+from .benchmark_autotune import SuccessiveHalving, get_candidates, get_instance_layouts, \
+    measure
 from ..conf.pythonic_config import Config
 
 def set_env_var(env_var, value, overwrite_existing=False):
@@ -171,20 +175,30 @@ class Benchmark(object):
         """Directly call a Benchmark object.
 
         Args:
-            mode: 'performance' or 'accuracy'
+            mode: 'performance', 'accuracy', 'server' or 'autotune'
             'performance' mode runs benchmarking with numactl on specific cores and instances set
                 by user config and returns model performance
             'accuracy' mode runs benchmarking with full cores and returns model accuracy
+            'server' mode sends queries to in-process model instances at the target rates of
+                evaluation.performance.server and returns the latencies
+            'autotune' mode searches the settings of evaluation.performance.autotune with
+                in-process model instances and returns the best ones
         """
         cfg = self.conf.usr_cfg
         assert cfg.evaluation is not None, 'benchmark evaluation filed should not be None...'
         assert sys.platform in ['linux', 'win32'], 'only support platform windows and linux...'
-        set_all_env_var(deep_get(cfg, 'evaluation.{}.configs'.format(mode)))
+        set_all_env_var(deep_get(cfg, 'evaluation.{}.configs'.format(
+            'performance' if mode == 'server' else mode)))
         # disable multi-instance for accuracy mode or running bechmark on GPU device
         if mode == "accuracy" or cfg.device == 'gpu':
             set_env_var('NC_ENV_CONF', True, overwrite_existing=True)
 
         logger.info("Start to run Benchmark.")
+        if mode == 'server':
+            # the instances run in this process
+            return self.run_server()
+        if mode == 'autotune':
+            return self.run_autotune()
         if os.environ.get('NC_ENV_CONF') == 'True':
             return self.run_instance(mode)
         else:
@@ -284,17 +298,9 @@ class Benchmark(object):
         else:
             return ''
 
-    def run_instance(self, mode):
-        """Run the instance with the configuration.
-
-        Args:
-            mode: 'performance' or 'accuracy'
-            'performance' mode runs benchmarking with numactl on specific cores and instances set
-                by user config and returns model performance
-            'accuracy' mode runs benchmarking with full cores and returns model accuracy
-        """
+    def _create_adaptor(self):
+        """Create the framework adaptor running the model."""
         cfg = self.conf.usr_cfg
-        GLOBAL_STATE.STATE = MODE.BENCHMARK
         framework_specific_info = {'device': cfg.device, \
                                    'approach': cfg.quantization.approach, \
                                    'random_seed': cfg.tuning.random_seed,
@@ -320,7 +326,169 @@ class Benchmark(object):
 
         assert isinstance(self._model, BaseModel), 'need set neural_compressor Model for quantization....'
 
-        adaptor = FRAMEWORKS[framework](framework_specific_info)
+        return FRAMEWORKS[framework](framework_specific_info)
+
+    def run_server(self):
+        """Run the server scenario with in-process model instances.
+
+        The instances are set by num_of_instance and cores_per_instance, and the queries use
+        the inputs of b_dataloader in turn.
+        """
+        cfg = self.conf.usr_cfg
+        GLOBAL_STATE.STATE = MODE.BENCHMARK
+        server_cfg = deep_get(cfg, 'evaluation.performance.server')
+        assert server_cfg is not None, 'server field of performance evaluation is missing'
+        target_qps = server_cfg.get('target_qps') or []
+        latency_slo = server_cfg.get('latency_slo')
+        assert target_qps or latency_slo, 'need target_qps or latency_slo for server scenario'
+        num_queries = server_cfg.get('num_queries') or 1000
+        trace = server_cfg.get('trace')
+
+        adaptor = self._create_adaptor()
+        samples = self._get_samples(deep_get(cfg, 'evaluation.performance.iteration'))
+
+        num_of_instance = int(os.environ.get('NUM_OF_INSTANCE'))
+        cores_per_instance = int(os.environ.get('CORES_PER_INSTANCE'))
+        if adaptor.predictor_threads_shared and num_of_instance > 1:
+            raise NotImplementedError("The {} model instances share the threads of the process, " \
+                                      "set num_of_instance to 1 for the server scenario.".format(
+                                      self.framework))
+        instances = [adaptor.predictor(self._model, cores_per_instance) \
+                     for _ in range(num_of_instance)]
+        warmup = deep_get(cfg, 'evaluation.performance.warmup') or 0
+        generator = LoadGenerator(instances, samples, warmup=warmup)
+        seed = cfg.tuning.random_seed
+
+        logger.info("\nserver scenario benchmark with {} instances of {} cores:".format(
+            num_of_instance, cores_per_instance))
+        curve = generator.sweep(target_qps, num_queries, trace=trace, seed=seed)
+        max_qps = None
+        if latency_slo:
+            percentile = server_cfg.get('slo_percentile') or 99
+            max_qps = generator.find_max_qps(latency_slo, num_queries, percentile=percentile,
+                                             trace=trace, seed=seed)
+            if max_qps is None:
+                logger.info("No QPS meets the p{} latency SLO {} ms.".format(
+                    percentile, latency_slo))
+            else:
+                logger.info("Max QPS meeting the p{} latency SLO {} ms: {:.3f}".format(
+                    percentile, latency_slo, max_qps['qps']))
+        self._results['server'] = {'curve': curve, 'max_qps': max_qps}
+        return self._results['server']
+
+    def _get_samples(self, iteration):
+        """Get the inputs of the first iteration batches of b_dataloader, all if it is -1."""
+        cfg = self.conf.usr_cfg
+        if self._b_dataloader is None:
+            assert deep_get(cfg, 'evaluation.performance.dataloader') is not None, \
+                'dataloader field of yaml file is missing'
+            self._b_dataloader = create_dataloader(
+                self.framework, deep_get(cfg, 'evaluation.performance.dataloader'))
+        samples = []
+        for inputs, _ in self._b_dataloader:
+            samples.append(inputs)
+            if len(samples) == iteration:
+                break
+        return samples
+
+    def run_autotune(self):
+        """Search the batch size, the instance layout and the threads with in-process instances.
+
+        The settings of the best throughput and the best latency are also saved to
+        benchmark_autotune.yaml in the workspace, in the format of the performance
+        evaluation configs and dataloader batch_size.
+        """
+        from ..config import BenchmarkConfig
+        cfg = self.conf.usr_cfg
+        GLOBAL_STATE.STATE = MODE.BENCHMARK
+        autotune_cfg = deep_get(cfg, 'evaluation.performance.autotune')
+        assert autotune_cfg is not None, 'autotune field of performance evaluation is missing'
+        min_iteration = autotune_cfg.get('min_iteration') or 4
+        reduction_factor = autotune_cfg.get('reduction_factor') or 2
+        warmup = deep_get(cfg, 'evaluation.performance.warmup') or 0
+        iteration = deep_get(cfg, 'evaluation.performance.iteration')
+
+        adaptor = self._create_adaptor()
+        self._get_samples(1)
+        origin_batch_size = self._b_dataloader.batch_size
+        batch_sizes = autotune_cfg.get('batch_size') or [origin_batch_size]
+        if not hasattr(self._b_dataloader, 'batch'):
+            logger.warning("b_dataloader can not be re-batched, " \
+                           "only batch size {} is tuned.".format(origin_batch_size))
+            batch_sizes = [origin_batch_size]
+        layouts = get_instance_layouts(psutil.cpu_count(logical=False),
+                                       autotune_cfg.get('num_of_instance'))
+        inter_num_of_threads = autotune_cfg.get('inter_num_of_threads') or [1]
+        if adaptor.predictor_threads_shared:
+            # the instances would share the threads of the process and the inter op threads
+            # can be set only once, so only the batch size is tuned for 1 instance
+            logger.warning("The {} model instances share the threads of the process, " \
+                           "only 1 instance of all cores is tuned and the inter op threads " \
+                           "are not set.".format(self.framework))
+            layouts = get_instance_layouts(psutil.cpu_count(logical=False), [1])
+            inter_num_of_threads = [None]
+        candidates = get_candidates(batch_sizes, layouts, inter_num_of_threads)
+        logger.info("Autotune {} benchmark settings.".format(len(candidates)))
+
+        samples = {}
+        def evaluate(candidate, iteration_of_trial):
+            batch_size = candidate['batch_size']
+            if batch_size not in samples:
+                if batch_size != self._b_dataloader.batch_size:
+                    self._b_dataloader.batch(batch_size)
+                samples[batch_size] = self._get_samples(
+                    iteration if iteration and iteration > 0 else min_iteration)
+            instances = [adaptor.predictor(self._model, candidate['intra_num_of_threads'],
+                                           candidate['inter_num_of_threads']) \
+                         for _ in range(candidate['num_of_instance'])]
+            return measure(instances, samples[batch_size], batch_size,
+                           iteration_of_trial, warmup)
+
+        halving = SuccessiveHalving(evaluate, min_iteration, reduction_factor)
+        try:
+            best_throughput, best_latency = halving.search(candidates)
+        finally:
+            if self._b_dataloader.batch_size != origin_batch_size:
+                self._b_dataloader.batch(origin_batch_size)
+
+        settings, configs = {}, {}
+        for objective, best in (('throughput', best_throughput), ('latency', best_latency)):
+            logger.info("Best {} setting: batch size {}, {} instances of {} cores, " \
+                        "{} inter op threads, throughput {:.3f} samples/sec, " \
+                        "latency {:.3f} ms.".format(objective, best['batch_size'],
+                        best['num_of_instance'], best['cores_per_instance'],
+                        best['inter_num_of_threads'], best['throughput'], best['latency']))
+            settings[objective] = {
+                'batch_size': best['batch_size'],
+                'configs': {key: best[key] for key in ['cores_per_instance', 'num_of_instance',
+                            'inter_num_of_threads', 'intra_num_of_threads']}}
+            configs[objective] = BenchmarkConfig(
+                inputs=cfg.model.inputs, outputs=cfg.model.outputs,
+                backend=cfg.model.get('backend', 'default'), warmup=warmup,
+                iteration=iteration if iteration is not None else -1,
+                **settings[objective]['configs'])
+        os.makedirs(cfg.tuning.workspace.path, exist_ok=True)
+        path = os.path.join(cfg.tuning.workspace.path, 'benchmark_autotune.yaml')
+        with open(path, 'w') as f:
+            yaml.dump(settings, f, default_flow_style=False)
+        logger.info("Save the autotuned benchmark settings to {}.".format(path))
+
+        self._results['autotune'] = {'throughput': best_throughput, 'latency': best_latency,
+                                     'configs': configs, 'trials': halving.trials}
+        return self._results['autotune']
+
+    def run_instance(self, mode):
+        """Run the instance with the configuration.
+
+        Args:
+            mode: 'performance' or 'accuracy'
+            'performance' mode runs benchmarking with numactl on specific cores and instances set
+                by user config and returns model performance
+            'accuracy' mode runs benchmarking with full cores and returns model accuracy
+        """
+        cfg = self.conf.usr_cfg
+        GLOBAL_STATE.STATE = MODE.BENCHMARK
+        adaptor = self._create_adaptor()
 
         if deep_get(cfg, 'evaluation.{}.iteration'.format(mode)) == -1 and 'dummy_v2' in \
             deep_get(cfg, 'evaluation.{}.dataloader.dataset'.format(mode), {}):
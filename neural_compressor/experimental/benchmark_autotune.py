@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Search the deployment settings of the best throughput and the best latency.
+
+The settings are the batch size, the instance layout and the threads. Every
+candidate is measured briefly, then only the best ones by throughput and by
+latency are measured again with more iterations, until few are left
+(successive halving), so the poor settings cost little time.
+"""
+
+import itertools
+import math
+import threading
+import time
+
+import numpy as np
+
+from ..utils import logger
+
+
+def get_instance_layouts(cpu_counts, num_of_instance=None):
+    """Get the (num_of_instance, cores_per_instance) layouts using all cores.
+
+    Args:
+        cpu_counts (int): the number of physical cores.
+        num_of_instance (list, optional): the numbers of instances, None uses the divisors
+            of cpu_counts. Defaults to None.
+
+    Returns:
+        list: the layouts, a number of instances larger than cpu_counts is skipped.
+    """
+    if num_of_instance is None:
+        num_of_instance = [i for i in range(1, cpu_counts + 1) if cpu_counts % i == 0]
+    layouts = [(i, cpu_counts // i) for i in num_of_instance if i <= cpu_counts]
+    skipped = [i for i in num_of_instance if i > cpu_counts]
+    if skipped:
+        logger.warning("Skip num_of_instance {} larger than {} cores.".format(skipped, cpu_counts))
+    return layouts
+
+
+def measure(instances, samples, batch_size, iteration, warmup=0):
+    """Run the instances concurrently and measure the throughput and the latency.
+
+    Args:
+        instances (list): the model instances, each is a callable running a batch of inputs.
+        samples (list): the input batches, used in turn.
+        batch_size (int): the number of samples of an input batch.
+        iteration (int): the number of batches each instance runs.
+        warmup (int, optional): the number of batches each instance runs before measuring.
+            Defaults to 0.
+
+    Returns:
+        tuple: the throughput in samples per second and the mean latency of a batch in
+            milliseconds.
+    """
+    for instance in instances:
+        for i in range(warmup):
+            instance(samples[i % len(samples)])
+    latencies = [[] for _ in instances]
+
+    def run(index, instance):
+        for i in range(iteration):
+            start = time.perf_counter()
+            instance(samples[i % len(samples)])
+            latencies[index].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=run, args=(index, instance)) \
+               for index, instance in enumerate(instances)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    throughput = len(instances) * iteration * batch_size / elapsed
+    return throughput, float(np.mean(latencies)) * 1000
+
+
+class SuccessiveHalving(object):
+    """Successive halving over the benchmark settings for the throughput and the latency.
+
+    Each round measures the remaining candidates, keeps the best 1 / (2 * reduction_factor)
+    of them by throughput and as many by latency, and multiplies the iterations of the
+    next round by reduction_factor. The last round measures at most 2 candidates.
+
+    Args:
+        evaluate (callable): measures a candidate with a number of iterations and returns
+            the throughput and the latency.
+        min_iteration (int, optional): the iterations of the first round. Defaults to 4.
+        reduction_factor (int, optional): the rate the candidates shrink and the
+            iterations grow. Defaults to 2.
+    """
+
+    def __init__(self, evaluate, min_iteration=4, reduction_factor=2):
+        """Init a SuccessiveHalving."""
+        assert reduction_factor >= 2, 'reduction_factor should be 2 at least'
+        self.evaluate = evaluate
+        self.min_iteration = min_iteration
+        self.reduction_factor = reduction_factor
+        self.trials = []
+
+    def search(self, candidates):
+        """Search the candidates of the best throughput and the best latency.
+
+        Args:
+            candidates (list): the settings, each is a dict.
+
+        Returns:
+            tuple: the trials of the best throughput and the best latency, a trial is the
+                candidate updated with 'iteration', 'throughput' and 'latency'.
+        """
+        assert len(candidates) > 0, 'need one candidate at least'
+        alive = list(candidates)
+        iteration = self.min_iteration
+        while True:
+            trials = [self._trial(candidate, iteration) for candidate in alive]
+            if len(alive) <= 2:
+                break
+            keep = math.ceil(len(alive) / (2 * self.reduction_factor))
+            by_throughput = sorted(range(len(trials)), key=lambda i: -trials[i]['throughput'])
+            by_latency = sorted(range(len(trials)), key=lambda i: trials[i]['latency'])
+            kept = sorted(set(by_throughput[:keep]) | set(by_latency[:keep]))
+            alive = [alive[i] for i in kept]
+            iteration *= self.reduction_factor
+        return max(trials, key=lambda trial: trial['throughput']), \
+               min(trials, key=lambda trial: trial['latency'])
+
+    def _trial(self, candidate, iteration):
+        """Measure a candidate and record the trial."""
+        throughput, latency = self.evaluate(candidate, iteration)
+        trial = dict(candidate, iteration=iteration, throughput=throughput, latency=latency)
+        logger.info("Autotune {}: throughput {:.3f} samples/sec, latency {:.3f} ms.".format(
+            candidate, throughput, latency))
+        self.trials.append(trial)
+        return trial
+
+
+def get_candidates(batch_size, layouts, inter_num_of_threads):
+    """Get the candidate settings of all combinations.
+
+    Args:
+        batch_size (list): the batch sizes.
+        layouts (list): the (num_of_instance, cores_per_instance) layouts.
+        inter_num_of_threads (list): the numbers of inter op threads.
+
+    Returns:
+        list: the settings, the intra op threads of an instance are its cores.
+    """
+    return [{'batch_size': bs,
+             'num_of_instance': num_of_instance,
+             'cores_per_instance': cores_per_instance,
+             'intra_num_of_threads': cores_per_instance,
+             'inter_num_of_threads': inter} \
+            for bs, (num_of_instance, cores_per_instance), inter in \
+            itertools.product(batch_size, layouts, inter_num_of_threads)]
@@ -19,6 +19,7 @@
 
 import numpy as np
 import collections
+import threading
 from abc import abstractmethod
 from neural_compressor.utils.utility import LazyImport, singleton
 from neural_compressor.utils import logger
@@ -521,13 +522,124 @@ class ComposeTransform(BaseTransform):
     def __init__(self, transform_list):
         """Initialize `ComposeTransform` class."""
         self.transform_list = transform_list
+        self._fused_list = None
+        self._fused_from = None
+
+    @staticmethod
+    def _fuse(transform_list):
+        """Replace each run of consecutive fusable transforms with a FusedImageTransform."""
+        fused_list, run = [], []
+        for transform in transform_list + [None]:
+            if transform is not None and type(transform) in FusedImageTransform.fusable_types():
+                run.append(transform)
+                continue
+            if len(run) > 1:
+                fused_list.append(FusedImageTransform(run))
+            else:
+                fused_list.extend(run)
+            run = []
+            if transform is not None:
+                fused_list.append(transform)
+        return fused_list
 
     def __call__(self, sample):
         """Call transforms in transform_list."""
-        for transform in self.transform_list:
+        # transform_list may be changed after the init, e.g. by the datasets
+        if self._fused_from != self.transform_list:
+            self._fused_list = self._fuse(self.transform_list)
+            self._fused_from = list(self.transform_list)
+        for transform in self._fused_list:
             sample = transform(sample)
         return sample
 
+
+class FusedImageTransform(BaseTransform):
+    """Run consecutive numpy image transforms in one pass.
+
+    The crops and the transposes are views. An image resized before a normalization or a cast is
+    written into a buffer reused for the next samples of the same thread, and a normalization
+    writes its result a channel at a time straight into the output laid out as after the
+    following transposes.
+    cv2 and numpy release the GIL, so the samples can be processed by several threads.
+
+    Args:
+        transform_list (list of Transform objects): transforms of fusable_types() to run
+
+    Returns:
+        tuple of processed image and label
+    """
+
+    def __init__(self, transform_list):
+        """Initialize `FusedImageTransform` class."""
+        self.transform_list = transform_list
+        self._local = threading.local()
+
+    @staticmethod
+    def fusable_types():
+        """Get the transform types which can be fused."""
+        return (ResizeTransform, CenterCropTransform, NormalizeTransform, Transpose, CastONNXTransform)
+
+    def __getstate__(self):
+        """Drop the buffers of the threads for pickle."""
+        return {'transform_list': self.transform_list}
+
+    def __setstate__(self, state):
+        """Set the state from pickle."""
+        self.__init__(state['transform_list'])
+
+    def _buffer(self, index, shape, dtype):
+        """Get the buffer of the thread for the transform at index."""
+        buffers = self._local.__dict__.setdefault('buffers', {})
+        buffer = buffers.get(index)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = buffers[index] = np.empty(shape, dtype=dtype)
+        return buffer
+
+    def __call__(self, sample):
+        """Run the transforms on the image in sample."""
+        image, label = sample
+        # whether image is an array created for this sample
+        owned = False
+        for index, transform in enumerate(self.transform_list):
+            if isinstance(transform, ResizeTransform):
+                # the resized image is only read by a following normalization or cast
+                if any(isinstance(next_transform, (NormalizeTransform, CastONNXTransform)) \
+                    for next_transform in self.transform_list[index + 1:]):
+                    width, height = transform.size
+                    shape = (height, width) + tuple(image.shape[2:])
+                    image = cv2.resize(image, transform.size, dst=self._buffer(index, shape, image.dtype),
+                                       interpolation=transform.interpolation)
+                    owned = False
+                else:
+                    image = cv2.resize(image, transform.size, interpolation=transform.interpolation)
+                    owned = True
+                if len(image.shape) == 2:
+                    image = np.expand_dims(image, -1)
+            elif isinstance(transform, NormalizeTransform):
+                assert len(transform.mean) == image.shape[-1], 'Mean channel must match image channel'
+                perm = list(range(len(image.shape)))
+                for next_transform in self.transform_list[index + 1:]:
+                    if not isinstance(next_transform, Transpose):
+                        break
+                    assert len(perm) == len(next_transform.perm), "Image rank doesn't match Perm rank"
+                    perm = [perm[axis] for axis in next_transform.perm]
+                mean, std = transform.get_mean_std(image.dtype)
+                output = np.empty([image.shape[axis] for axis in perm], dtype=mean.dtype)
+                output_view = output.transpose(np.argsort(perm))
+                # a channel at a time, the inner loops run over the planes instead of the channels
+                for channel in range(len(mean)):
+                    channel_view = output_view[..., channel]
+                    np.subtract(image[..., channel], mean[channel], out=channel_view, dtype=mean.dtype)
+                    np.divide(channel_view, std[channel], out=channel_view, dtype=mean.dtype)
+                image = output_view
+                owned = True
+            elif isinstance(transform, CastONNXTransform):
+                image = image.astype(np_dtype_map[transform.dtype], copy=not owned)
+                owned = True
+            else:
+                image, label = transform((image, label))
+        return (image, label)
+
 @transform_registry(transform_type="CropToBoundingBox", process="preprocess", \
         framework="pytorch")
 class CropToBoundingBox(BaseTransform):
@@ -1943,17 +2055,27 @@ class NormalizeTransform(BaseTransform):
 
     def __init__(self, mean=[0.0], std=[1.0]):
         """Initialize `NormalizeTransform` class."""
-        self.mean = mean
-        self.std = std
+        self.mean = np.array(mean, dtype=np.float64)
+        self.std = np.array(std, dtype=np.float64)
         for item in self.std:
             if item < 10**-6:
                 raise ValueError("Std should be greater than 0")
 
+    def get_mean_std(self, dtype):
+        """Get the mean and std to normalize an image of dtype.
+
+        The images are normalized in float32, only the float64 images are normalized in float64
+        instead of promoting all images to it.
+        """
+        dtype = np.result_type(dtype, np.float32)
+        return self.mean.astype(dtype, copy=False), self.std.astype(dtype, copy=False)
+
     def __call__(self, sample):
         """Normalize the image in sample."""
         image, label = sample
         assert len(self.mean) == image.shape[-1], 'Mean channel must match image channel'
-        image = (image - self.mean) / self.std
+        mean, std = self.get_mean_std(image.dtype)
+        image = (image - mean) / std
         return (image, label)
 
 @transform_registry(transform_type="RandomCrop", process="preprocess", \
@@ -2285,87 +2407,139 @@ def _check_is_max_context(doc_spans, cur_span_index, position):
 
     return cur_span_index == best_span_index
 
-def convert_examples_to_features(examples, tokenizer, max_seq_length,
-                                 doc_stride, max_query_length, output_fn):
-    """Load a data file into a list of `InputBatch`s."""
-    unique_id = 1000000000
-    for (example_index, example) in enumerate(examples):
-        query_tokens = tokenizer.tokenize(example.question_text)
-        if len(query_tokens) > max_query_length:
-            query_tokens = query_tokens[0:max_query_length]
-
-        tok_to_orig_index = []
-        orig_to_tok_index = []
-        all_doc_tokens = []
-        for (i, token) in enumerate(example.doc_tokens):
-            orig_to_tok_index.append(len(all_doc_tokens))
-            sub_tokens = tokenizer.tokenize(token)
-            for sub_token in sub_tokens:
-                tok_to_orig_index.append(i)
-                all_doc_tokens.append(sub_token)
-
-        tok_start_position = None
-        tok_end_position = None
-
-        # The -3 accounts for [CLS], [SEP] and [SEP]
-        max_tokens_for_doc = max_seq_length - len(query_tokens) - 3
-
-        # We can have documents that are longer than the maximum sequence length.
-        # To deal with this we do a sliding window approach, where we take chunks
-        # of the up to our max length with a stride of `doc_stride`.
-        _DocSpan = collections.namedtuple(  # pylint: disable=invalid-name
-            "DocSpan", ["start", "length"])
-        doc_spans = []
-        start_offset = 0
-        while start_offset < len(all_doc_tokens):
-            length = len(all_doc_tokens) - start_offset
-            if length > max_tokens_for_doc:
-                length = max_tokens_for_doc
-            doc_spans.append(_DocSpan(start=start_offset, length=length))
-            if start_offset + length == len(all_doc_tokens):
-                break
-            start_offset += min(length, doc_stride)
-        for (doc_span_index, doc_span) in enumerate(doc_spans):
-            tokens = []
-            token_to_orig_map = {}
-            token_is_max_context = {}
-            segment_ids = []
-            tokens.append("[CLS]")
-            segment_ids.append(0)
-            for token in query_tokens:
-                tokens.append(token)
-                segment_ids.append(0)
-            tokens.append("[SEP]")
+def _convert_example_to_spans(example, tokenizer, max_seq_length, doc_stride, max_query_length):
+    """Convert an example into the features of its doc spans, without the ids of the features."""
+    query_tokens = tokenizer.tokenize(example.question_text)
+    if len(query_tokens) > max_query_length:
+        query_tokens = query_tokens[0:max_query_length]
+
+    tok_to_orig_index = []
+    orig_to_tok_index = []
+    all_doc_tokens = []
+    for (i, token) in enumerate(example.doc_tokens):
+        orig_to_tok_index.append(len(all_doc_tokens))
+        sub_tokens = tokenizer.tokenize(token)
+        for sub_token in sub_tokens:
+            tok_to_orig_index.append(i)
+            all_doc_tokens.append(sub_token)
+
+    # The -3 accounts for [CLS], [SEP] and [SEP]
+    max_tokens_for_doc = max_seq_length - len(query_tokens) - 3
+
+    # We can have documents that are longer than the maximum sequence length.
+    # To deal with this we do a sliding window approach, where we take chunks
+    # of the up to our max length with a stride of `doc_stride`.
+    _DocSpan = collections.namedtuple(  # pylint: disable=invalid-name
+        "DocSpan", ["start", "length"])
+    doc_spans = []
+    start_offset = 0
+    while start_offset < len(all_doc_tokens):
+        length = len(all_doc_tokens) - start_offset
+        if length > max_tokens_for_doc:
+            length = max_tokens_for_doc
+        doc_spans.append(_DocSpan(start=start_offset, length=length))
+        if start_offset + length == len(all_doc_tokens):
+            break
+        start_offset += min(length, doc_stride)
+    spans = []
+    for (doc_span_index, doc_span) in enumerate(doc_spans):
+        tokens = []
+        token_to_orig_map = {}
+        token_is_max_context = {}
+        segment_ids = []
+        tokens.append("[CLS]")
+        segment_ids.append(0)
+        for token in query_tokens:
+            tokens.append(token)
             segment_ids.append(0)
+        tokens.append("[SEP]")
+        segment_ids.append(0)
 
-            for i in range(doc_span.length):
-                split_token_index = doc_span.start + i
-                token_to_orig_map[len(tokens)] = tok_to_orig_index[split_token_index]
+        for i in range(doc_span.length):
+            split_token_index = doc_span.start + i
+            token_to_orig_map[len(tokens)] = tok_to_orig_index[split_token_index]
 
-                is_max_context = _check_is_max_context(doc_spans, doc_span_index,
-                                                       split_token_index)
-                token_is_max_context[len(tokens)] = is_max_context
-                tokens.append(all_doc_tokens[split_token_index])
-                segment_ids.append(1)
-            tokens.append("[SEP]")
+            is_max_context = _check_is_max_context(doc_spans, doc_span_index,
+                                                   split_token_index)
+            token_is_max_context[len(tokens)] = is_max_context
+            tokens.append(all_doc_tokens[split_token_index])
             segment_ids.append(1)
+        tokens.append("[SEP]")
+        segment_ids.append(1)
+
+        input_ids = tokenizer.convert_tokens_to_ids(tokens)
 
-            input_ids = tokenizer.convert_tokens_to_ids(tokens)
+        # The mask has 1 for real tokens and 0 for padding tokens. Only real
+        # tokens are attended to.
+        input_mask = [1] * len(input_ids)
 
-            # The mask has 1 for real tokens and 0 for padding tokens. Only real
-            # tokens are attended to.
-            input_mask = [1] * len(input_ids)
+        # Zero-pad up to the sequence length.
+        while len(input_ids) < max_seq_length:
+            input_ids.append(0)
+            input_mask.append(0)
+            segment_ids.append(0)
 
-            # Zero-pad up to the sequence length.
-            while len(input_ids) < max_seq_length:
-                input_ids.append(0)
-                input_mask.append(0)
-                segment_ids.append(0)
+        assert len(input_ids) == max_seq_length
+        assert len(input_mask) == max_seq_length
+        assert len(segment_ids) == max_seq_length
+
+        spans.append((doc_span_index, tokens, token_to_orig_map, token_is_max_context,
+                      input_ids, input_mask, segment_ids))
+    return spans
+
+# the tokenizer of a worker process converting the examples
+_worker_tokenizer = None
+
+def _init_convert_worker(tokenizer):
+    """Set the tokenizer of the worker process."""
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer
+
+def _convert_examples_chunk(examples, max_seq_length, doc_stride, max_query_length):
+    """Convert a chunk of examples in a worker process."""
+    return [_convert_example_to_spans(example, _worker_tokenizer, max_seq_length, doc_stride,
+                                      max_query_length) for example in examples]
+
+def _convert_examples_to_spans(examples, tokenizer, max_seq_length, doc_stride, max_query_length,
+                               num_workers):
+    """Convert the examples into the features of their doc spans, in the order of the examples."""
+    import os
+    # the workers pay off only when each of them gets a few hundred examples
+    num_workers = min(num_workers, os.cpu_count() or 1, len(examples) // 256)
+    if num_workers > 1:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        chunk_size = -(-len(examples) // (num_workers * 4))
+        chunks = [examples[i:i + chunk_size] for i in range(0, len(examples), chunk_size)]
+        try:
+            # spawn the workers, forking a process with running TensorFlow threads may deadlock
+            with ProcessPoolExecutor(max_workers=num_workers,
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_convert_worker,
+                                     initargs=(tokenizer,)) as executor:
+                results = executor.map(_convert_examples_chunk, chunks,
+                                       *[[arg] * len(chunks) for arg in \
+                                         (max_seq_length, doc_stride, max_query_length)])
+                return [spans for chunk_spans in results for spans in chunk_spans]
+        except Exception as e: # pragma: no cover
+            logger.warning("Fail to convert the examples with {} processes due to {}, " \
+                           "convert them in this process.".format(num_workers, str(e)))
+    return [_convert_example_to_spans(example, tokenizer, max_seq_length, doc_stride,
+                                      max_query_length) for example in examples]
 
-            assert len(input_ids) == max_seq_length
-            assert len(input_mask) == max_seq_length
-            assert len(segment_ids) == max_seq_length
+def convert_examples_to_features(examples, tokenizer, max_seq_length,
+                                 doc_stride, max_query_length, output_fn, num_workers=1):
+    """Load a data file into a list of `InputBatch`s.
 
+    With num_workers > 1, the examples are tokenized by a pool of up to num_workers spawned
+    processes, bounded by the number of CPUs. The features are output in the order of the examples.
+    """
+    unique_id = 1000000000
+    all_spans = _convert_examples_to_spans(examples, tokenizer, max_seq_length, doc_stride,
+                                           max_query_length, num_workers)
+    for (example_index, (example, spans)) in enumerate(zip(examples, all_spans)):
+        for (doc_span_index, tokens, token_to_orig_map, token_is_max_context,
+             input_ids, input_mask, segment_ids) in spans:
             start_position = None
             end_position = None
 
@@ -2386,6 +2560,92 @@ def convert_examples_to_features(examples, tokenizer, max_seq_length,
             output_fn(feature)
             unique_id += 1
 
+def _hash_file(path):
+    """Get the sha256 of a file."""
+    import hashlib
+    sha256 = hashlib.sha256()
+    with tf.io.gfile.GFile(path, "rb") as reader:
+        for block in iter(lambda: reader.read(1 << 20), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+def load_squad_features(examples, label_file, vocab_file, max_seq_length, doc_stride,
+                        max_query_length, do_lower_case, cache_dir="./dataset_cached", num_workers=1):
+    """Get the features of the SQuAD examples read from label_file, caching them.
+
+    The cache is keyed by the content of label_file and vocab_file and the conversion arguments.
+    input_ids, input_mask and segment_ids are saved as arrays loaded with memory mapping, the
+    other fields of the features are pickled.
+
+    Args:
+        examples (list): the SquadExample read from label_file.
+        label_file (str): path of the SQuAD json file.
+        vocab_file (str): path of the vocabulary file.
+        max_seq_length (int): the maximum sequence length.
+        doc_stride (int): the stride between the chunks of a long document.
+        max_query_length (int): the maximum number of tokens for the question.
+        do_lower_case (bool): whether to lower case the input text.
+        cache_dir (str, optional): the directory of the cache, None to disable it.
+            Defaults to "./dataset_cached".
+        num_workers (int, optional): the number of processes converting the examples, see
+            convert_examples_to_features(). Defaults to 1.
+
+    Returns:
+        list: the InputFeatures.
+    """
+    import os
+    import json
+    import pickle
+    import hashlib
+    from . import tokenization
+    cache_path = None
+    if cache_dir is not None:
+        key = json.dumps([_hash_file(label_file), _hash_file(vocab_file), max_seq_length,
+                          doc_stride, max_query_length, do_lower_case])
+        cache_path = os.path.join(cache_dir,
+                                  'squad_features_{}'.format(hashlib.sha256(key.encode()).hexdigest()[:16]))
+        if os.path.exists(os.path.join(cache_path, 'features.pkl')):
+            logger.info("Load features from cached file {}.".format(cache_path))
+            arrays = {name: np.load(os.path.join(cache_path, name + '.npy'), mmap_mode='r') \
+                for name in ['input_ids', 'input_mask', 'segment_ids']}
+            with open(os.path.join(cache_path, 'features.pkl'), 'rb') as f:
+                fields = pickle.load(f)
+            return [InputFeatures(**field, **{name: array[index] for name, array in arrays.items()}) \
+                for index, field in enumerate(fields)]
+
+    tokenizer = tokenization.FullTokenizer(vocab_file=vocab_file, do_lower_case=do_lower_case)
+    features = []
+    convert_examples_to_features(
+        examples=examples,
+        tokenizer=tokenizer,
+        max_seq_length=max_seq_length,
+        doc_stride=doc_stride,
+        max_query_length=max_query_length,
+        output_fn=features.append,
+        num_workers=num_workers)
+
+    if cache_path is not None:
+        import shutil
+        # write into a temporary directory first, so a partial cache is never loaded
+        tmp_path = '{}.{}.tmp'.format(cache_path, os.getpid())
+        try:
+            os.makedirs(tmp_path, exist_ok=True)
+            for name in ['input_ids', 'input_mask', 'segment_ids']:
+                np.save(os.path.join(tmp_path, name + '.npy'),
+                        np.array([getattr(feature, name) for feature in features], dtype=np.int32) \
+                            .reshape(len(features), max_seq_length))
+            fields = [{key: value for key, value in vars(feature).items() \
+                if key not in ['input_ids', 'input_mask', 'segment_ids']} for feature in features]
+            with open(os.path.join(tmp_path, 'features.pkl'), 'wb') as f:
+                pickle.dump(fields, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            logger.info("Save features into cached file {}.".format(cache_path))
+        except OSError as e:
+            logger.warning("Fail to cache the features due to {}.".format(str(e)))
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    return features
+
 @transform_registry(transform_type="Collect", \
                 process="postprocess", framework="tensorflow")
 class CollectTransform(BaseTransform):
@@ -2440,30 +2700,24 @@ class TFSquadV1PostTransform(BaseTransform):
         doc_stride (int, default=128):
             When splitting up a long document into chunks,
             how much stride to take between chunks
+        num_workers (int, default=1):
+            The number of processes converting the examples into features,
+            see convert_examples_to_features()
+
+    The features of label_file are cached in ./dataset_cached, see load_squad_features().
 
     Returns:
         tuple of processed prediction and label
     """
 
     def __init__(self, label_file, vocab_file, n_best_size=20, max_seq_length=384, \
-        max_query_length=64, max_answer_length=30, do_lower_case=True, doc_stride=128):
+        max_query_length=64, max_answer_length=30, do_lower_case=True, doc_stride=128,
+        num_workers=1):
         """Initialize `TFSquadV1PostTransform` class."""
-        from . import tokenization
         self.eval_examples = read_squad_examples(label_file)
-        tokenizer = tokenization.FullTokenizer(
-            vocab_file=vocab_file, do_lower_case=do_lower_case)
-
-        self.eval_features = []
-        def append_feature(feature):
-            self.eval_features.append(feature)
-
-        convert_examples_to_features(
-            examples=self.eval_examples,
-            tokenizer=tokenizer,
-            max_seq_length=max_seq_length,
-            doc_stride=doc_stride,
-            max_query_length=max_query_length,
-            output_fn=append_feature)
+        self.eval_features = load_squad_features(self.eval_examples, label_file, vocab_file,
+                                                 max_seq_length, doc_stride, max_query_length,
+                                                 do_lower_case, num_workers=num_workers)
 
         self.n_best_size = n_best_size
         self.max_answer_length = max_answer_length
@@ -2657,10 +2911,11 @@ class TFSquadV1ModelZooPostTransform(TFSquadV1PostTransform):
     """
 
     def __init__(self, label_file, vocab_file, n_best_size=20, max_seq_length=384, \
-        max_query_length=64, max_answer_length=30, do_lower_case=True, doc_stride=128):
+        max_query_length=64, max_answer_length=30, do_lower_case=True, doc_stride=128,
+        num_workers=1):
         """Initialize `TFSquadV1ModelZooPostTransform` class."""
         super().__init__(label_file, vocab_file, n_best_size, max_seq_length, \
-                max_query_length, max_answer_length, do_lower_case, doc_stride)
+                max_query_length, max_answer_length, do_lower_case, doc_stride, num_workers)
         self.length = len(self.eval_features)
         self.collect_data = TFModelZooCollectTransform(length=self.length)
 
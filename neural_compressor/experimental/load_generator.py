@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Open-loop load generator for the server scenario benchmark.
+
+Queries arrive on a schedule independent of the model, e.g. a Poisson process
+or a replayed trace, and wait in a queue until a model instance is free. The
+latency of a query is measured from its scheduled arrival, so it includes the
+queueing delay a client sees when the model falls behind the traffic.
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+from ..utils import logger
+
+
+def poisson_arrivals(qps, num_queries, seed=None):
+    """Get the arrival times of queries sent by a Poisson process.
+
+    Args:
+        qps (float): the mean number of queries per second.
+        num_queries (int): the number of queries.
+        seed (int, optional): the random seed. Defaults to None.
+
+    Returns:
+        np.ndarray: the arrival times in seconds from the start.
+    """
+    assert qps > 0, 'qps should be greater than 0'
+    rng = np.random.RandomState(seed)
+    return np.cumsum(rng.exponential(1. / qps, num_queries))
+
+
+def trace_arrivals(trace, qps=None, num_queries=None):
+    """Get the arrival times of queries replayed from a trace.
+
+    Args:
+        trace (list or str): the arrival timestamps in seconds, or the path to a file with
+            one timestamp per line.
+        qps (float, optional): rescale the trace to this mean number of queries per second,
+            None replays the original timing. Defaults to None.
+        num_queries (int, optional): the number of queries, the trace is repeated if it is
+            shorter. Defaults to None, the length of the trace.
+
+    Returns:
+        np.ndarray: the arrival times in seconds from the start.
+    """
+    if isinstance(trace, str):
+        trace = np.loadtxt(trace, dtype=np.float64, ndmin=1)
+    arrivals = np.sort(np.asarray(trace, dtype=np.float64))
+    assert arrivals.size > 1, 'the trace should have 2 arrivals at least'
+    arrivals -= arrivals[0]
+    assert arrivals[-1] > 0, 'the trace should not arrive at the same time'
+    if num_queries is not None and num_queries != arrivals.size:
+        # the repeated trace starts one mean interval after the last arrival
+        period = arrivals[-1] * arrivals.size / (arrivals.size - 1)
+        repeats = -(-num_queries // arrivals.size)
+        arrivals = (arrivals + period * np.arange(repeats)[:, None]).reshape(-1)[:num_queries]
+    if qps is not None:
+        assert qps > 0, 'qps should be greater than 0'
+        arrivals *= (arrivals.size - 1) / (arrivals[-1] * qps)
+    return arrivals
+
+
+class LoadGenerator(object):
+    """Send queries to in-process model instances on an open-loop schedule.
+
+    Each instance is served by a thread of its own, the instances should release the GIL
+    while running the model as the inference runtimes do.
+
+    Args:
+        instances (list): the model instances, each is a callable running a batch of inputs.
+        samples (list): the inputs of the queries, used in turn.
+        warmup (int, optional): the number of queries each instance runs before measuring.
+            Defaults to 0.
+    """
+
+    def __init__(self, instances, samples, warmup=0):
+        """Init a LoadGenerator."""
+        assert len(instances) > 0, 'need one model instance at least'
+        assert len(samples) > 0, 'need one sample at least'
+        self.instances = instances
+        self.samples = samples
+        for instance in self.instances:
+            for i in range(warmup):
+                instance(self.samples[i % len(self.samples)])
+
+    def run(self, arrivals, percentiles=(50, 90, 99)):
+        """Send the queries at their arrival times and wait for all of them.
+
+        Args:
+            arrivals (np.ndarray): the arrival times in seconds from the start.
+            percentiles (tuple, optional): the reported latency percentiles.
+                Defaults to (50, 90, 99).
+
+        Returns:
+            dict: 'qps' is the offered queries per second, 'throughput' the completed queries
+                per second, and 'mean' and 'p<percentile>' the latencies in milliseconds.
+        """
+        num_queries = len(arrivals)
+        latencies = np.zeros(num_queries)
+        finish = np.zeros(len(self.instances))
+        errors = []
+        queries = queue.Queue()
+
+        def serve(index, instance):
+            while True:
+                query = queries.get()
+                if query is None:
+                    return
+                query_id, arrival = query
+                try:
+                    if not errors:
+                        instance(self.samples[query_id % len(self.samples)])
+                except Exception as e:  # pragma: no cover
+                    errors.append(e)
+                finish[index] = time.perf_counter()
+                latencies[query_id] = finish[index] - arrival
+
+        threads = [threading.Thread(target=serve, args=(index, instance), daemon=True) \
+                   for index, instance in enumerate(self.instances)]
+        for thread in threads:
+            thread.start()
+        start = time.perf_counter()
+        for query_id, arrival in enumerate(arrivals):
+            arrival += start
+            delay = arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            queries.put((query_id, arrival))
+        for _ in threads:
+            queries.put(None)
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+        latencies *= 1000
+        span = arrivals[-1] - arrivals[0]
+        result = {
+            'qps': float((num_queries - 1) / span) if span > 0 else float('inf'),
+            'throughput': float(num_queries / (finish.max() - start)),
+            'mean': float(latencies.mean())}
+        for percentile in percentiles:
+            result['p{}'.format(percentile)] = float(np.percentile(latencies, percentile))
+        return result
+
+    def sweep(self, target_qps, num_queries, trace=None, seed=None):
+        """Measure the latencies at each target number of queries per second.
+
+        Args:
+            target_qps (list): the target numbers of queries per second.
+            num_queries (int): the number of queries sent at each target.
+            trace (list or str, optional): the trace replayed at each target, see
+                trace_arrivals, None sends the queries by a Poisson process. Defaults to None.
+            seed (int, optional): the random seed of the Poisson process. Defaults to None.
+
+        Returns:
+            list: the results of run at each target, the latency-vs-QPS curve.
+        """
+        curve = []
+        for qps in target_qps:
+            result = self.run(self._arrivals(qps, num_queries, trace, seed))
+            logger.info("Server scenario QPS {:.3f}: throughput {:.3f}, latency mean {:.3f} ms, " \
+                        "p50 {:.3f} ms, p90 {:.3f} ms, p99 {:.3f} ms.".format(
+                        result['qps'], result['throughput'], result['mean'],
+                        result['p50'], result['p90'], result['p99']))
+            curve.append(result)
+        return curve
+
+    def find_max_qps(self, latency_slo, num_queries, percentile=99, trace=None, seed=None,
+                     max_qps=None, tolerance=0.05):
+        """Search the maximum number of queries per second meeting the tail latency SLO.
+
+        A rate meets the objective if the latency percentile is within it and the instances
+        keep up with the queries, i.e. the throughput is within tolerance of the rate, so a
+        run too short to fill the queue does not pass at an unsustainable rate.
+
+        Args:
+            latency_slo (float): the latency objective in milliseconds.
+            num_queries (int): the number of queries sent at each trial.
+            percentile (float, optional): the latency percentile meeting the objective.
+                Defaults to 99.
+            trace (list or str, optional): the replayed trace, see sweep. Defaults to None.
+            seed (int, optional): the random seed of the Poisson process. Defaults to None.
+            max_qps (float, optional): the upper bound of the search, None uses the
+                throughput of sending all queries at once. Defaults to None.
+            tolerance (float, optional): stop when the bounds are this relative distance
+                apart. Defaults to 0.05.
+
+        Returns:
+            dict: the result of run at the maximum number of queries per second, None if
+                even the lowest tried one misses the objective.
+        """
+        key = 'p{}'.format(percentile)
+        if max_qps is None:
+            # the open-loop traffic can not be served faster than the saturated throughput
+            max_qps = self.run(np.zeros(num_queries))['throughput']
+        low, high, best = 0., max_qps, None
+        qps = max_qps
+        while True:
+            result = self.run(self._arrivals(qps, num_queries, trace, seed),
+                              percentiles=(50, 90, 99, percentile))
+            meets = result[key] <= latency_slo and \
+                result['throughput'] >= (1 - tolerance) * result['qps']
+            logger.debug("Server scenario QPS {:.3f}: {} latency {:.3f} ms {} SLO {} ms.".format(
+                         qps, key, result[key], 'meets' if meets else 'misses', latency_slo))
+            if meets:
+                low, best = qps, result
+            else:
+                high = qps
+            if high - low <= tolerance * high or high <= tolerance * max_qps:
+                break
+            qps = (low + high) / 2
+        return best
+
+    @staticmethod
+    def _arrivals(qps, num_queries, trace, seed):
+        """Get the arrival times at a target number of queries per second."""
+        if trace is not None:
+            return trace_arrivals(trace, qps, num_queries)
+        return poisson_arrivals(qps, num_queries, seed)
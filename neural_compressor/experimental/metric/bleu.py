@@ -16,14 +16,36 @@
 # limitations under the License.
 """Script for BLEU metric."""
 
+import multiprocessing
 import re
 import six
 import sys
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Sequence
 
-from .bleu_util import compute_bleu
-from .metric import metric_registry
+import numpy as np
+
+from .bleu_util import compute_bleu_stats, compute_bleu_from_stats
+from .metric import BaseMetric, metric_registry
+
+
+def _char_class(chars: str) -> str:
+    """Write the characters as the ranges of a regular expression character class.
+
+    A class of thousands of single characters is slow to match, the ranges of
+    consecutive characters are much faster.
+    """
+    codes = sorted(set(ord(char) for char in chars))
+    ranges = []
+    for code in codes:
+        if ranges and code == ranges[-1][1] + 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return "".join(re.escape(six.unichr(start)) if start == end else \
+                   re.escape(six.unichr(start)) + "-" + re.escape(six.unichr(end)) \
+                   for start, end in ranges)
 
 
 class UnicodeRegex(object):
@@ -39,10 +61,12 @@ class UnicodeRegex(object):
 
     def __init__(self) -> None:
         """Initialize the regular expressions."""
-        punctuation = self.property_chars("P")
+        # the backslash used to escape the "]" after it in the expressions,
+        # so it is still not recognized as a punctuation
+        punctuation = _char_class(self.property_chars("P").replace("\\", ""))
         self.nondigit_punct_re = re.compile(r"([^\d])([" + punctuation + r"])")
         self.punct_nondigit_re = re.compile(r"([" + punctuation + r"])([^\d])")
-        self.symbol_re = re.compile("([" + self.property_chars("S") + "])")
+        self.symbol_re = re.compile("([" + _char_class(self.property_chars("S")) + "])")
 
     def property_chars(self, prefix: str) -> str:
         """Collect all Unicode strings starting with a specific prefix.
@@ -59,7 +83,20 @@ class UnicodeRegex(object):
         return punctuation
 
 
-uregex = UnicodeRegex()
+uregex = None
+
+
+def _get_uregex() -> UnicodeRegex:
+    """Get the regular expressions, which take seconds to build, on the first use."""
+    global uregex
+    if uregex is None:
+        uregex = UnicodeRegex()
+    return uregex
+
+
+def _init_bleu_worker() -> None:
+    """Build the regular expressions once in each worker process."""
+    _get_uregex()
 
 
 def bleu_tokenize(string: str) -> List[str]:
@@ -74,15 +111,23 @@ def bleu_tokenize(string: str) -> List[str]:
     Returns:
         tokens: A list of tokens.
     """
-    string = uregex.nondigit_punct_re.sub(r"\1 \2 ", string)
-    string = uregex.punct_nondigit_re.sub(r" \1 \2", string)
-    string = uregex.symbol_re.sub(r" \1 ", string)
+    regex = _get_uregex()
+    string = regex.nondigit_punct_re.sub(r"\1 \2 ", string)
+    string = regex.punct_nondigit_re.sub(r" \1 \2", string)
+    string = regex.symbol_re.sub(r" \1 ", string)
     tokens = string.split()
     return tokens
 
 
+def _bleu_stats(label: Sequence[str], prediction: Sequence[str]) -> np.ndarray:
+    """Tokenize the references and translations, and count their BLEU n-gram matches."""
+    label = [bleu_tokenize(x.lower()) for x in label]
+    prediction = [bleu_tokenize(x.lower()) for x in prediction]
+    return compute_bleu_stats(label, prediction)
+
+
 @metric_registry('BLEU', 'tensorflow, tensorflow_itex')
-class BLEU(object):
+class BLEU(BaseMetric):
     """Computes the BLEU (Bilingual Evaluation Understudy) score.
 
     BLEU is an algorithm for evaluating the quality of text which has 
@@ -92,20 +137,38 @@ class BLEU(object):
     By default, we use ngram order of 4 and use brevity penalty.
     Also, this does not have beam search.
 
+    The translations are tokenized and their clipped n-gram matches are
+    counted when they are added, so only the counts are kept.
+
     Attributes:
-        predictions: List of translations to score.
-        labels: List of the reference corresponding to the prediction result.
+        num_workers: The number of processes tokenizing the translations in
+          the background, 0 to tokenize them in update().
+        stats: The n-gram matches and lengths counted by compute_bleu_stats.
     """
 
-    def __init__(self) -> None:
-        """Initialize predictions and labels."""
-        self.predictions = []
-        self.labels = []
+    def __init__(self, num_workers: int = 0) -> None:
+        """Initialize the counts.
+
+        Args:
+            num_workers: The number of processes tokenizing the translations,
+              defaults to 0 to tokenize them in update().
+        """
+        self.num_workers = num_workers
+        self._pool = None
+        self._pending = []
+        self.reset()
 
     def reset(self) -> None:
-        """Clear the predictions and labels in the cache."""
-        self.predictions = []
-        self.labels = []
+        """Clear the counts and shut down the worker processes."""
+        self.close()
+        self.stats = np.zeros(2 * 4 + 2, dtype=np.int64)
+
+    def close(self) -> None:
+        """Wait for the translations being tokenized and shut down the worker processes."""
+        self._collect()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
 
     def update(self, prediction: Sequence[str], label: Sequence[str]) -> None:
         """Add the prediction and label.
@@ -122,12 +185,28 @@ class BLEU(object):
             raise ValueError("Reference and prediction files have different number "
                              "of lines. If training only a few steps (100-200), the "
                              "translation may be empty.")
-        label = [x.lower() for x in label]
-        prediction = [x.lower() for x in prediction]
-        label = [bleu_tokenize(x) for x in label]
-        prediction = [bleu_tokenize(x) for x in prediction]
-        self.labels.extend(label)
-        self.predictions.extend(prediction)
+        if self.num_workers <= 0:
+            self.stats += _bleu_stats(label, prediction)
+            return
+
+        if self._pool is None:
+            # spawn the workers, forking a process with running TensorFlow threads may deadlock
+            self._pool = ProcessPoolExecutor(max_workers=self.num_workers,
+                                             mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_init_bleu_worker)
+        chunk_size = -(-len(label) // self.num_workers)
+        for start in range(0, len(label), chunk_size):
+            self._pending.append(self._pool.submit(
+                _bleu_stats, list(label[start:start + chunk_size]),
+                list(prediction[start:start + chunk_size])))
+        while self._pending and self._pending[0].done():
+            self.stats += self._pending.pop(0).result()
+
+    def _collect(self) -> None:
+        """Wait for the translations being tokenized and add their counts."""
+        for future in self._pending:
+            self.stats += future.result()
+        self._pending = []
 
     def result(self) -> float:
         """Compute the BLEU score.
@@ -135,5 +214,16 @@ class BLEU(object):
         Returns:
             bleu_score: The approximate BLEU score.
         """
-        bleu_score = compute_bleu(self.labels, self.predictions) * 100
+        self.close()
+        stats = self.stats
+        if getattr(self, '_hvd', None) is not None:
+            stats = sum(self._hvd.allgather_object(stats))
+        bleu_score = compute_bleu_from_stats(stats) * 100
         return bleu_score
+
+    def __getstate__(self):
+        """Drop the worker processes when pickled."""
+        self._collect()
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
@@ -16,7 +16,6 @@
 
 import os
 
-import pandas as pd
 from neural_compressor.conf.config import Conf, NASConfig
 from neural_compressor.utils import logger
 
@@ -41,16 +40,20 @@ class DyNAS(NASBase):
                                            TransformerLTEncoding)
         from .dynast.dynas_predictor import Predictor
         from .dynast.dynas_search import (ProblemMultiObjective,
-                                          SearchAlgoManager)
+                                          SearchAlgoManager,
+                                          select_pareto_promising)
         from .dynast.dynas_utils import (EvaluationInterfaceMobileNetV3,
                                          EvaluationInterfaceResNet50,
                                          EvaluationInterfaceTransformerLT,
-                                         OFARunner, TransformerLTRunner)
+                                         OFARunner, ResultsStore,
+                                         TransformerLTRunner)
 
         self.ParameterManager = ParameterManager
         self.Predictor = Predictor
         self.ProblemMultiObjective = ProblemMultiObjective
         self.SearchAlgoManager = SearchAlgoManager
+        self.select_pareto_promising = select_pareto_promising
+        self.ResultsStore = ResultsStore
         self.SUPERNET_PARAMETERS = {
             'ofa_resnet50': {
                 'd':  {'count': 5,  'vars': [0, 1, 2]},
@@ -109,6 +112,9 @@ class DyNAS(NASBase):
         self.macs_predictor = None
         self.latency_predictor = None
         self.results_csv_path = None
+        self.results_db_path = None
+        self.results_store = None
+        self.screen_ratio = 1.0
         self.num_workers = None
         self.init_cfg(conf_fname_or_obj)
 
@@ -138,12 +144,16 @@ class DyNAS(NASBase):
             checkpoint_path=self.supernet_ckpt_path,
         )
 
+        # Persistent store of all the validated measurements
+        self.results_store = self.ResultsStore(self.results_db_path)
+
         # Setup validation interface
         self.validation_interface = self.EVALUATION_INTERFACE[self.supernet](
             evaluator=self.runner_validate,
             metrics=self.metrics,
             manager=self.supernet_manager,
-            csv_path=self.results_csv_path
+            csv_path=self.results_csv_path,
+            results_store=self.results_store,
         )
 
         # Clear csv file if one exists
@@ -161,18 +171,22 @@ class DyNAS(NASBase):
         # if number of results in results_csv_path smaller than population.
 
         if not os.path.exists(self.results_csv_path):
-            # Clear also creates empty CSV file.
+            # Clear also creates empty CSV file and empties the results store.
             self.validation_interface.clear_csv()
+        elif len(self.results_store) == 0:
+            # Results of a previous search are only kept in the csv file
+            self.results_store.import_csv(self.results_csv_path, self.supernet_manager)
 
-        df = pd.read_csv(self.results_csv_path)
         latest_population = [self.supernet_manager.random_sample()
-                             for _ in range(max(self.population - df.shape[0], 0))]
+                             for _ in range(max(self.population - len(self.results_store), 0))]
 
         # Start Lightweight Iterative Neural Architecture Search (LINAS)
         num_loops = round(self.num_evals/self.population)
         for loop in range(num_loops):
 
             for i, individual in enumerate(latest_population):
+                if self.results_store.contains(individual):
+                    continue
                 logger.info(
                 '[DyNAS-T] Starting eval {} of {} in LINAS loop {} of {}.'.format(
                     i+1, len(latest_population), loop+1, num_loops))
@@ -222,8 +236,12 @@ class DyNAS(NASBase):
 
             results = search_manager.run_search(problem)
 
-            latest_population = results.pop.get('X')
+            # Only the Pareto-promising part of the predicted population is validated
+            latest_population = self.select_pareto_promising(
+                results.pop.get('X'), results.pop.get('F'), self.screen_ratio)
 
+        self.results_store.export_csv(self.results_csv_path,
+                                      self.validation_interface.CSV_HEADER)
         logger.info(
             "[DyNAS-T] Validated model architectures in file: {}".format(self.results_csv_path))
 
@@ -244,13 +262,7 @@ class DyNAS(NASBase):
         """Create the accuracy predictor."""
         if 'acc' in self.metrics:
             logger.info('[DyNAS-T] Building Accuracy Predictor')
-            df = self.supernet_manager.import_csv(self.results_csv_path,
-                                                  config='config',
-                                                  objective='acc',
-                                                  column_names=['config', 'date', 'lat', 'macs', 'acc'])
-            features, labels = self.supernet_manager.create_training_set(df)
-            self.acc_predictor = self.Predictor()
-            self.acc_predictor.train(features, labels.ravel())
+            self.acc_predictor = self._fit_predictor(self.acc_predictor, 'acc')
         else:
             self.acc_predictor = None
 
@@ -258,13 +270,7 @@ class DyNAS(NASBase):
         """Create the MACs predictor."""
         if 'macs' in self.metrics:
             logger.info('[DyNAS-T] Building MACs Predictor')
-            df = self.supernet_manager.import_csv(self.results_csv_path,
-                                                  config='config',
-                                                  objective='macs',
-                                                  column_names=['config', 'date', 'lat', 'macs', 'acc'])
-            features, labels = self.supernet_manager.create_training_set(df)
-            self.macs_predictor = self.Predictor()
-            self.macs_predictor.train(features, labels.ravel())
+            self.macs_predictor = self._fit_predictor(self.macs_predictor, 'macs')
         else:
             self.macs_predictor = None
 
@@ -272,16 +278,23 @@ class DyNAS(NASBase):
         """Create the latency predictor."""
         if 'lat' in self.metrics:
             logger.info('[DyNAS-T] Building Latency Predictor')
-            df = self.supernet_manager.import_csv(self.results_csv_path,
-                                                  config='config',
-                                                  objective='lat',
-                                                  column_names=['config', 'date', 'lat', 'macs', 'acc'])
-            features, labels = self.supernet_manager.create_training_set(df)
-            self.latency_predictor = self.Predictor()
-            self.latency_predictor.train(features, labels.ravel())
+            self.latency_predictor = self._fit_predictor(self.latency_predictor, 'lat')
         else:
             self.latency_predictor = None
 
+    def _fit_predictor(self, predictor, objective):
+        """Train a new predictor, or update an existing one, on the stored measurements."""
+        df = self.supernet_manager.import_store(self.results_store,
+                                                config='config',
+                                                objective=objective)
+        features, labels = self.supernet_manager.create_training_set(df)
+        if predictor is None:
+            predictor = self.Predictor()
+            predictor.train(features, labels.ravel())
+        else:
+            predictor.update(features, labels.ravel())
+        return predictor
+
     def init_cfg(self, conf_fname_or_obj):
         """Initialize the configuration."""
         if isinstance(conf_fname_or_obj, str):
@@ -302,6 +315,10 @@ class DyNAS(NASBase):
         self.metrics = dynas_config.metrics
         self.num_evals = dynas_config.num_evals
         self.results_csv_path = dynas_config.results_csv_path
+        self.results_db_path = dynas_config.results_db_path
+        if self.results_db_path is None and self.results_csv_path is not None:
+            self.results_db_path = os.path.splitext(self.results_csv_path)[0] + '.db'
+        self.screen_ratio = dynas_config.screen_ratio
         self.dataset_path = dynas_config.dataset_path
         self.supernet_ckpt_path = dynas_config.supernet_ckpt_path
         self.batch_size = dynas_config.batch_size
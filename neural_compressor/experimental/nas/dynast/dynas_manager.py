@@ -212,6 +212,46 @@ class ParameterManager:
         else:
             df = pd.read_csv(filepath)
             df.columns = column_names
+        return self.import_dataframe(df, config, objective, drop_duplicates)
+
+    def import_store(
+        self,
+        store,
+        config: str,
+        objective: str,
+        drop_duplicates: bool = True,
+    ) -> pd.DataFrame:
+        """Import the measurements kept in a results store.
+
+        Args:
+            store (ResultsStore): the persistent store of the validated subnetworks.
+            config (str): the subnetwork configuration.
+            objective (str): target/label for the subnet configuration (e.g. accuracy, latency).
+
+        Returns:
+            df: the output dataframe in the same format as "import_csv".
+        """
+        df = pd.DataFrame(store.records(), columns=store.COLUMNS)
+        return self.import_dataframe(df, config, objective, drop_duplicates)
+
+    def import_dataframe(
+        self,
+        df: pd.DataFrame,
+        config: str,
+        objective: str,
+        drop_duplicates: bool = True,
+    ) -> pd.DataFrame:
+        """Convert the raw results dataframe into the predictor training format.
+
+        Args:
+            df (pd.DataFrame): raw results with the subnetwork configuration stored as string.
+            config (str): the subnetwork configuration.
+            objective (str): target/label for the subnet configuration (e.g. accuracy, latency).
+
+        Returns:
+            df: the output dataframe that contains the original config dict, pymoo, and 1-hot
+                equivalent vector for training.
+        """
         df = df[[config, objective]]
 
         # OFA corner case coverage
@@ -232,7 +272,7 @@ class ParameterManager:
             config_as_pymoo = self.translate2pymoo(config_as_dict)
             convert_to_pymoo.append(config_as_pymoo)
             # Onehot preditor format
-            config_as_onehot = self.onehot_generic(config_as_pymoo)
+            config_as_onehot = self.encode_config(config_as_dict, config_as_pymoo)
             convert_to_onehot.append(config_as_onehot)
 
         df[config] = convert_to_dict
@@ -241,6 +281,10 @@ class ParameterManager:
 
         return df
 
+    def encode_config(self, config_as_dict: dict, config_as_pymoo: list) -> np.ndarray:
+        """Encode a subnetwork configuration into the predictor feature format."""
+        return self.onehot_generic(config_as_pymoo)
+
     def set_seed(self, seed) -> None:
         """Set the random seed for randomized subnet generation and test/train split."""
         self.seed = seed
@@ -373,57 +417,9 @@ class TransformerLTEncoding(ParameterManager):  #noqa: D101
         else:
             return features
 
-    def import_csv(
-        self,
-        filepath: str,
-        config: str,
-        objective: str,
-        column_names: List[str] = None,
-        drop_duplicates: bool = True,
-    ) -> pd.DataFrame:
-        """Import a csv file generated from a supernetwork search for the purpose of training a predictor.
-
-        filepath - path of the csv to be imported.
-        config - the subnetwork configuration
-        objective - target/label for the subnet configuration (e.g. accuracy, latency)
-        column_names - a list of column names for the dataframe
-        df - the output dataframe that contains the original config dict, pymoo, and 1-hot
-             equivalent vector for training.
-        """
-        if column_names == None:
-            df = pd.read_csv(filepath)
-        else:
-            df = pd.read_csv(filepath)
-            df.columns = column_names
-        df = df[[config, objective]]
-        # Old corner case coverage
-        df[config] = df[config].replace({'null': 'None'}, regex=True)
-
-        if drop_duplicates:
-            df.drop_duplicates(subset=[config], inplace=True)
-            df.reset_index(drop=True, inplace=True)
-
-        convert_to_dict = list()
-        convert_to_pymoo = list()
-        convert_to_onehot = list()
-        for i in range(len(df)):
-            # Elastic Param Config format
-            config_as_dict = ast.literal_eval(df[config].iloc[i])
-            convert_to_dict.append(config_as_dict)
-            # PyMoo 1-D vector format
-            config_as_pymoo = self.translate2pymoo(config_as_dict)
-            convert_to_pymoo.append(config_as_pymoo)
-            # Onehot predictor format
-            config_as_onehot = self.onehot_custom(
-                config_as_dict, provide_onehot=False)
-            convert_to_onehot.append(config_as_onehot)
-        df[config] = convert_to_dict
-        df['config_pymoo'] = convert_to_pymoo
-        df['config_onehot'] = convert_to_onehot
-
-        return df
+    def encode_config(self, config_as_dict, config_as_pymoo):  #noqa: D102
+        return self.onehot_custom(config_as_dict, provide_onehot=False)
 
-    # @staticmethod
     def create_training_set(
         self,
         dataframe: pd.DataFrame,
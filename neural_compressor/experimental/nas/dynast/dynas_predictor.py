@@ -22,6 +22,7 @@ import pickle
 import numpy as np
 from scipy.stats import kendalltau, spearmanr
 from sklearn import linear_model, svm
+from sklearn.base import clone
 from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
 from sklearn.model_selection import GridSearchCV
 
@@ -35,9 +36,11 @@ class Predictor:
     DEFAULT_ALPHAS = np.arange(0.1, 10.1, 0.1)
     DEFAULT_COST_FACTORS = np.arange(1.0, 101.0, 1.0)
     DEFAULT_MAX_ITERATIONS = 1000000
+    DEFAULT_SEARCH_INTERVAL = 5
 
     def __init__(self, alphas=DEFAULT_ALPHAS, cost_factors=DEFAULT_COST_FACTORS,
-                 max_iterations=DEFAULT_MAX_ITERATIONS, verbose=False):
+                 max_iterations=DEFAULT_MAX_ITERATIONS, verbose=False,
+                 search_interval=DEFAULT_SEARCH_INTERVAL):
         """Initialize the attributes."""
         SEARCHER_VERBOSITY = 10
 
@@ -47,6 +50,11 @@ class Predictor:
         # Initialize best searcher index
         self.best_index = 0
 
+        # Number of refits with cached hyper-parameters between two full searches
+        self.search_interval = search_interval
+        self.num_updates = 0
+        self.trained = False
+
         # Create lists of regressors and associated hyper-parameters
         regressors = [
             linear_model.Ridge(max_iter=max_iterations),
@@ -75,15 +83,8 @@ class Predictor:
             examples: Examples to be used for training.
             labels: Labels to be used for training.
         """
-        # Compute normalization factor
-        max_label = np.amax(np.abs(labels))
-        if max_label > 0.0:
-            self.normalization_factor = 10 ** (np.floor(np.log10(max_label)) - 1.0)
-        else:
-            self.normalization_factor = 1.0
-
         # Compute normalized labels
-        normalized_labels = labels / self.normalization_factor
+        normalized_labels = self._normalize_labels(labels)
 
         # Train regressors with optimal parameters
         scores = np.zeros(len(self.searchers))
@@ -93,6 +94,40 @@ class Predictor:
 
         # Determine index of best searcher
         self.best_index = np.argmax(scores)
+        self.num_updates = 0
+        self.trained = True
+
+    def update(self, examples, labels):
+        """Update the predictor after new measurements were added to the training set.
+
+        The hyper-parameters found by the last full `train` are reused, so only the
+        best regressor is refit instead of re-running the grid search over all of them.
+        A full search is repeated every `search_interval` updates.
+
+        Args:
+            examples: Examples to be used for training, including the new ones.
+            labels: Labels to be used for training, including the new ones.
+        """
+        self.num_updates += 1
+        if not self.trained or self.num_updates >= self.search_interval:
+            self.train(examples, labels)
+            return
+
+        normalized_labels = self._normalize_labels(labels)
+        searcher = self.searchers[self.best_index]
+        regressor = clone(searcher.best_estimator_)
+        regressor.fit(examples, normalized_labels)
+        searcher.best_estimator_ = regressor
+
+    def _normalize_labels(self, labels):
+        """Compute the label normalization factor and return the normalized labels."""
+        max_label = np.amax(np.abs(labels))
+        if max_label > 0.0:
+            self.normalization_factor = 10 ** (np.floor(np.log10(max_label)) - 1.0)
+        else:
+            self.normalization_factor = 1.0
+
+        return labels / self.normalization_factor
 
     def predict(self, examples):
         """Predict the output values of the specified examples using the underlying regressor.
@@ -162,6 +197,7 @@ class Predictor:
             self.normalization_factor = pickle.load(input_file)
             self.best_index = pickle.load(input_file)
             self.searchers = pickle.load(input_file)
+        self.trained = True
 
     def save(self, filename):
         """Save the model of the underlying regressor and searcher.
@@ -30,6 +30,7 @@ from pymoo.algorithms.moo.nsga2 import NSGA2
 from pymoo.core.problem import Problem
 from pymoo.factory import get_crossover, get_mutation, get_sampling
 from pymoo.optimize import minimize
+from pymoo.util.nds.non_dominated_sorting import NonDominatedSorting
 
 
 class SearchAlgoManager:
@@ -194,16 +195,42 @@ class ProblemMultiObjective(Problem):
     ) -> None:
         """Evaluate the Subnet."""
         # Store results for a given generation for PyMoo
-        objective_x_arr, objective_y_arr = list(), list()
+        objective_x_arr, objective_y_arr = self.evaluation_interface.eval_subnets(x)
 
-        # Measure new individuals
-        for i in range(len(x)):
+        # Update PyMoo with evaluation data
+        out["F"] = anp.column_stack([objective_x_arr, objective_y_arr])
 
-            _, objective_x, objective_y = self.evaluation_interface.eval_subnet(
-                x[i])
 
-            objective_x_arr.append(objective_x)
-            objective_y_arr.append(objective_y)
+def select_pareto_promising(
+    population: np.ndarray,
+    objectives: np.ndarray,
+    ratio: float = 1.0,
+) -> np.ndarray:
+    """Select the Pareto-promising fraction of a population scored by the predictors.
 
-        # Update PyMoo with evaluation data
-        out["F"] = anp.column_stack([objective_x_arr, objective_y_arr])
+    Individuals are taken front by front from the non-dominated sorting of the
+    predicted objectives. Inside the last selected front the individuals with the
+    best predicted accuracy (second objective) are preferred.
+
+    Args:
+        population (np.ndarray): The pymoo vectors of the population.
+        objectives (np.ndarray): The predicted objectives of the population.
+        ratio (float): The fraction of the population to select.
+
+    Returns:
+        The selected part of the population.
+    """
+    if ratio >= 1.0:
+        return population
+
+    count = max(1, int(np.ceil(len(population) * ratio)))
+    selected = []
+    for front in NonDominatedSorting().do(objectives):
+        front = sorted(front, key=lambda i: objectives[i][1])
+        selected.extend(front[:count - len(selected)])
+        if len(selected) >= count:
+            break
+
+    logger.info('[DyNAS-T] Selected {} of {} individuals for validation.'.format(
+        len(selected), len(population)))
+    return population[selected]
@@ -17,8 +17,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import ast
 import copy
 import csv
+import sqlite3
 import time
 import uuid
 from datetime import datetime
@@ -429,6 +431,145 @@ class TransformerLTRunner(Runner):  #noqa: D101
         return latency_mean, latency_std
 
 
+class ResultsStore:
+    """Persistent store of the validated sub-network measurements.
+
+    The measurements are kept in a SQLite database, so they survive between searches
+    and can be queried without re-reading and re-parsing the whole results csv file.
+
+    Args:
+        db_path (str): The path of the SQLite database file.
+    """
+
+    COLUMNS = ['config', 'date', 'lat', 'macs', 'acc']
+
+    def __init__(
+        self,
+        db_path: str,
+    ) -> None:
+        """Initialize the attributes."""
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, config TEXT UNIQUE, vector TEXT, '
+            'date TEXT, lat REAL, macs REAL, acc REAL)'
+        )
+        self.connection.commit()
+
+    def __len__(self) -> int:
+        """Return the number of stored measurements."""
+        return self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def add(
+        self,
+        config: dict,
+        lat: float,
+        macs: float,
+        acc: float,
+        vector: list = None,
+        date: str = None,
+    ) -> None:
+        """Store the measurements of a sub-network, replacing older ones of the same config.
+
+        Args:
+            config (dict): The dictionary describing the subnet.
+            lat (float): The measured latency.
+            macs (float): The measured MACs.
+            acc (float): The measured accuracy.
+            vector (list, Optional): The pymoo vector of the subnet.
+            date (str, Optional): The date of the measurement, defaults to now.
+        """
+        self.connection.execute(
+            'INSERT OR REPLACE INTO results (config, vector, date, lat, macs, acc) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (
+                str(config),
+                None if vector is None else str([int(v) for v in vector]),
+                date if date is not None else str(datetime.now()),
+                float(lat), float(macs), float(acc),
+            )
+        )
+        self.connection.commit()
+
+    def contains(
+        self,
+        vector: list,
+    ) -> bool:
+        """Check whether the subnet given as pymoo vector has already been measured."""
+        query = 'SELECT 1 FROM results WHERE vector = ? LIMIT 1'
+        key = str([int(v) for v in vector])
+        return self.connection.execute(query, (key,)).fetchone() is not None
+
+    def records(self) -> list:
+        """Return all the measurements as (config, date, lat, macs, acc) tuples in insertion order."""
+        query = 'SELECT {} FROM results ORDER BY id'.format(', '.join(self.COLUMNS))
+        return self.connection.execute(query).fetchall()
+
+    def clear(self) -> None:
+        """Remove all the measurements."""
+        self.connection.execute('DELETE FROM results')
+        self.connection.commit()
+
+    def import_csv(
+        self,
+        csv_path: str,
+        manager: ParameterManager = None,
+    ) -> int:
+        """Import the measurements of a results csv file written by a previous search.
+
+        Args:
+            csv_path (str): The path of the results csv file.
+            manager (ParameterManager, Optional): The manager translating the configs to
+                pymoo vectors, so that the imported subnets are found by "contains".
+
+        Returns:
+            The number of imported measurements.
+        """
+        count = 0
+        with open(csv_path, newline='') as f:
+            rows = [row for row in csv.reader(f) if any(cell.strip() for cell in row)]
+        # The first row is the header
+        for row in rows[1:]:
+            config, date, lat, macs, acc = row[:5]
+            vector = None
+            if manager is not None:
+                try:
+                    vector = str([int(v) for v in
+                                  manager.translate2pymoo(ast.literal_eval(config))])
+                except (KeyError, ValueError, SyntaxError, TypeError):
+                    logger.warning('[DyNAS-T] Config {} does not belong to the supernet, '
+                                   'it is imported without vector.'.format(config))
+            self.connection.execute(
+                'INSERT OR REPLACE INTO results (config, vector, date, lat, macs, acc) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (config, vector, date, float(lat), float(macs), float(acc))
+            )
+            count += 1
+        self.connection.commit()
+        return count
+
+    def export_csv(
+        self,
+        csv_path: str,
+        header: list,
+    ) -> None:
+        """Write all the measurements to a results csv file.
+
+        Args:
+            csv_path (str): The path of the results csv file.
+            header (list): The column names written as first row.
+        """
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(self.records())
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+
 class EvaluationInterface:
     """Evaluation Interface class.
 
@@ -439,8 +580,11 @@ class EvaluationInterface:
         evaluator (class): The 'runner' that performs the validation or prediction.
         manager (class): The DyNAS-T manager that translates between PyMoo and the parameter dict.
         csv_path (str, Optional): The csv file that get written to during the subnetwork search.
+        results_store (ResultsStore, Optional): The store that keeps the validated measurements.
     """
 
+    CSV_HEADER = ['Sub-network', 'Date', 'Latency (ms)', 'MACs', 'Top-1 Acc (%)']
+
     def __init__(
         self,
         evaluator: Runner,
@@ -448,6 +592,7 @@ class EvaluationInterface:
         metrics: list = ['acc', 'macs'],
         predictor_mode: bool = False,
         csv_path: str = None,
+        results_store: ResultsStore = None,
     ) -> None:
         """Initialize the attributes."""
         self.evaluator = evaluator
@@ -455,6 +600,7 @@ class EvaluationInterface:
         self.metrics = metrics
         self.predictor_mode = predictor_mode
         self.csv_path = csv_path
+        self.results_store = results_store
 
     def eval_subnet(
         self,
@@ -463,14 +609,78 @@ class EvaluationInterface:
         """Evaluate the subnet."""
         pass
 
+    def eval_subnets(
+        self,
+        xs: list,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Evaluate a population of subnets.
+
+        In predictor mode the whole population is encoded once and every predictor
+        is called a single time on the stacked features, instead of once per subnet.
+
+        Args:
+            xs (list): The pymoo vectors of the subnets.
+
+        Returns:
+            objective x array; objective y array.
+        """
+        if not self.predictor_mode:
+            results = [self.eval_subnet(x) for x in xs]
+            return np.array([r[1] for r in results]), np.array([r[2] for r in results])
+
+        features = np.stack([self.encode_subnet(x) for x in xs])
+        acc = self.estimate_accuracy(features)
+        if 'lat' in self.metrics:
+            return np.asarray(self.evaluator.estimate_latency(features)), -np.asarray(acc)
+        elif 'macs' in self.metrics:
+            return np.asarray(self.evaluator.estimate_macs(features)), -np.asarray(acc)
+        else:
+            return np.zeros(len(xs)), -np.asarray(acc)
+
+    def encode_subnet(
+        self,
+        x: list,
+    ) -> np.ndarray:
+        """Encode the subnet into the predictor feature format."""
+        return self.manager.onehot_generic(x)
+
+    def estimate_accuracy(
+        self,
+        features: np.ndarray,
+    ) -> np.ndarray:
+        """Estimate the accuracy of the encoded subnets with the predictor."""
+        return self.evaluator.estimate_accuracy_top1(features)
+
+    def record(
+        self,
+        config: dict,
+        lat: float,
+        macs: float,
+        acc: float,
+        x: list = None,
+    ) -> None:
+        """Record the measurements of a validated subnet.
+
+        The measurements go to the results store when one is set, otherwise they are
+        appended to the csv file.
+        """
+        if self.results_store is not None:
+            self.results_store.add(config, lat, macs, acc, vector=x)
+        elif self.csv_path:
+            with open(self.csv_path, 'a') as f:
+                writer = csv.writer(f)
+                date = str(datetime.now())
+                result = [config, date, lat, macs, acc]
+                writer.writerow(result)
+
     def clear_csv(self) -> None:
-        """Clear the csv file."""
+        """Clear the csv file and the results store together."""
+        if self.results_store is not None:
+            self.results_store.clear()
         if self.csv_path:
             f = open(self.csv_path, "w")
             writer = csv.writer(f)
-            result = ['Sub-network', 'Date',
-                      'Latency (ms)', 'MACs', 'Top-1 Acc (%)']
-            writer.writerow(result)
+            writer.writerow(self.CSV_HEADER)
             f.close()
 
 
@@ -490,9 +700,10 @@ class EvaluationInterfaceResNet50(EvaluationInterface):
         metrics: list = ['acc', 'macs'],
         predictor_mode: bool = False,
         csv_path: str = None,
+        results_store: 'ResultsStore' = None,
     ) -> None:
         """Initialize the attributes."""
-        super().__init__(evaluator, manager, metrics, predictor_mode, csv_path)
+        super().__init__(evaluator, manager, metrics, predictor_mode, csv_path, results_store)
 
     def eval_subnet(
         self,
@@ -530,12 +741,8 @@ class EvaluationInterfaceResNet50(EvaluationInterface):
             if 'lat' in self.metrics:
                 lat, _ = self.evaluator.measure_latency(subnet_sample)
 
-        if self.csv_path:
-            with open(self.csv_path, 'a') as f:
-                writer = csv.writer(f)
-                date = str(datetime.now())
-                result = [subnet_sample, date, lat, macs, top1]
-                writer.writerow(result)
+        if not self.predictor_mode:
+            self.record(subnet_sample, lat, macs, top1, x)
 
         # PyMoo only minimizes objectives, thus accuracy needs to be negative
         # Requires format: subnetwork, objective x, objective y
@@ -561,9 +768,10 @@ class EvaluationInterfaceMobileNetV3(EvaluationInterface):
         metrics=['acc', 'macs'],
         predictor_mode=False,
         csv_path=None,
+        results_store=None,
     ) -> None:
         """Initialize the attributes."""
-        super().__init__(evaluator, manager, metrics, predictor_mode, csv_path)
+        super().__init__(evaluator, manager, metrics, predictor_mode, csv_path, results_store)
 
     def eval_subnet(
         self,
@@ -599,12 +807,8 @@ class EvaluationInterfaceMobileNetV3(EvaluationInterface):
             if 'lat' in self.metrics:
                 lat, _ = self.evaluator.measure_latency(subnet_sample)
 
-        if self.csv_path:
-            with open(self.csv_path, 'a') as f:
-                writer = csv.writer(f)
-                date = str(datetime.now())
-                result = [subnet_sample, date, lat, macs, top1]
-                writer.writerow(result)
+        if not self.predictor_mode:
+            self.record(subnet_sample, lat, macs, top1, x)
 
         # PyMoo only minimizes objectives, thus accuracy needs to be negative
         # Requires format: subnetwork, objective x, objective y
@@ -615,6 +819,8 @@ class EvaluationInterfaceMobileNetV3(EvaluationInterface):
 
 
 class EvaluationInterfaceTransformerLT(EvaluationInterface):  #noqa: D101
+    CSV_HEADER = ['Sub-network', 'Date', 'Latency (ms)', 'MACs', 'BLEU']
+
     def __init__(
         self,
         evaluator: Runner,
@@ -622,8 +828,9 @@ class EvaluationInterfaceTransformerLT(EvaluationInterface):  #noqa: D101
         metrics=['acc', 'macs'],
         predictor_mode=False,
         csv_path=None,
+        results_store=None,
     ) -> None:  #noqa: D107
-        super().__init__(evaluator, manager, metrics, predictor_mode, csv_path)
+        super().__init__(evaluator, manager, metrics, predictor_mode, csv_path, results_store)
 
     def eval_subnet(
         self,
@@ -668,12 +875,8 @@ class EvaluationInterfaceTransformerLT(EvaluationInterface):  #noqa: D101
             if 'lat' in self.metrics:
                 lat, _ = self.evaluator.measure_latency(subnet_sample)
 
-        if self.csv_path:
-            with open(self.csv_path, 'a') as f:
-                writer = csv.writer(f)
-                date = str(datetime.now())
-                result = [param_dict, date, lat, macs, bleu, ]
-                writer.writerow(result)
+        if not self.predictor_mode:
+            self.record(param_dict, lat, macs, bleu, x)
 
         # PyMoo only minimizes objectives, thus accuracy needs to be negative
         # Requires format: subnetwork, objective x, objective y
@@ -682,14 +885,17 @@ class EvaluationInterfaceTransformerLT(EvaluationInterface):  #noqa: D101
         else:
             return sample, macs, -bleu
 
-    def clear_csv(self) -> None:  #noqa: D102
-        if self.csv_path:
-            f = open(self.csv_path, "w")
-            writer = csv.writer(f)
-            result = ['Sub-network', 'Date',
-                      'Latency (ms)', 'MACs', 'BLEU']
-            writer.writerow(result)
-            f.close()
+    def encode_subnet(
+        self,
+        x: list,
+    ) -> np.ndarray:  #noqa: D102
+        return self.manager.onehot_custom(self.manager.translate2param(x))
+
+    def estimate_accuracy(
+        self,
+        features: np.ndarray,
+    ) -> np.ndarray:  #noqa: D102
+        return self.evaluator.estimate_accuracy_bleu(features)
 
 
 def get_torchvision_model(
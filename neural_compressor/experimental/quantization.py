@@ -26,6 +26,7 @@ from ..conf.dotdict import deep_get, deep_set, DotDict
 from ..strategy import STRATEGIES
 from ..utils import logger
 from ..utils.utility import time_limit
+from ..utils.tracing import trace
 from ..utils.create_obj_from_config import create_dataloader
 from ..model import BaseModel
 from ..model.tensorflow_model import TensorflowQATModel
@@ -231,11 +232,18 @@ class Quantization(Component):
 
               For this usage, model, calib_dataloader and eval_func parameters are mandatory.
 
+           If tuning.profiling is set, the stages of the tuning are traced to tuning_trace.json
+           in the workspace, which can be opened in chrome://tracing or Perfetto.
+
         Returns:
             quantized model: best qanitized model found, otherwise return None
 
         """
-        return super(Quantization, self).__call__()
+        cfg = self.conf.usr_cfg
+        if not cfg.tuning.profiling:
+            return super(Quantization, self).__call__()
+        with trace(os.path.join(cfg.tuning.workspace.path, 'tuning_trace.json')):
+            return super(Quantization, self).__call__()
 
     fit = __call__
 
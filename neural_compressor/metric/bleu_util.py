@@ -71,11 +71,13 @@ def _get_ngrams_with_counter(segment: Sequence[str],
     return ngram_counts
 
 
-def compute_bleu(reference_corpus: Union[Sequence[str], Sequence[Sequence[str]]], 
-                 translation_corpus: Sequence[str], 
-                 max_order: int = 4,
-                 use_bp: bool = True) -> float:
-    """Compute the BLEU score of translated segments against its references.
+def compute_bleu_stats(reference_corpus: Union[Sequence[str], Sequence[Sequence[str]]],
+                       translation_corpus: Sequence[str],
+                       max_order: int = 4) -> np.ndarray:
+    """Count the clipped n-gram matches and lengths of translated segments.
+
+    The counts of different segments can be summed up, and the sum gives the
+    BLEU score of all the segments with compute_bleu_from_stats.
 
     Args:
         reference_corpus: List of references for each translation. 
@@ -83,19 +85,16 @@ def compute_bleu(reference_corpus: Union[Sequence[str], Sequence[Sequence[str]]]
         translation_corpus: List of translations to score. Each translation
           should be tokenized into a list of tokens.
         max_order: Maximum n-gram order to use when computing BLEU score.
-        use_bp: The flag to decide whether to apply brevity penalty.
 
     Returns:
-        bleu_score: The approximate BLEU score.
+        stats: An int64 array of the matches by order, the possible matches
+          by order, the reference length and the translation length.
     """
     reference_length = 0
     translation_length = 0
-    bp = 1.0
-    geo_mean = 0
 
     matches_by_order = [0] * max_order
     possible_matches_by_order = [0] * max_order
-    precisions = []
 
     for (references, translations) in zip(reference_corpus, translation_corpus):
         reference_length += len(references)
@@ -113,6 +112,30 @@ def compute_bleu(reference_corpus: Union[Sequence[str], Sequence[Sequence[str]]]
             possible_matches_by_order[len(ngram) - 1] += translation_ngram_counts[
                 ngram]
 
+    return np.array(matches_by_order + possible_matches_by_order + \
+                    [reference_length, translation_length], dtype=np.int64)
+
+
+def compute_bleu_from_stats(stats: np.ndarray,
+                            max_order: int = 4,
+                            use_bp: bool = True) -> float:
+    """Compute the BLEU score from the counts of compute_bleu_stats.
+
+    Args:
+        stats: The counts returned by compute_bleu_stats, or the sum of them.
+        max_order: Maximum n-gram order to use when computing BLEU score.
+        use_bp: The flag to decide whether to apply brevity penalty.
+
+    Returns:
+        bleu_score: The approximate BLEU score.
+    """
+    stats = [int(count) for count in stats]
+    matches_by_order = stats[:max_order]
+    possible_matches_by_order = stats[max_order:2 * max_order]
+    reference_length, translation_length = stats[2 * max_order:]
+    bp = 1.0
+    geo_mean = 0
+
     precisions = [0] * max_order
     smooth = 1.0
 
@@ -137,3 +160,24 @@ def compute_bleu(reference_corpus: Union[Sequence[str], Sequence[Sequence[str]]]
         bp = math.exp(1 - 1. / ratio) if ratio < 1.0 else 1.0
     bleu_score = np.float32(geo_mean * bp)
     return bleu_score
+
+
+def compute_bleu(reference_corpus: Union[Sequence[str], Sequence[Sequence[str]]], 
+                 translation_corpus: Sequence[str], 
+                 max_order: int = 4,
+                 use_bp: bool = True) -> float:
+    """Compute the BLEU score of translated segments against its references.
+
+    Args:
+        reference_corpus: List of references for each translation. 
+          Each reference should be tokenized into a list of tokens.
+        translation_corpus: List of translations to score. Each translation
+          should be tokenized into a list of tokens.
+        max_order: Maximum n-gram order to use when computing BLEU score.
+        use_bp: The flag to decide whether to apply brevity penalty.
+
+    Returns:
+        bleu_score: The approximate BLEU score.
+    """
+    stats = compute_bleu_stats(reference_corpus, translation_corpus, max_order)
+    return compute_bleu_from_stats(stats, max_order, use_bp)
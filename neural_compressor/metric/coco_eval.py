@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Incremental COCO box evaluation with numpy.
+
+The evaluation follows the bbox evaluation of pycocotools COCOeval, with the
+accumulation of coco_tools.COCOEvalWrapper. Each image is matched when it is
+added, so only the sorted scores and the true/false positive flags of the
+detections are kept for each category until the metrics are computed.
+
+  evaluator = COCOBoxEvaluator(category_ids)
+  evaluator.add_image(image_id, groundtruth_boxes, groundtruth_classes,
+                      detection_boxes, detection_scores, detection_classes)
+  metrics = evaluator.compute_metrics()
+"""
+
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+AREA_RANGES = np.array([[0 ** 2, 1e5 ** 2], [0 ** 2, 32 ** 2], [32 ** 2, 96 ** 2],
+                        [96 ** 2, 1e5 ** 2]])
+AREA_LABELS = ['all', 'small', 'medium', 'large']
+MAX_DETS = [1, 10, 100]
+
+
+def _to_coco_boxes(boxes):
+    """Convert boxes in [ymin, xmin, ymax, xmax] format to float64 [xmin, ymin, width, height]."""
+    return np.stack([boxes[:, 1], boxes[:, 0], boxes[:, 3] - boxes[:, 1],
+                     boxes[:, 2] - boxes[:, 0]], axis=1).astype(np.float64)
+
+
+def _box_iou(detections, groundtruths):
+    """Compute the IoU between [xmin, ymin, width, height] boxes like pycocotools mask.iou.
+
+    Returns:
+        A numpy array with shape [num_detections, num_groundtruths].
+    """
+    dx, dy, dw, dh = [col[:, None] for col in detections.T]
+    gx, gy, gw, gh = [col[None, :] for col in groundtruths.T]
+    w = np.minimum(dw + dx, gw + gx) - np.maximum(dx, gx)
+    h = np.minimum(dh + dy, gh + gy) - np.maximum(dy, gy)
+    intersection = w * h
+    union = dw * dh + gw * gh - intersection
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where((w > 0) & (h > 0), intersection / union, 0.)
+
+
+def _match(ious, groundtruth_ignore, iou_thrs):
+    """Greedily match the sorted detections to the groundtruths like COCOeval.evaluateImg.
+
+    Args:
+        ious: IoU with shape [num_detections, num_groundtruths], detections sorted by score.
+        groundtruth_ignore: bool array with shape [num_areas, num_groundtruths].
+        iou_thrs: IoU thresholds with shape [num_thrs].
+
+    Returns:
+        A tuple of (matched, matched_ignore), bool arrays with shape
+        [num_areas, num_thrs, num_detections] marking the detections matched to a
+        groundtruth and to an ignored groundtruth.
+    """
+    num_areas, num_gts = groundtruth_ignore.shape
+    num_dets = ious.shape[0]
+    matched = np.zeros((num_areas, len(iou_thrs), num_dets), dtype=bool)
+    matched_ignore = np.zeros_like(matched)
+    if num_dets == 0 or num_gts == 0:
+        return matched, matched_ignore
+
+    # a detection takes the unmatched groundtruth over the threshold that COCOeval
+    # prefers: not ignored first, then the larger IoU, then the later one
+    keys = np.broadcast_arrays(np.arange(num_gts), ious[:, None, :], ~groundtruth_ignore[None])
+    priority = np.argsort(np.lexsort(keys, axis=-1), axis=-1)
+    over_thrs = ious[None, :, :] >= np.minimum(iou_thrs, 1 - 1e-10)[:, None, None]
+    gt_matched = np.zeros((num_areas, len(iou_thrs), 1, num_gts), dtype=bool)
+    next_det = np.zeros((num_areas, len(iou_thrs), 1), dtype=np.int64)
+    # each round matches the next detection having an unmatched groundtruth over the
+    # threshold for all the area ranges and thresholds, so there are at most num_gts rounds
+    for _ in range(min(num_dets, num_gts)):
+        available = over_thrs & ~gt_matched
+        pending = available.any(axis=-1) & (np.arange(num_dets) >= next_det)
+        area_index, thr_index = np.nonzero(pending.any(axis=-1))
+        if len(area_index) == 0:
+            break
+        det = np.argmax(pending[area_index, thr_index], axis=-1)
+        candidates = np.where(available[area_index, thr_index, det],
+                              priority[det, area_index], -1)
+        best = np.argmax(candidates, axis=-1)
+        gt_matched[area_index, thr_index, 0, best] = True
+        next_det[area_index, thr_index, 0] = det + 1
+        matched[area_index, thr_index, det] = True
+        matched_ignore[area_index, thr_index, det] = groundtruth_ignore[area_index, best]
+    return matched, matched_ignore
+
+
+def _accumulate_category(records, iou_thrs, rec_thrs):
+    """Compute the precision and recall of one category like COCOEvalWrapper.accumulate.
+
+    Args:
+        records: the per image records of the category, in the image order.
+        iou_thrs: IoU thresholds with shape [num_thrs].
+        rec_thrs: recall thresholds, [-1] for the area under the PR curve.
+
+    Returns:
+        A tuple of (precision, recall) with shape [num_thrs, num_recalls, num_areas,
+        num_max_dets] and [num_thrs, num_areas, num_max_dets], -1 where there is no
+        groundtruth.
+    """
+    T, R, A, M = len(iou_thrs), len(rec_thrs), len(AREA_RANGES), len(MAX_DETS)
+    precision = -np.ones((T, R, A, M))
+    recall = -np.ones((T, A, M))
+    scores = np.concatenate([record['scores'] for record in records])
+    ranks = np.concatenate([record['ranks'] for record in records])
+    tps = np.concatenate([record['tps'] for record in records], axis=-1)
+    fps = np.concatenate([record['fps'] for record in records], axis=-1)
+    num_positives = np.sum([record['num_positives'] for record in records], axis=0)
+    for m, max_det in enumerate(MAX_DETS):
+        kept = ranks < max_det
+        # mergesort is used to be consistent with COCOeval
+        inds = np.argsort(-scores[kept], kind='mergesort')
+        for a in range(A):
+            npig = int(num_positives[a])
+            if npig == 0:
+                continue
+            tp_sum = np.cumsum(tps[a][:, kept][:, inds], axis=1).astype(dtype=np.float32)
+            fp_sum = np.cumsum(fps[a][:, kept][:, inds], axis=1).astype(dtype=np.float32)
+            nd = tp_sum.shape[1]
+            rc = tp_sum / npig
+            pr = tp_sum / (fp_sum + tp_sum + np.spacing(1))
+            if R == 1:
+                for t in range(T):
+                    t_rc = np.concatenate(([0.], rc[t], [1.]))
+                    t_pr = np.maximum.accumulate(np.concatenate(([0.], pr[t], [0.]))[::-1])[::-1]
+                    change_point = np.where(t_rc[1:] != t_rc[:-1])[0]
+                    precision[t, :, a, m] = np.sum((t_rc[change_point + 1] - t_rc[change_point]) \
+                        * t_pr[change_point + 1])
+            elif nd:
+                # the precision envelope
+                pr = np.maximum.accumulate(pr[:, ::-1], axis=1)[:, ::-1]
+                for t in range(T):
+                    rc_inds = np.searchsorted(rc[t], rec_thrs, side='left')
+                    precision[t, :, a, m] = np.where(rc_inds < nd,
+                                                     pr[t][np.minimum(rc_inds, nd - 1)], 0.)
+            else:
+                precision[:, :, a, m] = 0.
+            if R == 1:
+                # COCOEvalWrapper reads the recall after appending 1 for the area under the PR curve
+                recall[:, a, m] = 1.
+            else:
+                recall[:, a, m] = rc[:, -1] if nd else 0.
+    return precision, recall
+
+
+class COCOBoxEvaluator(object):
+    """Evaluate box detections in COCO metrics, matching each image when it is added.
+
+    The metrics are the same as computed by coco_tools.COCOEvalWrapper without
+    per category metrics, including its quirks: with a float iou_thrs,
+    mAP@.50IOU and mAP@.75IOU are -1, and with map_points 0, the recall is 1
+    for the categories having groundtruths. No groundtruth is a crowd.
+
+    Args:
+        category_ids: the valid class ids, groundtruths and detections with other
+            classes are dropped.
+        iou_thrs: one float IoU threshold or string '0.5:0.05:0.95' for standard COCO thresholds.
+        map_points: 101 for 101-point interpolated AP, 11 for 11-point interpolated AP,
+            0 for area under PR curve.
+    """
+
+    def __init__(self, category_ids, iou_thrs='0.5:0.05:0.95', map_points=101):
+        """Initialize the evaluator."""
+        self.category_ids = sorted(category_ids)
+        self.iou_thrs = np.linspace(.5, 0.95, int(np.round((0.95 - .5) / .05)) + 1, endpoint=True)
+        self.single_iou_thr = isinstance(iou_thrs, float)
+        if self.single_iou_thr:
+            self.iou_thrs = np.array([iou_thrs])
+        self.rec_thrs = np.linspace(.0, 1.00, int(np.round((1.00 - .0) / .01)) + 1, endpoint=True)
+        if map_points == 11:
+            self.rec_thrs = np.linspace(.0, 1.00, int(np.round((1.00 - .0) / .1)) + 1, endpoint=True)
+        elif map_points == 0:
+            self.rec_thrs = np.array([-1.])
+        self.reset()
+
+    def reset(self):
+        """Drop all the added images."""
+        self.num_groundtruths = 0
+        self._records = {category_id: [] for category_id in self.category_ids}
+
+    def add_image(self, image_id, groundtruth_boxes, groundtruth_classes,
+                  detection_boxes, detection_scores, detection_classes):
+        """Match the detections of an image to its groundtruths.
+
+        Args:
+            image_id: a unique image identifier, the images are evaluated in sorted order.
+            groundtruth_boxes: numpy array with shape [num_gt_boxes, 4] in [ymin, xmin, ymax, xmax].
+            groundtruth_classes: numpy array with shape [num_gt_boxes].
+            detection_boxes: numpy array with shape [num_detections, 4] in [ymin, xmin, ymax, xmax].
+            detection_scores: numpy array with shape [num_detections].
+            detection_classes: numpy array with shape [num_detections].
+
+        Raises:
+            ValueError: if the shapes of the arrays are not correct.
+        """
+        if len(groundtruth_classes.shape) != 1:
+            raise ValueError('groundtruth_classes is expected to be of rank 1.')
+        if len(groundtruth_boxes.shape) != 2:
+            raise ValueError('groundtruth_boxes is expected to be of rank 2.')
+        if groundtruth_boxes.shape[1] != 4:
+            raise ValueError('groundtruth_boxes should have shape[1] == 4.')
+        if groundtruth_classes.shape[0] != groundtruth_boxes.shape[0]:
+            raise ValueError(
+                'Corresponding entries in groundtruth_classes, '
+                'and groundtruth_boxes should have '
+                'compatible shapes (i.e., agree on the 0th dimension).'
+                'Classes shape: %d. Boxes shape: %d. Image ID: %s' %
+                (groundtruth_classes.shape[0], groundtruth_boxes.shape[0], image_id))
+        if len(detection_classes.shape) != 1 or len(detection_scores.shape) != 1:
+            raise ValueError('All entries in detection_classes and detection_scores'
+                             'expected to be of rank 1.')
+        if len(detection_boxes.shape) != 2:
+            raise ValueError('All entries in detection_boxes expected to be of rank 2.')
+        if detection_boxes.shape[1] != 4:
+            raise ValueError('All entries in detection_boxes should have shape[1] == 4.')
+        if not detection_classes.shape[0] == detection_boxes.shape[0] == \
+            detection_scores.shape[0]:
+            raise ValueError(
+                'Corresponding entries in detection_classes, '
+                'detection_scores and detection_boxes should have '
+                'compatible shapes (i.e., agree on the 0th dimension). '
+                'Classes shape: %d. Boxes shape: %d. '
+                'Scores shape: %d' %
+                (detection_classes.shape[0], detection_boxes.shape[0],
+                 detection_scores.shape[0]))
+
+        gt_kept = np.isin(groundtruth_classes, self.category_ids)
+        gt_classes = groundtruth_classes[gt_kept].astype(np.int64)
+        gt_boxes = groundtruth_boxes[gt_kept]
+        gt_areas = ((gt_boxes[:, 2] - gt_boxes[:, 0]) * \
+            (gt_boxes[:, 3] - gt_boxes[:, 1])).astype(np.float64)
+        gt_boxes = _to_coco_boxes(gt_boxes)
+        self.num_groundtruths += len(gt_classes)
+
+        det_kept = np.isin(detection_classes, self.category_ids)
+        det_classes = detection_classes[det_kept].astype(np.int64)
+        det_scores = detection_scores[det_kept].astype(np.float64)
+        det_boxes = _to_coco_boxes(detection_boxes[det_kept])
+
+        for category_id in np.unique(np.concatenate([gt_classes, det_classes])):
+            gts = gt_classes == category_id
+            dets = np.nonzero(det_classes == category_id)[0]
+            dets = dets[np.argsort(-det_scores[dets], kind='mergesort')][:MAX_DETS[-1]]
+            boxes = det_boxes[dets]
+            areas = gt_areas[gts]
+            gt_ignore = (areas[None, :] < AREA_RANGES[:, :1]) | (areas[None, :] > AREA_RANGES[:, 1:])
+            matched, matched_ignore = _match(_box_iou(boxes, gt_boxes[gts]), gt_ignore,
+                                             self.iou_thrs)
+            # unmatched detections outside of the area range are ignored
+            det_areas = boxes[:, 2] * boxes[:, 3]
+            det_outside = (det_areas[None, :] < AREA_RANGES[:, :1]) | \
+                (det_areas[None, :] > AREA_RANGES[:, 1:])
+            det_ignore = matched_ignore | (~matched & det_outside[:, None, :])
+            self._records[int(category_id)].append({
+                'image_id': image_id,
+                'scores': det_scores[dets],
+                'ranks': np.arange(len(dets)),
+                'tps': matched & ~det_ignore,
+                'fps': ~matched & ~det_ignore,
+                'num_positives': np.count_nonzero(~gt_ignore, axis=1)})
+
+    def accumulate(self, num_workers=None):
+        """Compute the precision and recall of all the categories.
+
+        Args:
+            num_workers: the number of threads computing the categories, defaults to the cpu count.
+
+        Returns:
+            A tuple of (precision, recall) with shape [num_thrs, num_recalls, num_categories,
+            num_areas, num_max_dets] and [num_thrs, num_categories, num_areas, num_max_dets].
+        """
+        T, R, K, A, M = len(self.iou_thrs), len(self.rec_thrs), len(self.category_ids), \
+            len(AREA_RANGES), len(MAX_DETS)
+        precision = -np.ones((T, R, K, A, M))
+        recall = -np.ones((T, K, A, M))
+        indices = [k for k, category_id in enumerate(self.category_ids) \
+            if self._records[category_id]]
+
+        def accumulate_category(k):
+            records = sorted(self._records[self.category_ids[k]],
+                             key=lambda record: record['image_id'])
+            return _accumulate_category(records, self.iou_thrs, self.rec_thrs)
+
+        num_workers = num_workers or os.cpu_count() or 1
+        if num_workers > 1 and len(indices) > 1:
+            with ThreadPoolExecutor(max_workers=min(num_workers, len(indices))) as executor:
+                results = list(executor.map(accumulate_category, indices))
+        else:
+            results = [accumulate_category(k) for k in indices]
+        for k, (category_precision, category_recall) in zip(indices, results):
+            precision[:, :, k] = category_precision
+            recall[:, k] = category_recall
+        return precision, recall
+
+    def compute_metrics(self, num_workers=None):
+        """Compute the summary metrics like COCOEvalWrapper.ComputeMetrics.
+
+        Args:
+            num_workers: the number of threads computing the categories, defaults to the cpu count.
+
+        Returns:
+            An OrderedDict from 'Precision/mAP', 'Precision/mAP@.50IOU', ...,
+            'Recall/AR@100 (large)' to the metric, -1 if there is no groundtruth.
+        """
+        precision, recall = self.accumulate(num_workers)
+
+        def summarize(ap=1, iou_thr=None, area_rng='all', max_dets=100):
+            aind = [AREA_LABELS.index(area_rng)]
+            mind = [MAX_DETS.index(max_dets)]
+            s = precision if ap == 1 else recall
+            if iou_thr is not None:
+                # COCOEvalWrapper keeps a float iou_thrs in a list, which never equals iou_thr
+                s = s[[] if self.single_iou_thr else np.where(iou_thr == self.iou_thrs)[0]]
+            s = s[:, :, :, aind, mind] if ap == 1 else s[:, :, aind, mind]
+            return -1 if len(s[s > -1]) == 0 else np.mean(s[s > -1])
+
+        return OrderedDict([
+            ('Precision/mAP', summarize(1)),
+            ('Precision/mAP@.50IOU', summarize(1, iou_thr=.5)),
+            ('Precision/mAP@.75IOU', summarize(1, iou_thr=.75)),
+            ('Precision/mAP (small)', summarize(1, area_rng='small')),
+            ('Precision/mAP (medium)', summarize(1, area_rng='medium')),
+            ('Precision/mAP (large)', summarize(1, area_rng='large')),
+            ('Recall/AR@1', summarize(0, max_dets=1)),
+            ('Recall/AR@10', summarize(0, max_dets=10)),
+            ('Recall/AR@100', summarize(0, max_dets=100)),
+            ('Recall/AR@100 (small)', summarize(0, area_rng='small')),
+            ('Recall/AR@100 (medium)', summarize(0, area_rng='medium')),
+            ('Recall/AR@100 (large)', summarize(0, area_rng='large'))
+        ])
@@ -23,7 +23,7 @@ From https://github.com/allenai/bi-att-flow/blob/master/squad/evaluate-v1.1.py
 from collections import Counter, abc
 import string
 import re
-from typing import Any, Callable, Dict, List, TypeVar
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
 from neural_compressor.utils import logger
 
 def normalize_answer(text: str) -> str:
@@ -93,13 +93,45 @@ def metric_max_over_ground_truths(metric_fn: Callable[[T, T], float],
         The max metric. Float point number.
     """
     scores_for_ground_truths = []
-    for ground_truth in ground_truths:
-        prediction_tokens = normalize_answer(prediction).split()
+    prediction_tokens = normalize_answer(prediction).split()
+    # the answers of a question often repeat
+    for ground_truth in set(ground_truths):
         ground_truth_tokens = normalize_answer(ground_truth).split()
         score = metric_fn(prediction_tokens, ground_truth_tokens)
         scores_for_ground_truths.append(score)
     return max(scores_for_ground_truths)
 
+def squad_f1_sum(predictions: Dict[str, str], dataset: List[Dict[str, Any]]) -> Tuple[float, int]:
+    """Sum the F1 scores of the questions in dataset.
+
+    The sums of different parts of a dataset add up to the sum of the dataset,
+    so the F1 score can be accumulated part by part.
+
+    Args:
+        predictions: A dict mapping the id of a question to the predicted answer.
+        dataset: A list instance of articles, see evaluate().
+
+    Returns:
+        A tuple of the sum of F1 scores and the number of questions.
+    """
+    f1 = total = 0
+    for article in dataset:
+        for paragraph in article['paragraphs']:
+            for qa in paragraph['qas']:
+                total += 1
+                if qa['id'] not in predictions:
+                    message = 'Unanswered question ' + qa['id'] + \
+                              ' will receive score 0.'
+                    logger.warning(message)
+                    continue
+
+                ground_truths = list(map(lambda x: x['text'], qa['answers']))
+                prediction = predictions[qa['id']]
+
+                f1 += metric_max_over_ground_truths(
+                    f1_score, prediction, ground_truths)
+    return f1, total
+
 def evaluate(predictions: Dict[str, str], dataset: List[Dict[str, Any]]) -> float:
     """Evaluate the average F1 score of Question-Answering results.
 
@@ -123,22 +155,6 @@ def evaluate(predictions: Dict[str, str], dataset: List[Dict[str, Any]]) -> floa
     Returns:
         The F1 score of this prediction. Float point number in forms of a percentage. 
     """
-    f1 = total = 0
-    for article in dataset:
-        for paragraph in article['paragraphs']:
-            for qa in paragraph['qas']:
-                total += 1
-                if qa['id'] not in predictions:
-                    message = 'Unanswered question ' + qa['id'] + \
-                              ' will receive score 0.'
-                    logger.warning(message)
-                    continue
-
-                ground_truths = list(map(lambda x: x['text'], qa['answers']))
-                prediction = predictions[qa['id']]
-
-                f1 += metric_max_over_ground_truths(
-                    f1_score, prediction, ground_truths)
-
+    f1, total = squad_f1_sum(predictions, dataset)
     f1 = 100.0 * f1 / total
     return f1
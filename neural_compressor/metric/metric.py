@@ -1058,15 +1058,14 @@ class COCOmAPv2(BaseMetric):
             # label: index
             self.category_map_reverse = {v: k for k, v in category_map.items()}
         self.image_ids = []
-        self.ground_truth_list = []
-        self.detection_list = []
-        self.annotation_id = 1
         self.category_map = category_map
         self.category_id_set = set(
             [cat for cat in self.category_map]) #index
         self.iou_thrs = iou_thrs
         self.map_points = map_points
         self.map_key = map_key
+        from .coco_eval import COCOBoxEvaluator
+        self.evaluator = COCOBoxEvaluator(self.category_id_set, iou_thrs, map_points)
 
     def update(self, predicts, labels, sample_weight=None):
         """Add the predictions and labels.
@@ -1076,8 +1075,6 @@ class COCOmAPv2(BaseMetric):
             labels: The labels corresponding to the predictions.
             sample_weight: The sample weight. Defaults to None.
         """
-        from .coco_tools import ExportSingleImageGroundtruthToCoco,\
-            ExportSingleImageDetectionBoxesToCoco
         detections = []
         if 'num_detections' in self.output_index_mapping and \
             self.output_index_mapping['num_detections'] > -1:
@@ -1119,33 +1116,19 @@ class COCOmAPv2(BaseMetric):
                 continue
             self.image_ids.append(image_id)
 
-            ground_truth = {}
-            ground_truth['boxes'] = np.asarray(bboxes[idx])
-            ground_truth['classes'] = np.asarray(labels[idx])
-
-            self.ground_truth_list.extend(
-                ExportSingleImageGroundtruthToCoco(
-                    image_id=image_id,
-                    next_annotation_id=self.annotation_id,
-                    category_id_set=self.category_id_set,
-                    groundtruth_boxes=ground_truth['boxes'],
-                    groundtruth_classes=ground_truth['classes']))
-            self.annotation_id += ground_truth['boxes'].shape[0]
-
-            self.detection_list.extend(
-                ExportSingleImageDetectionBoxesToCoco(
-                    image_id=image_id,
-                    category_id_set=self.category_id_set,
-                    detection_boxes=detections[idx]['boxes'],
-                    detection_scores=detections[idx]['scores'],
-                    detection_classes=detections[idx]['classes']))
+            # match the image now and keep only the per category results
+            self.evaluator.add_image(
+                image_id=image_id,
+                groundtruth_boxes=np.asarray(bboxes[idx]),
+                groundtruth_classes=np.asarray(labels[idx]),
+                detection_boxes=detections[idx]['boxes'],
+                detection_scores=detections[idx]['scores'],
+                detection_classes=detections[idx]['classes'])
 
     def reset(self):
         """Reset the prediction and labels."""
         self.image_ids = []
-        self.ground_truth_list = []
-        self.detection_list = []
-        self.annotation_id = 1
+        self.evaluator.reset()
 
     def result(self):
         """Compute mean average precision.
@@ -1153,33 +1136,11 @@ class COCOmAPv2(BaseMetric):
         Returns:
             The mean average precision score.
         """
-        from .coco_tools import COCOWrapper, COCOEvalWrapper
-        if len(self.ground_truth_list) == 0:
+        if self.evaluator.num_groundtruths == 0:
             logger.warning("Sample num during evaluation is 0.")
             return 0
         else:
-            groundtruth_dict = {
-                'annotations':
-                self.ground_truth_list,
-                'images': [{
-                    'id': image_id
-                } for image_id in self.image_ids],
-                'categories': [{
-                    'id': k,
-                    'name': v
-                } for k, v in self.category_map.items()]
-            }
-            coco_wrapped_groundtruth = COCOWrapper(groundtruth_dict)
-            coco_wrapped_detections = coco_wrapped_groundtruth.LoadAnnotations(
-                self.detection_list)
-            box_evaluator = COCOEvalWrapper(coco_wrapped_groundtruth,
-                                                 coco_wrapped_detections,
-                                                 agnostic_mode=False,
-                                                 iou_thrs = self.iou_thrs,
-                                                 map_points = self.map_points)
-            box_metrics, box_per_category_ap = box_evaluator.ComputeMetrics(
-                include_metrics_per_category=False, all_metrics_per_category=False)
-            box_metrics.update(box_per_category_ap)
+            box_metrics = self.evaluator.compute_metrics()
             box_metrics = {
                 'DetectionBoxes_' + key: value
                 for key, value in iter(box_metrics.items())
@@ -1407,8 +1368,9 @@ class SquadF1(BaseMetric):
     """Evaluate for v1.1 of the SQuAD dataset."""
     
     def __init__(self):
-        """Initialize the score list."""
-        self._score_list = [] # squad metric only work when all data preds collected
+        """Initialize the F1 score sum."""
+        self._f1_sum = 0.
+        self._num_questions = 0
         
     def update(self, preds, labels, sample_weight=None):
         """Add the predictions and labels.
@@ -1419,28 +1381,25 @@ class SquadF1(BaseMetric):
             sample_weight: The sample weight.
         """
         if preds:
-            from .evaluate_squad import evaluate
-            if getattr(self, '_hvd', None) is not None:
-                gathered_preds_list = self._hvd.allgather_object(preds)
-                gathered_labels_list = self._hvd.allgather_object(labels)
-                temp_preds_list, temp_labels_list = [], []
-                for i in range(0, self._hvd.size()):
-                    temp_preds_list += gathered_preds_list[i]
-                    temp_labels_list += gathered_labels_list[i]
-                preds = temp_preds_list
-                labels = temp_labels_list
-            result = evaluate(labels, preds)
-            self._score_list.append(result["f1"])
+            from .f1 import squad_f1_sum
+            f1_sum, num_questions = squad_f1_sum(preds, labels)
+            self._f1_sum += f1_sum
+            self._num_questions += num_questions
             
     def reset(self):
-         """Reset the score list."""
-         self._score_list = []
+         """Reset the F1 score sum."""
+         self._f1_sum = 0.
+         self._num_questions = 0
         
     def result(self):
         """Compute F1 score."""
-        if len(self._score_list) == 0:
+        f1_sum, num_questions = self._f1_sum, self._num_questions
+        if getattr(self, '_hvd', None) is not None:
+            f1_sum = sum(self._hvd.allgather_object(f1_sum))
+            num_questions = sum(self._hvd.allgather_object(num_questions))
+        if num_questions == 0:
             return 0.
-        return np.array(self._score_list).mean()
+        return 100.0 * f1_sum / num_questions
     
 @metric_registry('mIOU', 'tensorflow, tensorflow_itex')
 class mIOU(BaseMetric):
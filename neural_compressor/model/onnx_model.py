@@ -24,7 +24,6 @@ from neural_compressor.utils.utility import LazyImport
 from neural_compressor.model.base_model import BaseModel
 
 onnx = LazyImport('onnx')
-ort = LazyImport("onnxruntime")
 ortq = LazyImport("neural_compressor.adaptor.ox_utils.util")
 
 logger = logging.getLogger("neural_compressor")
@@ -42,7 +41,8 @@ class ONNXModel(BaseModel):
         self._model_path = None if not isinstance(model, str) else model
         self._large_size = False
         try:
-            ort.InferenceSession(self._model.SerializeToString())
+            # only serializing the model tells whether it exceeds 2GB, no session is needed for it
+            self._model.SerializeToString()
         except Exception as e:  # pragma: no cover
             if 'Message onnx.ModelProto exceeds maximum protobuf size of 2GB' in str(e):
                 self._large_size = True
@@ -458,16 +458,19 @@ class ONNXModel(BaseModel):
 
     def get_nodes_chain(self, start_node, stop_node, result_chain=[]):
         """Get nodes chain with given start node and stop node."""
+        name_to_node = {node.name: node for node in self.model.graph.node}
+        visited = set(result_chain)
         while start_node:
             node_name = start_node.popleft()
             if node_name in stop_node:
                 continue
-            if node_name not in result_chain:
+            if node_name not in visited:
+                visited.add(node_name)
                 result_chain.append(node_name)
             else:
                 continue
 
-            node = ortq.find_by_name(node_name, list(self.model.graph.node))
+            node = name_to_node.get(node_name)
             for parent in self.get_parents(node):
                 start_node.append(parent.name)
 
@@ -0,0 +1,337 @@
+"""Physical compaction of structured-pruned PyTorch models."""
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from neural_compressor.utils.utility import LazyImport
+torch = LazyImport('torch')
+from .logger import logger
+
+# ops applied to each channel independently, so channels can be removed across them.
+# LayerNorm/GroupNorm mix the channels (mean and variance), the channels they normalize are never removed.
+CHANNELWISE_MODULES = ["ReLU", "ReLU6", "GELU", "SiLU", "Sigmoid", "Tanh", "LeakyReLU", "Hardswish", "ELU",
+                       "Dropout", "Identity"]
+CHANNELWISE_FUNCTIONS = ["relu", "relu_", "relu6", "gelu", "silu", "sigmoid", "tanh", "leaky_relu", "hardswish",
+                         "elu", "dropout"]
+
+
+class ChannelGroup:
+    """Layers sharing one channel dimension.
+
+    The output channels of the producer are passed through channel-wise ops to the input channels of the consumers.
+
+    Args:
+        producer: The name of the nn.Linear/nn.Conv2d producing the channels.
+        consumers: A list of names of the nn.Linear/nn.Conv2d consuming the channels.
+        ops: A list of torch.fx nodes of the channel-wise ops in between, or None if they are unknown
+            (then they are assumed to map zero to zero).
+        norms: A list of names of the BatchNorm2d among ops.
+    """
+
+    def __init__(self, producer, consumers, ops=None, norms=[]):
+        """Initialize."""
+        self.producer = producer
+        self.consumers = consumers
+        self.ops = ops
+        self.norms = norms
+
+
+def _is_prunable_layer(module):
+    """Check if the channels of a module can be compacted."""
+    if isinstance(module, torch.nn.Linear):
+        return True
+    return isinstance(module, torch.nn.Conv2d) and module.groups == 1
+
+
+def _is_channelwise(node, modules, producer):
+    """Check if a torch.fx node applies a channel-wise op to its first input."""
+    if len(node.args) == 0 or any(isinstance(arg, torch.fx.Node) for arg in node.args[1:]) or \
+            any(isinstance(arg, torch.fx.Node) for arg in node.kwargs.values()):
+        return False
+    if node.op == "call_module":
+        module = modules[node.target]
+        if type(module).__name__ in CHANNELWISE_MODULES:
+            return True
+        return isinstance(module, torch.nn.BatchNorm2d) and isinstance(producer, torch.nn.Conv2d)
+    if node.op == "call_function":
+        return getattr(node.target, "__name__", "") in CHANNELWISE_FUNCTIONS
+    if node.op == "call_method":
+        return node.target in CHANNELWISE_FUNCTIONS
+    return False
+
+
+def get_channel_groups(model):
+    """Find the layers sharing channel dimensions in the torch.fx graph of a model.
+
+    Args:
+        model: A torch.nn.Module which can be traced by torch.fx.
+
+    Returns:
+        A list of ChannelGroup.
+    """
+    graph = torch.fx.symbolic_trace(model).graph
+    modules = dict(model.named_modules())
+    # layers called more than once are shared by several channel dimensions
+    call_cnts = {}
+    for node in graph.nodes:
+        if node.op == "call_module":
+            call_cnts[node.target] = call_cnts.get(node.target, 0) + 1
+
+    groups = []
+    for node in graph.nodes:
+        if node.op != "call_module" or not _is_prunable_layer(modules[node.target]) or call_cnts[node.target] > 1:
+            continue
+        producer = modules[node.target]
+        ops = []
+        output = node
+        while len(output.users) == 1:
+            user = next(iter(output.users))
+            if user.args[0] is not output or not _is_channelwise(user, modules, producer) or \
+                    (user.op == "call_module" and call_cnts[user.target] > 1 and
+                     isinstance(modules[user.target], torch.nn.BatchNorm2d)):
+                break
+            ops.append(user)
+            output = user
+        consumers = list(output.users)
+        if len(consumers) == 0 or not all(
+                consumer.op == "call_module" and consumer.args[0] is output and len(consumer.args) == 1 and
+                call_cnts[consumer.target] == 1 and _is_prunable_layer(modules[consumer.target]) and
+                type(modules[consumer.target]) == type(producer) for consumer in consumers):
+            continue
+        norms = [op.target for op in ops if op.op == "call_module" and
+                 isinstance(modules[op.target], torch.nn.BatchNorm2d)]
+        groups.append(ChannelGroup(node.target, [consumer.target for consumer in consumers], ops, norms))
+    return groups
+
+
+def _get_zero_preserving_channels(group, modules, num_channels, conv):
+    """Check which channels stay zero through the channel-wise ops of a group."""
+    data = torch.zeros([1, num_channels, 1, 1] if conv else [1, num_channels])
+    if group.ops is None:
+        return torch.ones(num_channels, dtype=torch.bool)
+    chain_modules = [modules[op.target] for op in group.ops if op.op == "call_module"]
+    training = [module.training for module in chain_modules]
+    try:
+        for module in chain_modules:
+            module.eval()
+        with torch.no_grad():
+            for op in group.ops:
+                if op.op == "call_module":
+                    data = modules[op.target](data)
+                elif op.op == "call_function":
+                    data = op.target(data, *op.args[1:], **op.kwargs)
+                else:
+                    data = getattr(data, op.target)(*op.args[1:], **op.kwargs)
+    finally:
+        for module, mode in zip(chain_modules, training):
+            module.train(mode)
+    return data.reshape(num_channels) == 0
+
+
+def _get_removable_channels(group, modules):
+    """Obtain the channels of a group which can be removed without changing the model's outputs.
+
+    A channel is removable if the consumers do not use it (their weights of the channel are all zero), or if the
+    producer outputs zero for it (all-zero weights and bias) and the channel-wise ops keep it zero.
+    """
+    producer = modules[group.producer]
+    weight = producer.weight.detach()
+    conv = isinstance(producer, torch.nn.Conv2d)
+    zero_outputs = (weight.reshape(weight.shape[0], -1) == 0).all(dim=1)
+    if producer.bias is not None:
+        zero_outputs &= producer.bias.detach() == 0
+    if zero_outputs.any():
+        zero_outputs &= _get_zero_preserving_channels(group, modules, weight.shape[0], conv)
+    unused_inputs = torch.ones(weight.shape[0], dtype=torch.bool)
+    for name in group.consumers:
+        consumer_weight = modules[name].weight.detach().transpose(0, 1)
+        unused_inputs &= (consumer_weight.reshape(consumer_weight.shape[0], -1) == 0).all(dim=1)
+    return zero_outputs | unused_inputs
+
+
+def _slice_parameter(module, name, index, dim=0):
+    """Keep the entries of a parameter or buffer at index along dim."""
+    tensor = getattr(module, name)
+    if tensor is None:
+        return
+    data = tensor.data.index_select(dim, index.to(tensor.device)).clone()
+    if isinstance(tensor, torch.nn.Parameter):
+        setattr(module, name, torch.nn.Parameter(data, requires_grad=tensor.requires_grad))
+    else:
+        setattr(module, name, data)
+
+
+def prune_output_channels(module, index):
+    """Keep the output channels of a nn.Linear, nn.Conv2d or nn.BatchNorm2d at index."""
+    _slice_parameter(module, "weight", index)
+    _slice_parameter(module, "bias", index)
+    if isinstance(module, torch.nn.Linear):
+        module.out_features = len(index)
+    elif isinstance(module, torch.nn.Conv2d):
+        module.out_channels = len(index)
+    else:
+        _slice_parameter(module, "running_mean", index)
+        _slice_parameter(module, "running_var", index)
+        module.num_features = len(index)
+
+
+def prune_input_channels(module, index):
+    """Keep the input channels of a nn.Linear or nn.Conv2d at index."""
+    _slice_parameter(module, "weight", index, dim=1)
+    if isinstance(module, torch.nn.Linear):
+        module.in_features = len(index)
+    else:
+        module.in_channels = len(index)
+
+
+def _is_attention(module):
+    """Check if a module is a BERT-like (HuggingFace transformers) attention supporting prune_heads."""
+    self_attention = getattr(module, "self", None)
+    output = getattr(module, "output", None)
+    return hasattr(module, "prune_heads") and \
+        all(hasattr(self_attention, attr) for attr in ["value", "num_attention_heads", "attention_head_size"]) and \
+        isinstance(getattr(output, "dense", None), torch.nn.Linear)
+
+
+def _get_removable_heads(module):
+    """Obtain the heads whose outputs are all zero (value) or unused (output dense) in the current numbering."""
+    num_heads = module.self.num_attention_heads
+    head_size = module.self.attention_head_size
+    value = module.self.value
+    value_weight = value.weight.detach().reshape(num_heads, -1)
+    zero_values = (value_weight == 0).all(dim=1)
+    if value.bias is not None:
+        zero_values &= (value.bias.detach().reshape(num_heads, head_size) == 0).all(dim=1)
+    dense_weight = module.output.dense.weight.detach()
+    unused = (dense_weight.reshape(dense_weight.shape[0], num_heads, head_size) == 0).all(dim=2).all(dim=0)
+    return [head for head in range(num_heads) if zero_values[head] or unused[head]]
+
+
+def compact_model(model, layer_pairs=None):
+    """Physically remove the pruned channels and attention heads of a model.
+
+    After structured pruning (e.g. channelx1, 1xchannel or Nx1 patterns), the masks only zero weights. This function
+    removes the output channels of nn.Linear/nn.Conv2d layers which are all-zero or not used by the consuming layers,
+    together with the related input channels of the consumers and BatchNorm2d statistics, and the attention heads of
+    BERT-like attentions (by their prune_heads) whose values are all-zero or not used. The model's outputs do not
+    change. Channels normalized by LayerNorm/GroupNorm are kept since the removal would change the statistics.
+
+    Args:
+        model: A torch.nn.Module, compacted in place.
+        layer_pairs: A list of (producer_name, consumer_name) for layers that torch.fx can not find,
+            e.g. the FFN of transformers models. The outputs of the producer must be used only by the consumer,
+            through activations mapping zero to zero.
+
+    Returns:
+        A dict {"channels": {"producer_name": (original channels, kept channels)},
+            "heads": {"attention_name": [removed heads]}}.
+    """
+    modules = dict(model.named_modules())
+    summary = {"channels": {}, "heads": {}}
+    attentions = [name for name, module in modules.items() if _is_attention(module)]
+    with torch.no_grad():
+        for name in attentions:
+            module = modules[name]
+            heads = _get_removable_heads(module)
+            if len(heads) == module.self.num_attention_heads:
+                heads = heads[1:]  ##keep the layers valid
+            if len(heads) == 0:
+                continue
+            # prune_heads takes the heads' indices before any pruning
+            pruned_heads = getattr(module, "pruned_heads", set())
+            orig_heads = [head for head in range(module.self.num_attention_heads + len(pruned_heads))
+                          if head not in pruned_heads]
+            module.prune_heads([orig_heads[head] for head in heads])
+            summary["heads"][name] = heads
+            logger.info(f"Compact {name}: remove {len(heads)} heads")
+
+    groups = []
+    try:
+        groups = get_channel_groups(model)
+    except Exception as e:
+        logger.warning(f"The model can not be traced by torch.fx ({e}), "
+                       f"only attention heads and layer_pairs are compacted.")
+    found = set(group.producer for group in groups)
+    for producer, consumer in (layer_pairs or []):
+        if producer not in found:
+            groups.append(ChannelGroup(producer, [consumer]))
+    # the layers inside attentions are compacted by heads
+    prefixes = tuple(name + "." for name in attentions)
+    groups = [group for group in groups if not any(
+        name.startswith(prefixes) for name in [group.producer] + group.consumers)]
+
+    with torch.no_grad():
+        for group in groups:
+            removable = _get_removable_channels(group, modules)
+            num_channels = removable.numel()
+            if not removable.any():
+                continue
+            if removable.all():
+                removable[0] = False  ##keep the layers valid
+            index = torch.nonzero(~removable).flatten()
+            prune_output_channels(modules[group.producer], index)
+            for name in group.norms:
+                prune_output_channels(modules[name], index)
+            for name in group.consumers:
+                prune_input_channels(modules[name], index)
+            summary["channels"][group.producer] = (num_channels, len(index))
+            logger.info(f"Compact {group.producer}: {num_channels} -> {len(index)} channels")
+    return summary
+
+
+def get_model_size(model):
+    """Get the size of the parameters and buffers of a model in bytes."""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+
+def benchmark_compaction(model, compacted_model, b_dataloader, config=None):
+    """Measure the latency and memory gains of a compacted model with the Benchmark API.
+
+    Both models are benchmarked in performance mode in the current process.
+
+    Args:
+        model: The torch.nn.Module before compaction.
+        compacted_model: The torch.nn.Module after compaction.
+        b_dataloader: The dataloader for benchmarking.
+        config: A BenchmarkConfig, warmup 5 and iteration 20 by default.
+
+    Returns:
+        A dict {"dense": {...}, "compacted": {...}} with the latency (seconds per sample), throughput
+            (samples per second) and model_size (bytes) of each model, and the speedup and memory_reduction.
+    """
+    from ..config import BenchmarkConfig
+    from ..conf.pythonic_config import Config
+    from ..experimental import Benchmark
+
+    if config is None:
+        config = BenchmarkConfig(warmup=5, iteration=20)
+    results = {}
+    for name, user_model in [("dense", model), ("compacted", compacted_model)]:
+        benchmarker = Benchmark(Config(benchmark=config))
+        benchmarker.model = user_model
+        benchmarker.b_dataloader = b_dataloader
+        benchmarker.run_instance('performance')
+        _, batch_size, result_list = benchmarker.results['performance']
+        latency = np.array(result_list).mean() / batch_size
+        results[name] = {"latency": latency, "throughput": 1. / latency, "model_size": get_model_size(user_model)}
+    results["speedup"] = results["dense"]["latency"] / results["compacted"]["latency"]
+    results["memory_reduction"] = 1. - float(results["compacted"]["model_size"]) / results["dense"]["model_size"]
+    logger.info("Compaction: speedup {:.3f}x, model size {:.3f} MB -> {:.3f} MB".format(
+        results["speedup"], results["dense"]["model_size"] / 2 ** 20, results["compacted"]["model_size"] / 2 ** 20))
+    return results
@@ -73,6 +73,11 @@ def get_pattern(config, modules):
 
 SparsityInfo = namedtuple("SparsityInfo", ['zero_cnt', 'total_cnt', 'sparsity_ratio'])
 
+# bins of the merged histogram in one refinement round of the approximate global threshold
+THRESHOLD_HISTOGRAM_BINS = 1024
+# scores histogrammed at once, keeps the float32 bin counts of torch.histogram exact
+THRESHOLD_HISTOGRAM_CHUNK = 1 << 22
+
 
 class BasePattern:
     """Pruning Pattern.
@@ -96,6 +101,9 @@ class BasePattern:
         max_sparsity_ratio_per_op: A float representing the maximum sparsity that one layer could reach.
         min_sparsity_ratio_per_op: A float representing the minimum sparsity that one layer could reach.
         target_sparsity: A float representing the sparsity ratio of the modules after pruning.
+        global_threshold_type: "exact" or "approximate", how the common threshold of global pruning is selected.
+        global_threshold_error: A float, in approximate mode the number of pruned units may differ from
+            the exact selection by at most this ratio of all units.
     """
 
     def __init__(self, config, modules):
@@ -109,6 +117,8 @@ class BasePattern:
         self.max_sparsity_ratio_per_op = self.config['max_sparsity_ratio_per_op']
         self.min_sparsity_ratio_per_op = self.config['min_sparsity_ratio_per_op']
         self.target_sparsity_ratio = self.config['target_sparsity']
+        self.global_threshold_type = self.config.get('global_threshold_type', "exact")
+        self.global_threshold_error = self.config.get('global_threshold_error', 0.001)
         # Not using deterministic_algorithms for all examples
         torch.use_deterministic_algorithms(False)
 
@@ -256,6 +266,67 @@ class BasePattern:
         """Obtain the unpruned weights and reshape according to the block_size."""
         raise NotImplementedError
 
+    def get_init_masks(self, modules):
+        """Generate the initial all-ones masks of the modules.
+
+        Args:
+            modules: A dict{"layer_name": Tensor} that stores weights.
+
+        Returns:
+            A dict with the identical size as modules, containing the masks.
+        """
+        masks = {}
+        for key in modules.keys():
+            weight = modules[key].weight
+            masks[key] = torch.ones(weight.shape, device=weight.device)
+        return masks
+
+    def get_full_masks(self, masks):
+        """Obtain masks with the identical size as the weights, e.g. for elementwise (progressive) updates.
+
+        Args:
+            masks: A dict{"layer_name": Tensor} that stores the masks.
+
+        Returns:
+            A dict{"layer_name": Tensor} of new float masks with the weights' shapes.
+        """
+        return {key: masks[key].float().clone() for key in masks.keys()}
+
+    def mask_weight(self, weight, mask, key):
+        """Apply a mask to a weight in place.
+
+        Args:
+            weight: The weight tensor of the layer.
+            mask: The mask of the layer.
+            key: The layer name.
+        """
+        weight.mul_(mask)
+
+    def get_zero_cnt(self, mask, key):
+        """Count the pruned and total units (elements or blocks, depending on the pattern) of a mask.
+
+        Args:
+            mask: The mask of the layer.
+            key: The layer name.
+
+        Returns:
+            Two integers, the zero cnt and the total cnt.
+        """
+        reduced_mask = self.get_reduced_masks_from_data(mask, key)
+        return int(torch.sum(reduced_mask == 0.0).data.item()), int(reduced_mask.numel())
+
+    def count_masked_elements(self, mask, key):
+        """Count the weight elements a mask sets to zero.
+
+        Args:
+            mask: The mask of the layer.
+            key: The layer name.
+
+        Returns:
+            An integer.
+        """
+        return int(torch.sum(mask == 0).data.item())
+
     def update_residual_cnt(self, masks, target_sparsity_ratio):
         """Update the number of parameters yet to be pruned.
         
@@ -291,9 +362,7 @@ class BasePattern:
         for key in masks.keys():
             if key in self.invalid_layers:
                 continue
-            reduced_mask = self.get_reduced_masks_from_data(masks[key], key)
-            zero_cnt = (int(torch.sum(reduced_mask == 0.0).data.item()))
-            total_cnt = int(reduced_mask.numel())
+            zero_cnt, total_cnt = self.get_zero_cnt(masks[key], key)
             sparsity_ratio = float(zero_cnt) / total_cnt
             val = SparsityInfo(zero_cnt, total_cnt, sparsity_ratio)
             infos[key] = val
@@ -371,6 +440,73 @@ class BasePattern:
             adjust_sparsity_ratio = new_sparsity_ratio
             return True, adjust_sparsity_ratio
 
+    def get_global_threshold(self, scores, k, max_cnts=None):
+        """Select a threshold such that about k scores of all layers are not greater than it.
+
+        The scores are never concatenated. Histograms of the candidate range are computed per layer (chunk by
+        chunk, on the device of the scores), merged and refined on the bin containing the k-th score, until at most global_threshold_error of
+        all scores are left in that bin. Layers reaching their maximum sparsity are handled in closed form:
+        layer i contributes at most max_cnts[i] scores to the counts, so no re-thresholding is needed after
+        clamping them.
+
+        Args:
+            scores: A list of Tensors, the scores of each layer.
+            k: An integer, the number of scores to be selected.
+            max_cnts: A list of integers, the maximum number of selected scores in each layer, or None.
+
+        Returns:
+            A float. The number of (clamped) scores not greater than it differs from k by at most
+                global_threshold_error * (the number of all scores), up to ties of the k-th score.
+        """
+        if max_cnts is None:
+            max_cnts = [score.numel() for score in scores]
+        max_cnts = torch.tensor(max_cnts, dtype=torch.int64)
+        dtype = torch.float64 if any(score.dtype == torch.float64 for score in scores) else torch.float32
+        error_cnt = int(self.global_threshold_error * sum(score.numel() for score in scores))
+        # the k-th score is in [lo, hi) ([lo, hi] if hi_inclusive), lo_cnts are the scores < lo of each layer
+        lo = min(score.min().to(dtype).item() for score in scores)
+        hi = max(score.max().to(dtype).item() for score in scores)
+        hi_inclusive = True
+        lo_cnts = torch.zeros(len(scores), dtype=torch.int64)
+        lo_cnt, hi_cnt = 0, int(max_cnts.sum())
+        while lo < hi and hi_cnt - lo_cnt > error_cnt:
+            edges = torch.linspace(lo, hi, THRESHOLD_HISTOGRAM_BINS + 1, dtype=dtype)
+            layer_cnts = []
+            for idx, score in enumerate(scores):
+                ##the histogram is built on the device of the scores, only the bin counts are moved to the host
+                device_edges = edges.to(score.device)
+                hist = torch.zeros(THRESHOLD_HISTOGRAM_BINS, dtype=torch.int64, device=score.device)
+                for chunk in torch.flatten(score).split(THRESHOLD_HISTOGRAM_CHUNK):
+                    chunk = chunk.to(dtype)
+                    if lo_cnts.sum() > 0 or not hi_inclusive:
+                        chunk = chunk[(chunk >= lo) & ((chunk <= hi) if hi_inclusive else (chunk < hi))]
+                    ##bins are [e_i, e_i+1) except for the last one [e_i, hi], binned against the same edges
+                    ##that the next round refines on (torch.histc interpolates and may shift values on an edge)
+                    bin_ids = torch.bucketize(chunk, device_edges, right=True) - 1
+                    hist += torch.bincount(bin_ids.clamp_(0, THRESHOLD_HISTOGRAM_BINS - 1),
+                                           minlength=THRESHOLD_HISTOGRAM_BINS)
+                hist = hist.cpu()
+                layer_cnts.append(torch.cat([lo_cnts[idx:idx + 1], lo_cnts[idx] + torch.cumsum(hist, dim=0)]))
+            layer_cnts = torch.stack(layer_cnts)  # scores < edge (<= hi for the last edge), [layers, bins + 1]
+            cnts = torch.minimum(layer_cnts, max_cnts[:, None]).sum(0)
+            if cnts[-1] < k:
+                break
+            bin_idx = int(torch.searchsorted(cnts, k))
+            new_lo, new_hi = edges[bin_idx - 1].item(), edges[bin_idx].item()
+            # a bin of zero width (float resolution) holds the scores equal to its edge
+            new_hi_inclusive = (hi_inclusive and bin_idx == THRESHOLD_HISTOGRAM_BINS) or new_lo == new_hi
+            if (new_lo, new_hi, new_hi_inclusive) == (lo, hi, hi_inclusive):  ##no finer resolution
+                break
+            lo, hi, hi_inclusive = new_lo, new_hi, new_hi_inclusive
+            lo_cnts = layer_cnts[:, bin_idx - 1]
+            lo_cnt, hi_cnt = int(cnts[bin_idx - 1]), int(cnts[bin_idx])
+        neg_inf = torch.tensor(float("-inf"), dtype=dtype)
+        if k - lo_cnt < hi_cnt - k:
+            return torch.nextafter(torch.tensor(lo, dtype=dtype), neg_inf).item()
+        if hi_inclusive:
+            return hi
+        return torch.nextafter(torch.tensor(hi, dtype=dtype), neg_inf).item()
+
 
 @register_pattern('NxM')
 class PatternNxM(BasePattern):
@@ -378,6 +514,8 @@ class PatternNxM(BasePattern):
     
     A Pattern class derived from BasePattern. In this pattern, the weights in a NxM block will be pruned or kept
     during one pruning step.
+    The masks of valid layers are stored at block granularity, i.e. as bool tensors of shape [s1/N, s2/M]
+    of the two-dimensional weight view, and applied to the weights in place.
     
     Args:
         config: A config dict object that contains the pattern information.
@@ -401,6 +539,8 @@ class PatternNxM(BasePattern):
         else:
             self.block_size = [int(pattern.split('x')[0]), int(pattern.split('x')[1])]
         self.total_params_cnt = -1
+        # layer_name -> (mask, mask version, zero_cnt, total_cnt) of the last counted mask
+        self.zero_cnts = {}
 
         self.block_size = self.get_block_size_dict()
         self.check_layer_validity()
@@ -456,6 +596,8 @@ class PatternNxM(BasePattern):
             The unpruned weights.
         """
         assert key not in self.invalid_layers
+        if self.is_block_mask(data, key):
+            return data != 0
         block_size = self.block_size[key]
         data = self._reshape_orig_to_2dims(data)
         shape = data.shape
@@ -465,6 +607,130 @@ class PatternNxM(BasePattern):
         reduced_mask = data != 0
         return reduced_mask
 
+    def get_block_mask_shape(self, key):
+        """Get the shape [s1/N, s2/M] of a layer's block-wise mask.
+
+        Args:
+            key: The layer name.
+
+        Returns:
+            A tuple of two integers.
+        """
+        shape = self.modules[key].weight.shape
+        rows, cols = shape[0], shape[1:].numel()
+        block_size = self.block_size[key]
+        return (rows // block_size[0], cols // block_size[1])
+
+    def is_block_mask(self, mask, key):
+        """Check if a mask is stored at block granularity.
+
+        Args:
+            mask: The mask of the layer.
+            key: The layer name.
+
+        Returns:
+            A bool.
+        """
+        return key not in self.invalid_layers and tuple(mask.shape) == self.get_block_mask_shape(key)
+
+    def get_init_masks(self, modules):
+        """Generate the initial all-ones masks, block-wise for valid layers.
+
+        Args:
+            modules: A dict{"layer_name": Tensor} that stores weights.
+
+        Returns:
+            A dict{"layer_name": Tensor} containing the masks.
+        """
+        masks = {}
+        for key in modules.keys():
+            weight = modules[key].weight
+            if key in self.invalid_layers:
+                masks[key] = torch.ones(weight.shape, device=weight.device)
+            else:
+                masks[key] = torch.ones(self.get_block_mask_shape(key), dtype=torch.bool, device=weight.device)
+        return masks
+
+    def get_full_masks(self, masks):
+        """Expand block-wise masks to float masks with the weights' shapes.
+
+        Args:
+            masks: A dict{"layer_name": Tensor} that stores the masks.
+
+        Returns:
+            A dict{"layer_name": Tensor} of new float masks with the weights' shapes.
+        """
+        full_masks = {}
+        for key in masks.keys():
+            mask = masks[key]
+            if self.is_block_mask(mask, key):
+                full_masks[key] = self.reshape_reduced_to_orig(mask.float(), key, self.modules[key].weight.shape)
+            else:
+                full_masks[key] = mask.float().clone()
+        return full_masks
+
+    def mask_weight(self, weight, mask, key):
+        """Apply a mask to a weight in place.
+
+        Block-wise masks are broadcast over a [s1/N, N, s2/M, M] view of the weight, so no full-size mask is built.
+
+        Args:
+            weight: The weight tensor of the layer.
+            mask: The mask of the layer.
+            key: The layer name.
+        """
+        if not self.is_block_mask(mask, key):
+            weight.mul_(mask)
+            return
+        block_size = self.block_size[key]
+        pruned = mask == 0
+        shape = weight.shape
+        if weight.is_contiguous() and len(shape) == 2:
+            weight.view(shape[0] // block_size[0], block_size[0], shape[1] // block_size[1], block_size[1]) \
+                .masked_fill_(pruned[:, None, :, None], 0)
+        elif weight.is_contiguous() and len(shape) == 4 and shape[1] % block_size[1] == 0:
+            ##blocks of the cout,k,k,cin view, see _reshape_orig_to_2dims
+            pruned = pruned.reshape(pruned.shape[0], shape[2], shape[3], shape[1] // block_size[1])
+            pruned = pruned.permute(0, 3, 1, 2)
+            weight.view(shape[0] // block_size[0], block_size[0], shape[1] // block_size[1], block_size[1],
+                        shape[2], shape[3]).masked_fill_(pruned[:, None, :, None], 0)
+        else:
+            weight.masked_fill_(self.reshape_reduced_to_orig(pruned, key, shape), 0)
+
+    def get_zero_cnt(self, mask, key):
+        """Count the pruned and total blocks of a mask.
+
+        The counts are kept until the mask is replaced or modified in place, so unchanged layers are not recounted.
+
+        Args:
+            mask: The mask of the layer.
+            key: The layer name.
+
+        Returns:
+            Two integers, the zero cnt and the total cnt.
+        """
+        cnt = self.zero_cnts.get(key)
+        if cnt is not None and cnt[0] is mask and cnt[1] == mask._version:
+            return cnt[2], cnt[3]
+        zero_cnt, total_cnt = super(PatternNxM, self).get_zero_cnt(mask, key)
+        self.zero_cnts[key] = (mask, mask._version, zero_cnt, total_cnt)
+        return zero_cnt, total_cnt
+
+    def count_masked_elements(self, mask, key):
+        """Count the weight elements a mask sets to zero.
+
+        Args:
+            mask: The mask of the layer.
+            key: The layer name.
+
+        Returns:
+            An integer.
+        """
+        if not self.is_block_mask(mask, key):
+            return super(PatternNxM, self).count_masked_elements(mask, key)
+        block_size = self.block_size[key]
+        return self.get_zero_cnt(mask, key)[0] * block_size[0] * block_size[1]
+
     def get_sparsity_ratio(self, pre_masks, return_dict=False):
         """Please note that the zero cnt and total cnt are all block_wise for supporting channel-wise pruning.
 
@@ -480,9 +746,9 @@ class PatternNxM(BasePattern):
         for key in pre_masks.keys():
             if key in self.invalid_layers:
                 continue
-            reduced_mask = self.get_reduced_masks_from_data(pre_masks[key], key)
-            zero_cnt += (int(torch.sum(reduced_mask == 0.0).data.item()))
-            total_cnt += int(reduced_mask.numel())
+            layer_zero_cnt, layer_total_cnt = self.get_zero_cnt(pre_masks[key], key)
+            zero_cnt += layer_zero_cnt
+            total_cnt += layer_total_cnt
         if total_cnt == 0:
             sparsity_ratio = 0.0
         else:
@@ -601,12 +867,8 @@ class PatternNxM(BasePattern):
         return new_scores
 
     def get_mask_per_threshold(self, score, threshold, block_size):
-        """Get the mask per threshold."""
-        zero = torch.tensor([0.]).to(score.device)
-        one = torch.tensor([1.]).to(score.device)
-        mask = torch.where(score <= threshold, zero, one)
-        mask = mask.repeat_interleave(block_size[0], dim=0).repeat_interleave(block_size[1], dim=-1)
-        return mask
+        """Get the block-wise mask per threshold."""
+        return score > threshold
 
     def get_masks_global(self, scores, cur_target_sparsity_ratio, pre_masks,
                          keep_exact_sparsity_ratio=True):
@@ -623,8 +885,8 @@ class PatternNxM(BasePattern):
             keep_pre_masks: A bool representing if the masks should remain unchanged.
             
         Returns:
-            A dict with the identical size as pre_masks and its 0/1 values are updated. 
-                1 means unpruned and 0 means pruned.
+            A dict with the identical keys as pre_masks and its block-wise bool masks are updated.
+                True means unpruned and False means pruned.
         """
         ##keep the masks if the layer exceed max sparsity ratio
 
@@ -634,6 +896,10 @@ class PatternNxM(BasePattern):
         if k_blockwise <= 0:
             return masks
         new_scores = self.reduce_scores(scores)
+        if self.global_threshold_type == "approximate":
+            masks = self.get_masks_global_approximate(new_scores, k_blockwise, masks)
+            self.log_layer_sparsity(masks)
+            return masks
         global_scores = torch.cat([torch.flatten(v) for v in new_scores.values()])
         residual_k = k_blockwise
         not_exceed_layers = [key for key in new_scores.keys()]
@@ -646,9 +912,7 @@ class PatternNxM(BasePattern):
                 block_size = self.block_size[key]
                 score = new_scores[key]
                 mask = self.get_mask_per_threshold(score, threshold, block_size)
-                info = self.get_sparsity_ratio({key: mask}, return_dict=True)
-                zero_cnt = info["zero_cnt"]
-                total_cnt = info["total_cnt"]
+                zero_cnt, total_cnt = self.get_zero_cnt(mask, key)
                 current_sparsity_ratio = float(zero_cnt) / total_cnt
                 key_new_sparsity = SparsityInfo(zero_cnt, total_cnt, current_sparsity_ratio)
                 need_adjust, adjust_ratio = self.adjust_ratio(masks, key, key_new_sparsity,
@@ -658,10 +922,9 @@ class PatternNxM(BasePattern):
                 if need_adjust:
                     # uptade status
                     self.keep_mask_layers[key] = True
-                    masks[key] = self.get_single_mask_per_target_ratio(new_scores[key], adjust_ratio)
-                    masks[key] = masks[key].repeat_interleave(block_size[0], 0).repeat_interleave(block_size[1], -1)
+                    masks[key] = self.get_single_mask_per_target_ratio(new_scores[key], adjust_ratio) != 0
                     if keep_exact_sparsity_ratio:
-                        zero_cnt = self.get_sparsity_ratio({key: masks[key]}, return_dict=True)["zero_cnt"]
+                        zero_cnt = self.get_zero_cnt(masks[key], key)[0]
                         residual_k -= zero_cnt
                 else:
                     masks[key] = mask
@@ -673,38 +936,65 @@ class PatternNxM(BasePattern):
             not_exceed_layers = new_not_exceed_layers
             global_scores = torch.cat([torch.flatten(new_scores[key]) for key in not_exceed_layers])
 
+        self.log_layer_sparsity(masks)
+        return masks
+
+    def get_masks_global_approximate(self, new_scores, k_blockwise, masks):
+        """Generate masks for layers with one approximate common threshold, see get_global_threshold.
+
+        Args:
+            new_scores: A dict{"layer_name": Tensor} that stores the reduced scores of the layers to be pruned.
+            k_blockwise: An integer representing the number of blocks to be pruned in these layers.
+            masks: A dict{"layer_name": Tensor} that stores the masks generated at the last pruning step.
+
+        Returns:
+            A dict with the identical keys as masks and the masks of the layers in new_scores updated.
+        """
+        keys = list(new_scores.keys())
+        max_cnts = [int(new_scores[key].numel() * self.max_sparsity_ratio_per_op) for key in keys]
+        threshold = self.get_global_threshold([new_scores[key] for key in keys], k_blockwise, max_cnts)
+        for key in keys:
+            mask = self.get_mask_per_threshold(new_scores[key], threshold, self.block_size[key])
+            zero_cnt, total_cnt = self.get_zero_cnt(mask, key)
+            key_new_sparsity = SparsityInfo(zero_cnt, total_cnt, float(zero_cnt) / total_cnt)
+            need_adjust, adjust_ratio = self.adjust_ratio(masks, key, key_new_sparsity,
+                                                          self.max_sparsity_ratio_per_op,
+                                                          self.min_sparsity_ratio_per_op,
+                                                          self.target_sparsity_ratio)
+            if need_adjust:
+                # the layer is clamped to its maximum sparsity, which the threshold already accounts for
+                self.keep_mask_layers[key] = True
+                masks[key] = self.get_single_mask_per_target_ratio(new_scores[key], adjust_ratio) != 0
+            else:
+                masks[key] = mask
+        return masks
+
+    def log_layer_sparsity(self, masks):
+        """Log the sparsity ratio of each layer."""
         for key in masks.keys():
             if key in self.invalid_layers:
                 continue
-            if len(scores[key].shape) == 4:  ## need to permute
-                mask = masks[key]
-                orig_shape = scores[key].shape
-                mask = self._reshape_2dims_to_orig(mask, orig_shape)
-                masks[key] = mask
-            layer_ratio = torch.sum(masks[key] == 0.0).data.item() / masks[key].numel()
+            zero_cnt, total_cnt = self.get_zero_cnt(masks[key], key)
+            layer_ratio = float(zero_cnt) / total_cnt
             logger.info(f'layer {key} sparsity_ratio is {layer_ratio}')
-        return masks
 
     def get_pattern_lock_masks(self, modules):
-        """Obtain masks from original weight map by masking the zero-valued weights.
+        """Obtain block-wise masks from original weight map by masking the zero-valued blocks.
         
         Args:
             modules: A dict{"layer_name": Tensor} that stores weights.
             
         Returns:
-            A dict with the identical size as modules, containing pattern lock masks.
+            A dict with the identical keys as modules, containing pattern lock masks.
         """
         pattern_lock_masks = {}
         for key in modules.keys():
             weight = modules[key].weight
-            ori_shape = weight.shape
             if key in self.invalid_layers:
                 mask = torch.ones(weight.shape, device=weight.device)
                 pattern_lock_masks[key] = mask
                 continue
-            reduced_mask = self.get_reduced_masks_from_data(weight, key)
-            mask = self.reshape_reduced_to_orig(reduced_mask, key, ori_shape)
-            pattern_lock_masks[key] = mask
+            pattern_lock_masks[key] = self.get_reduced_masks_from_data(weight, key)
         return pattern_lock_masks
 
     # ---------------progressive related--------------------
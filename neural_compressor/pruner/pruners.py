@@ -15,7 +15,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 from neural_compressor.utils.utility import LazyImport
 
 torch = LazyImport('torch')
@@ -137,14 +136,14 @@ class BasePruner:
             self.total_prune_cnt = 1
             self.completed_pruned_cnt = 1
 
-        for key in self.modules.keys():
-            module = self.modules[key]
-            self.masks[key] = torch.ones(module.weight.shape).to(module.weight.device)  ##TODO support bias or others
-
         self.target_sparsity_ratio = self.config['target_sparsity']
         self.current_sparsity_ratio = 0.0
         self.init_sparsity_ratio = 0.0
         self._init()
+        if not self.masks:
+            for key in self.modules.keys():
+                module = self.modules[key]
+                self.masks[key] = torch.ones(module.weight.shape).to(module.weight.device)  ##TODO support bias or others
 
     def _init(self):
         """Auxiliary function for initializing."""
@@ -157,17 +156,14 @@ class BasePruner:
     def mask_weights(self):
         """Apply masks to corresponding modules' weights.
         
-        Weights are multipled with masks. This is the formal pruning process.
+        Weights are multipled with masks in place. This is the formal pruning process.
         """
-        with torch.no_grad():
-            for key in self.modules.keys():
-                module = self.modules[key]
-                module.weight.data = module.weight.data * self.masks[key]
+        self.mask_weights_general(self.masks)
 
     def mask_weights_general(self, input_masks):
         """Apply input masks to corresponding modules' weights.
         
-        Weights are multipled with input_masks. 
+        Weights are multipled with input_masks in place, see the pattern's mask_weight.
 
         Args:
             input_masks: A dict {"module_name": Tensor} that stores the masks for modules' weights.
@@ -175,7 +171,7 @@ class BasePruner:
         with torch.no_grad():
             for key in self.modules.keys():
                 module = self.modules[key]
-                module.weight.data = module.weight.data * input_masks[key]
+                self.pattern.mask_weight(module.weight.data, input_masks[key], key)
 
     def on_step_begin(self, local_step):
         """Implement at the start of each step."""
@@ -269,6 +265,7 @@ class BasicPruner(BasePruner):
     def _init(self):
         """Auxiliary function for initializing."""
         self.pattern = get_pattern(self.config, self.modules)
+        self.masks = self.pattern.get_init_masks(self.modules)
         self.scheduler = get_scheduler(self.config)
         self.criterion = get_criterion(self.config, self.modules)
         self.reg = get_reg(self.config, self.modules, self.pattern)
@@ -395,6 +392,7 @@ class ProgressivePruner(BasicPruner):
     def _init(self):
         """Auxiliary function for initialization."""
         self.pattern = get_pattern(self.config, self.modules)
+        self.masks = self.pattern.get_init_masks(self.modules)
         self.scheduler = get_scheduler(self.config)
         self.criterion = get_criterion(self.config, self.modules)
         self.reg = get_reg(self.config, self.modules, self.pattern)
@@ -435,8 +433,9 @@ class ProgressivePruner(BasicPruner):
             logger.info(f"Progressive type: {self.progressive_type}")
             logger.info(f"Progressive balance: {self.use_global}")
             self.check_progressive_validity()
-            self.pre_masks = copy.deepcopy(self.masks)
-            self.progressive_masks = copy.deepcopy(self.masks)
+            # progressive masks are elementwise, keep them with the weights' shapes
+            self.pre_masks = self.pattern.get_full_masks(self.masks)
+            self.progressive_masks = self.pattern.get_full_masks(self.masks)
             if self.pruning_frequency < self.progressive_steps:  ##TODO trick
                 self.progressive_steps = self.pruning_frequency
                 # if self.progressive_steps == 3:
@@ -509,14 +508,14 @@ class ProgressivePruner(BasicPruner):
             step_offset = self.global_step - self.structured_update_step
             progressive_idx = step_offset // self.pruning_frequency_progressive
             if progressive_idx < (self.progressive_steps - 1):
-                self.progressive_masks = self.pattern.update_progressive_masks(self.pre_masks, self.masks, \
+                self.progressive_masks = self.pattern.update_progressive_masks(self.pre_masks, \
+                                                                               self.pattern.get_full_masks(self.masks), \
                                                                                self.criterion.scores, \
                                                                                progressive_idx + 1, \
                                                                                self.progressive_configs)
             else:
                 # in the end, directly use new masks.
-                for n in self.masks.keys():
-                    self.progressive_masks[n] = self.masks[n].clone()
+                self.progressive_masks = self.pattern.get_full_masks(self.masks)
             self.mask_weights_general(self.progressive_masks)
             if self.progressive_logger:
                 self.print_progressive_sparsity()
@@ -533,11 +532,11 @@ class ProgressivePruner(BasicPruner):
         self.completed_pruned_cnt += 1
         if self.criterion.scores == {}:
             return
-        for n in self.masks.keys():
-            self.pre_masks[n] = self.masks[n].clone()
+        self.pre_masks = self.pattern.get_full_masks(self.masks)
         # update new masks
         self.masks = self.pattern.get_masks(self.criterion.scores, current_target_sparsity_ratio, self.masks, )
-        self.progressive_masks = self.pattern.update_progressive_masks(self.pre_masks, self.masks, \
+        self.progressive_masks = self.pattern.update_progressive_masks(self.pre_masks, \
+                                                                       self.pattern.get_full_masks(self.masks), \
                                                                        self.criterion.scores, 1, \
                                                                        self.progressive_configs)
         self.mask_weights_general(self.progressive_masks)
@@ -51,6 +51,10 @@ def check_config(prune_config):
         "pruning_frequency should be greater than 0"
     assert prune_config['pruning_scope'] == "global" or prune_config['pruning_scope'] == "local", \
         "only support 'global' and 'local' prune domain"
+    assert prune_config['global_threshold_type'] in ["exact", "approximate"], \
+        "only support 'exact' and 'approximate' global threshold"
+    assert prune_config['global_threshold_error'] >= 0 and prune_config['global_threshold_error'] < 1, \
+        "global_threshold_error should be in range [0,1)"
     try:
         prune_config['resume_from_pruned_checkpoint'] = bool(prune_config['resume_from_pruned_checkpoint'])
     except:
@@ -243,7 +247,8 @@ def process_and_check_config(val):
                              'pruning_op_types': ['Conv', 'Linear'],
                              }
     default_local_config = {'resume_from_pruned_checkpoint': False, 'reg_type': None,
-                            'criterion_reduce_type': "mean", 'parameters': {"reg_coeff": 0.0}}
+                            'criterion_reduce_type': "mean", 'global_threshold_type': "exact",
+                            'global_threshold_error': 0.001, 'parameters': {"reg_coeff": 0.0}}
 
     params_default_config = {"reg_coeff": 0.0}
 
@@ -24,13 +24,16 @@ from .strategy import strategy_registry, TuneStrategy
 from ..utils import logger
 
 from .utils.tuning_sampler import OpTypeWiseTuningSampler, FallbackTuningSampler, ModelWiseTuningSampler
-from .utils.tuning_structs import OpTuningConfig
+from .utils.tuning_structs import OpTuningConfig, TuningCfgOverlay
 from .utils.tuning_space import TUNING_ITEMS_LST
 
 @strategy_registry
 class BasicTuneStrategy(TuneStrategy):
     """The basic tuning strategy."""
 
+    # the trial of the group fallback search: None, 'group' or 'kept'
+    _group_fallback_trial = None
+
     def next_tune_cfg(self):
         """Generate and yield the next tuning config with below order.
         
@@ -38,6 +41,9 @@ class BasicTuneStrategy(TuneStrategy):
             2. Fallback OP One by One
             3. Fallback Multiple OPs Accumulated
 
+        With the 'group' fallback_mode of the strategy, the stages 2 and 3 are replaced by a group
+        testing search, see _group_fallback_tune_cfg().
+
         Yields:
             tune_config (dict): A dict containing the tuning configuration for quantization.
         """
@@ -65,8 +71,9 @@ class BasicTuneStrategy(TuneStrategy):
             # Fallback the ops supported both static and dynamic from static to dynamic
             # Tuning items: None
             if self.cfg.quantization.approach == 'post_training_auto_quant':
+                dynamic_items = set(tuning_space.query_items_by_quant_mode('dynamic'))
                 static_dynamic_items = [item for item in tuning_space.query_items_by_quant_mode('static') if
-                                        item in tuning_space.query_items_by_quant_mode('dynamic')]
+                                        item in dynamic_items]
                 if static_dynamic_items:
                     logger.info("Fallback all ops that support both dynamic and static to dynamic.")
                 else:
@@ -84,10 +91,22 @@ class BasicTuneStrategy(TuneStrategy):
             for target_dtype in ['bf16', 'fp32']:
                 target_type_lst = set(tuning_space.query_items_by_quant_mode(target_dtype))
                 fallback_items_lst = [item for item in quant_ops if item in target_type_lst]
+                fallback_items_name_lst = [item.name for item in fallback_items_lst][::-1] # from bottom to up
+                if self.cfg.tuning.strategy.fallback_mode == 'group':
+                    if not fallback_items_name_lst:
+                        continue
+                    fallback_items_name_lst = self._sort_by_sensitivity(fallback_items_name_lst,
+                                                                        best_op_tuning_cfg_stage1)
+                    group_fallback_sampler = self._group_fallback_tune_cfg(best_op_tuning_cfg_stage1,
+                                                                           fallback_items_name_lst,
+                                                                           target_dtype)
+                    for op_tuning_cfg in group_fallback_sampler:
+                        op_tuning_cfg['calib_sampling_size'] = calib_sampling_size
+                        yield op_tuning_cfg
+                    continue
                 if fallback_items_lst:
                     logger.info(f"Start to fallback op to {target_dtype} one by one.")
                     self._fallback_started()
-                fallback_items_name_lst = [item.name for item in fallback_items_lst][::-1] # from bottom to up
                 op_dtypes = OrderedDict(zip(fallback_items_name_lst, [target_dtype] * len(fallback_items_name_lst)))
                 initial_op_tuning_cfg = deepcopy(best_op_tuning_cfg_stage1)
                 fallback_sampler = FallbackTuningSampler(tuning_space, tuning_order_lst=[],
@@ -116,6 +135,113 @@ class BasicTuneStrategy(TuneStrategy):
                         op_tuning_cfg['calib_sampling_size'] = calib_sampling_size
                         yield op_tuning_cfg
                         
+    def _sort_by_sensitivity(self, op_names, op_tuning_cfg):
+        """Sort the ops by the sensitivity from the adaptor as the prior of group testing.
+
+        The sensitivity is measured on a few batches without evaluating, the most sensitive op comes
+        first. The order is kept if the adaptor does not support it.
+
+        Args:
+            op_names: list of (op_name, op_type).
+            op_tuning_cfg: the tuning config of the ops.
+
+        Returns:
+            The sorted list of (op_name, op_type).
+        """
+        if not hasattr(self.adaptor, 'calculate_op_sensitivity'):
+            return op_names
+        confidence_batches = self.cfg.tuning.strategy.confidence_batches \
+            if self.cfg.tuning.strategy.confidence_batches != None else 2
+        try:
+            ops_lst = self.adaptor.calculate_op_sensitivity(self.model,
+                                                            self.calib_dataloader,
+                                                            copy.deepcopy(self._tune_cfg_converter(op_tuning_cfg)),
+                                                            self.adaptor.get_output_op_names(self.cur_best_qmodel),
+                                                            confidence_batches,
+                                                            fallback=True)
+        except Exception as e: # pragma: no cover
+            logger.warning(f"Fail to calculate the op sensitivity due to {e}, keep the fallback order.")
+            return op_names
+        order = {op_info: index for index, op_info in enumerate(ops_lst)}
+        return sorted(op_names, key=lambda op_info: order.get(op_info, len(order)))
+
+    def _group_fallback_tune_cfg(self, initial_op_tuning_cfg, op_names, target_dtype):
+        """Find the ops to fallback by group testing.
+
+        Instead of a trial for each op, the groups of ops are fallen back together. When all ops
+        fallen back meet the accuracy requirements, the shortest prefix of the ordered ops meeting
+        them is found by bisection, its last op is kept fallen back and the ops before it are
+        searched again until the kept ops alone meet the requirements. Finding k ops out of N takes
+        about k * (log2(N) + 1) trials. The tuning is not stopped by a group meeting the requirements,
+        the last trial is the one of the kept ops if they meet them.
+
+        Args:
+            initial_op_tuning_cfg: the tuning config to fallback the ops from.
+            op_names: list of (op_name, op_type) to fallback, the more likely ones first.
+            target_dtype: the data type to fallback to.
+
+        Yields:
+            tune_config (dict): A dict containing the tuning configuration for quantization.
+        """
+        def _fallback_cfg(fallback_ops):
+            new_op_tuning_cfg = TuningCfgOverlay(initial_op_tuning_cfg)
+            for op_name_type in fallback_ops:
+                new_op_tuning_cfg[op_name_type] = OpTuningConfig(op_name_type[0], op_name_type[1],
+                                                                 target_dtype, self.tuning_space)
+            return new_op_tuning_cfg
+
+        logger.info(f"Start to fallback ops to {target_dtype} by group.")
+        self._fallback_started()
+        kept_ops, candidates = [], list(op_names)
+        self._group_fallback_trial = 'group'
+        yield _fallback_cfg(candidates)
+        if not self.objectives.compare(self.last_tune_result, self.baseline):
+            logger.info(f"*** Fallback all ops to {target_dtype} does not meet the accuracy requirements.")
+            self._group_fallback_trial = None
+            return
+        while candidates:
+            # kept_ops + candidates[:high] meet the requirements, kept_ops + candidates[:low] do not
+            low, high = 0, len(candidates)
+            while high - low > 1:
+                mid = (low + high) // 2
+                self._group_fallback_trial = 'group'
+                yield _fallback_cfg(kept_ops + candidates[:mid])
+                if self.objectives.compare(self.last_tune_result, self.baseline):
+                    high = mid
+                else:
+                    low = mid
+            kept_ops.append(candidates[high - 1])
+            candidates = candidates[:high - 1]
+            logger.info(f"*** Keep {kept_ops[-1]} fallen back to {target_dtype}, " + \
+                        f"{len(kept_ops)} ops are kept fallen back.")
+            self._group_fallback_trial = 'kept'
+            yield _fallback_cfg(kept_ops)
+        self._group_fallback_trial = None
+
+    def stop(self, timeout, trials_count):
+        """Check if need to stop traverse.
+
+        During the group fallback search, a group meeting the accuracy requirements does not stop
+        the tuning, the kept ops meeting them do and become the best model. The performance_only
+        and max_trials exit policies apply as usual.
+
+        Returns:
+            bool: True if need stop, otherwise False
+        """
+        need_stop = super().stop(timeout, trials_count)
+        if self._group_fallback_trial is None:
+            return need_stop
+        if self._group_fallback_trial == 'kept' and \
+            self.objectives.compare(self.last_tune_result, self.baseline):
+            self.best_tune_result = self.last_tune_result
+            self.best_qmodel = self.last_qmodel
+            logger.debug(f"*** Update the best qmodel with the kept ops fallen back.")
+            return True
+        if self.cfg.tuning.exit_policy.performance_only or \
+            trials_count >= self.cfg.tuning.exit_policy.max_trials:
+            return need_stop
+        return False
+
     def _initial_dynamic_cfg_based_on_static_cfg(self, op_static_cfg:OpTuningConfig):
         op_state = op_static_cfg.get_state()
         op_name = op_static_cfg.op_name
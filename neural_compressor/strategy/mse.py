@@ -92,16 +92,17 @@ class MSETuneStrategy(TuneStrategy):
         for (op_name, op_type) in list(op_list):
             op_mapping[op_name] = (op_name, op_type)
         current_best_tune_cfg = self._tune_cfg_converter(self.cur_best_tuning_cfg)
+        # the dumps are read lazily side by side, so each one has its own directory
         fp32_dump_content = self.adaptor.inspect_tensor(fp32_model, 
             self.calib_dataloader, op_name_lst, [1], inspect_type='activation', 
-            save_to_disk=True, save_path="./nc_workspace/", 
+            save_to_disk=True, save_path="./nc_workspace/fp32/", 
             quantization_cfg=current_best_tune_cfg)
         fp32_tensor_dict = fp32_dump_content['activation'][0]
         best_qmodel = self.q_model = self.adaptor.quantize(current_best_tune_cfg, self.model, \
                                                            self.calib_dataloader, self.q_func)
         quant_dump_content = self.adaptor.inspect_tensor(best_qmodel, 
             self.calib_dataloader, op_name_lst, [1], inspect_type='activation',
-            save_to_disk=True, save_path="./nc_workspace/", 
+            save_to_disk=True, save_path="./nc_workspace/quan/", 
             quantization_cfg=current_best_tune_cfg)
         dequantize_tensor_dict = quant_dump_content['activation'][0]
         ops_mse = {
@@ -141,17 +142,16 @@ class MSETuneStrategy(TuneStrategy):
                 yield op_tuning_cfg
 
             # Fallback the ops supported both static and dynamic from static to dynamic
+            dynamic_items = set(tuning_space.query_items_by_quant_mode('dynamic'))
             static_dynamic_items = [item for item in tuning_space.query_items_by_quant_mode('static') if
-                                    item in tuning_space.query_items_by_quant_mode('dynamic')]
+                                    item in dynamic_items]
             if static_dynamic_items:
                 logger.info("Fallback all ops that support both dynamic and static to dynamic.")
             else:
                 logger.info("No op support both dynamic and static")
 
             def dynamic_op_tuning_cfg_from_static(op_tuning_cfg: OpTuningConfig):
-                new_op_tuning_cfg = deepcopy(op_tuning_cfg)
-                new_op_tuning_cfg.op_quant_mode = 'dynamic'
-                return new_op_tuning_cfg
+                return op_tuning_cfg._replace(op_quant_mode='dynamic')
 
             new_op_tuning_cfg = deepcopy(self.cur_best_tuning_cfg)
             for item in static_dynamic_items:
@@ -163,8 +163,8 @@ class MSETuneStrategy(TuneStrategy):
 
             # Fallback to float point datatypes ('bf16' or 'fp32')
             for target_dtype in ['bf16', 'fp32']:
-                fallback_items_lst = [item for item in int8_ops if
-                                    item in tuning_space.query_items_by_quant_mode(target_dtype)]
+                target_type_lst = set(tuning_space.query_items_by_quant_mode(target_dtype))
+                fallback_items_lst = [item for item in int8_ops if item in target_type_lst]
                 if fallback_items_lst:
                     logger.info(f"Start to fallback op to {target_dtype} one by one.")
                 # Replace it with sorted items list
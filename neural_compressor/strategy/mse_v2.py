@@ -105,17 +105,16 @@ class MSE_V2TuneStrategy(TuneStrategy):
                 yield op_tuning_cfg
 
             # Fallback the ops supported both static and dynamic from static to dynamic
+            dynamic_items = set(tuning_space.query_items_by_quant_mode('dynamic'))
             static_dynamic_items = [item for item in tuning_space.query_items_by_quant_mode('static') if
-                                    item in tuning_space.query_items_by_quant_mode('dynamic')]
+                                    item in dynamic_items]
             if static_dynamic_items:
                 logger.info("Fallback all ops that support both dynamic and static to dynamic.")
             else:
                 logger.info("No op support both dynamic and static")
 
             def dynamic_op_tuning_cfg_from_static(op_tuning_cfg: OpTuningConfig):
-                new_op_tuning_cfg = deepcopy(op_tuning_cfg)
-                new_op_tuning_cfg.op_quant_mode = 'dynamic'
-                return new_op_tuning_cfg
+                return op_tuning_cfg._replace(op_quant_mode='dynamic')
 
             new_op_tuning_cfg = deepcopy(self.cur_best_tuning_cfg)
             for item in static_dynamic_items:
@@ -24,6 +24,7 @@ import math
 import copy
 import pickle
 from collections import OrderedDict, defaultdict
+from contextlib import ExitStack
 from pathlib import Path
 import yaml
 import numpy as np
@@ -37,6 +38,7 @@ from ..utils.utility import fault_tolerant_file, equal_dicts, GLOBAL_STATE, MODE
 from ..utils.create_obj_from_config import create_eval_func, create_train_func
 from ..utils import logger
 from ..utils import OPTIONS
+from ..utils.tracing import span, traced, traced_iter
 from ..version import __version__
 from ..conf.dotdict import DotDict, deep_get, deep_set
 from ..algorithm import AlgorithmScheduler
@@ -150,9 +152,11 @@ class TuneStrategy(object):
         self.cur_best_qmodel = None   # track quantized model with the current best accuracy
         self.re_quant = False
 
-        self.capability = self.adaptor.query_fw_capability(model)
+        with span('query_fw_capability', 'strategy'):
+            self.capability = self.adaptor.query_fw_capability(model)
         logger.debug(self.capability)
-        self.set_tuning_space(conf)
+        with span('set_tuning_space', 'strategy'):
+            self.set_tuning_space(conf)
 
         self.algo = AlgorithmScheduler(self.cfg.quantization.recipes)
         self.algo.dataloader = self.calib_dataloader  # reuse the calibration iteration
@@ -184,6 +188,7 @@ class TuneStrategy(object):
         raise NotImplementedError
 
 
+    @traced('traverse', 'strategy')
     def traverse(self):
         """Traverse the tuning space.
         
@@ -211,22 +216,28 @@ class TuneStrategy(object):
 
         trials_count = 0
         traverse_start_time = time()
-        for op_tuning_cfg in self.next_tune_cfg():
+        # the trial spans are entered and closed in the loop to keep its body flat
+        trial_spans = ExitStack()
+        for op_tuning_cfg in traced_iter(self.next_tune_cfg(), 'next_tune_cfg', 'strategy'):
+            trial_span = trial_spans.enter_context(span('trial', 'strategy', trial=trials_count + 1))
             tuning_start_time = time()
-            tune_cfg = self._tune_cfg_converter(op_tuning_cfg)
+            with span('tune_cfg_converter', 'strategy'):
+                tune_cfg = self._tune_cfg_converter(op_tuning_cfg)
             trials_count += 1
             tuning_history = self._find_tuning_history(tune_cfg)
             if tuning_history and trials_count < self.cfg.tuning.exit_policy.max_trials:
                 self.last_tune_result = tuning_history['last_tune_result']
                 self.best_tune_result = tuning_history['best_tune_result']
                 logger.warn("Find evaluated tuning config, skip.")
+                trial_spans.close()
                 continue
             logger.debug("Dump current tuning configuration:")
             logger.debug(tune_cfg)
 
             self.tuning_times += 1
-            self.q_model = self.adaptor.quantize(
-                copy.deepcopy(tune_cfg), self.model, self.calib_dataloader, self.q_func)
+            with span('quantize', 'strategy', ops=len(tune_cfg['op'])):
+                self.q_model = self.adaptor.quantize(
+                    copy.deepcopy(tune_cfg), self.model, self.calib_dataloader, self.q_func)
             self.algo.calib_iter = tune_cfg['calib_iteration']
             self.algo.q_model = self.q_model
             # TODO align the api to let strategy has access to pre_optimized model
@@ -234,19 +245,20 @@ class TuneStrategy(object):
             self.algo.origin_model = self.adaptor.pre_optimized_model
             if self.cfg.quantization.recipes.fast_bias_correction:
                 self.algo.algorithms[0].quantization_cfg = tune_cfg
-            self.last_qmodel = self.algo()
+            with span('algorithm', 'strategy'):
+                self.last_qmodel = self.algo()
             assert self.last_qmodel
             self.last_tune_result = self._evaluate(self.last_qmodel)
             self.cur_best_acc, self.cur_best_tuning_cfg = self.update_best_op_tuning_cfg(op_tuning_cfg)
             need_stop = self.stop(self.cfg.tuning.exit_policy.timeout, trials_count)
 
-            # record the tuning history
-            saved_tune_cfg = copy.deepcopy(tune_cfg)
-            saved_last_tune_result = copy.deepcopy(self.last_tune_result)
-            self._add_tuning_history(saved_tune_cfg,
-                                    saved_last_tune_result,
-                                    q_config=self.q_model.q_config)
-            self.tune_result_record.append(copy.deepcopy(self.last_tune_result))
+            # record the tuning history, tune_cfg is built for the trial and not changed afterwards
+            with span('tuning_history', 'strategy'):
+                saved_last_tune_result = copy.deepcopy(self.last_tune_result)
+                self._add_tuning_history(tune_cfg,
+                                        saved_last_tune_result,
+                                        q_config=self.q_model.q_config)
+                self.tune_result_record.append(copy.deepcopy(self.last_tune_result))
             self.tune_cfg = tune_cfg
             now_time = time()
             acc_res_msg = ""
@@ -257,9 +269,13 @@ class TuneStrategy(object):
             logger.debug(f"*** The accuracy of last tuning is: {acc_res_msg}")
             logger.debug(f"*** The perfomance of last tuning is: {performace_res_msg}")
             logger.debug(f"*** The last tuning time: {(now_time - tuning_start_time):.2f} s")
+            if trial_span.children:
+                logger.debug("*** The last tuning time by stage: " + ", ".join(
+                    f"{name} {duration:.2f} s" for name, duration in trial_span.children.items()))
             logger.debug(f"*** The tuning process lasted time: {(now_time - traverse_start_time):.2f} s")
             
             self._dump_tuning_process_statistics()
+            trial_spans.close()
             if need_stop:
                 if self.re_quant:
                     logger.info("*** Do not stop the tuning process, re-quantize the ops.")
@@ -299,6 +315,7 @@ class TuneStrategy(object):
             self._optype_statistics[optype][dtype] += 1
         return
 
+    @traced('dump_tuning_process_statistics', 'strategy')
     def _dump_tuning_process_statistics(self):
         self._update_optype_statistics()
         
@@ -500,7 +517,8 @@ class TuneStrategy(object):
             'op': self.capability['opwise']
         }
         self.tuning_space = TuningSpace(adaptor_cap, conf=conf, framework=self.framework)
-        logger.debug(self.tuning_space.root_item.get_details())
+        if logger.level == logger.DEBUG:
+            logger.debug(self.tuning_space.root_item.get_details())
 
     def setup_resume(self, resume):
         """Resume the best quantized model from tuning history.
@@ -754,6 +772,7 @@ class TuneStrategy(object):
         """
         return self._evaluate(self.model)
 
+    @traced('evaluate', 'strategy')
     def _evaluate(self, model):
         """Interface of evaluating model.
 
@@ -981,9 +1000,12 @@ class TuneStrategy(object):
     def _save(self):
         """Save current tuning state to snapshot for resuming."""
         logger.info("Save tuning history to {}.".format(self.history_path))
-        with fault_tolerant_file(self.history_path) as f:
-            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with span('save', 'strategy') as save_span:
+            with fault_tolerant_file(self.history_path) as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+                save_span.add('bytes', f.tell())
 
+    @traced('find_tuning_history', 'strategy')
     def _find_tuning_history(self, tune_cfg):
         """Check if the specified tune_cfg is evaluated or not on same yaml config.
 
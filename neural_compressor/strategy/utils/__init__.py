@@ -18,5 +18,5 @@
 """Intel Neural Compressor Strategy Utils."""
 
 from .tuning_sampler import TuningSampler, OpWiseTuningSampler, OpTypeWiseTuningSampler, FallbackTuningSampler
-from .tuning_structs import OpTuningConfig
+from .tuning_structs import OpTuningConfig, TuningCfgOverlay
 from .tuning_space import TuningItem, TuningSpace
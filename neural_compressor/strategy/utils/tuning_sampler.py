@@ -18,11 +18,10 @@
 """Tuning sampler."""
 
 from itertools import product
-import copy
 from collections import deque, OrderedDict, defaultdict
 from typing import List, Dict, Any
 from .tuning_space import TuningSpace
-from .tuning_structs import OpTuningConfig
+from .tuning_structs import OpTuningConfig, TuningCfgOverlay
 from ...utils import logger
 
 TUNING_ITEM_PRIORITY = [('activation','scheme'), ('activation','algorithm'),('activation','granularity'), 
@@ -114,7 +113,7 @@ class ModelWiseTuningSampler(TuningSampler):
         keys = self.tuning_items.keys()
         for vals in product(*self.tuning_items.values()):
             # traverse all possible combinations by model-wise level
-            tune_cfg = copy.deepcopy(self.initial_op_tuning_cfg)
+            tune_cfg = TuningCfgOverlay(self.initial_op_tuning_cfg)
             for op_name_type, quant_mode in self.op_dtype_dict.items():
                 all_exist_flag = True
                 for key, val in zip(keys, vals):
@@ -190,7 +189,7 @@ class OpTypeWiseTuningSampler(TuningSampler):
         Yields:
             The next tuning config.
         """
-        new_tune_cfg = copy.deepcopy(self.initial_op_tuning_cfg)
+        new_tune_cfg = TuningCfgOverlay(self.initial_op_tuning_cfg)
         for options_lst in product(*self.op_type_quant_mode_wise_combination.values()):
             for index, op_type_quant_mode in enumerate(self.op_type_quant_mode_wise_combination.keys()):
                 for op_name_type, quant_mode in self.op_dtype_dict.items():
@@ -261,7 +260,7 @@ class OpWiseTuningSampler(TuningSampler):
         Yields:
             The next tuning config.
         """
-        new_tune_cfg = copy.deepcopy(self.initial_op_tuning_cfg)
+        new_tune_cfg = TuningCfgOverlay(self.initial_op_tuning_cfg)
         for op_options_lst in product(*self.op_options_combination.values()):
             for index, op_name_type in enumerate(self.op_options_combination.keys()):
                 op_quant_mode = self.op_dtype_dict[op_name_type]
@@ -324,11 +323,11 @@ class FallbackTuningSampler(TuningSampler):
         Yields:
             The next tuning config.
         """
-        new_tune_cfg = copy.deepcopy(self.initial_op_tuning_cfg)
+        new_tune_cfg = TuningCfgOverlay(self.initial_op_tuning_cfg)
         skip_first = self.skip_first
         for op_name_type, target_dtype in self.op_dtypes.items():
             if not self.accumulate:
-                new_tune_cfg = copy.deepcopy(self.initial_op_tuning_cfg)
+                new_tune_cfg = TuningCfgOverlay(self.initial_op_tuning_cfg)
             new_op_config = OpTuningConfig(op_name_type[0], op_name_type[1], target_dtype, self.tuning_space)
             new_tune_cfg.update({op_name_type: new_op_config})
             if self.accumulate and skip_first:  # skip the first one
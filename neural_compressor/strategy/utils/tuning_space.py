@@ -21,7 +21,6 @@ from ast import Or
 from collections import defaultdict, OrderedDict
 import re
 from typing import Dict
-from copy import deepcopy
 from ...utils import logger
 
 PRECISION_SET = {'bf16', 'fp32'}
@@ -127,15 +126,24 @@ class TuningSpace:
         self.ops_dtype = defaultdict(OrderedDict) 
         usr_cfg = conf.usr_cfg if conf else None
         self.op_items = {}
+        # quant_mode/precision_name and each part of quant_mode: [op_item, ...]
+        self._quant_mode_index = defaultdict(OrderedDict)
+        self._merged_op_caps = {}
         self._create_tuning_space(capability, usr_cfg)
 
     def _parse_capability(self, capability):
-        """Parse the capability and construct the tuning space(a tree)."""
+        """Parse the capability and construct the tuning space(a tree).
+
+        The quant mode items and their tuning items are read-only, so the ops sharing a capability
+        share these items instead of creating them for each op.
+        """
         calib = TuningItem(name='calib_sampling_size',
                            options=capability['calib']['calib_sampling_size'],
                            item_type='calib_sampling_size')
         self.root_item.append(calib)
 
+        # (quant_mode, id of quant capability, op_weight_flag): (quant capability, item, dtype)
+        shared_items = {}
         for op_name_type, op_cap in capability['op'].items():
             op_name, op_type = op_name_type
             op_item = TuningItem(name=op_name_type, options=[], item_type='op')
@@ -145,26 +153,39 @@ class TuningSpace:
             op_weight_flag = op_cap['op_weight_flag']
             # for other precision capability
             for quant_mode in op_cap['precision']:
-                self.quant_mode_wise_items[quant_mode].append(op_item)
-                quant_mode_item = TuningItem(name=quant_mode, options=[], item_type='quant_mode')
-                op_item.append(quant_mode_item)
-                self.ops_dtype[op_name_type][quant_mode] = {'act_dtype': quant_mode}
-                if op_weight_flag:
-                    self.ops_dtype[op_name_type][quant_mode]['weight_dtype'] = quant_mode
+                key = (quant_mode, None, op_weight_flag)
+                if key not in shared_items:
+                    quant_mode_item = TuningItem(name=quant_mode, options=[], item_type='quant_mode')
+                    dtype = {'act_dtype': quant_mode}
+                    if op_weight_flag:
+                        dtype['weight_dtype'] = quant_mode
+                    shared_items[key] = (None, quant_mode_item, dtype)
+                self._add_quant_mode_item(op_item, *shared_items[key][1:])
             for quant_mode_flag, quant_cap in op_cap['quant'].items():
-                quant_mode_item = TuningItem(name=quant_mode_flag, options=[], item_type='quant_mode')
-                op_item.append(quant_mode_item)
-                self.quant_mode_wise_items[quant_mode_flag].append(op_item)
-                act_dtype = quant_cap['activation']['dtype']
-                act_dtype = act_dtype[0] if isinstance(act_dtype, list) else act_dtype
-                self.ops_dtype[op_name_type][quant_mode_flag] = {'act_dtype': act_dtype}
-                self._create_tuning_item(quant_cap['activation'], 'activation', quant_mode_item)
-                if op_weight_flag:
-                    self._create_tuning_item(quant_cap['weight'], 'weight', quant_mode_item)
-                    weight_dtype = quant_cap['weight']['dtype']
-                    weight_dtype = weight_dtype[0] if isinstance(weight_dtype, list) else weight_dtype
-                    self.ops_dtype[op_name_type][quant_mode_flag]['weight_dtype'] = weight_dtype
-                                                                                       
+                key = (quant_mode_flag, id(quant_cap), op_weight_flag)
+                if key not in shared_items:
+                    quant_mode_item = TuningItem(name=quant_mode_flag, options=[], item_type='quant_mode')
+                    act_dtype = quant_cap['activation']['dtype']
+                    act_dtype = act_dtype[0] if isinstance(act_dtype, list) else act_dtype
+                    dtype = {'act_dtype': act_dtype}
+                    self._create_tuning_item(quant_cap['activation'], 'activation', quant_mode_item)
+                    if op_weight_flag:
+                        self._create_tuning_item(quant_cap['weight'], 'weight', quant_mode_item)
+                        weight_dtype = quant_cap['weight']['dtype']
+                        weight_dtype = weight_dtype[0] if isinstance(weight_dtype, list) else weight_dtype
+                        dtype['weight_dtype'] = weight_dtype
+                    # the capability is kept to make sure its id is not reused
+                    shared_items[key] = (quant_cap, quant_mode_item, dtype)
+                self._add_quant_mode_item(op_item, *shared_items[key][1:])
+
+    def _add_quant_mode_item(self, op_item, quant_mode_item, dtype):
+        """Add a quant mode item to an op item and index the op item by the quant mode."""
+        quant_mode = quant_mode_item.name
+        op_item.append(quant_mode_item)
+        self.quant_mode_wise_items[quant_mode].append(op_item)
+        self.ops_dtype[op_item.name][quant_mode] = dtype
+        for key in [quant_mode] + (list(quant_mode) if isinstance(quant_mode, tuple) else []):
+            self._quant_mode_index[key][op_item.name] = op_item
 
     def _create_tuning_item(self, tuning_items: Dict, attr_name: str, quant_mode_item: TuningItem):
         for tuning_item_name, options in tuning_items.items():
@@ -209,12 +230,13 @@ class TuningSpace:
                     merged_options = [option for option in user_dtype_lst if option in fw_op_cap['precision']]
                     if not merged_options: 
                         merged_options = fw_op_cap['precision']
-                    op_cap['precision'] = merged_options
-                    op_cap['quant'] = OrderedDict() # do not do quantization
+                    # do not do quantization
+                    op_cap = dict(op_cap, precision=merged_options, quant=OrderedDict())
                     break
+                merged_quant_cap = OrderedDict(op_cap['quant'])
                 for quant_mode_flag, fw_quant_cap in fw_op_cap['quant'].items():
-                    if quant_mode_flag not in op_cap['quant']:
-                        op_cap['quant'][quant_mode_flag] = deepcopy(fw_quant_cap)
+                    quant_cap = dict(merged_quant_cap.get(quant_mode_flag, fw_quant_cap))
+                    merged_quant_cap[quant_mode_flag] = quant_cap
                     for item_name, item_options in op_user_cfg[key].items():
                         if item_options is not None and key in fw_quant_cap and item_name in fw_quant_cap[key]:
                             merged_options = []
@@ -229,22 +251,40 @@ class TuningSpace:
                                                    "capability in Intel Neural Compressor")
                             if len(merged_options) == 0:
                                 merged_options = fw_quant_cap[key][item_name]
-                            op_cap['quant'][quant_mode_flag][key][item_name] = merged_options
+                            quant_cap[key] = dict(quant_cap[key], **{item_name: merged_options})
+                op_cap = dict(op_cap, quant=merged_quant_cap)
         return op_cap
 
+    def _merge_shared_op_cfg(self, op_cap, op_user_cfg, fw_op_cap):
+        """Merge the capability with user config once for all ops sharing them.
+
+        The op capabilities are shared by ops and not changed in place, see _merge_op_cfg.
+
+        Returns:
+            op_cap: merged op capability.
+        """
+        key = (id(op_cap), id(op_user_cfg), id(fw_op_cap))
+        if key not in self._merged_op_caps:
+            # the inputs are kept to make sure their ids are not reused
+            self._merged_op_caps[key] = (op_cap, op_user_cfg, fw_op_cap,
+                                         self._merge_op_cfg(op_cap, op_user_cfg, fw_op_cap))
+        return self._merged_op_caps[key][-1]
+
     def _merge_optype_wise_cfg(self, cap: Dict, optype_wise_usr_cfg: Dict, fw_cap: Dict):
+        op_type_wise_ops = defaultdict(list)
+        for op_name_type in cap['op']:
+            op_type_wise_ops[op_name_type[1]].append(op_name_type)
         for op_type, op_user_cfg in optype_wise_usr_cfg.items():
-            op_lst = [op_name_type for op_name_type in cap['op'] if op_name_type[1] == op_type]
-            for op_name_type in op_lst:
-                cap['op'][op_name_type] = self._merge_op_cfg(cap['op'][op_name_type], 
-                                                             op_user_cfg,
-                                                             fw_cap['op'][op_name_type])
+            for op_name_type in op_type_wise_ops[op_type]:
+                cap['op'][op_name_type] = self._merge_shared_op_cfg(cap['op'][op_name_type], 
+                                                                    op_user_cfg,
+                                                                    fw_cap['op'][op_name_type])
 
     def _merge_model_wise_cfg(self, cap: Dict, model_wise_usr_cfg: Dict, fw_cap: Dict):
         for op_name_type in cap['op'].keys():
-            cap['op'][op_name_type] = self._merge_op_cfg(cap['op'][op_name_type], 
-                                                         model_wise_usr_cfg,
-                                                         fw_cap['op'][op_name_type])
+            cap['op'][op_name_type] = self._merge_shared_op_cfg(cap['op'][op_name_type], 
+                                                                model_wise_usr_cfg,
+                                                                fw_cap['op'][op_name_type])
 
     def _merge_op_wise_cfg(self, cap: Dict, op_wise_usr_cfg: Dict, fw_cap: Dict):
         op_name_types = {key[0]: key for key in cap['op'].keys()}
@@ -253,9 +293,9 @@ class TuningSpace:
             for op_name in op_name_types:
                 if op_name_pattern.fullmatch(op_name):
                     op_name_type = op_name_types[op_name]
-                    cap['op'][op_name_type] = self._merge_op_cfg(cap['op'][op_name_type], 
-                                                                 op_user_cfg,
-                                                                 fw_cap['op'][op_name_type])
+                    cap['op'][op_name_type] = self._merge_shared_op_cfg(cap['op'][op_name_type], 
+                                                                        op_user_cfg,
+                                                                        fw_cap['op'][op_name_type])
              
     def _merge_with_user_cfg(self, capability: Dict, user_cfg: Dict):
         """Merge the capability with user config.
@@ -362,13 +402,15 @@ class TuningSpace:
         :param user_cfg:
         :return:
         """
-        fw_capability = deepcopy(capability)
+        # the merged op capabilities are new objects, the framework capability is not changed
+        fw_capability = {'op': OrderedDict(capability['op'])}
         if user_cfg['model_wise'] is not None:
             self._merge_model_wise_cfg(capability, user_cfg['model_wise'], fw_capability)
         if user_cfg['optype_wise'] is not None:
             self._merge_optype_wise_cfg(capability, user_cfg['optype_wise'], fw_capability)
         if user_cfg['op_wise'] is not None:
             self._merge_op_wise_cfg(capability, user_cfg['op_wise'], fw_capability)
+        self._merged_op_caps.clear()
             
     def _parse_cap_helper(self, cap):
         """Parse the capability and convert it into internal structure.
@@ -414,9 +456,16 @@ class TuningSpace:
                 'dtype': 'bf16'},
             },
             ],
+
+        The ops sharing a capability list share the parsed capability.
         """
         parsed_cap = OrderedDict()
+        # id of capability list: (capability list, parsed capability)
+        parsed_caps = {}
         for op_name_type, op_cap_lst in cap.items():
+            if id(op_cap_lst) in parsed_caps:
+                parsed_cap[op_name_type] = parsed_caps[id(op_cap_lst)][1]
+                continue
             parsed_op_cap = {'precision': [], 'quant': OrderedDict()}
             for op_cap in op_cap_lst:
                 if 'quant_mode' in op_cap['activation']:
@@ -433,6 +482,7 @@ class TuningSpace:
                         parsed_op_cap['precision'].append(op_cap['activation']['dtype'])
             parsed_cap[op_name_type] = parsed_op_cap
             parsed_cap[op_name_type]['op_weight_flag'] = 'weight' in op_cap_lst[0]
+            parsed_caps[id(op_cap_lst)] = (op_cap_lst, parsed_op_cap)
         return parsed_cap
     
     def _create_tuning_space(self, capability, usr_cfg):
@@ -458,13 +508,14 @@ class TuningSpace:
         Returns:
             List: the list of op items
         """
+        if quant_mode in self._quant_mode_index:
+            return list(self._quant_mode_index[quant_mode].values())
         items_lst = []
         for _, op_item in self.op_items.items():
             for quant_item in op_item.options:
                 if quant_mode == quant_item.name or quant_mode in quant_item.name:
-                    if op_item not in items_lst:
-                        items_lst.append(op_item)
-                        break
+                    items_lst.append(op_item)
+                    break
         return items_lst
     
     def query_quant_mode_item(self, op_name_type, quant_mode):
@@ -17,13 +17,21 @@
 
 """Tuning structure."""
 
+import copy
+from collections.abc import MutableMapping
 from typing import Dict, Any
 from .tuning_space import QUANT_MODE_SET
 from ...utils import logger
 
 class OpTuningConfig:
-    """Op tuning config."""
-    
+    """Op tuning config.
+
+    The config is an immutable and hashable value, so it is shared instead of copied, e.g. by
+    copy.deepcopy of the tuning config of all ops.
+    """
+
+    __slots__ = ('op_name', 'op_type', 'op_quant_mode', 'kwargs', 'act_dtype', 'weight_dtype', '_hash')
+
     def __init__(self, op_name, op_type, op_quant_mode, tuning_space, kwargs={}):
         """Create the tuning config.
 
@@ -37,9 +45,63 @@ class OpTuningConfig:
         self.op_name = op_name
         self.op_type = op_type
         self.op_quant_mode = op_quant_mode  # [static, dynamic]
-        self.kwargs = kwargs
+        self.kwargs = dict(kwargs)
         self._set_dtype(tuning_space)
-    
+        self._hash = hash(self._key())
+
+    def __setattr__(self, name, value):
+        """Forbid changing the config once it is created."""
+        if hasattr(self, '_hash'):
+            raise AttributeError(f"OpTuningConfig is immutable, can not set {name}.")
+        object.__setattr__(self, name, value)
+
+    def _key(self):
+        return (self.op_name, self.op_type, self.op_quant_mode, self.act_dtype, self.weight_dtype,
+                frozenset(self.kwargs.items()))
+
+    def __eq__(self, other):
+        """Compare the configs by value."""
+        if not isinstance(other, OpTuningConfig):
+            return NotImplemented
+        return self._hash == other._hash and self._key() == other._key()
+
+    def __hash__(self):
+        """Hash the config by value."""
+        return self._hash
+
+    def __copy__(self):
+        """Share the immutable config."""
+        return self
+
+    def __deepcopy__(self, memo):
+        """Share the immutable config."""
+        return self
+
+    def __getstate__(self):
+        """Get the state for pickle, the hash is computed again when loading."""
+        return {name: getattr(self, name) for name in self.__slots__ if name != '_hash'}
+
+    def __setstate__(self, state):
+        """Set the state from pickle."""
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_hash', hash(self._key()))
+
+    def _replace(self, **fields):
+        """Create a new config with the given fields replaced, the other fields are kept.
+
+        Args:
+            fields: the field names and the new values.
+
+        Returns:
+            OpTuningConfig: the new config.
+        """
+        state = self.__getstate__()
+        state.update(fields)
+        new_config = object.__new__(OpTuningConfig)
+        new_config.__setstate__(state)
+        return new_config
+
     def _set_dtype(self, tuning_space, quant_bit='int8', act_quant_flag=None):
         quant_mode = self.op_quant_mode
         op_name_type = (self.op_name, self.op_type)
@@ -103,3 +165,74 @@ class OpTuningConfig:
             config: A dict includes the tuning config.
         """
         cls(**config)
+
+
+class TuningCfgOverlay(MutableMapping):
+    """Tuning config of ops sharing its unchanged items with the config it is created from.
+
+    The items set on the config are kept in a delta over a base which is never changed, so
+    creating or copying a config costs the number of changed items instead of the number of ops.
+    A dict used as the base must not be changed afterwards.
+
+    Args:
+        base (Mapping, optional): the initial items, a TuningCfgOverlay shares its base with the
+            new config. Defaults to None.
+    """
+
+    __slots__ = ('_base', '_delta')
+
+    def __init__(self, base=None):
+        """Init a TuningCfgOverlay."""
+        if isinstance(base, TuningCfgOverlay):
+            self._base, self._delta = base._base, dict(base._delta)
+        else:
+            self._base, self._delta = base if base is not None else {}, {}
+
+    def __getitem__(self, key):
+        """Get the item from the delta or the base."""
+        if key in self._delta:
+            return self._delta[key]
+        return self._base[key]
+
+    def __setitem__(self, key, value):
+        """Set the item in the delta."""
+        self._delta[key] = value
+
+    def __delitem__(self, key):
+        """Delete the item, the base is rebuilt without it."""
+        if key not in self:
+            raise KeyError(key)
+        items = dict(self.items())
+        del items[key]
+        self._base, self._delta = items, {}
+
+    def __contains__(self, key):
+        """Check the item in the delta or the base."""
+        return key in self._delta or key in self._base
+
+    def __iter__(self):
+        """Iterate the keys in the order of a dict updated with the delta."""
+        yield from self._base
+        for key in self._delta:
+            if key not in self._base:
+                yield key
+
+    def __len__(self):
+        """Get the number of items."""
+        return len(self._base) + sum([1 for key in self._delta if key not in self._base])
+
+    def __repr__(self):
+        """Display the items as a dict."""
+        return f"{self.__class__.__name__}({dict(self.items())})"
+
+    def copy(self):
+        """Create a config sharing the base."""
+        return TuningCfgOverlay(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        """Copy the delta only, the base is shared."""
+        new_cfg = TuningCfgOverlay.__new__(TuningCfgOverlay)
+        new_cfg._base, new_cfg._delta = self._base, copy.deepcopy(self._delta, memo)
+        return new_cfg
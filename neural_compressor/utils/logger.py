@@ -92,6 +92,9 @@ def log(level, msg, *args, **kwargs):
 def debug(msg, *args, **kwargs):
     """Output log with the debug level."""
     if isinstance(msg, dict):
+        # skip formatting the dict, e.g. the capability of a large model, if it is not logged
+        if not Logger().get_logger().isEnabledFor(DEBUG):
+            return
         for _, line in enumerate(_pretty_dict(msg).split('\n')):
             Logger().get_logger().debug(line, *args, **kwargs)
     else:
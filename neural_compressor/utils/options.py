@@ -25,6 +25,10 @@ class onnxrt:
     qdq_setting = DotDict({'OpTypesToExcludeOutputQuantizatioin': None, 
                            'AddQDQPairToWeight': False,
                            'DedicatedQDQPair': False})
+    session_options = DotDict({'intra_op_num_threads': None,
+                               'inter_op_num_threads': None,
+                               'enable_mem_pattern': None,
+                               'enable_cpu_mem_arena': None})
 
 OPTIONS = {'tensorflow': None,
            'tensorflow_itex': None,
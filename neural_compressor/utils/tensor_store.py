@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Store of dumped tensors, written in the background and read back lazily."""
+
+import json
+import os
+import queue
+import threading
+import uuid
+from collections.abc import Mapping
+
+import numpy as np
+
+from .logger import info
+
+INDEX_FILE = 'index.json'
+
+
+class LazyTensorDict(Mapping):
+    """Read-only dict whose values are loaded on access.
+
+    Args:
+        keys: The keys of the dict.
+        load: The function loading the value of a key.
+    """
+
+    def __init__(self, keys, load):
+        """Init a LazyTensorDict."""
+        self._keys = list(keys)
+        self._load = load
+
+    def __getitem__(self, key):
+        """Load the value of a key."""
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._load(key)
+
+    def __iter__(self):
+        """Iterate the keys."""
+        return iter(self._keys)
+
+    def __len__(self):
+        """Get the number of keys."""
+        return len(self._keys)
+
+    def __contains__(self, key):
+        """Check if the dict has a key."""
+        return key in self._keys
+
+
+class TensorStore:
+    """Tensors dumped per iteration and op.
+
+    Each tensor is saved as one .npy file by a background thread while the inference goes on, and index.json
+    records the iteration, op name, tensor name, shape and dtype of every file. Reading maps the files into
+    memory, so the dumped tensors do not need to fit in RAM.
+
+    The iteration is an int, or a str for tensors not bound to an iteration (e.g. 'weight').
+
+    Replacing a store deletes its files, so the dicts read lazily from it must not be used anymore. Each
+    store names its files with its own token, so such a stale read fails instead of returning the tensors
+    of the new store. Dumps that are read side by side need their own directories.
+
+    Args:
+        path: The directory of the store.
+        mode: 'r' to read an existing store, 'w' to create a new one (replacing the old one).
+        max_pending: The maximum number of tensors waiting to be written, put() blocks when it is reached.
+    """
+
+    def __init__(self, path, mode='r', max_pending=16):
+        """Init a TensorStore."""
+        assert mode in ['r', 'w'], "mode should be 'r' or 'w'."
+        self.path = path
+        self.mode = mode
+        self.index = {}
+        self._file_cnt = 0
+        self._token = uuid.uuid4().hex[:8]
+        self._queue = None
+        self._writer = None
+        self._error = None
+        self._max_pending = max_pending
+        if mode == 'r':
+            with open(os.path.join(path, INDEX_FILE), 'r') as f:
+                self.index = json.load(f)
+        else:
+            os.makedirs(path, exist_ok=True)
+            for name in os.listdir(path):
+                if name.endswith('.npy') or name == INDEX_FILE:
+                    os.remove(os.path.join(path, name))
+
+    def _write_files(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                file_name, array = item
+                if self._error is None:
+                    np.save(os.path.join(self.path, file_name), array)
+            except Exception as e:  # pragma: no cover
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def put(self, iteration, op_name, tensors):
+        """Write the tensors of an op in an iteration.
+
+        Args:
+            iteration: The iteration.
+            op_name: The op name.
+            tensors: A dict of tensor name and numpy array.
+        """
+        assert self.mode == 'w', "The store is read-only."
+        if self._writer is None:
+            self._queue = queue.Queue(maxsize=self._max_pending)
+            self._writer = threading.Thread(target=self._write_files, daemon=True)
+            self._writer.start()
+        op_index = self.index.setdefault(str(iteration), {}).setdefault(op_name, {})
+        for tensor_name, array in tensors.items():
+            array = np.asarray(array)
+            file_name = '{}_{}.npy'.format(self._token, self._file_cnt)
+            self._file_cnt += 1
+            op_index[tensor_name] = {'file': file_name, 'shape': list(array.shape), 'dtype': str(array.dtype)}
+            self._queue.put((file_name, array))
+
+    def flush(self):
+        """Wait for the pending writes and save the index."""
+        if self._writer is not None:
+            self._queue.join()
+        if self._error is not None:
+            raise self._error
+        if self.mode == 'w':
+            with open(os.path.join(self.path, INDEX_FILE), 'w') as f:
+                json.dump(self.index, f)
+
+    def close(self):
+        """Finish writing."""
+        self.flush()
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+            info("Dumped tensors to %s" % self.path)
+
+    def __enter__(self):
+        """Enter the context."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close at the exit of the context."""
+        self.close()
+
+    def iterations(self):
+        """Get the iterations in the store."""
+        return [int(iteration) if iteration.lstrip('-').isdigit() else iteration for iteration in self.index]
+
+    def op_names(self, iteration):
+        """Get the op names of an iteration."""
+        return list(self.index[str(iteration)].keys())
+
+    def get(self, iteration, op_name, tensor_name):
+        """Read a tensor as a read-only memory-mapped numpy array."""
+        entry = self.index[str(iteration)][op_name][tensor_name]
+        if self._writer is not None:
+            self._queue.join()
+        file_path = os.path.join(self.path, entry['file'])
+        # empty arrays can not be memory-mapped
+        return np.load(file_path, mmap_mode='r' if int(np.prod(entry['shape'])) > 0 else None)
+
+    def load(self, iteration):
+        """Get the tensors of an iteration as a lazy dict {op_name: {tensor_name: array}}."""
+        op_index = self.index.get(str(iteration), {})
+        return LazyTensorDict(op_index.keys(), lambda op_name: LazyTensorDict(
+            op_index[op_name].keys(), lambda tensor_name: self.get(iteration, op_name, tensor_name)))
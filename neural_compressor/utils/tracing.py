@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Nested spans over the stages of a tuning run, exported as a Chrome trace.
+
+The spans are recorded only between start() and stop(), otherwise span() returns a
+shared no-op span, so the instrumented code costs a flag check. A span may carry
+counters, e.g. the batches, ops or bytes it processed, which are shown as the args of
+the event when the trace is opened in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from .logger import debug, info
+
+
+class _NullSpan(object):
+    """The span returned when the tracing is disabled, it records nothing.
+
+    It is false in a boolean context, so the counters costly to compute can be skipped.
+    """
+
+    children = MappingProxyType({})
+
+    def __bool__(self):
+        return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def add(self, counter, value=1):
+        """Ignore the counter."""
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span(object):
+    """A timed stage of the tracer, use it as a context manager.
+
+    Args:
+        tracer (Tracer): the tracer recording the span.
+        name (str): the name of the stage.
+        category (str): the category of the stage, e.g. 'strategy' or 'adaptor'.
+        counters (dict): the initial counters.
+    """
+
+    def __init__(self, tracer, name, category, counters):
+        """Init a Span."""
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.counters = counters
+        # the total seconds of the direct child spans by name
+        self.children = defaultdict(float)
+        self.start = None
+
+    def add(self, counter, value=1):
+        """Add a value to a counter of the span."""
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def __enter__(self):
+        self.tracer._stack().append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        duration = time.perf_counter() - self.start
+        stack = self.tracer._stack()
+        # the spans left open inside this one, e.g. by an exception, are dropped
+        while stack and stack.pop() is not self:
+            pass
+        if stack:
+            stack[-1].children[self.name] += duration
+        self.tracer._record(self, duration)
+        return False
+
+
+class Tracer(object):
+    """Record the spans of all threads and export them as a Chrome trace."""
+
+    def __init__(self):
+        """Init a Tracer."""
+        self.enabled = False
+        self.events = []
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    def start(self):
+        """Drop the recorded spans and start recording."""
+        self.events = []
+        self._origin = time.perf_counter()
+        self.enabled = True
+
+    def stop(self):
+        """Stop recording."""
+        self.enabled = False
+
+    def span(self, name, category='tuning', **counters):
+        """Get a span of the stage, a no-op one if the tracing is disabled."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, category, counters)
+
+    def current_span(self):
+        """Get the innermost open span of the thread, a no-op one if there is none."""
+        if not self.enabled:
+            return _NULL_SPAN
+        stack = self._stack()
+        return stack[-1] if stack else _NULL_SPAN
+
+    def summary(self):
+        """Get the total seconds and the number of the recorded spans by name."""
+        summary = defaultdict(lambda: {'duration': 0., 'count': 0})
+        for event in self.events:
+            summary[event['name']]['duration'] += event['dur'] / 1e6
+            summary[event['name']]['count'] += 1
+        return dict(summary)
+
+    def export(self, path):
+        """Write the recorded spans to a Chrome trace JSON file.
+
+        Args:
+            path (str): the path of the trace file.
+
+        Returns:
+            str: the path of the trace file.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        metadata = {'name': 'process_name', 'ph': 'M', 'pid': os.getpid(),
+                    'args': {'name': 'Neural Compressor'}}
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': [metadata] + self.events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+    def _stack(self):
+        """Get the open spans of the thread."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span, duration):
+        """Record a closed span as a complete event, the times are in microseconds."""
+        self.events.append({'name': span.name,
+                            'cat': span.category,
+                            'ph': 'X',
+                            'ts': (span.start - self._origin) * 1e6,
+                            'dur': duration * 1e6,
+                            'pid': os.getpid(),
+                            'tid': threading.get_ident(),
+                            'args': span.counters})
+
+
+TRACER = Tracer()
+
+
+def span(name, category='tuning', **counters):
+    """Get a span of the stage from the global tracer, see Tracer.span."""
+    return TRACER.span(name, category, **counters)
+
+
+def current_span():
+    """Get the innermost open span of the global tracer, see Tracer.current_span."""
+    return TRACER.current_span()
+
+
+def traced(name=None, category='tuning'):
+    """Decorate a function to run it in a span of the global tracer.
+
+    Args:
+        name (str, optional): the name of the span, None uses the qualified name of the
+            function. Defaults to None.
+        category (str, optional): the category of the span. Defaults to 'tuning'.
+    """
+    def decorator(func):
+        span_name = name if name else func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with Span(TRACER, span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def traced_iter(iterable, name, category='tuning'):
+    """Iterate an iterable, getting each item in a span of the global tracer.
+
+    Args:
+        iterable (iterable): the iterable, e.g. a generator computing its items lazily.
+        name (str): the name of the spans.
+        category (str, optional): the category of the spans. Defaults to 'tuning'.
+    """
+    iterator = iter(iterable)
+    while True:
+        with span(name, category):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+@contextmanager
+def trace(path):
+    """Record the spans in the context and export them to a Chrome trace file.
+
+    Args:
+        path (str): the path of the trace file.
+    """
+    TRACER.start()
+    try:
+        yield TRACER
+    finally:
+        TRACER.stop()
+        TRACER.export(path)
+        info("Save the trace of the tuning stages to {}, open it in chrome://tracing or "
+             "https://ui.perfetto.dev.".format(path))
+        summary = TRACER.summary()
+        for name in sorted(summary, key=lambda name: -summary[name]['duration']):
+            debug("Stage {}: {:.3f} s in {} spans.".format(
+                name, summary[name]['duration'], summary[name]['count']))
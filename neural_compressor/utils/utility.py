@@ -37,6 +37,7 @@ import threading, _thread
 import cpuinfo
 import numpy as np
 from neural_compressor.utils import logger
+from neural_compressor.utils.tracing import span
 import prettytable as pt
 import psutil
 import subprocess
@@ -284,13 +285,17 @@ class CpuInfo(object):
 def dump_elapsed_time(customized_msg=""):
     """Get the elapsed time for decorated functions.
 
+    The decorated functions are also recorded as spans when the tracing of the tuning
+    stages is enabled.
+
     Args:
         customized_msg (string, optional): The parameter passed to decorator. Defaults to None.
     """
     def f(func):
         def fi(*args, **kwargs):
             start = time.time()
-            res = func(*args, **kwargs)
+            with span(customized_msg if customized_msg else func.__qualname__, 'elapsed'):
+                res = func(*args, **kwargs)
             end = time.time()
             logging.getLogger("neural_compressor").info('%s elapsed time: %s ms' %
                                      (customized_msg if customized_msg else func.__qualname__,
@@ -553,3 +558,9 @@ def set_tensorboard(tensorboard: bool):
     """Set the tensorboard in config."""
     from neural_compressor.config import options
     options.tensorboard = tensorboard
+
+
+def set_profiling(profiling: bool):
+    """Set the profiling in config."""
+    from neural_compressor.config import options
+    options.profiling = profiling
@@ -47,12 +47,30 @@ class Diagnosis:
             self.optimization.workdir,
             tensors_filename,
         )
+        store_path = os.path.join(os.path.dirname(tensors_path), "inspect_result")
+        if os.path.exists(os.path.join(store_path, "index.json")):
+            return self._load_tensor_store(store_path)
         if not os.path.exists(tensors_path):
             raise ClientErrorException("Could not find tensor data for specified optimization.")
         with open(tensors_path, "rb") as tensors_pickle:
             dump_tensor_result = pickle.load(tensors_pickle)
         return dump_tensor_result
 
+    @staticmethod
+    def _load_tensor_store(store_path: str) -> dict:
+        """Get tensors dumped to a tensor store in the inspect_result layout."""
+        from neural_compressor.utils.tensor_store import TensorStore
+
+        store = TensorStore(store_path)
+        dump_tensor_result: dict = {}
+        iterations = store.iterations()
+        if "weight" in iterations:
+            dump_tensor_result["weight"] = store.load("weight")
+        activations = [store.load(it) for it in iterations if isinstance(it, int)]
+        if activations:
+            dump_tensor_result["activation"] = activations
+        return dump_tensor_result
+
     def load_quantization_config(self) -> dict:
         """Get config quantization data."""
         config_path = os.path.join(
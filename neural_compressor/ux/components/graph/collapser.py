@@ -14,9 +14,10 @@
 # limitations under the License.
 """Graph collapser."""
 
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from neural_compressor.ux.components.graph.graph import Graph
+from neural_compressor.ux.components.graph.hierarchy import GroupHierarchy
 from neural_compressor.ux.components.graph.node import GroupNode, Node
 
 
@@ -29,37 +30,70 @@ class Collapser:
         """Construct the collapser."""
         restored_group_names = [self._unprepare_group_name(name) for name in expanded_groups]
         self.expanded_groups: Set[str] = set(restored_group_names)
-        self.group_sizes: Dict[str, int] = {}
+        self.hierarchy = GroupHierarchy(Graph())
 
     def collapse(self, graph: Graph) -> Graph:
         """Return graph with collapsed nodes."""
         collapsed_graph = Graph()
 
-        self._calculate_group_sizes(graph)
-        self._add_nodes_to_collapsed_graph(collapsed_graph, graph)
-        self._add_edges_to_collapsed_graph(collapsed_graph, graph)
+        hierarchy = graph.hierarchy
+        self.hierarchy = hierarchy
+        visible_groups = self._get_visible_groups(hierarchy)
+        self._add_nodes_to_collapsed_graph(collapsed_graph, hierarchy, visible_groups)
+        self._add_edges_to_collapsed_graph(collapsed_graph, graph, hierarchy, visible_groups)
 
         return collapsed_graph
 
-    def _calculate_group_sizes(self, graph: Graph) -> None:
-        """Create dict with number of nodes in each group."""
-        self.group_sizes = {}
-        for node in graph.nodes:
-            for group in node.groups:
-                if not self.group_sizes.get(group):
-                    self.group_sizes[group] = 0
-                self.group_sizes[group] += 1
-
-    def _add_nodes_to_collapsed_graph(self, collapsed_graph: Graph, graph: Graph) -> None:
-        """Add Nodes from source graph to collapsed graph."""
-        for node in graph.nodes:
-            collapsed_graph.add_node(self._get_node_for_collapsed_graph(node))
-
-    def _add_edges_to_collapsed_graph(self, collapsed_graph: Graph, graph: Graph) -> None:
+    def _get_visible_groups(self, hierarchy: GroupHierarchy) -> List[Optional[str]]:
+        """Return root and groups whose content is visible, i.e. all their parents are expanded."""
+        visible_groups: List[Optional[str]] = [hierarchy.ROOT]
+        for group in visible_groups:
+            for child_group in hierarchy.child_groups[group]:
+                if self._is_group_expanded(child_group):
+                    visible_groups.append(child_group)
+        return visible_groups
+
+    def _is_group_expanded(self, group: str) -> bool:
+        """Check if group content is shown."""
+        return group in self.expanded_groups or not self.hierarchy.is_collapsible(group)
+
+    def _add_nodes_to_collapsed_graph(
+        self,
+        collapsed_graph: Graph,
+        hierarchy: GroupHierarchy,
+        visible_groups: List[Optional[str]],
+    ) -> None:
+        """Add visible Nodes from source graph to collapsed graph keeping source order."""
+        visible_nodes: List[Tuple[int, Node]] = []
+        for group in visible_groups:
+            for index in hierarchy.direct_nodes[group]:
+                visible_nodes.append((index, hierarchy.nodes[index]))
+            for child_group in hierarchy.child_groups[group]:
+                if not self._is_group_expanded(child_group):
+                    index = hierarchy.first_node_index[child_group]
+                    visible_nodes.append(
+                        (index, self._get_node_for_collapsed_graph(hierarchy.nodes[index])),
+                    )
+
+        for _, node in sorted(visible_nodes, key=lambda item: item[0]):
+            collapsed_graph.add_node(node)
+
+    def _add_edges_to_collapsed_graph(
+        self,
+        collapsed_graph: Graph,
+        graph: Graph,
+        hierarchy: GroupHierarchy,
+        visible_groups: List[Optional[str]],
+    ) -> None:
         """Add Edges from source graph to collapsed graph."""
         collapsed_edges_repository: Dict[str, bool] = {}
 
-        for edge in graph.edges:
+        # edges inside collapsed groups are never visible, so skip them without checking
+        edge_indices = sorted(
+            index for group in visible_groups for index in hierarchy.group_edges[group]
+        )
+        for index in edge_indices:
+            edge = hierarchy.edges[index]
             edge_added = collapsed_graph.add_edge(
                 source_id=edge.source,
                 target_id=edge.target,
@@ -101,7 +135,7 @@ class Collapser:
 
         for group in node.groups:
             if group not in self.expanded_groups:
-                return self.group_sizes.get(group, 0) > 1
+                return self.hierarchy.is_collapsible(group)
 
         return False
 
@@ -14,9 +14,11 @@
 # limitations under the License.
 """Graph class."""
 
-from typing import Dict, List
+import copy
+from typing import Dict, List, Optional
 
 from neural_compressor.ux.components.graph.edge import Edge
+from neural_compressor.ux.components.graph.hierarchy import GroupHierarchy
 from neural_compressor.ux.components.graph.node import Node
 from neural_compressor.ux.utils.exceptions import NotFoundException
 from neural_compressor.ux.utils.json_serializer import JsonSerializer
@@ -31,10 +33,14 @@ class Graph(JsonSerializer):
         super().__init__()
         self._nodes: Dict[str, Node] = {}
         self._edges: List[Edge] = []
+        self._targets: Dict[str, List[str]] = {}
+        self._hierarchy: Optional[GroupHierarchy] = None
+        self._skip.extend(["_targets", "_hierarchy"])
 
     def add_node(self, node: Node) -> None:
         """Add a Node to graph."""
         self._nodes[node.id] = node
+        self._hierarchy = None
 
     @property
     def nodes(self) -> List[Node]:
@@ -46,6 +52,13 @@ class Graph(JsonSerializer):
         """Return edges as a list."""
         return self._edges
 
+    @property
+    def hierarchy(self) -> GroupHierarchy:
+        """Return group hierarchy of the graph, built on first use."""
+        if self._hierarchy is None:
+            self._hierarchy = GroupHierarchy(self)
+        return self._hierarchy
+
     def add_edge(self, source_id: str, target_id: str) -> bool:
         """Add an Edge to graph."""
         try:
@@ -58,6 +71,8 @@ class Graph(JsonSerializer):
             )
             return False
         self._edges.append(Edge(source, target))
+        self._targets.setdefault(source_id, []).append(target_id)
+        self._hierarchy = None
         return True
 
     def get_node(self, id: str) -> Node:
@@ -69,21 +84,21 @@ class Graph(JsonSerializer):
     def highlight_pattern(self, op_name: str, pattern: List[str]) -> None:
         """Highlight pattern in graph."""
         source_op = op_name
-        self.get_node(source_op).highlight = True
+        self._highlight_node(source_op)
         for op in pattern[1:]:
             target_nodes = self.get_target_nodes(source_op)
             for target_node in target_nodes:
                 if target_node.label == op:
-                    self.get_node(target_node.id).highlight = True
+                    self._highlight_node(target_node.id)
                     source_op = target_node.id
                     continue
 
+    def _highlight_node(self, id: str) -> None:
+        """Highlight a node without modifying node objects shared with other graphs."""
+        node = copy.copy(self.get_node(id))
+        node.highlight = True
+        self._nodes[id] = node
+
     def get_target_nodes(self, op_name: str) -> List[Node]:
         """Get target nodes from specified op."""
-        target_nodes: List[Node] = []
-
-        for edge in self.edges:
-            if edge.source == op_name:
-                target_nodes.append(self.get_node(edge.target))
-
-        return target_nodes
+        return [self.get_node(target_id) for target_id in self._targets.get(op_name, [])]
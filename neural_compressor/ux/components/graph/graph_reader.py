@@ -13,13 +13,70 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Graph reader."""
+import os
+from collections import OrderedDict
+from threading import Lock
 from typing import List, Optional, Tuple
 
 from neural_compressor.ux.components.graph.collapser import Collapser
 from neural_compressor.ux.components.graph.graph import Graph
-from neural_compressor.ux.components.graph.node import Node
 from neural_compressor.ux.components.model.repository import ModelRepository
-from neural_compressor.ux.utils.exceptions import ClientErrorException
+from neural_compressor.ux.utils.exceptions import ClientErrorException, NotFoundException
+from neural_compressor.ux.utils.logger import log
+
+GraphCacheKey = Tuple[str, float, int]
+
+
+class _GraphCache:
+    """LRU cache of parsed model graphs."""
+
+    def __init__(self, max_size: int = 8) -> None:
+        """Construct the cache."""
+        self.max_size = max_size
+        self._graphs: "OrderedDict[GraphCacheKey, Graph]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def get_key(model_path: str) -> Optional[GraphCacheKey]:
+        """Return key identifying current version of the model, None if model can't be checked."""
+        try:
+            path = os.path.realpath(model_path)
+            stat = os.stat(path)
+            mtime, size = stat.st_mtime, stat.st_size
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    for file_name in files:
+                        file_stat = os.stat(os.path.join(root, file_name))
+                        mtime = max(mtime, file_stat.st_mtime)
+                        size += file_stat.st_size
+        except OSError:
+            return None
+        return path, mtime, size
+
+    def get(self, key: GraphCacheKey) -> Optional[Graph]:
+        """Get graph from cache and mark it as recently used."""
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is not None:
+                self._graphs.move_to_end(key)
+            return graph
+
+    def put(self, key: GraphCacheKey, graph: Graph) -> None:
+        """Put graph into cache removing older versions of the model and least recently used."""
+        with self._lock:
+            for cached_key in [cached_key for cached_key in self._graphs if cached_key[0] == key[0]]:
+                del self._graphs[cached_key]
+            self._graphs[key] = graph
+            while len(self._graphs) > self.max_size:
+                self._graphs.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all graphs from cache."""
+        with self._lock:
+            self._graphs.clear()
+
+
+graph_cache = _GraphCache()
 
 
 class GraphReader:
@@ -27,9 +84,7 @@ class GraphReader:
 
     def read(self, model_path: str, expanded_groups: List[str]) -> Graph:
         """Return Graph for given model path."""
-        model_repository = ModelRepository()
-        model = model_repository.get_model(model_path)
-        graph = model.get_model_graph()
+        graph = self._get_model_graph(model_path)
 
         collapser = Collapser(expanded_groups)
         collapsed_graph = collapser.collapse(graph)
@@ -43,17 +98,11 @@ class GraphReader:
         pattern: List[str],
     ) -> Tuple[Graph, List[str]]:
         """Search graph for specific nodes pattern."""
-        model_repository = ModelRepository()
-        model = model_repository.get_model(model_path)
-        graph = model.get_model_graph()
-
-        op_data: Optional[Node] = None
-        for node in graph.nodes:
-            if node.id == op_name:
-                op_data = node
-                break
+        graph = self._get_model_graph(model_path)
 
-        if op_data is None:
+        try:
+            op_data = graph.get_node(op_name)
+        except NotFoundException:
             raise ClientErrorException(f"Could not find {op_name} in graph.")
 
         expanded_groups = op_data.groups
@@ -64,3 +113,21 @@ class GraphReader:
         collapsed_graph.highlight_pattern(op_name, pattern)
 
         return collapsed_graph, expanded_groups
+
+    @staticmethod
+    def _get_model_graph(model_path: str) -> Graph:
+        """Return full model graph, parsed graphs are cached until the model file changes."""
+        key = graph_cache.get_key(model_path)
+        if key is not None:
+            graph = graph_cache.get(key)
+            if graph is not None:
+                log.debug(f"Using cached graph of {model_path}.")
+                return graph
+
+        model_repository = ModelRepository()
+        model = model_repository.get_model(model_path)
+        graph = model.get_model_graph()
+
+        if key is not None:
+            graph_cache.put(key, graph)
+        return graph
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Graph group hierarchy."""
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from neural_compressor.ux.components.graph.edge import Edge
+from neural_compressor.ux.components.graph.node import Node
+
+if TYPE_CHECKING:
+    from neural_compressor.ux.components.graph.graph import Graph
+
+
+class GroupHierarchy:
+    """Precomputed group structure of a Graph.
+
+    Groups form a tree rooted in None. Every node is attached to its innermost
+    group and every edge to the innermost group containing both of its ends,
+    so only the part of the tree that is expanded has to be visited to build
+    a collapsed graph.
+    """
+
+    ROOT = None
+
+    def __init__(self, graph: "Graph") -> None:
+        """Build hierarchy for given graph."""
+        self.group_sizes: Dict[str, int] = {}
+        self.first_node_index: Dict[Optional[str], int] = {}
+        self.child_groups: Dict[Optional[str], List[str]] = {self.ROOT: []}
+        self.direct_nodes: Dict[Optional[str], List[int]] = {self.ROOT: []}
+        self.group_edges: Dict[Optional[str], List[int]] = {self.ROOT: []}
+        self.nodes: List[Node] = graph.nodes
+        self.edges: List[Edge] = graph.edges
+
+        node_groups: Dict[str, List[str]] = {}
+        for index, node in enumerate(self.nodes):
+            node_groups[node.id] = node.groups
+            parent: Optional[str] = self.ROOT
+            for group in node.groups:
+                self.group_sizes[group] = self.group_sizes.get(group, 0) + 1
+                if group not in self.first_node_index:
+                    self.first_node_index[group] = index
+                    self.child_groups[parent].append(group)
+                    self.child_groups[group] = []
+                    self.direct_nodes[group] = []
+                    self.group_edges[group] = []
+                parent = group
+            self.direct_nodes[parent].append(index)
+
+        for index, edge in enumerate(self.edges):
+            source_groups = node_groups.get(edge.source, [])
+            target_groups = node_groups.get(edge.target, [])
+            common_group: Optional[str] = self.ROOT
+            for source_group, target_group in zip(source_groups, target_groups):
+                if source_group != target_group:
+                    break
+                common_group = source_group
+            self.group_edges[common_group].append(index)
+
+    def is_collapsible(self, group: str) -> bool:
+        """Check if group has enough nodes to be collapsed."""
+        return self.group_sizes.get(group, 0) > 1
@@ -28,8 +28,16 @@ class _JobsControlQueue:
 
     _requests: Queue = Queue()
 
-    def schedule_job(self, target: Callable, args: Tuple, job_id: str, request_id: str) -> None:
-        """Schedule new job to be run."""
+    def schedule_job(
+        self,
+        target: Callable,
+        args: Tuple,
+        job_id: str,
+        request_id: str,
+        priority: int = 0,
+        cores: Optional[int] = None,
+    ) -> None:
+        """Schedule new job to be run, jobs with higher priority are started first."""
         wrapped_target = self._wrap_target(target, job_id)
         task = _Request(
             _RequestType.SCHEDULE,
@@ -37,6 +45,8 @@ class _JobsControlQueue:
             args=args,
             job_id=job_id,
             request_id=request_id,
+            priority=priority,
+            cores=cores,
         )
         self._requests.put(task)
 
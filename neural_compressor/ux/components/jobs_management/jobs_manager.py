@@ -17,10 +17,15 @@ import typing
 from collections import OrderedDict
 from subprocess import Popen
 from threading import Thread
-from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Union
 
 from neural_compressor.ux.components.jobs_management.jobs_control_queue import _JobsControlQueue
 from neural_compressor.ux.components.jobs_management.request import _Request, _RequestType
+from neural_compressor.ux.components.jobs_management.resources import (
+    _CpuTopology,
+    _ResourcePool,
+    _ResourceSlice,
+)
 
 
 class _Job(Thread):
@@ -38,6 +43,8 @@ class _Job(Thread):
         kwargs: Mapping[str, Any] = {},
         *,
         daemon: Optional[bool] = None,
+        priority: int = 0,
+        cores: Optional[int] = None,
     ) -> None:
         if args is None:
             args = ()
@@ -45,6 +52,9 @@ class _Job(Thread):
         self._job_id: str = job_id
         self._subprocess_handle: Optional[Popen] = None
         self.to_be_aborted: bool = False
+        self.priority: int = priority
+        self.requested_cores: Optional[int] = cores
+        self.resources: Optional[_ResourceSlice] = None
 
     @property
     def job_id(self) -> str:
@@ -76,11 +86,22 @@ class _Job(Thread):
 
 
 class _JobsManager:
-    """Oparates on request_queue, recives tasks and processes them."""
+    """Oparates on request_queue, recives tasks and processes them.
 
-    def __init__(self, request_queue: _JobsControlQueue, daemon: bool = True):
+    Jobs are started in priority order as soon as the resource pool can give them
+    a disjoint slice of cores, so several jobs may run at the same time.
+    """
+
+    def __init__(
+        self,
+        request_queue: _JobsControlQueue,
+        daemon: bool = True,
+        max_parallel_jobs: Optional[int] = None,
+        topology: Optional[_CpuTopology] = None,
+    ):
         self._request_queue: _JobsControlQueue = request_queue
         self._jobs: typing.OrderedDict[str, _Job] = OrderedDict()
+        self._resource_pool: _ResourcePool = _ResourcePool(topology, max_parallel_jobs)
         self._main_thread: Thread = Thread(target=self.main_loop, daemon=daemon)
         self._request_methods: Dict[_RequestType, Callable] = {
             _RequestType.SCHEDULE: self._schedule_job,
@@ -109,10 +130,15 @@ class _JobsManager:
         if self._jobs.get(request.job_id, None):
             raise Exception(f"Logic error. Job with this job_id exists {request.job_id}.")
         else:
-            job = _Job(request.job_id, target=request.target, args=request.args)
+            job = _Job(
+                request.job_id,
+                target=request.target,
+                args=request.args,
+                priority=request.priority,
+                cores=request.cores,
+            )
             self._jobs[job.job_id] = job
-            if len(self._jobs) == 1:
-                self._start_first()
+            self._start_pending()
 
     def _abort_job(self, request: _Request) -> None:
         job = self._jobs.get(request.job_id, None)
@@ -131,9 +157,9 @@ class _JobsManager:
             # if job spawns subprocess it will be terminated
             job.to_be_aborted = True
 
-        # job is in jobs queue and it is not alive and does not have subprocess
+        # job is in jobs queue waiting for resources, it has not been started
         # so it can be deleted from queue
-        elif not job.is_alive() and job.subprocess_handle is None:
+        elif job.resources is None:
             del self._jobs[job.job_id]
 
         # if request has event it means that it is synchronous request waiting for job to end
@@ -152,13 +178,6 @@ class _JobsManager:
     def _add_process_handle(self, request: _Request) -> None:
         """Add process handle to job object on jobs queue."""
         job = self._jobs.get(request.job_id, None)
-        # check for current assumption that only one job runs at a time,
-        # remove this check if running multiple jobs simultaneously is allowed
-        if job is not self._get_first():
-            raise Exception(
-                "Logic error.\
-                 Try to add subprocess to job different than first in queue.",
-            )
         if job is None:
             # because of delay in handling jobs requests,
             # job may finish before its' add_subprocess is handled
@@ -178,28 +197,25 @@ class _JobsManager:
         job = self._jobs.get(request.job_id, None)
         if job is None:
             raise Exception("Processing job end notification but job doest not exist.")
-        # check if selected job is first in queue,
-        # remove this check if jobs' parallelism is allowed
-        if job != self._get_first():
-            raise Exception("Tries to delete job that is not first in queue.")
+        if job.resources is None:
+            raise Exception("Tries to delete job that has not been started.")
         del self._jobs[request.job_id]
-        self._start_first()
-
-    def _start_first(self) -> None:
-        """Start first job in queue, in case of empty queue do nothing."""
-        first_job = self._get_first()
-        if first_job is None:
-            # there is no more jobs in queue
-            return
-        if not first_job.is_alive():
-            first_job.start()
-        else:
-            raise Exception("Logic error, first job is already running.")
-
-    def _get_first(self) -> Optional[_Job]:
-        """Return reference to first job in queue, none in case of empty queue."""
-        try:
-            first = next(iter(self._jobs.values()))
-        except StopIteration:
-            first = None
-        return first
+        self._resource_pool.release(job.resources)
+        job.resources = None
+        self._start_pending()
+
+    def _start_pending(self) -> None:
+        """Start waiting jobs in priority order while there are free resources for them."""
+        for job in self._get_pending():
+            resources = self._resource_pool.allocate(job.requested_cores)
+            if resources is None:
+                # keep priority order, do not let later jobs overtake the waiting one
+                return
+            job.resources = resources
+            job.start()
+
+    def _get_pending(self) -> List[_Job]:
+        """Return jobs that have not been started yet, highest priority first."""
+        pending = [job for job in self._jobs.values() if job.resources is None]
+        # sort is stable, so jobs with the same priority keep their scheduling order
+        return sorted(pending, key=lambda job: -job.priority)
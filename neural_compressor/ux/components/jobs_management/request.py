@@ -40,3 +40,5 @@ class _Request:
     request_id: Optional[str] = None
     process_handle: Optional[Popen] = None
     event: Optional[Event] = None
+    priority: int = 0
+    cores: Optional[int] = None
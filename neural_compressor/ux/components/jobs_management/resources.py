@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Defines CPU topology and resource pool used to run jobs in parallel."""
+import glob
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from neural_compressor.ux.utils.logger import log
+
+
+def _parse_cpu_list(cpu_list: str) -> List[int]:
+    """Parse cpu list in kernel format, e.g. '0-3,8,10-11'."""
+    cpus: List[int] = []
+    for part in cpu_list.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-")
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+class _CpuTopology:
+    """CPU topology of the platform as list of NUMA nodes with their cores."""
+
+    def __init__(self, nodes: Optional[Dict[int, List[int]]] = None) -> None:
+        if nodes is None:
+            nodes = self._read_nodes()
+        self._nodes: Dict[int, List[int]] = {
+            node: sorted(cores) for node, cores in nodes.items() if cores
+        }
+
+    @property
+    def nodes(self) -> Dict[int, List[int]]:
+        return self._nodes
+
+    @property
+    def cores(self) -> int:
+        return sum(len(cores) for cores in self._nodes.values())
+
+    @staticmethod
+    def _read_nodes() -> Dict[int, List[int]]:
+        """Read NUMA nodes from sysfs, fall back to single node with all available cpus."""
+        available_cpus = _CpuTopology._available_cpus()
+        nodes: Dict[int, List[int]] = {}
+        for node_path in glob.glob("/sys/devices/system/node/node[0-9]*"):
+            match = re.search(r"node(\d+)$", node_path)
+            if match is None:
+                continue
+            try:
+                with open(os.path.join(node_path, "cpulist")) as cpu_list_file:
+                    cpus = _parse_cpu_list(cpu_list_file.read())
+            except (OSError, ValueError):
+                continue
+            nodes[int(match.group(1))] = [cpu for cpu in cpus if cpu in available_cpus]
+        if not any(nodes.values()):
+            nodes = {0: sorted(available_cpus)}
+        return nodes
+
+    @staticmethod
+    def _available_cpus() -> set:
+        """Get cpus that current process is allowed to run on."""
+        try:
+            return set(os.sched_getaffinity(0))
+        except AttributeError:
+            return set(range(os.cpu_count() or 1))
+
+
+@dataclass(frozen=True)
+class _ResourceSlice:
+    """Cores and NUMA nodes assigned to a job."""
+
+    cores: Tuple[int, ...]
+    nodes: Tuple[int, ...]
+
+    @property
+    def env(self) -> Dict[str, str]:
+        """Environment variables limiting threading libraries to the slice."""
+        return {"OMP_NUM_THREADS": str(len(self.cores))}
+
+
+class _ResourcePool:
+    """Hands out disjoint core slices of the CPU topology to jobs."""
+
+    def __init__(
+        self,
+        topology: Optional[_CpuTopology] = None,
+        max_parallel_jobs: Optional[int] = None,
+    ) -> None:
+        self._topology: _CpuTopology = topology if topology is not None else _CpuTopology()
+        self._free: Dict[int, List[int]] = {
+            node: list(cores) for node, cores in self._topology.nodes.items()
+        }
+        self._allocated: int = 0
+        if max_parallel_jobs is None:
+            max_parallel_jobs = len(self._topology.nodes)
+        self._max_parallel_jobs: int = max(1, max_parallel_jobs)
+        log.debug(
+            f"Jobs resource pool: {len(self._topology.nodes)} NUMA node(s), "
+            f"{self._topology.cores} core(s), up to {self._max_parallel_jobs} parallel job(s).",
+        )
+
+    @property
+    def default_cores(self) -> int:
+        """Cores assigned to a job that does not request a specific number of cores."""
+        return max(1, self._topology.cores // self._max_parallel_jobs)
+
+    def allocate(self, cores: Optional[int] = None) -> Optional[_ResourceSlice]:
+        """Allocate slice of requested size, return None when there are not enough free cores."""
+        if self._allocated >= self._max_parallel_jobs:
+            return None
+        if cores is None:
+            cores = self.default_cores
+        cores = min(max(1, cores), self._topology.cores)
+        if sum(len(free) for free in self._free.values()) < cores:
+            return None
+
+        # prefer single NUMA node with the fewest free cores that fits the request,
+        # otherwise span nodes starting from the ones with most free cores
+        fitting_nodes = [node for node, free in self._free.items() if len(free) >= cores]
+        if fitting_nodes:
+            node_order = [min(fitting_nodes, key=lambda node: len(self._free[node]))]
+        else:
+            node_order = sorted(self._free, key=lambda node: len(self._free[node]), reverse=True)
+
+        assigned_cores: List[int] = []
+        assigned_nodes: List[int] = []
+        for node in node_order:
+            needed = cores - len(assigned_cores)
+            if needed <= 0:
+                break
+            taken = self._free[node][:needed]
+            if not taken:
+                continue
+            self._free[node] = self._free[node][len(taken) :]
+            assigned_cores.extend(taken)
+            assigned_nodes.append(node)
+
+        self._allocated += 1
+        return _ResourceSlice(cores=tuple(sorted(assigned_cores)), nodes=tuple(assigned_nodes))
+
+    def release(self, resources: _ResourceSlice) -> None:
+        """Return slice cores to the pool."""
+        for node, node_cores in self._topology.nodes.items():
+            returned = [core for core in resources.cores if core in node_cores]
+            self._free[node] = sorted(self._free[node] + returned)
+        self._allocated = max(0, self._allocated - 1)
@@ -19,11 +19,13 @@ import datetime
 import json
 import os
 import re
+import shlex
+import shutil
 import subprocess
 import threading
 import uuid
 from contextlib import ExitStack
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from neural_compressor.ux.components.jobs_management import jobs_control_queue
 from neural_compressor.ux.components.jobs_management.jobs_manager import _Job
@@ -115,9 +117,19 @@ class Proc(object):
             ignore_exit_codes if ignore_exit_codes and isinstance(ignore_exit_codes, list) else [0]
         )
 
+        current_thread_obj = threading.current_thread()
+        cores: Optional[Tuple[int, ...]] = None
+        # pin subprocess to the cores assigned to the job it runs in
+        if isinstance(current_thread_obj, _Job) and current_thread_obj.resources is not None:
+            cores = current_thread_obj.resources.cores
+            env = {**(env if env is not None else os.environ), **current_thread_obj.resources.env}
+        taskset = shutil.which("taskset") if cores else None
+
         try:
             self.args = args
-            cmd: Union[str, Any] = " ".join(map(str, args)) if shell else map(str, args)
+            cmd: Union[str, Any] = " ".join(map(str, args)) if shell else list(map(str, args))
+            if taskset:
+                cmd = bind_to_cores(cmd, cores, taskset)  # type: ignore
             proc = subprocess.Popen(
                 cmd,
                 stdin=subprocess.PIPE,
@@ -131,7 +143,11 @@ class Proc(object):
                 startupinfo=startupinfo,
                 creationflags=creationflags,
             )
-            current_thread_obj = threading.current_thread()
+            if cores and not taskset and hasattr(os, "sched_setaffinity"):
+                try:
+                    os.sched_setaffinity(proc.pid, cores)
+                except ProcessLookupError:
+                    log.debug("Process %s finished before it was pinned.", proc.pid)
             # check if function was called in Job object
             if isinstance(current_thread_obj, _Job):
                 jobs_control_queue.add_subprocess(current_thread_obj.job_id, proc)
@@ -294,3 +310,26 @@ class Proc(object):
         """
         os.remove(self.output_path)
         os.remove(self.info_path)
+
+
+def bind_to_cores(
+    cmd: Union[str, List[str]],
+    cores: Iterable[int],
+    taskset: str = "taskset",
+) -> Union[str, List[str]]:
+    """
+    Prefix command with taskset, so the process starts pinned to the cores.
+
+    The binding is part of the command instead of a preexec_fn, which is not safe to run
+    in the forked child while other job threads are running.
+
+    :param cmd: command as shell string or list of arguments
+    :param cores: cores to pin the process to
+    :param taskset: path to taskset executable
+    :return: command of the same type as the given one
+    """
+    cpu_list = ",".join(map(str, cores))
+    if isinstance(cmd, str):
+        # pin the whole shell command, not only its first program
+        return " ".join([shlex.quote(taskset), "-c", cpu_list, "/bin/sh", "-c", shlex.quote(cmd)])
+    return [taskset, "-c", cpu_list] + list(cmd)
@@ -256,6 +256,7 @@ class Router:
                 args=args,
                 job_id=job_id,
                 request_id=request_id,
+                priority=int(data.get("priority", 0)),
             )
             return {"exit_code": 102, "message": "processing"}
         raise ValueError(
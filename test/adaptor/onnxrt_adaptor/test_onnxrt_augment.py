@@ -11,6 +11,7 @@ sys.path.append('..')
 from neural_compressor.experimental.data.datasets.dataset import Dataset
 from neural_compressor.adaptor.ox_utils.calibration import ONNXRTAugment
 from neural_compressor.model.onnx_model import ONNXModel
+from neural_compressor.utils.tensor_store import TensorStore
 from neural_compressor.data import Datasets, DATALOADERS
 
 def generate_input_initializer(tensor_shape, tensor_dtype, input_name):
@@ -148,6 +149,33 @@ class TestAugment(unittest.TestCase):
         map_dumped_tensors = augment.dump_tensor()
         assert "gather" in map_dumped_tensors["activation"][0]
 
+    def test_dump_tensor_to_store(self):
+        model, dataloader = self.cv_session
+        augment = ONNXRTAugment(ONNXModel(model),
+                                dataloader,
+                                [],
+                                iterations=[0, 1],
+                                white_nodes=["conv", "relu"])
+        map_dumped_tensors = augment.dump_tensor(weight=True)
+        augment = ONNXRTAugment(ONNXModel(model),
+                                dataloader,
+                                [],
+                                iterations=[0, 1],
+                                white_nodes=["conv", "relu"])
+        with TensorStore(os.path.join(self.work_space, 'dump'), 'w') as store:
+            stored_tensors = augment.dump_tensor(weight=True, store=store)
+        self.assertEqual(len(stored_tensors["activation"]), 2)
+        stored_tensors["activation"].append(TensorStore(os.path.join(self.work_space, 'dump')).load(1))
+        for dumped, stored in zip(map_dumped_tensors["activation"] + map_dumped_tensors["activation"][1:],
+                                  stored_tensors["activation"]):
+            self.assertEqual(list(dumped.keys()), list(stored.keys()))
+            for node_name in dumped:
+                for tensor_name, tensor in dumped[node_name].items():
+                    self.assertTrue(np.array_equal(tensor, stored[node_name][tensor_name]))
+        self.assertEqual(list(map_dumped_tensors["weight"].keys()), list(stored_tensors["weight"].keys()))
+        for tensor_name, tensor in map_dumped_tensors["weight"]["conv"].items():
+            self.assertTrue(np.array_equal(tensor, stored_tensors["weight"]["conv"][tensor_name]))
+
     def test_dump_calibration(self):
         model, dataloader = self.cv_session
         augment = ONNXRTAugment(ONNXModel(model),
@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+import onnxruntime as ort
+from onnx import helper, TensorProto, numpy_helper
+
+from neural_compressor.adaptor.ox_utils.io_binding import IOBindingRunner
+
+
+def build_model():
+    A = helper.make_tensor_value_info('A', TensorProto.FLOAT, ['N', 1, 5, 5])
+    B_init = numpy_helper.from_array(np.random.randn(1, 1, 3, 3).astype(np.float32), 'B')
+    D = helper.make_tensor_value_info('D', TensorProto.FLOAT, ['N', 1, 5, 5])
+    conv_node = helper.make_node('Conv', ['A', 'B'], ['C'], name='conv', kernel_shape=[3, 3], pads=[1, 1, 1, 1])
+    relu_node = helper.make_node('Relu', ['C'], ['D'], name='relu')
+    graph = helper.make_graph([conv_node, relu_node], 'test_graph', [A], [D], [B_init])
+    return helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+
+
+def build_nonzero_model():
+    A = helper.make_tensor_value_info('A', TensorProto.FLOAT, [4])
+    B = helper.make_tensor_value_info('B', TensorProto.INT64, [1, None])
+    nonzero_node = helper.make_node('NonZero', ['A'], ['B'], name='nonzero')
+    graph = helper.make_graph([nonzero_node], 'test_graph', [A], [B])
+    return helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+
+
+class TestIOBindingRunner(unittest.TestCase):
+    def create_session(self, model):
+        return ort.InferenceSession(model.SerializeToString(), providers=['CPUExecutionProvider'])
+
+    def test_run(self):
+        session = self.create_session(build_model())
+        self.assertTrue(IOBindingRunner.is_supported(session))
+        runner = IOBindingRunner(session)
+        inputs = [{'A': np.random.randn(2, 1, 5, 5).astype(np.float32)} for _ in range(3)]
+
+        output = runner.run(inputs[0])[0]
+        self.assertTrue(np.allclose(output, session.run(None, inputs[0])[0]))
+        # a retained output is not overwritten
+        output = runner.run(inputs[1])[0]
+        expected = session.run(None, inputs[1])[0]
+        self.assertTrue(np.allclose(output, expected))
+        runner.run(inputs[2])
+        self.assertTrue(np.allclose(output, expected))
+
+        # a released output buffer is reused
+        address = runner.run(inputs[0])[0].ctypes.data
+        output = runner.run(inputs[1])[0]
+        self.assertEqual(output.ctypes.data, address)
+        self.assertTrue(np.allclose(output, session.run(None, inputs[1])[0]))
+
+        # another input shape allocates new outputs
+        inputs = {'A': np.random.randn(3, 1, 5, 5).astype(np.float32)}
+        output = runner.run(inputs)[0]
+        self.assertEqual(output.shape, (3, 1, 5, 5))
+        self.assertTrue(np.allclose(output, session.run(None, inputs)[0]))
+
+    def test_data_dependent_outputs(self):
+        session = self.create_session(build_nonzero_model())
+        runner = IOBindingRunner(session)
+        self.assertEqual(runner.run({'A': np.array([1, 0, 1, 0], dtype=np.float32)})[0].tolist(), [[0, 2]])
+        self.assertEqual(runner.run({'A': np.array([1, 1, 1, 0], dtype=np.float32)})[0].tolist(), [[0, 1, 2]])
+        self.assertFalse(runner.reuse_outputs)
+        self.assertEqual(runner.run({'A': np.array([0, 0, 0, 1], dtype=np.float32)})[0].tolist(), [[3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import copy
+import unittest
+
+import numpy as np
+import onnx
+from onnx import helper, TensorProto, numpy_helper
+
+from neural_compressor.adaptor.ox_utils.calibration import ONNXRTAugment
+from neural_compressor.adaptor.ox_utils.session_pool import SessionPool
+from neural_compressor.data import Datasets, DATALOADERS
+from neural_compressor.model.onnx_model import ONNXModel
+
+
+def build_model():
+    A = helper.make_tensor_value_info('A', TensorProto.FLOAT, [1, 1, 5, 5])
+    B_init = numpy_helper.from_array(np.random.randn(1, 1, 3, 3).astype(np.float32), 'B')
+    D = helper.make_tensor_value_info('D', TensorProto.FLOAT, [1, 1, 5, 5])
+    conv_node = helper.make_node('Conv', ['A', 'B'], ['C'], name='conv', kernel_shape=[3, 3], pads=[1, 1, 1, 1])
+    relu_node = helper.make_node('Relu', ['C'], ['D'], name='relu')
+    graph = helper.make_graph([conv_node, relu_node], 'test_graph', [A], [D], [B_init])
+    return helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+
+
+class TestSessionPool(unittest.TestCase):
+    def test_get_session(self):
+        pool = SessionPool(max_size=2)
+        model = build_model()
+        providers = ['CPUExecutionProvider']
+        session = pool.get_session(model, providers)
+        self.assertIs(pool.get_session(model, providers), session)
+        # an equal model shares the session
+        self.assertIs(pool.get_session(copy.deepcopy(model), providers), session)
+        self.assertIsNot(pool.get_session(model, providers, intra_op_num_threads=1), session)
+        self.assertIsNot(pool.get_session(model, providers, enable_mem_pattern=False), session)
+
+        inputs = {'A': np.random.randn(1, 1, 5, 5).astype(np.float32)}
+        output = pool.get_session(model, providers).run(None, inputs)[0]
+        # edits in place that keep the number of nodes and tensors get a new session
+        model.graph.initializer[0].CopyFrom(
+            numpy_helper.from_array(np.zeros((1, 1, 3, 3), dtype=np.float32), 'B'))
+        new_output = pool.get_session(model, providers).run(None, inputs)[0]
+        self.assertTrue(np.any(output != 0))
+        self.assertTrue(np.all(new_output == 0))
+        model.graph.initializer[0].CopyFrom(
+            numpy_helper.from_array(np.ones((1, 1, 3, 3), dtype=np.float32), 'B'))
+        model.graph.node[0].attribute[1].ints[:] = [0, 0, 0, 0]  # pads
+        model.graph.node[0].input[0] = 'A'
+        model.graph.output[0].type.tensor_type.shape.dim[2].dim_value = 3
+        model.graph.output[0].type.tensor_type.shape.dim[3].dim_value = 3
+        new_output = pool.get_session(model, providers).run(None, inputs)[0]
+        self.assertEqual(new_output.shape, (1, 1, 3, 3))
+        self.assertEqual(len(pool._sessions), 2)
+
+        with self.assertRaises(AssertionError):
+            pool.get_session(model, providers, log_severity_level=1)
+
+    def test_calibration_reuses_session(self):
+        pool = SessionPool()
+        model = ONNXModel(build_model())
+        dataset = Datasets('onnxrt_qlinearops')['dummy'](shape=(2, 1, 5, 5), label=True)
+        dataloader = DATALOADERS['onnxrt_qlinearops'](dataset)
+        results = []
+        for _ in range(2):
+            augment = ONNXRTAugment(model, dataloader, ['Conv'], iterations=[0, 1], session_pool=pool)
+            results.append(augment.dump_minmax())
+        self.assertEqual(len(pool._sessions), 1)
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import types
+import unittest
+
+import torch
+import torch.nn as nn
+
+from neural_compressor.adaptor.torch_utils.hawq_metric import HessianTrace
+
+
+class Model(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.fc1 = nn.Linear(4, 6)
+        self.fc2 = nn.Linear(6, 3)
+
+    def forward(self, x):
+        return self.fc2(torch.tanh(self.fc1(x)))
+
+
+class TestHessianTrace(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.model = Model()
+        dataset = torch.utils.data.TensorDataset(torch.randn(16, 4), torch.randint(0, 3, (16,)))
+        self.dataloader = torch.utils.data.DataLoader(dataset, batch_size=8)
+
+    def get_exact_traces(self, ht):
+        traces = {}
+        for name, param in ht.model.named_parameters():
+            def loss_fn(value):
+                cnt, loss = 0, 0.
+                for input, target in self.dataloader:
+                    output = torch.func.functional_call(ht.model, {name: value}, (input,))
+                    loss = loss + nn.CrossEntropyLoss()(output, target) * input.shape[0]
+                    cnt += input.shape[0]
+                return loss / cnt
+            hessian = torch.autograd.functional.hessian(loss_fn, param.detach())
+            traces[name] = float(hessian.reshape(param.numel(), param.numel()).diagonal().sum()) / param.numel()
+        return traces
+
+    def test_weight_traces(self):
+        ht = HessianTrace(types.SimpleNamespace(model=self.model), self.dataloader, None)
+        ht.max_iter = 4000
+        ht.layer_tolerance = 0
+        op_to_traces = ht.get_weight_traces(num_samples=16)
+        self.assertEqual(ht._grad_cache, [])
+        exact_traces = self.get_exact_traces(ht)
+        for op_name in ["fc1", "fc2"]:
+            self.assertAlmostEqual(op_to_traces[op_name], exact_traces[op_name + ".weight"],
+                                   delta=0.1 * abs(exact_traces[op_name + ".weight"]))
+
+    def test_layer_convergence(self):
+        ht = HessianTrace(types.SimpleNamespace(model=self.model), self.dataloader, None)
+        ht.layer_tolerance = 0.2
+        probed, cached = [], []
+        get_vtHv_weight = ht.get_vtHv_weight
+        def probe(params, num_samples, num_probes):
+            probed.append(len(params))
+            result = get_vtHv_weight(params, num_samples, num_probes)
+            cached.append(len(ht._grad_cache))
+            return result
+        ht.get_vtHv_weight = probe
+        ht.get_weight_traces(num_samples=16)
+        self.assertEqual(probed[0], 2)  # only the weights
+        # only the gradient graph of the first batch is kept across rounds
+        self.assertEqual(max(cached), ht.max_cached_batches)
+        self.assertLess(len(probed), ht.max_iter / ht.num_probes)
+        self.assertEqual(sorted(probed, reverse=True), probed)
+
+
+if __name__ == "__main__":
+    unittest.main()
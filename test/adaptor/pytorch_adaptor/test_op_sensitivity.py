@@ -0,0 +1,103 @@
+import copy
+import unittest
+
+import torch
+import torch.nn as nn
+
+from neural_compressor.adaptor.pytorch import _cfg_to_qconfig
+from neural_compressor.adaptor.torch_utils.util import FakeQuantToggle, get_mse_order_per_fp32, \
+    get_mse_order_per_int8
+
+int8_cfg = {
+    'activation': {'dtype': 'uint8', 'scheme': 'asym', 'granularity': 'per_tensor',
+                   'algorithm': 'minmax', 'quant_mode': 'static'},
+    'weight': {'dtype': 'int8', 'scheme': 'sym', 'granularity': 'per_channel', 'algorithm': 'minmax'}}
+fp32_cfg = {'activation': {'dtype': 'fp32'}, 'weight': {'dtype': 'fp32'}}
+embedding_cfg = {
+    'activation': {'dtype': 'fp32', 'compute_dtype': 'None', 'scheme': 'asym', 'granularity': 'per_tensor',
+                   'algorithm': 'placeholder', 'quant_mode': 'static'},
+    'weight': {'dtype': 'uint8', 'scheme': 'asym_float', 'granularity': 'per_channel', 'algorithm': 'minmax'}}
+
+
+class Model(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.conv1 = nn.Conv2d(3, 8, 3)
+        self.conv2 = nn.Conv2d(8, 8, 3)
+        self.fc = nn.Linear(8, 4)
+
+    def forward(self, x):
+        x = torch.relu(self.conv2(torch.relu(self.conv1(x))))
+        return self.fc(x.mean(dim=(2, 3)))
+
+
+class EmbeddingModel(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.embedding = nn.Embedding(16, 8)
+        self.fc = nn.Linear(8, 4)
+
+    def forward(self, x):
+        return self.fc(self.embedding(x).mean(dim=1))
+
+
+class TestOpSensitivity(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.model = Model().eval()
+        self.example_inp = torch.randn(2, 3, 16, 16)
+        ops = [('conv1', 'Conv2d'), ('conv2', 'Conv2d'), ('fc', 'Linear')]
+        self.tune_cfg = {'approach': 'post_training_static_quant',
+                         'op': {op: copy.deepcopy(int8_cfg) for op in ops}}
+
+    def test_fake_quant_toggle(self):
+        op_cfgs = _cfg_to_qconfig(self.tune_cfg, self.tune_cfg['approach'])
+        qconfigs = {name: qconfig for name, qconfig in op_cfgs.items() if name != 'bf16_ops_list'}
+        weight = self.model.conv1.weight.detach().clone()
+        toggle = FakeQuantToggle(self.model, qconfigs, self.example_inp, 'fc')
+        self.assertEqual(toggle.get_mse(), 0)
+        toggle.set_quantized('conv1')
+        mse_conv1 = toggle.get_mse()
+        self.assertGreater(mse_conv1, 0)
+        toggle.set_quantized('conv2')
+        self.assertGreater(toggle.get_mse(), 0)
+        toggle.set_quantized('conv2', False)
+        self.assertEqual(toggle.get_mse(), mse_conv1)
+        toggle.remove()
+        # the fp32 model is not changed
+        self.assertTrue(torch.equal(self.model.conv1.weight, weight))
+        self.assertEqual(len(self.model.conv1._forward_pre_hooks), 0)
+        self.assertEqual(len(self.model.fc._forward_hooks), 0)
+
+    def test_mse_order(self):
+        ordered_ops = get_mse_order_per_fp32(None, self.model, self.example_inp, self.tune_cfg)
+        self.assertEqual(sorted(ordered_ops), [('conv1', 'Conv2d'), ('conv2', 'Conv2d'), ('fc', 'Linear')])
+        self.tune_cfg['op'][('conv1', 'Conv2d')] = copy.deepcopy(fp32_cfg)
+        self.tune_cfg['op'][('conv2', 'Conv2d')] = copy.deepcopy(fp32_cfg)
+        ordered_ops = get_mse_order_per_int8(None, self.model, self.example_inp, self.tune_cfg)
+        self.assertEqual(sorted(ordered_ops), [('conv1', 'Conv2d'), ('conv2', 'Conv2d')])
+
+    def test_embedding(self):
+        model = EmbeddingModel().eval()
+        example_inp = torch.randint(0, 16, (2, 5))
+        tune_cfg = {'approach': 'post_training_static_quant',
+                    'op': {('embedding', 'Embedding'): copy.deepcopy(embedding_cfg),
+                           ('fc', 'Linear'): copy.deepcopy(int8_cfg)}}
+        op_cfgs = _cfg_to_qconfig(tune_cfg, tune_cfg['approach'])
+        qconfigs = {name: qconfig for name, qconfig in op_cfgs.items() if name != 'bf16_ops_list'}
+        toggle = FakeQuantToggle(model, qconfigs, example_inp, 'fc')
+        toggle.set_quantized('embedding')
+        # the weight is quantized per row with float zero points, the output is kept in fp32
+        self.assertEqual(toggle.forward().dtype, torch.float)
+        self.assertGreater(toggle.get_mse(), 0)
+        toggle.remove()
+
+        ordered_ops = get_mse_order_per_fp32(None, model, example_inp, tune_cfg)
+        self.assertEqual(sorted(ordered_ops), [('embedding', 'Embedding'), ('fc', 'Linear')])
+        tune_cfg['op'][('embedding', 'Embedding')] = copy.deepcopy(fp32_cfg)
+        ordered_ops = get_mse_order_per_int8(None, model, example_inp, tune_cfg)
+        self.assertEqual(ordered_ops, [('embedding', 'Embedding')])
+
+
+if __name__ == "__main__":
+    unittest.main()
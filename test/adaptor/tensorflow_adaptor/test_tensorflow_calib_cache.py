@@ -0,0 +1,87 @@
+#
+#  -*- coding: utf-8 -*-
+#
+import os
+import shutil
+import unittest
+
+import neural_compressor
+from neural_compressor.adaptor.tensorflow import TensorflowQuery
+from neural_compressor.adaptor.tf_utils.graph_converter import GraphConverter
+from neural_compressor.adaptor.tf_utils.util import disable_random
+from neural_compressor.data import Datasets, DATALOADERS
+from neural_compressor.experimental.common import Model
+
+import tensorflow as tf
+
+
+class TestCalibrationCache(unittest.TestCase):
+    workspace = './calib_cache_test'
+
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    @disable_random()
+    def build_graph(self):
+        x = tf.compat.v1.placeholder(tf.float32, [None, 16, 16, 8], name="input")
+        conv1_weights = tf.compat.v1.get_variable("weight1", [3, 3, 8, 8],
+                                                  initializer=tf.compat.v1.random_normal_initializer())
+        conv1 = tf.nn.conv2d(x, conv1_weights, strides=[1, 1, 1, 1], padding="SAME", name='conv1')
+        relu1 = tf.nn.relu(conv1)
+        conv2_weights = tf.compat.v1.get_variable("weight2", [3, 3, 8, 8],
+                                                  initializer=tf.compat.v1.random_normal_initializer())
+        conv2 = tf.nn.conv2d(relu1, conv2_weights, strides=[1, 1, 1, 1], padding="SAME", name='conv2')
+        relu2 = tf.nn.relu(conv2)
+        tf.identity(relu2, name='op_to_store')
+        with tf.compat.v1.Session() as sess:
+            sess.run(tf.compat.v1.global_variables_initializer())
+            return tf.compat.v1.graph_util.convert_variables_to_constants(
+                sess=sess, input_graph_def=sess.graph_def, output_node_names=['op_to_store'])
+
+    def convert(self, graph_def, op_names, calib_cache):
+        model = Model(graph_def)
+        model.workspace_path = self.workspace
+        op_wise_sequences = TensorflowQuery(local_config_file=os.path.join(
+            os.path.dirname(neural_compressor.__file__), "adaptor/tensorflow.yaml")).get_eightbit_patterns()
+        qt_config = {'calib_iteration': 2,
+                     'op_wise_config': {name: (False, 'minmax', False, 7.0) for name in op_names}}
+        converter = GraphConverter(model, qt_config=qt_config, int8_sequences=op_wise_sequences,
+                                   data_loader=self.dataloader, calib_cache=calib_cache)
+        inference = converter._inference
+        def count_inference(model):
+            self.inference_cnt += 1
+            return inference(model)
+        converter._inference = count_inference
+        return converter.convert().graph_def
+
+    def test_calibration_cache(self):
+        os.makedirs(self.workspace, exist_ok=True)
+        graph_def = self.build_graph()
+        dataset = Datasets('tensorflow')['dummy'](shape=(4, 16, 16, 8), label=True)
+        self.dataloader = DATALOADERS['tensorflow'](dataset, batch_size=1)
+        calib_cache = {}
+
+        self.inference_cnt = 0
+        q_graph_def = self.convert(graph_def, ['conv1', 'conv2'], calib_cache)
+        self.assertEqual(self.inference_cnt, 1)
+        self.assertEqual(len(calib_cache), 2)
+
+        # an op falls back to fp32, the other op reuses its calibration data
+        fallback_graph_def = self.convert(graph_def, ['conv2'], calib_cache)
+        self.assertEqual(self.inference_cnt, 1)
+        self.assertEqual(fallback_graph_def, self.convert(graph_def, ['conv2'], None))
+        self.assertEqual(self.inference_cnt, 2)
+
+        # both ops are quantized again without calibration
+        self.assertEqual(q_graph_def, self.convert(graph_def, ['conv1', 'conv2'], calib_cache))
+        self.assertEqual(self.inference_cnt, 2)
+
+        # a different calibration setting is calibrated again
+        self.dataloader = DATALOADERS['tensorflow'](dataset, batch_size=2)
+        self.convert(graph_def, ['conv1', 'conv2'], calib_cache)
+        self.assertEqual(self.inference_cnt, 3)
+        self.assertEqual(len(calib_cache), 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -107,7 +107,8 @@ class TestTensorflowInspectTensortinMSETuning(unittest.TestCase):
             self.cfg_path = os.path.join(os.getcwd(), 'nc_workspace\\')
             self.dumped_tensor_path = os.path.join(os.getcwd(), 'nc_workspace\\')
         self.cfg_file_path = os.path.join(self.cfg_path, 'cfg.pkl')
-        self.dumped_tensor_file_path = os.path.join(self.dumped_tensor_path, 'inspect_result.pkl')
+        # the fp32 and the quantized models are dumped to their own directories
+        self.dumped_tensor_file_path = os.path.join(self.dumped_tensor_path, 'quan', 'inspect_result.pkl')
 
     @classmethod
     def tearDownClass(self):
@@ -127,7 +128,8 @@ class TestTensorflowInspectTensortinMSETuning(unittest.TestCase):
         quantizer.model = model
         quantizer.fit()
         self.assertEqual(os.path.exists(self.dumped_tensor_path), True)
-        data = load_data_from_pkl(self.dumped_tensor_path, 'inspect_result.pkl')
+        self.assertEqual(os.path.exists(os.path.join(self.dumped_tensor_path, 'fp32', 'inspect_result.pkl')), True)
+        data = load_data_from_pkl(os.path.join(self.dumped_tensor_path, 'quan'), 'inspect_result.pkl')
         self.assertEqual('activation' in data, True)
         self.assertEqual(set(data['activation'][0].keys()), set(['pool_1', 'conv2d_2', 'conv2d_1']))
         self.assertEqual(len(data['activation'][0].keys()), 3)
@@ -0,0 +1,112 @@
+"""Tests for the benchmark autotune"""
+import glob
+import shutil
+import time
+import unittest
+
+import numpy as np
+import yaml
+from onnx import helper, TensorProto, numpy_helper
+
+from neural_compressor.experimental.benchmark_autotune import SuccessiveHalving, \
+    get_candidates, get_instance_layouts, measure
+
+
+def build_matmul_model():
+    A = helper.make_tensor_value_info('A', TensorProto.FLOAT, ['N', 16])
+    B_init = numpy_helper.from_array(np.random.randn(16, 16).astype(np.float32), 'B')
+    C = helper.make_tensor_value_info('C', TensorProto.FLOAT, ['N', 16])
+    matmul_node = helper.make_node('MatMul', ['A', 'B'], ['C'], name='matmul')
+    graph = helper.make_graph([matmul_node], 'test_graph', [A], [C], [B_init])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 7
+    return model
+
+
+class TestBenchmarkAutotune(unittest.TestCase):
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree('nc_workspace', ignore_errors=True)
+
+    def test_candidates(self):
+        self.assertEqual(get_instance_layouts(8), [(1, 8), (2, 4), (4, 2), (8, 1)])
+        self.assertEqual(get_instance_layouts(8, [2, 3, 16]), [(2, 4), (3, 2)])
+        candidates = get_candidates([1, 8], [(1, 4), (2, 2)], [1, 2])
+        self.assertEqual(len(candidates), 8)
+        self.assertIn({'batch_size': 8, 'num_of_instance': 2, 'cores_per_instance': 2,
+                       'intra_num_of_threads': 2, 'inter_num_of_threads': 1}, candidates)
+
+    def test_successive_halving(self):
+        evaluated = []
+        def evaluate(candidate, iteration):
+            evaluated.append(iteration)
+            # larger batches have higher throughput and higher latency
+            batch_size = candidate['batch_size']
+            return batch_size * candidate['num_of_instance'], float(batch_size)
+
+        candidates = get_candidates([1, 2, 4, 8, 16, 32, 64, 128], [(1, 2), (2, 1)], [1])
+        halving = SuccessiveHalving(evaluate, min_iteration=2)
+        best_throughput, best_latency = halving.search(candidates)
+        self.assertEqual((best_throughput['batch_size'], best_throughput['num_of_instance']),
+                         (128, 2))
+        self.assertEqual(best_latency['batch_size'], 1)
+        # 16 candidates, then 8, 4 and 2 with doubled iterations
+        self.assertEqual(evaluated, [2] * 16 + [4] * 8 + [8] * 4 + [16] * 2)
+        self.assertEqual(len(halving.trials), 30)
+        self.assertEqual(best_throughput['iteration'], 16)
+
+    def test_measure(self):
+        def instance(inputs):
+            time.sleep(0.01)
+        throughput, latency = measure([instance, instance], [None], 4, 5, warmup=1)
+        self.assertGreater(latency, 9)
+        self.assertGreater(throughput, 4 * 2 / 0.015)
+        self.assertLess(throughput, 4 * 2 / 0.01)
+
+    def test_autotune(self):
+        from neural_compressor.benchmark import fit
+        from neural_compressor.config import BenchmarkConfig, AutotuneConfig
+        from neural_compressor.data import Datasets, DATALOADERS
+        dataset = Datasets('onnxrt_qlinearops')['dummy'](shape=(32, 16), label=True)
+        dataloader = DATALOADERS['onnxrt_qlinearops'](dataset, batch_size=2)
+        conf = BenchmarkConfig(warmup=1, autotune=AutotuneConfig(
+            batch_size=[1, 4, 16], num_of_instance=[1], inter_num_of_threads=[1, 2]))
+        results = fit(build_matmul_model(), conf, b_dataloader=dataloader)['autotune']
+        # the 6 candidates are measured, then the best ones again
+        self.assertGreater(len(results['trials']), 6)
+        self.assertIn(results['throughput'], results['trials'])
+        self.assertIn(results['latency'], results['trials'])
+        config = results['configs']['throughput']
+        self.assertIsInstance(config, BenchmarkConfig)
+        self.assertEqual(config.num_of_instance, 1)
+        # b_dataloader is batched back
+        self.assertEqual(dataloader.batch_size, 2)
+        with open(glob.glob('nc_workspace/*/benchmark_autotune.yaml')[0]) as f:
+            settings = yaml.safe_load(f)
+        self.assertEqual(settings['latency']['batch_size'], results['latency']['batch_size'])
+        self.assertEqual(settings['throughput']['configs']['inter_num_of_threads'],
+                         results['throughput']['inter_num_of_threads'])
+
+        with self.assertRaises(AssertionError):
+            AutotuneConfig(batch_size=[1.5])
+
+    def test_autotune_pytorch(self):
+        import torch
+        from neural_compressor.benchmark import fit
+        from neural_compressor.config import BenchmarkConfig, AutotuneConfig
+        from neural_compressor.data import Datasets, DATALOADERS
+        dataset = Datasets('pytorch')['dummy'](shape=(32, 16), label=True)
+        dataloader = DATALOADERS['pytorch'](dataset, batch_size=2)
+        conf = BenchmarkConfig(warmup=1, autotune=AutotuneConfig(
+            batch_size=[1, 4], num_of_instance=[1, 2], inter_num_of_threads=[1, 2]))
+        inter_num_threads = torch.get_num_interop_threads()
+        results = fit(torch.nn.Linear(16, 16), conf, b_dataloader=dataloader)['autotune']
+        # torch threads are of the process, only the batch size is tuned
+        self.assertEqual(set((trial['batch_size'], trial['num_of_instance'],
+                              trial['inter_num_of_threads']) for trial in results['trials']),
+                         set([(1, 1, None), (4, 1, None)]))
+        self.assertEqual(torch.get_num_interop_threads(), inter_num_threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Tests for the server scenario load generator"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+from onnx import helper, TensorProto, numpy_helper
+
+from neural_compressor.experimental.load_generator import LoadGenerator, poisson_arrivals, \
+    trace_arrivals
+
+
+def build_matmul_model():
+    A = helper.make_tensor_value_info('A', TensorProto.FLOAT, ['N', 16])
+    B_init = numpy_helper.from_array(np.random.randn(16, 16).astype(np.float32), 'B')
+    C = helper.make_tensor_value_info('C', TensorProto.FLOAT, ['N', 16])
+    matmul_node = helper.make_node('MatMul', ['A', 'B'], ['C'], name='matmul')
+    graph = helper.make_graph([matmul_node], 'test_graph', [A], [C], [B_init])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 7
+    return model
+
+
+def sleep_instance(seconds):
+    def predict(inputs):
+        time.sleep(seconds)
+    return predict
+
+
+class TestLoadGenerator(unittest.TestCase):
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree('nc_workspace', ignore_errors=True)
+
+    def test_arrivals(self):
+        arrivals = poisson_arrivals(1000, 5000, seed=1)
+        self.assertEqual(len(arrivals), 5000)
+        self.assertTrue(np.all(np.diff(arrivals) >= 0))
+        self.assertAlmostEqual(len(arrivals) / arrivals[-1], 1000, delta=50)
+        self.assertTrue(np.allclose(arrivals, poisson_arrivals(1000, 5000, seed=1)))
+
+        trace = [3., 1., 1.5, 2.]
+        self.assertEqual(trace_arrivals(trace).tolist(), [0., 0.5, 1., 2.])
+        self.assertEqual(trace_arrivals(trace, qps=6).tolist(), [0., 0.125, 0.25, 0.5])
+        # repeated one mean interval after the last arrival
+        arrivals = trace_arrivals(trace, num_queries=6)
+        self.assertTrue(np.allclose(arrivals, [0., 0.5, 1., 2., 2.6666667, 3.1666667]))
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write('\n'.join(str(t) for t in trace))
+        self.assertEqual(trace_arrivals(f.name).tolist(), [0., 0.5, 1., 2.])
+        os.remove(f.name)
+        with self.assertRaises(AssertionError):
+            trace_arrivals([1., 1.])
+
+    def test_run(self):
+        generator = LoadGenerator([sleep_instance(0.01)], [None], warmup=1)
+        # far below the capacity of 100 queries per second, no query waits
+        result = generator.run(trace_arrivals(np.arange(10), qps=20))
+        self.assertAlmostEqual(result['qps'], 20, delta=0.1)
+        self.assertLess(result['p50'], 15)
+        # the queries arriving at once wait for the previous ones
+        result = generator.run(np.zeros(10))
+        self.assertGreater(result['p99'], 90)
+        self.assertLess(result['throughput'], 110)
+
+        generator = LoadGenerator([sleep_instance(0.01), sleep_instance(0.01)], [None])
+        result = generator.run(np.zeros(10), percentiles=(95,))
+        self.assertLess(result['p95'], 70)
+        self.assertGreater(result['throughput'], 150)
+
+        curve = generator.sweep([10, 20], 10, seed=1)
+        self.assertEqual(len(curve), 2)
+        self.assertLess(curve[0]['qps'], curve[1]['qps'])
+
+    def test_find_max_qps(self):
+        generator = LoadGenerator([sleep_instance(0.01)], [None])
+        result = generator.find_max_qps(40, 30, seed=1, max_qps=200)
+        self.assertIsNotNone(result)
+        self.assertLessEqual(result['p99'], 40)
+        self.assertLess(result['qps'], 110)
+        # no rate meets a latency objective below the inference time
+        self.assertIsNone(generator.find_max_qps(5, 5, trace=[0., 1.], max_qps=1000))
+
+    def test_server_scenario(self):
+        from neural_compressor.benchmark import fit
+        from neural_compressor.config import BenchmarkConfig, ServerScenarioConfig
+        from neural_compressor.data import Datasets, DATALOADERS
+        dataset = Datasets('onnxrt_qlinearops')['dummy'](shape=(8, 16), label=True)
+        dataloader = DATALOADERS['onnxrt_qlinearops'](dataset, batch_size=2)
+        conf = BenchmarkConfig(warmup=2, cores_per_instance=1, num_of_instance=1,
+                               server_scenario=ServerScenarioConfig(
+                                   target_qps=[50, 100], num_queries=20, latency_slo=1000))
+        results = fit(build_matmul_model(), conf, b_dataloader=dataloader)
+        curve = results['server']['curve']
+        self.assertEqual(len(curve), 2)
+        self.assertLess(curve[0]['qps'], curve[1]['qps'])
+        self.assertIsNotNone(results['server']['max_qps'])
+
+        with self.assertRaises(AssertionError):
+            ServerScenarioConfig(target_qps=['10'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1282,6 +1282,29 @@ class TestDataloader(unittest.TestCase):
             dataset = datasets['dummy'](\
                 shape=[(4, 256, 256, 3), (4, 256, 256, 3)], dtype=['float32', 'int8', 'int8'])
 
+    def test_onnxrt_num_workers(self):
+        transforms = TRANSFORMS('onnxrt_qlinearops', 'preprocess')
+        transform = transforms['Compose']([transforms['Resize'](size=24), transforms['CenterCrop'](size=16),
+            transforms['Normalize'](mean=[0.5, 0.5, 0.5], std=[0.2, 0.2, 0.2]),
+            transforms['Transpose'](perm=[2, 0, 1])])
+        images = [np.random.randint(0, 255, (32, 40, 3), dtype=np.uint8) for _ in range(5)]
+        class list_dataset(object):
+            def __getitem__(self, index):
+                return transform((images[index], index))
+            def __len__(self):
+                return len(images)
+        batches = []
+        for num_workers in [0, 4]:
+            data_loader = DATALOADERS['onnxrt_qlinearops'](list_dataset(), batch_size=2,
+                                                           num_workers=num_workers)
+            batches.append(list(data_loader))
+        self.assertEqual(len(batches[1]), 3)
+        self.assertEqual(batches[1][0][0].shape, (2, 3, 16, 16))
+        self.assertEqual(batches[1][0][0].dtype, np.float32)
+        for batch, expected in zip(batches[1], batches[0]):
+            self.assertTrue((batch[0] == expected[0]).all())
+            self.assertEqual(list(batch[1]), list(expected[1]))
+
     def test_onnx_integer_dummy(self):
         datasets = Datasets('onnxrt_integerops')
         dataset = datasets['dummy'](shape=(4, 256, 256, 3))
@@ -732,6 +732,81 @@ class TestTFTransorm(unittest.TestCase):
         os.remove('dev.json')
         os.remove('vocab.txt')
  
+class TestSquadFeatures(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import json
+        words = ['super', 'bowl', 'game', 'team', 'american', 'football', 'which', 'nfl']
+        with open('squad_vocab.txt', 'w') as f:
+            f.write('\n'.join(['[PAD]', '[UNK]', '[CLS]', '[SEP]'] + words))
+        paragraphs = [{'context': ' '.join(random.choice(words) for _ in range(random.randint(5, 60))),
+                       'qas': [{'question': 'which nfl team', 'id': 'q{}_{}'.format(p, q), 'answers': []} \
+                               for q in range(2)]} for p in range(300)]
+        with open('squad_dev.json', 'w') as f:
+            json.dump({'data': [{'paragraphs': paragraphs}]}, f)
+
+    @classmethod
+    def tearDownClass(cls):
+        import shutil
+        os.remove('squad_vocab.txt')
+        os.remove('squad_dev.json')
+        shutil.rmtree('dataset_cached', ignore_errors=True)
+
+    def get_fields(self, features):
+        return [(feature.unique_id, feature.example_index, feature.doc_span_index, feature.tokens,
+                 feature.token_to_orig_map, feature.token_is_max_context, list(feature.input_ids),
+                 list(feature.input_mask), list(feature.segment_ids)) for feature in features]
+
+    def testConvertInProcesses(self):
+        from neural_compressor.data.transforms import tokenization
+        from neural_compressor.data.transforms.transform import read_squad_examples, \
+            convert_examples_to_features
+        examples = read_squad_examples('squad_dev.json')
+        tokenizer = tokenization.FullTokenizer(vocab_file='squad_vocab.txt')
+        results = []
+        for num_workers in [1, 2]:
+            features = []
+            convert_examples_to_features(examples, tokenizer, max_seq_length=32, doc_stride=16,
+                                         max_query_length=8, output_fn=features.append,
+                                         num_workers=num_workers)
+            results.append(self.get_fields(features))
+        self.assertGreater(len(results[0]), len(examples))
+        self.assertEqual(results[0], results[1])
+
+    def testCache(self):
+        from neural_compressor.data.transforms.transform import read_squad_examples, load_squad_features
+        examples = read_squad_examples('squad_dev.json')
+        args = ('squad_dev.json', 'squad_vocab.txt', 32, 16, 8, True)
+        features = load_squad_features(examples, *args)
+        self.assertEqual(len(os.listdir('dataset_cached')), 1)
+        cached_features = load_squad_features(examples, *args)
+        self.assertIsInstance(cached_features[0].input_ids, np.memmap)
+        self.assertEqual(self.get_fields(features), self.get_fields(cached_features))
+        # another doc stride is cached separately
+        load_squad_features(examples, 'squad_dev.json', 'squad_vocab.txt', 32, 8, 8, True)
+        self.assertEqual(len(os.listdir('dataset_cached')), 2)
+
+    def testPostTransformNumWorkers(self):
+        from unittest.mock import patch
+        from neural_compressor.data.transforms import transform
+        post_transforms = TRANSFORMS('tensorflow', 'postprocess')
+        with patch.object(transform, 'load_squad_features', wraps=transform.load_squad_features) as load:
+            squadv1 = post_transforms['SquadV1'](label_file='squad_dev.json', vocab_file='squad_vocab.txt',
+                                                  max_seq_length=32, doc_stride=16, num_workers=2)
+        self.assertEqual(load.call_args[1]['num_workers'], 2)
+        self.assertGreater(len(squadv1.eval_features), len(squadv1.eval_examples))
+
+    def testCacheFailure(self):
+        from unittest.mock import patch
+        from neural_compressor.data.transforms.transform import read_squad_examples, load_squad_features
+        examples = read_squad_examples('squad_dev.json')
+        cached = os.listdir('dataset_cached') if os.path.exists('dataset_cached') else []
+        with patch('os.replace', side_effect=OSError('rename failed')):
+            features = load_squad_features(examples, 'squad_dev.json', 'squad_vocab.txt', 32, 4, 8, True)
+        self.assertGreater(len(features), len(examples))
+        # the temporary directory is removed
+        self.assertEqual(os.listdir('dataset_cached'), cached)
+
 class TestAlignImageChannel(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -906,6 +981,40 @@ class TestONNXTransfrom(unittest.TestCase):
         with self.assertRaises(ValueError):
             TestONNXTransfrom.transforms["Normalize"](**args)
 
+    def testFusedCompose(self):
+        import pickle
+        def get_transform_list():
+            return [TestONNXTransfrom.transforms['Resize'](size=[60, 50]),
+                    TestONNXTransfrom.transforms['CenterCrop'](size=40),
+                    TestONNXTransfrom.transforms['Normalize'](mean=[0.4, 0.5, 0.6], std=[0.2, 0.25, 0.3]),
+                    TestONNXTransfrom.transforms['Transpose'](perm=[2, 0, 1]),
+                    TestONNXTransfrom.transforms['Cast'](dtype='float32')]
+        transform_list = get_transform_list()
+        compose = TestONNXTransfrom.transforms['Compose'](get_transform_list())
+        for image in [np.random.randint(0, 255, (100, 80, 3), dtype=np.uint8), TestONNXTransfrom.img]:
+            expected = (image, None)
+            for transform in transform_list:
+                expected = transform(expected)
+            for _ in range(2):
+                image_result = compose((image, None))
+                self.assertEqual(image_result[0].shape, (3, 40, 40))
+                self.assertTrue(image_result[0].flags['C_CONTIGUOUS'])
+                self.assertTrue((image_result[0] == expected[0]).all())
+        self.assertEqual(len(compose._fused_list), 1)
+        # the images are not promoted to float64
+        uint8_image = np.random.randint(0, 255, (100, 80, 3), dtype=np.uint8)
+        self.assertEqual(transform_list[2]((uint8_image, None))[0].dtype, np.float32)
+        new_compose = pickle.loads(pickle.dumps(compose))
+        self.assertTrue((new_compose((uint8_image, None))[0] == compose((uint8_image, None))[0]).all())
+
+        # the transforms inserted after the init are applied
+        compose.transform_list.insert(0, TestONNXTransfrom.transforms['Resize'](size=20))
+        self.assertEqual(compose((uint8_image, None))[0].shape, (3, 40, 40))
+        self.assertEqual(len(compose._fused_list), 1)
+        compose.transform_list.insert(2, TestONNXTransfrom.transforms['RandomCrop'](size=45))
+        self.assertEqual(compose((uint8_image, None))[0].shape, (3, 40, 40))
+        self.assertEqual(len(compose._fused_list), 3)
+
     def testRandomCrop(self):
         args = {'size':[50]}
         randomcrop = TestONNXTransfrom.transforms["RandomCrop"](**args)
@@ -158,5 +158,59 @@ class TestCOCO(unittest.TestCase):
                     1, [0,1,2], mask, np.array([0.8]), np.array([1]))
         self.assertEqual(len(result), 1)
 
+    def testCOCOBoxEvaluator(self):
+        from pycocotools.cocoeval import COCOeval
+        from neural_compressor.experimental.metric.coco_eval import COCOBoxEvaluator
+        rng = np.random.RandomState(0)
+        category_ids = set([1, 2, 3])
+        settings = [('0.5:0.05:0.95', 101), (0.5, 0), (0.75, 11)]
+        evaluators = [COCOBoxEvaluator(category_ids, *setting) for setting in settings]
+        groundtruths, detections = [], []
+        image_ids = ['image_{}'.format(i) for i in rng.permutation(20)]
+        for index, image_id in enumerate(image_ids):
+            # rounded boxes and scores make equal IoUs and scores
+            gt_boxes = np.round(rng.rand(5, 4) * 10) * 20
+            gt_boxes[:, 2:] += gt_boxes[:, :2] + 10
+            gt_classes = rng.randint(1, 5, size=5)
+            det_boxes = np.round(gt_boxes[rng.randint(0, 5, size=8)] + rng.randn(8, 4) * 10)
+            det_scores = np.round(rng.rand(8), 1)
+            det_classes = rng.randint(1, 5, size=8).astype(np.float32)
+            for evaluator in evaluators:
+                evaluator.add_image(image_id, gt_boxes, gt_classes, det_boxes, det_scores,
+                                    det_classes)
+            groundtruths.extend(ExportSingleImageGroundtruthToCoco(
+                image_id, index * 5 + 1, category_ids, gt_boxes, gt_classes))
+            detections.extend(ExportSingleImageDetectionBoxesToCoco(
+                image_id, category_ids, det_boxes, det_scores, det_classes))
+        groundtruth = COCOWrapper({
+            'annotations': groundtruths,
+            'images': [{'id': image_id} for image_id in image_ids],
+            'categories': [{'id': i, 'name': str(i)} for i in category_ids]})
+        for (iou_thrs, map_points), evaluator in zip(settings, evaluators):
+            expected, _ = COCOEvalWrapper(groundtruth, groundtruth.LoadAnnotations(detections),
+                                          iou_thrs=iou_thrs, map_points=map_points).ComputeMetrics()
+            self.assertEqual(evaluator.compute_metrics(num_workers=2), expected)
+            self.assertEqual(evaluator.compute_metrics(num_workers=1), expected)
+            self.assertGreater(expected['Precision/mAP'], 0)
+        # a float iou_thrs does not report mAP@.50IOU and map_points 0 reports a recall of 1
+        self.assertEqual(expected['Precision/mAP@.75IOU'], -1)
+        self.assertEqual(evaluators[1].compute_metrics()['Recall/AR@100'], 1)
+
+        # the standard metrics are the ones of pycocotools
+        coco_eval = COCOeval(groundtruth, groundtruth.LoadAnnotations(detections), 'bbox')
+        coco_eval.evaluate()
+        coco_eval.accumulate()
+        coco_eval.summarize()
+        np.testing.assert_allclose(list(evaluators[0].compute_metrics().values()),
+                                   coco_eval.stats)
+
+        evaluator = evaluators[0]
+        evaluator.reset()
+        self.assertEqual(evaluator.num_groundtruths, 0)
+        self.assertEqual(evaluator.compute_metrics()['Precision/mAP'], -1)
+        with self.assertRaises(ValueError):
+            evaluator.add_image('image', np.zeros((1, 4)), np.array([1]), np.zeros((2, 4)),
+                                np.zeros(2), np.zeros(3))
+
 if __name__ == "__main__":
     unittest.main()
@@ -64,6 +64,52 @@ class TestMetrics(unittest.TestCase):
         with self.assertRaises(ValueError):
             bleu.update(['a','b'], ('c',))
 
+    def testBLEU_accumulate(self):
+        metrics = METRICS('tensorflow')
+        preds = ['Gutach: Mehr Sicherheit für Fußgänger',
+                 'Dies wurde auch von Peter Arnold vom Offenburg District Office bestätigt.']
+        labels = ('Gutach: Noch mehr Sicherheit für Fußgänger',
+                  'Dies bestätigt auch Peter Arnold vom Landratsamt Offenburg.')
+        bleu = metrics['BLEU']()
+        bleu.update(preds, labels)
+        expected = bleu.result()
+        bleu.reset()
+        for pred, label in zip(preds, labels):
+            bleu.update([pred], (label,))
+        self.assertAlmostEqual(bleu.result(), expected)
+
+        bleu = metrics['BLEU'](num_workers=2)
+        bleu.update(preds * 3, labels * 3)
+        self.assertIsNotNone(bleu._pool)
+        self.assertAlmostEqual(bleu.result(), expected)
+        self.assertIsNone(bleu._pool)
+        bleu.reset()
+        bleu.update(preds, labels)
+        bleu.reset()
+        self.assertIsNone(bleu._pool)
+        self.assertEqual(bleu.stats.sum(), 0)
+        bleu.update(preds, labels)
+        self.assertAlmostEqual(bleu.result(), expected)
+        bleu.close()
+
+    def test_squad_F1(self):
+        metrics = METRICS('tensorflow')
+        squad_f1 = metrics['SquadF1']()
+        label = [{'paragraphs':\
+            [{'qas':[{'answers': [{'answer_start': 177, 'text': 'Denver Broncos'}], \
+                      'question': 'Which NFL team represented the AFC at Super Bowl 50?', \
+                      'id': '56be4db0acb8001400a502ec'}]}]}]
+        squad_f1.update({'56be4db0acb8001400a502ec': 'Denver Broncos'}, label)
+        self.assertEqual(squad_f1.result(), 100.)
+        label = [{'paragraphs':\
+            [{'qas':[{'answers': [{'answer_start': 403, 'text': 'Santa Clara, California'}], \
+                      'question': 'Where did Super Bowl 50 take place?', \
+                      'id': '56be4db0acb8001400a502ee'}]}]}]
+        squad_f1.update({'56be4db0acb8001400a502ee': 'Levi Stadium'}, label)
+        self.assertEqual(squad_f1.result(), 50.)
+        squad_f1.reset()
+        self.assertEqual(squad_f1.result(), 0.)
+
     def test_onnxrt_GLUE(self):
         metrics = METRICS('onnxrt_qlinearops')
         glue = metrics['GLUE']('mrpc')
@@ -1,3 +1,4 @@
+import ast
 import os
 import shutil
 import unittest
@@ -131,6 +132,8 @@ class TestNAS(unittest.TestCase):
         os.remove('fake.yaml')
         os.remove('dynas_fake.yaml')
         os.remove('search_results.csv')
+        if os.path.exists('search_results.db'):
+            os.remove('search_results.db')
         shutil.rmtree(os.path.join(os.getcwd(), 'NASResults'), ignore_errors=True)
         shutil.rmtree('runs', ignore_errors=True)
 
@@ -209,6 +212,40 @@ class TestNAS(unittest.TestCase):
         nas_agent.validation_interface.clear_csv()
         os.remove('tmp.pickle')
 
+    def test_results_store(self):
+        from neural_compressor.experimental.nas.dynast.dynas_manager import \
+            ParameterManager
+        from neural_compressor.experimental.nas.dynast.dynas_utils import \
+            EvaluationInterface, ResultsStore
+        store = ResultsStore('tmp_results.db')
+        self.assertEqual(store.import_csv('search_results.csv'), 11)
+        store.add({'d': [2]}, 1.0, 2.0, 3.0, vector=[0, 1])
+        store.add({'d': [2]}, 1.5, 2.0, 3.0, vector=[0, 1])
+        self.assertEqual(len(store), 12)
+        self.assertTrue(store.contains([0, 1]))
+        self.assertFalse(store.contains([1, 0]))
+        self.assertEqual(store.records()[-1][2], 1.5)
+        store.export_csv('tmp_results.csv', ['Sub-network', 'Date', 'Latency (ms)', 'MACs', 'Top-1 Acc (%)'])
+        store.clear()
+        self.assertEqual(store.import_csv('tmp_results.csv'), 12)
+        # the imported subnets get their pymoo vectors from the manager
+        store.clear()
+        manager = ParameterManager(param_dict={
+            'ks': {'count': 20, 'vars': [3, 5, 7]},
+            'e': {'count': 20, 'vars': [3, 4, 6]},
+            'd': {'count': 5, 'vars': [2, 3, 4]}})
+        self.assertEqual(store.import_csv('search_results.csv', manager), 11)
+        config = ast.literal_eval(store.records()[0][0])
+        self.assertTrue(store.contains(manager.translate2pymoo(config)))
+        # clearing the csv file also empties the store
+        interface = EvaluationInterface(None, manager, csv_path='tmp_results.csv',
+                                        results_store=store)
+        interface.clear_csv()
+        self.assertEqual(len(store), 0)
+        store.close()
+        os.remove('tmp_results.db')
+        os.remove('tmp_results.csv')
+
     def test_vision_reference(self):
         from neural_compressor.experimental.nas.dynast.dynas_utils import \
             TorchVisionReference
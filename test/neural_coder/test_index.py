@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from neural_coder import globals
+from neural_coder.graphers import index
+from neural_coder.graphers.code_line import register_code_line
+from neural_coder.graphers.function import register_func_wrap_pair
+from neural_coder.graphers.model import register_nnModule_class, register_nnModule_instance_definition
+
+code = '''import torch.nn as nn
+
+class Net(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.fc = nn.Linear(2, 2)
+
+    def forward(self, x):
+        return self.fc(x)
+
+class SubNet(Net):
+    pass
+
+def _net():
+    model = Net()
+    return model
+
+def net_large():
+    return _net()
+
+model = net_large()
+'''
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        self.workspace = tempfile.mkdtemp()
+        self.path = os.path.join(self.workspace, "model.py")
+        with open(self.path, "w") as f:
+            f.write(code)
+        index.index_cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def test_file_index(self):
+        file_index = index.index_files([self.path])[0]
+        self.assertTrue(file_index.parsed)
+        self.assertEqual(
+            [(c.class_name, c.parent_class_name) for c in file_index.classes],
+            [("Net", ["nn.Module"]), ("SubNet", ["Net"])])
+        self.assertEqual(file_index.func_wrap_pairs, [("_net", "model"), ("net_large", "_net")])
+
+        code_lines = file_index.get_code_lines(self.path)
+        self.assertEqual(len(code_lines), len(code.split("\n")))
+        self.assertEqual(code_lines[8].func_name, "forward")
+        self.assertEqual(code_lines[8].class_name, "Net")
+        self.assertEqual(code_lines[14].func_return_idx, 15)
+        self.assertEqual(code_lines[14].definition, (True, "model", "Net"))
+
+    def test_line_scan_compatibility(self):
+        # returns of nested defs belong to the outermost function and the comments
+        # and empty lines following a function belong to it, like in the line-based scan
+        nested_code = """def get_model(pretrained):
+    def _load(model):
+        return model
+    # build the model
+
+    model = Net()
+    if pretrained:
+        return _load(model)
+
+    # trailing comment
+
+def forward(x):
+    return
+
+model = get_model(True)
+"""
+        from neural_coder.graphers.code_line import _scan_code_lines
+        from neural_coder.graphers.function import _scan_func_wrap_pair
+        file_index = index.build_file_index(nested_code)
+        self.assertTrue(file_index.parsed)
+        self.assertEqual(file_index.func_wrap_pairs, _scan_func_wrap_pair(nested_code))
+        fields = ["is_in_func", "func_name", "func_def_line_idx", "func_end_line_idx", "func_return_idx",
+                  "return_item"]
+        for cl, scanned_cl in zip(file_index.code_lines, _scan_code_lines(None, nested_code)):
+            self.assertEqual([getattr(cl, f) for f in fields], [getattr(scanned_cl, f) for f in fields])
+        self.assertEqual(file_index.code_lines[10].func_name, "get_model")
+        self.assertEqual(file_index.code_lines[10].func_return_idx, 7)
+        self.assertEqual(file_index.code_lines[12].func_return_idx, 12)
+
+    def test_cache(self):
+        first = index.index_files([self.path])[0]
+        self.assertIs(index.index_files([self.path])[0], first)
+
+        # same content at another path reuses the index
+        copy_path = os.path.join(self.workspace, "model_nc_enabled.py")
+        shutil.copy(self.path, copy_path)
+        self.assertIs(index.index_files([copy_path])[0], first)
+
+        with open(self.path, "a") as f:
+            f.write("def other():\n    return model\n")
+        os.utime(self.path, (time.time() + 10, time.time() + 10))
+        changed = index.index_files([self.path])[0]
+        self.assertIsNot(changed, first)
+        self.assertIn(("other", "model"), changed.func_wrap_pairs)
+
+    def test_unparsable_file(self):
+        with open(self.path, "w") as f:
+            f.write("class Net(nn.Module):\n    print 'python 2'\n")
+        file_index = index.index_files([self.path])[0]
+        self.assertFalse(file_index.parsed)
+        self.assertEqual([c.class_name for c in file_index.classes], ["Net"])
+
+    def test_register(self):
+        globals.reset_globals()
+        globals.list_code_path = [self.path]
+        register_code_line()
+        register_func_wrap_pair()
+        register_nnModule_class()
+        register_nnModule_instance_definition()
+        self.assertEqual(sorted(globals.list_class_name), ["Net", "SubNet"])
+        self.assertEqual(globals.list_model_name, ["model"])
+        self.assertEqual(sorted(globals.list_wrapper_all_function_name), ["_net", "net_large"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from neural_coder.utils import parallel_sweep
+
+FPS = {
+    (): 100,
+    ("pytorch_ipex_fp32",): 150,
+    ("pytorch_inc_dynamic_quant",): 50,
+    ("pytorch_channels_last",): 110,
+    ("pytorch_ipex_fp32", "pytorch_channels_last"): 170,
+    ("pytorch_inc_dynamic_quant", "pytorch_channels_last"): 60,
+}
+
+class FakeCPUinfo:
+    def node_nums(self):
+        return 2
+
+    def get_node_physical_cores(self, node_id):
+        return [[3, 2, 1, 0], [4, 5, 6, 7]][node_id]
+
+class TestParallelSweep(unittest.TestCase):
+    def setUp(self):
+        self.list_features = [list(features) for features in FPS]
+        self.list_features[0] = ["pytorch_cuda_to_cpu"]
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def run_features(self, features, num_benchmark_iteration, slot_idx):
+        with self.lock:
+            self.calls.append((tuple(features), num_benchmark_iteration, slot_idx))
+        fps = FPS[tuple(parallel_sweep.optimization_features(features))]
+        return [fps, 0, 0, 0, 0, 0], "throughput", "ws"
+
+    def test_get_sweep_slots(self):
+        self.assertEqual(parallel_sweep.get_sweep_slots(FakeCPUinfo()), [[0, 1, 2, 3], [4, 5, 6, 7]])
+
+    def test_sweep_features(self):
+        result = parallel_sweep.sweep_features(
+            self.list_features, self.run_features, 10,
+            iteration_dynamic_adjust=False, prune_threshold=0, max_parallel=2)
+        self.assertEqual([r[0] for r in result], self.list_features)
+        self.assertEqual(result[4][1][0], 170)
+        # the original model runs first (dry-run), then all the others on both slots
+        self.assertEqual(self.calls[0][0], ("pytorch_cuda_to_cpu",))
+        self.assertEqual({call[2] for call in self.calls[1:]}, {0, 1})
+
+    def test_prune_dominated_features(self):
+        result = parallel_sweep.sweep_features(
+            self.list_features, self.run_features, 10,
+            iteration_dynamic_adjust=True, prune_threshold=0.8, max_parallel=1,
+            logger=logging.getLogger(__name__))
+        swept = [r[0] for r in result]
+        self.assertIn(["pytorch_ipex_fp32", "pytorch_channels_last"], swept)
+        self.assertNotIn(["pytorch_inc_dynamic_quant", "pytorch_channels_last"], swept)
+        self.assertEqual(len(swept), 5)
+        self.assertTrue(all(call[1] >= 5 for call in self.calls[1:]))
+
+    def test_failed_run(self):
+        def run_features(features, num_benchmark_iteration, slot_idx):
+            if "pytorch_channels_last" in features:
+                raise RuntimeError("failed")
+            return self.run_features(features, num_benchmark_iteration, slot_idx)
+
+        result = parallel_sweep.sweep_features(
+            self.list_features, run_features, 10, iteration_dynamic_adjust=False, prune_threshold=0.8)
+        swept = {tuple(r[0]): r[1] for r in result}
+        # failed runs are marked, not reported as zero throughput
+        self.assertIsNone(swept[("pytorch_channels_last",)])
+        self.assertNotIn(("pytorch_ipex_fp32", "pytorch_channels_last"), swept)
+
+    def test_code_workspace(self):
+        workspace = tempfile.mkdtemp()
+        try:
+            src_root = os.path.join(workspace, "project")
+            os.makedirs(os.path.join(src_root, "data"))
+            os.makedirs(os.path.join(src_root, "models"))
+            open(os.path.join(src_root, "main.py"), "w").write("print('main')\n")
+            open(os.path.join(src_root, "utils.py"), "w").write("")
+            open(os.path.join(src_root, "models", "resnet.py"), "w").write("")
+            open(os.path.join(src_root, "models", "vgg.py"), "w").write("")
+            open(os.path.join(src_root, "data", "images.bin"), "w").write("data")
+            entry_code = os.path.join(src_root, "main.py")
+            dst_root = os.path.join(workspace, "copy", "project")
+            parallel_sweep.copy_code_workspace(
+                src_root, dst_root, [entry_code, os.path.join(src_root, "models", "resnet.py")])
+            # only the benchmarked files are copied, everything else is linked
+            self.assertFalse(os.path.islink(os.path.join(dst_root, "main.py")))
+            self.assertFalse(os.path.islink(os.path.join(dst_root, "models")))
+            self.assertFalse(os.path.islink(os.path.join(dst_root, "models", "resnet.py")))
+            self.assertTrue(os.path.islink(os.path.join(dst_root, "models", "vgg.py")))
+            self.assertTrue(os.path.islink(os.path.join(dst_root, "utils.py")))
+            self.assertTrue(os.path.islink(os.path.join(dst_root, "data")))
+
+            self.assertEqual(parallel_sweep.get_code_root([entry_code]), src_root)
+            self.assertEqual(
+                parallel_sweep.relocate_path(entry_code, src_root, dst_root), os.path.join(dst_root, "main.py"))
+
+            sweep = parallel_sweep.ParallelSweep(
+                entry_code, entry_code, workspace, logging.getLogger(__name__), slots=[[0, 1], [2, 3]])
+            self.assertTrue(sweep.available())
+            self.assertFalse(sweep.available(ncores_needed=4))
+            sweep = parallel_sweep.ParallelSweep(
+                entry_code, entry_code, workspace, logging.getLogger(__name__), slots=[[0, 1]])
+            self.assertFalse(sweep.available())
+        finally:
+            shutil.rmtree(workspace)
+
+if __name__ == '__main__':
+    unittest.main()
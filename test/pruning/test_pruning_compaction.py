@@ -0,0 +1,113 @@
+import unittest
+
+import torch
+import torch.nn as nn
+
+from neural_compressor.data import Datasets
+from neural_compressor.experimental.data.dataloaders.pytorch_dataloader import PyTorchDataLoader
+from neural_compressor.pruner.compaction import compact_model, benchmark_compaction
+
+
+class ConvNet(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.conv1 = nn.Conv2d(3, 16, 3, padding=1)
+        self.bn1 = nn.BatchNorm2d(16)
+        self.conv2 = nn.Conv2d(16, 8, 1)
+        self.fc1 = nn.Linear(8, 32)
+        self.fc2 = nn.Linear(32, 4)
+        self.norm = nn.LayerNorm(4)
+        self.fc3 = nn.Linear(4, 2)
+
+    def forward(self, x):
+        x = torch.relu(self.bn1(self.conv1(x)))
+        x = self.conv2(x).mean(dim=(2, 3))
+        x = self.fc2(nn.functional.gelu(self.fc1(x)))
+        return self.fc3(self.norm(x))
+
+
+class Attention(nn.Module):
+    """Mimics the head pruning of BERT-like attentions."""
+
+    def __init__(self, hidden_size=8, num_heads=4):
+        super().__init__()
+        self.self = nn.Module()
+        self.self.num_attention_heads = num_heads
+        self.self.attention_head_size = hidden_size // num_heads
+        self.self.value = nn.Linear(hidden_size, hidden_size)
+        self.output = nn.Module()
+        self.output.dense = nn.Linear(hidden_size, hidden_size)
+        self.pruned_heads = set()
+
+    def prune_heads(self, heads):
+        size = self.self.attention_head_size
+        heads = [head - sum(1 for pruned in self.pruned_heads if pruned < head) for head in heads]
+        keep = [i for i in range(self.self.value.out_features) if i // size not in heads]
+        index = torch.tensor(keep)
+        self.self.value.weight = nn.Parameter(self.self.value.weight.data[index])
+        self.self.value.bias = nn.Parameter(self.self.value.bias.data[index])
+        self.output.dense.weight = nn.Parameter(self.output.dense.weight.data[:, index])
+        self.self.num_attention_heads -= len(heads)
+        self.pruned_heads |= set(heads)
+
+    def forward(self, x):
+        return self.output.dense(self.self.value(x))
+
+
+class TestPruningCompaction(unittest.TestCase):
+    def test_compact_model(self):
+        torch.manual_seed(0)
+        model = ConvNet()
+        with torch.no_grad():
+            model.bn1.running_mean.uniform_(-1, 1)
+            model.bn1.bias.fill_(-1.)  # relu(bn(0)) == 0
+            model.conv1.weight[:6] = 0
+            model.conv1.bias[:6] = 0
+            model.bn1.bias[:3] = 1.  # bn(0) != 0, not removable
+            model.fc1.weight[:20] = 0
+            model.fc1.bias[:20] = 0
+            model.fc2.weight[:, 30:] = 0
+            model.fc3.weight[:, :2] = 0  # across LayerNorm, kept
+        model.eval()
+        data = torch.randn(2, 3, 8, 8)
+        output = model(data)
+        summary = compact_model(model)
+        self.assertEqual(summary["channels"], {"conv1": (16, 13), "fc1": (32, 10)})
+        self.assertEqual(model.bn1.running_var.shape[0], 13)
+        self.assertEqual(model.conv2.in_channels, 13)
+        self.assertEqual(model.fc2.weight.shape, (4, 10))
+        self.assertEqual(model.fc3.in_features, 4)
+        self.assertTrue(torch.allclose(output, model(data), atol=1e-6))
+
+    def test_compact_heads(self):
+        torch.manual_seed(0)
+        model = Attention()
+        with torch.no_grad():
+            model.self.value.weight[2:4] = 0
+            model.self.value.bias[2:4] = 0
+            model.output.dense.weight[:, 6:] = 0
+        data = torch.randn(2, 8)
+        output = model(data)
+        summary = compact_model(model)
+        self.assertEqual(summary["heads"], {"": [1, 3]})
+        self.assertEqual(model.self.num_attention_heads, 2)
+        self.assertTrue(torch.allclose(output, model(data), atol=1e-6))
+
+    def test_benchmark_compaction(self):
+        model = nn.Sequential(nn.Linear(16, 64), nn.ReLU(), nn.Linear(64, 16))
+        with torch.no_grad():
+            model[0].weight[:48] = 0
+            model[0].bias[:48] = 0
+        compacted_model = nn.Sequential(nn.Linear(16, 64), nn.ReLU(), nn.Linear(64, 16))
+        compacted_model.load_state_dict(model.state_dict())
+        compact_model(compacted_model)
+        datasets = Datasets('pytorch')
+        dataset = datasets['dummy'](shape=(8, 16), low=0., high=1., label=True)
+        dataloader = PyTorchDataLoader(dataset, batch_size=4)
+        results = benchmark_compaction(model, compacted_model, dataloader)
+        self.assertGreater(results["dense"]["latency"], 0)
+        self.assertAlmostEqual(results["memory_reduction"], 1 - (16 * 16 + 16 + 16 * 16 + 16) / (16 * 64 + 64 + 64 * 16 + 16))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,8 @@ from neural_compressor.data import Datasets
 from neural_compressor.experimental.data.dataloaders.pytorch_dataloader import PyTorchDataLoader
 from neural_compressor.config import WeightPruningConfig
 from neural_compressor.pruner.pruning import Pruning
+from neural_compressor.pruner.patterns import get_pattern
+from neural_compressor.pruner.utils import process_config
 
 
 class TestPruningPatterns(unittest.TestCase):
@@ -77,6 +79,50 @@ class TestPruningPatterns(unittest.TestCase):
         prune.on_before_eval()
         prune.on_after_eval()
 
+    def test_block_masks(self):
+        modules = {"fc": nn.Linear(32, 16), "conv": nn.Conv2d(8, 16, 3)}
+        config = process_config(WeightPruningConfig([{}], pattern="4x2", target_sparsity=0.5))[0]
+        pattern = get_pattern(config, modules)
+        masks = pattern.get_init_masks(modules)
+        self.assertEqual(masks["fc"].shape, (4, 16))
+        self.assertEqual(masks["conv"].dtype, torch.bool)
+
+        scores = {key: module.weight.detach().abs() for key, module in modules.items()}
+        masks = pattern.get_masks(scores, 0.5, masks)
+        self.assertEqual(pattern.get_sparsity_ratio(masks), 0.5)
+        full_masks = pattern.get_full_masks(masks)
+        for key, module in modules.items():
+            self.assertEqual(full_masks[key].shape, module.weight.shape)
+            weight = module.weight.data.clone()
+            pattern.mask_weight(module.weight.data, masks[key], key)
+            self.assertTrue(torch.equal(module.weight.data, weight * full_masks[key]))
+            self.assertEqual(pattern.count_masked_elements(masks[key], key), int((full_masks[key] == 0).sum()))
+
+        # counts follow in-place updates of the masks
+        masks["fc"][0] = False
+        self.assertEqual(pattern.get_zero_cnt(masks["fc"], "fc"), (int((masks["fc"] == 0).sum()), 64))
+
+    def test_approximate_global_threshold(self):
+        modules = {"fc": nn.Linear(32, 16), "conv": nn.Conv2d(8, 16, 3)}
+        config = process_config(WeightPruningConfig([{}], pattern="1x1", target_sparsity=0.5,
+                                                    global_threshold_type="approximate",
+                                                    global_threshold_error=0.01))[0]
+        pattern = get_pattern(config, modules)
+        scores = [torch.rand(1000), torch.rand(3000) * 2, torch.randint(0, 10, (500,)).float()]
+        total_cnt = 4500
+        for k in [1, 100, 2000, 4500]:
+            threshold = pattern.get_global_threshold(scores, k)
+            cnt = sum(int((score <= threshold).sum()) for score in scores)
+            self.assertLessEqual(abs(cnt - k), 0.01 * total_cnt)
+        # layers reaching their maximum sparsity are clamped
+        threshold = pattern.get_global_threshold(scores, 2000, [500, 3000, 500])
+        cnt = sum(min(int((score <= threshold).sum()), max_cnt) for score, max_cnt in zip(scores, [500, 3000, 500]))
+        self.assertLessEqual(abs(cnt - 2000), 0.01 * total_cnt)
+
+        scores = {key: module.weight.detach().abs() for key, module in modules.items()}
+        masks = pattern.get_masks(scores, 0.5, pattern.get_init_masks(modules))
+        self.assertAlmostEqual(pattern.get_sparsity_ratio(masks), 0.5, delta=0.01)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,472 @@
+"""Benchmark the overhead of Neural Compressor's own hot paths.
+
+Each stage times one internal step on a synthetic model of the chosen size, e.g. the
+tuning space construction, the ONNX Runtime calibration or the TensorFlow graph rewriting,
+and reports the median time of the repeats and the peak memory allocated by Python
+(tracemalloc, which also tracks numpy arrays but not the native allocations of the
+inference runtimes). The stages whose framework is not installed are skipped.
+
+The results are written to a JSON file which can be passed back as the baseline of a
+later run, the stages slower or larger than the baseline by more than the threshold are
+reported and make the run exit with 1:
+
+    python self_benchmark.py --size small --output baseline.json
+    python self_benchmark.py --size small --baseline baseline.json --threshold 0.2
+"""
+import argparse
+import copy
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import OrderedDict
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic_models import build_onnx_model, build_tf_graph, build_torch_model
+
+
+# blocks, channels and size shape the synthetic models, samples is the number of
+# calibration samples, trials the max trials of the tuning runs
+SIZES = {
+    'tiny': {'blocks': 2, 'channels': 4, 'size': 8, 'samples': 2, 'trials': 2,
+             'kl_tensors': 1, 'metric_samples': 16},
+    'small': {'blocks': 8, 'channels': 16, 'size': 16, 'samples': 8, 'trials': 4,
+              'kl_tensors': 4, 'metric_samples': 500},
+    'large': {'blocks': 32, 'channels': 32, 'size': 32, 'samples': 32, 'trials': 8,
+              'kl_tensors': 16, 'metric_samples': 5000},
+}
+
+STAGES = OrderedDict()
+
+
+def stage(name, requires=()):
+    """Register a stage.
+
+    The decorated function takes the size settings and the workspace, prepares the inputs
+    and returns the function to time, which may return a dict of counters to report.
+    """
+    def decorator(setup):
+        STAGES[name] = (setup, requires)
+        return setup
+    return decorator
+
+
+def _fake_eval_func():
+    """Get an eval_func whose quantized models always miss the accuracy goal."""
+    evaluations = []
+
+    def eval_func(model):
+        evaluations.append(1)
+        return 1. if len(evaluations) == 1 else 0.
+    return eval_func, evaluations
+
+
+def _onnxrt_adaptor(workspace):
+    from neural_compressor import options
+    from neural_compressor.adaptor.onnxrt import ONNXRUNTIMEAdaptor
+    return ONNXRUNTIMEAdaptor({'device': 'cpu',
+                               'approach': 'post_training_static_quant',
+                               'random_seed': 1234,
+                               'q_dataloader': None,
+                               'backend': 'default',
+                               'format': 'default',
+                               'graph_optimization': options.onnxrt.graph_optimization,
+                               'workspace_path': workspace,
+                               'recipes': {}})
+
+
+def _onnxrt_dataloader(size):
+    from neural_compressor.data import Datasets, DATALOADERS
+    dataset = Datasets('onnxrt_qlinearops')['dummy'](
+        shape=(size['samples'], size['channels'], size['size'], size['size']), label=True)
+    return DATALOADERS['onnxrt_qlinearops'](dataset, batch_size=1)
+
+
+def _onnxrt_quantize_config(size, workspace):
+    """Get the adaptor, the pre-optimized model and the config quantizing every op."""
+    from neural_compressor.model import Model
+    adaptor = _onnxrt_adaptor(workspace)
+    model = Model(build_onnx_model(size['blocks'], size['channels'], size['size']))
+    capability = adaptor.query_fw_capability(model)
+    tune_cfg = {'calib_iteration': size['samples'], 'op': {}}
+    for op, configs in capability['opwise'].items():
+        tune_cfg['op'][op] = {tensor: {key: value[0] if isinstance(value, list) else value \
+                                       for key, value in config.items()} \
+                              for tensor, config in configs[0].items()}
+    adaptor.quantizable_ops = adaptor._query_quantizable_ops(adaptor.pre_optimized_model.model)
+    return adaptor, adaptor.pre_optimized_model, adaptor._cfg_to_quantize_config(tune_cfg)
+
+
+@stage('onnxrt_capability', requires=('onnx', 'onnxruntime'))
+def onnxrt_capability(size, workspace):
+    from neural_compressor.model import Model
+    model = build_onnx_model(size['blocks'], size['channels'], size['size'])
+
+    def run():
+        capability = _onnxrt_adaptor(workspace).query_fw_capability(Model(model))
+        return {'ops': len(capability['opwise'])}
+    return run
+
+
+@stage('tuning_space', requires=('onnx', 'onnxruntime'))
+def tuning_space(size, workspace):
+    from neural_compressor.model import Model
+    from neural_compressor.strategy.utils.tuning_space import TuningSpace
+    capability = _onnxrt_adaptor(workspace).query_fw_capability(
+        Model(build_onnx_model(size['blocks'], size['channels'], size['size'])))
+
+    def run():
+        TuningSpace({'calib': {'calib_sampling_size': [size['samples']]},
+                     'op': copy.deepcopy(capability['opwise'])}, None,
+                    framework='onnxrt_qlinearops')
+        return {'ops': len(capability['opwise'])}
+    return run
+
+
+@stage('onnxrt_calibration', requires=('onnx', 'onnxruntime'))
+def onnxrt_calibration(size, workspace):
+    from neural_compressor.adaptor.ox_utils.calibration import ONNXRTAugment
+    adaptor, model, quantize_config = _onnxrt_quantize_config(size, workspace)
+    dataloader = _onnxrt_dataloader(size)
+
+    def run():
+        augment = ONNXRTAugment(model, dataloader, adaptor.quantizable_op_types,
+                                white_nodes=[node for node in quantize_config \
+                                             if node != 'calib_iteration'],
+                                iterations=list(range(size['samples'])),
+                                backend=adaptor.backend, reduce_range=adaptor.reduce_range)
+        augment.dump_minmax()
+        quantize_params = augment.dump_calibration(quantize_config)
+        return {'batches': size['samples'], 'tensors': len(quantize_params)}
+    return run
+
+
+@stage('onnxrt_quantize_model', requires=('onnx', 'onnxruntime'))
+def onnxrt_quantize_model(size, workspace):
+    from neural_compressor.adaptor.ox_utils.quantizer import Quantizer
+    from neural_compressor.adaptor.ox_utils.util import QuantizationMode
+    adaptor, model, quantize_config = _onnxrt_quantize_config(size, workspace)
+    quantize_params = adaptor._get_quantize_params(model, _onnxrt_dataloader(size),
+                                                   quantize_config, size['samples'])
+
+    def run():
+        quantizer = Quantizer(copy.deepcopy(model), quantize_config, QuantizationMode.QLinearOps,
+                              True, quantize_params, adaptor.quantizable_op_types,
+                              adaptor.query_handler.get_fallback_list(), adaptor.reduce_range)
+        quantizer.quantize_model()
+        return {'ops': len(quantizer.model.model.graph.node)}
+    return run
+
+
+@stage('onnxrt_fit', requires=('onnx', 'onnxruntime'))
+def onnxrt_fit(size, workspace):
+    """Tune until max_trials, so TuneStrategy.traverse runs its bookkeeping every trial."""
+    from neural_compressor import quantization, PostTrainingQuantConfig
+    from neural_compressor.config import TuningCriterion
+    model = build_onnx_model(size['blocks'], size['channels'], size['size'])
+    dataloader = _onnxrt_dataloader(size)
+
+    def run():
+        eval_func, evaluations = _fake_eval_func()
+        conf = PostTrainingQuantConfig(calibration_sampling_size=[size['samples']],
+                                       tuning_criterion=TuningCriterion(
+                                           max_trials=size['trials']))
+        quantization.fit(model, conf, calib_dataloader=dataloader, eval_func=eval_func)
+        return {'trials': len(evaluations) - 1}
+    return run
+
+
+@stage('tensorflow_graph_converter', requires=('tensorflow',))
+def tensorflow_graph_converter(size, workspace):
+    import neural_compressor
+    from neural_compressor.adaptor.tensorflow import TensorflowQuery
+    from neural_compressor.adaptor.tf_utils.graph_converter import GraphConverter
+    from neural_compressor.data import Datasets, DATALOADERS
+    from neural_compressor.experimental.common import Model
+    graph_def = build_tf_graph(size['blocks'], size['channels'], size['size'])
+    int8_sequences = TensorflowQuery(local_config_file=os.path.join(
+        os.path.dirname(neural_compressor.__file__),
+        'adaptor/tensorflow.yaml')).get_eightbit_patterns()
+    qt_config = {'calib_iteration': size['samples'],
+                 'op_wise_config': {'conv{}_{}'.format(i, j): (False, 'minmax', False, 7.0) \
+                                    for i in range(size['blocks']) for j in range(2)}}
+    dataset = Datasets('tensorflow')['dummy'](
+        shape=(size['samples'], size['size'], size['size'], size['channels']), label=True)
+    dataloader = DATALOADERS['tensorflow'](dataset, batch_size=1)
+
+    def run():
+        model = Model(graph_def)
+        model.workspace_path = workspace
+        converter = GraphConverter(model, qt_config=qt_config, int8_sequences=int8_sequences,
+                                   data_loader=dataloader)
+        return {'ops': len(converter.convert().graph_def.node)}
+    return run
+
+
+@stage('pytorch_fit', requires=('torch',))
+def pytorch_fit(size, workspace):
+    """Tune until max_trials, so TuneStrategy.traverse runs its bookkeeping every trial."""
+    from neural_compressor import quantization, PostTrainingQuantConfig
+    from neural_compressor.config import TuningCriterion
+    from neural_compressor.data import Datasets, DATALOADERS
+    model = build_torch_model(size['blocks'], size['channels'])
+    dataset = Datasets('pytorch')['dummy'](
+        (size['samples'], size['channels'], size['size'], size['size']))
+    dataloader = DATALOADERS['pytorch'](dataset)
+
+    def run():
+        eval_func, evaluations = _fake_eval_func()
+        conf = PostTrainingQuantConfig(calibration_sampling_size=[size['samples']],
+                                       tuning_criterion=TuningCriterion(
+                                           max_trials=size['trials']))
+        quantization.fit(copy.deepcopy(model), conf, calib_dataloader=dataloader,
+                         eval_func=eval_func)
+        return {'trials': len(evaluations) - 1}
+    return run
+
+
+@stage('kl_threshold')
+def kl_threshold(size, workspace):
+    from neural_compressor.utils.kl_divergence import KL_Divergence
+    rng = np.random.RandomState(0)
+    tensors = []
+    for i in range(size['kl_tensors']):
+        # activations after relu and signed activations
+        data = rng.randn(10000) * (i + 1)
+        data = np.abs(data) if i % 2 == 0 else data
+        hist, hist_edges = np.histogram(data, bins=2048)
+        tensors.append((hist, hist_edges, data.min(), data.max()))
+
+    def run():
+        for hist, hist_edges, min_val, max_val in tensors:
+            KL_Divergence().get_threshold(hist, hist_edges, min_val, max_val, 2048, 'uint8')
+        return {'tensors': len(tensors)}
+    return run
+
+
+@stage('metric_topk')
+def metric_topk(size, workspace):
+    from neural_compressor.metric.metric import GeneralTopK
+    rng = np.random.RandomState(0)
+    preds = rng.rand(size['metric_samples'], 1000)
+    labels = rng.randint(0, 1000, size['metric_samples'])
+
+    def run():
+        metric = GeneralTopK(k=5)
+        for start in range(0, len(labels), 32):
+            metric.update(preds[start:start + 32], labels[start:start + 32])
+        metric.result()
+        return {'samples': len(labels)}
+    return run
+
+
+@stage('metric_coco')
+def metric_coco(size, workspace):
+    from neural_compressor.metric.metric import COCOmAPv2
+    rng = np.random.RandomState(0)
+    images = []
+    for i in range(size['metric_samples']):
+        gt_boxes = rng.rand(1, 10, 4) * 0.5
+        gt_boxes[..., 2:] += gt_boxes[..., :2] + 0.1
+        gt_classes = rng.randint(1, 11, (1, 10))
+        det_boxes = np.clip(np.concatenate([gt_boxes, gt_boxes], axis=1) + \
+                            rng.randn(1, 20, 4) * 0.05, 0, 1)
+        det_classes = np.concatenate([gt_classes, rng.randint(1, 11, (1, 10))], axis=1)
+        images.append(([det_boxes, rng.rand(1, 20), det_classes.astype(np.float32)],
+                       [gt_boxes, np.array([[]]), gt_classes,
+                        np.array(['{}.jpg'.format(i).encode()])]))
+
+    def run():
+        metric = COCOmAPv2()
+        for detection, ground_truth in images:
+            metric.update(detection, ground_truth)
+        metric.result()
+        return {'samples': len(images)}
+    return run
+
+
+@stage('metric_bleu')
+def metric_bleu(size, workspace):
+    from neural_compressor.metric.bleu import BLEU
+    rng = np.random.RandomState(0)
+    vocabulary = ['word{}'.format(i) for i in range(1000)]
+
+    def sentence():
+        return ' '.join(rng.choice(vocabulary, rng.randint(5, 30))) + '.'
+    labels = [sentence() for _ in range(size['metric_samples'])]
+    preds = [' '.join(label.split()[:-2]) + ' word0.' for label in labels]
+
+    def run():
+        metric = BLEU()
+        for start in range(0, len(labels), 32):
+            metric.update(preds[start:start + 32], tuple(labels[start:start + 32]))
+        metric.result()
+        return {'samples': len(labels)}
+    return run
+
+
+@stage('metric_squad_f1')
+def metric_squad_f1(size, workspace):
+    from neural_compressor.metric.metric import SquadF1
+    rng = np.random.RandomState(0)
+    vocabulary = ['word{}'.format(i) for i in range(1000)]
+    batches = []
+    for start in range(0, size['metric_samples'], 32):
+        preds, qas = {}, []
+        for i in range(start, min(start + 32, size['metric_samples'])):
+            answer = ' '.join(rng.choice(vocabulary, rng.randint(1, 8)))
+            preds[str(i)] = ' '.join(answer.split()[1:] + ['word0'])
+            qas.append({'id': str(i), 'question': '', 'answers': [{'text': answer}]})
+        batches.append((preds, [{'paragraphs': [{'qas': qas}]}]))
+
+    def run():
+        metric = SquadF1()
+        for preds, labels in batches:
+            metric.update(preds, labels)
+        metric.result()
+        return {'samples': size['metric_samples']}
+    return run
+
+
+def _missing_requirement(requires):
+    """Get the first framework which can not be imported."""
+    for module in requires:
+        try:
+            __import__(module)
+        except Exception:
+            return module
+    return None
+
+
+def measure(run, repeat):
+    """Measure the median time in seconds and the peak Python memory in MB of a function.
+
+    A first call warms up the lazy imports and the caches, the next one runs under
+    tracemalloc and the timed calls run without it.
+    """
+    run()
+    gc.collect()
+    tracemalloc.start()
+    counters = run() or {}
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return dict(counters, time=statistics.median(times), times=times,
+                peak_memory=peak / 1024 ** 2)
+
+
+def run_suite(stages=None, size='small', repeat=3, workspace=None):
+    """Run the stages and get the results.
+
+    Args:
+        stages (list, optional): the stage names, None runs all stages. Defaults to None.
+        size (str or dict, optional): a key of SIZES or the size settings. Defaults to 'small'.
+        repeat (int, optional): the number of timed runs of each stage. Defaults to 3.
+        workspace (str, optional): the directory of the files written by the stages,
+            None uses a temporary directory. Defaults to None.
+
+    Returns:
+        dict: 'meta' describes the run, 'stages' maps each stage to its measurement or to
+            the reason it is skipped.
+    """
+    settings = SIZES[size] if isinstance(size, str) else size
+    stages = list(STAGES) if stages is None else stages
+    temporary = workspace is None
+    workspace = tempfile.mkdtemp() if temporary else workspace
+    from neural_compressor import set_workspace
+    from neural_compressor.version import __version__
+    set_workspace(os.path.join(workspace, 'nc_workspace'))
+    results = {'meta': {'version': __version__, 'size': settings, 'repeat': repeat,
+                        'python': platform.python_version(), 'machine': platform.machine()},
+               'stages': OrderedDict()}
+    try:
+        for name in stages:
+            setup, requires = STAGES[name]
+            missing = _missing_requirement(requires)
+            if missing:
+                results['stages'][name] = {'skipped': '{} is not available'.format(missing)}
+                continue
+            results['stages'][name] = measure(setup(settings, workspace), repeat)
+            print('{:<28} {:>10.4f} s {:>10.2f} MB'.format(
+                name, results['stages'][name]['time'], results['stages'][name]['peak_memory']))
+    finally:
+        if temporary:
+            shutil.rmtree(workspace, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold=0.2, min_time=0.005, min_memory=1.):
+    """Compare the results with a baseline.
+
+    Args:
+        results (dict): the results of run_suite.
+        baseline (dict): the results of an earlier run_suite.
+        threshold (float, optional): the relative increase reported as a regression.
+            Defaults to 0.2.
+        min_time (float, optional): the increase in seconds below which the time is
+            not reported, it is noise. Defaults to 0.005.
+        min_memory (float, optional): the increase in MB below which the memory is
+            not reported. Defaults to 1.
+
+    Returns:
+        list: the regressions, each is a dict of the 'stage', the 'metric', the 'baseline'
+            and the 'current' values and their 'ratio'.
+
+    Raises:
+        ValueError: the baseline is measured with another size.
+    """
+    if results['meta']['size'] != baseline['meta']['size']:
+        raise ValueError("The baseline is measured with the size {}, not {}.".format(
+            baseline['meta']['size'], results['meta']['size']))
+    regressions = []
+    for name, current in results['stages'].items():
+        base = baseline['stages'].get(name, {})
+        if 'skipped' in current or 'skipped' in base or not base:
+            continue
+        for metric, minimum in (('time', min_time), ('peak_memory', min_memory)):
+            ratio = current[metric] / base[metric] if base[metric] > 0 else float('inf')
+            if ratio > 1 + threshold and current[metric] - base[metric] > minimum:
+                regressions.append({'stage': name, 'metric': metric, 'baseline': base[metric],
+                                    'current': current[metric], 'ratio': ratio})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=None,
+                        help='the stages to run, all stages by default')
+    parser.add_argument('--size', choices=list(SIZES), default='small')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='self_benchmark.json')
+    parser.add_argument('--baseline', default=None, help='the JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.stages, args.size, args.repeat)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for regression in regressions:
+        print('Regression in {stage} {metric}: {baseline:.4f} -> {current:.4f} '
+              '({ratio:.2f}x)'.format(**regression))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
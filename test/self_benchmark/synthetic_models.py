@@ -0,0 +1,76 @@
+"""Synthetic models of configurable size for the self benchmark.
+
+Every model is a stack of residual blocks, conv -> relu -> conv -> add -> relu, so the
+number of quantizable ops grows with `blocks` and the tensor sizes with `channels` and
+`size`. The weights come from a fixed seed, nothing is downloaded.
+"""
+import numpy as np
+
+
+def build_onnx_model(blocks, channels, size, seed=0):
+    """Build an ONNX model taking an input of shape [N, channels, size, size]."""
+    from onnx import helper, numpy_helper, TensorProto
+    rng = np.random.RandomState(seed)
+    nodes, initializers, prev = [], [], 'input'
+    for i in range(blocks):
+        for j in range(2):
+            name = 'conv{}_{}'.format(i, j)
+            weight = rng.randn(channels, channels, 3, 3).astype(np.float32) * 0.1
+            initializers.append(numpy_helper.from_array(weight, name + '_weight'))
+            inputs = [prev if j == 0 else 'relu{}_0'.format(i), name + '_weight']
+            nodes.append(helper.make_node('Conv', inputs, [name], name=name, pads=[1, 1, 1, 1]))
+        nodes.append(helper.make_node('Relu', ['conv{}_0'.format(i)], ['relu{}_0'.format(i)],
+                                      name='relu{}_0'.format(i)))
+        nodes.append(helper.make_node('Add', ['conv{}_1'.format(i), prev], ['add{}'.format(i)],
+                                      name='add{}'.format(i)))
+        nodes.append(helper.make_node('Relu', ['add{}'.format(i)], ['relu{}'.format(i)],
+                                      name='relu{}'.format(i)))
+        prev = 'relu{}'.format(i)
+    shape = ['N', channels, size, size]
+    graph = helper.make_graph(nodes, 'synthetic',
+                              [helper.make_tensor_value_info('input', TensorProto.FLOAT, shape)],
+                              [helper.make_tensor_value_info(prev, TensorProto.FLOAT, shape)],
+                              initializers)
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 7
+    return model
+
+
+def build_tf_graph(blocks, channels, size, seed=0):
+    """Build a frozen TensorFlow graph_def taking an input of shape [N, size, size, channels]."""
+    import tensorflow as tf
+    rng = np.random.RandomState(seed)
+    graph = tf.Graph()
+    with graph.as_default():
+        x = tf.compat.v1.placeholder(tf.float32, [None, size, size, channels], name='input')
+        prev = x
+        for i in range(blocks):
+            out = prev
+            for j in range(2):
+                weight = tf.constant(rng.randn(3, 3, channels, channels).astype(np.float32) * 0.1)
+                out = tf.nn.conv2d(out, weight, strides=[1, 1, 1, 1], padding='SAME',
+                                   name='conv{}_{}'.format(i, j))
+                if j == 0:
+                    out = tf.nn.relu(out)
+            prev = tf.nn.relu(tf.add(out, prev))
+        tf.identity(prev, name='output')
+    return graph.as_graph_def()
+
+
+def build_torch_model(blocks, channels, seed=0):
+    """Build a PyTorch module taking an input of shape [N, channels, H, W]."""
+    import torch
+
+    class Block(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.conv0 = torch.nn.Conv2d(channels, channels, 3, padding=1, bias=False)
+            self.relu0 = torch.nn.ReLU()
+            self.conv1 = torch.nn.Conv2d(channels, channels, 3, padding=1, bias=False)
+            self.relu1 = torch.nn.ReLU()
+
+        def forward(self, x):
+            return self.relu1(self.conv1(self.relu0(self.conv0(x))) + x)
+
+    torch.manual_seed(seed)
+    return torch.nn.Sequential(*[Block() for _ in range(blocks)]).eval()
@@ -0,0 +1,78 @@
+"""Tests for the self benchmark"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from self_benchmark import compare, main, measure, SIZES
+
+
+class TestSelfBenchmark(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.workspace = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def test_measure(self):
+        def run():
+            data = np.ones(1024 ** 2 * 4, dtype=np.uint8)
+            time.sleep(0.01)
+            return {'bytes': data.size}
+        result = measure(run, 3)
+        self.assertEqual(len(result['times']), 3)
+        self.assertGreater(result['time'], 0.009)
+        self.assertGreater(result['peak_memory'], 3.9)
+        self.assertEqual(result['bytes'], 1024 ** 2 * 4)
+
+    def test_compare(self):
+        meta = {'size': SIZES['tiny']}
+        baseline = {'meta': meta, 'stages': {
+            'a': {'time': 1., 'peak_memory': 10.},
+            'b': {'time': 0.001, 'peak_memory': 10.},
+            'c': {'skipped': 'tensorflow is not available'}}}
+        results = {'meta': meta, 'stages': {
+            'a': {'time': 1.5, 'peak_memory': 10.5},
+            'b': {'time': 0.002, 'peak_memory': 20.},
+            'c': {'time': 1., 'peak_memory': 1.},
+            'd': {'time': 1., 'peak_memory': 1.}}}
+        regressions = compare(results, baseline, threshold=0.2)
+        # the time of b and the memory of a increase less than the minimums
+        self.assertEqual([(r['stage'], r['metric']) for r in regressions],
+                         [('a', 'time'), ('b', 'peak_memory')])
+        self.assertAlmostEqual(regressions[0]['ratio'], 1.5)
+        self.assertEqual(compare(results, baseline, threshold=1.5), [])
+        with self.assertRaises(ValueError):
+            compare(results, {'meta': {'size': SIZES['small']}, 'stages': {}})
+
+    def test_main(self):
+        output = os.path.join(self.workspace, 'results.json')
+        stages = ['tuning_space', 'onnxrt_calibration', 'onnxrt_quantize_model',
+                  'kl_threshold', 'metric_coco', 'metric_squad_f1']
+        self.assertEqual(main(['--size', 'tiny', '--repeat', '1', '--output', output,
+                               '--stages'] + stages), 0)
+        with open(output) as f:
+            results = json.load(f)
+        self.assertEqual(list(results['stages']), stages)
+        for result in results['stages'].values():
+            if 'skipped' not in result:
+                self.assertGreater(result['time'], 0)
+                self.assertGreaterEqual(result['peak_memory'], 0)
+        self.assertEqual(results['stages']['kl_threshold']['tensors'], 1)
+
+        baseline = os.path.join(self.workspace, 'baseline.json')
+        results['stages']['kl_threshold']['time'] /= 10
+        with open(baseline, 'w') as f:
+            json.dump(results, f)
+        self.assertEqual(main(['--size', 'tiny', '--repeat', '1', '--output', output,
+                               '--baseline', baseline, '--stages', 'kl_threshold']), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import shutil
+import unittest
+
+import numpy as np
+from onnx import helper, TensorProto, numpy_helper
+
+from neural_compressor.config import PostTrainingQuantConfig, TuningCriterion
+from neural_compressor.data import Datasets, DATALOADERS
+from neural_compressor.quantization import fit
+
+
+def build_conv_model(conv_cnt):
+    inputs = helper.make_tensor_value_info('input', TensorProto.FLOAT, [1, 2, 4, 4])
+    output = helper.make_tensor_value_info('output{}'.format(conv_cnt - 1), TensorProto.FLOAT, [1, 2, 4, 4])
+    nodes, initializers = [], []
+    for i in range(conv_cnt):
+        weight = np.random.randn(2, 2, 1, 1).astype(np.float32)
+        initializers.append(numpy_helper.from_array(weight, 'weight{}'.format(i)))
+        nodes.append(helper.make_node('Conv', ['input' if i == 0 else 'output{}'.format(i - 1),
+                                               'weight{}'.format(i)],
+                                      ['output{}'.format(i)], name='conv{}'.format(i)))
+    graph = helper.make_graph(nodes, 'test_graph', [inputs], [output], initializers)
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 7
+    return model
+
+
+class TestBasicGroupFallback(unittest.TestCase):
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree('nc_workspace', ignore_errors=True)
+
+    def fit(self, fallback_mode, culprits, max_trials=100):
+        evaluated = []
+        def fake_eval_func(model):
+            if len(evaluated) == 0:
+                evaluated.append(None) # the fp32 baseline
+                return 1.
+            fp32_ops = set([node.name for node in model.graph.node if node.op_type == 'Conv'])
+            evaluated.append(fp32_ops)
+            # each quantized culprit loses 10% accuracy
+            return 1. - 0.1 * len(culprits - fp32_ops)
+
+        dataset = Datasets('onnxrt_qlinearops')['dummy'](shape=(2, 2, 4, 4), label=True)
+        dataloader = DATALOADERS['onnxrt_qlinearops'](dataset)
+        conf = PostTrainingQuantConfig(
+            approach='static',
+            quant_level=1,
+            tuning_criterion=TuningCriterion(strategy='basic',
+                                             strategy_kwargs={'fallback_mode': fallback_mode},
+                                             max_trials=max_trials))
+        q_model = fit(model=self.model, conf=conf, calib_dataloader=dataloader,
+                      eval_func=fake_eval_func)
+        self.trials_count = len(evaluated) - 1
+        fallback_trials = [fp32_ops for fp32_ops in evaluated[1:] if fp32_ops]
+        return q_model, fallback_trials
+
+    def test_group_fallback(self):
+        self.model = build_conv_model(16)
+        culprits = set(['conv3', 'conv10'])
+        q_model, fallback_trials = self.fit('group', culprits)
+        self.assertIsNotNone(q_model)
+        self.assertEqual(fallback_trials[-1], culprits)
+        fp32_ops = set([node.name for node in q_model.nodes() if node.op_type == 'Conv'])
+        self.assertEqual(fp32_ops, culprits)
+        # about 2 * (log2(16) + 1) trials instead of one for each op
+        self.assertLessEqual(len(fallback_trials), 11)
+
+        _, one_by_one_trials = self.fit('one_by_one', culprits)
+        self.assertGreater(len(one_by_one_trials), 16)
+
+    def test_group_fallback_max_trials(self):
+        self.model = build_conv_model(16)
+        culprits = set(['conv3', 'conv10'])
+        _, fallback_trials = self.fit('group', culprits)
+        max_trials = self.trials_count - 2
+        q_model, fallback_trials = self.fit('group', culprits, max_trials)
+        # the groups meeting the requirements do not bypass max_trials
+        self.assertEqual(self.trials_count, max_trials)
+        self.assertIsNotNone(q_model)
+        self.assertNotEqual(fallback_trials[-1], culprits)
+
+    def test_group_fallback_not_meet(self):
+        self.model = build_conv_model(4)
+        q_model, fallback_trials = self.fit('group', set(['conv1', 'input']))
+        # fallback all ops can not recover the accuracy
+        self.assertIsNone(q_model)
+        self.assertEqual(len(fallback_trials), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,10 @@
 from neural_compressor.strategy.utils.tuning_sampler import OpTypeWiseTuningSampler, ModelWiseTuningSampler
 from neural_compressor.strategy.utils.tuning_sampler import OpWiseTuningSampler, FallbackTuningSampler
-from neural_compressor.strategy.utils.tuning_structs import OpTuningConfig
+from neural_compressor.strategy.utils.tuning_structs import OpTuningConfig, TuningCfgOverlay
 from neural_compressor.strategy.utils.tuning_space import TuningSpace
 from collections import OrderedDict
 from copy import deepcopy
+import pickle
 import unittest
 
 op_cap = {
@@ -244,6 +245,44 @@ class TestTuningSampler(unittest.TestCase):
                     cnt = cnt + 1
             fallback_cnt.append(cnt)
         self.assertListEqual(fallback_cnt, [2, 3, 4])
-        
+
+    def test_op_tuning_config(self):
+        tuning_space = TuningSpace({'calib': {'calib_sampling_size': [1]}, 'op': op_cap}, None)
+        op_name_type = ('op_name1', 'op_type1')
+        kwargs = {('activation', 'algorithm'): 'kl'}
+        op_cfg = OpTuningConfig(op_name_type[0], op_name_type[1], 'static', tuning_space, kwargs)
+        same_op_cfg = OpTuningConfig(op_name_type[0], op_name_type[1], 'static', tuning_space, dict(kwargs))
+        self.assertEqual(op_cfg, same_op_cfg)
+        self.assertEqual(len(set([op_cfg, same_op_cfg])), 1)
+        self.assertNotEqual(op_cfg, OpTuningConfig(op_name_type[0], op_name_type[1], 'static', tuning_space))
+        # the immutable config is shared by copies
+        self.assertIs(deepcopy(op_cfg), op_cfg)
+        with self.assertRaises(AttributeError):
+            op_cfg.op_quant_mode = 'dynamic'
+        dynamic_op_cfg = op_cfg._replace(op_quant_mode='dynamic')
+        self.assertEqual(dynamic_op_cfg.op_quant_mode, 'dynamic')
+        self.assertEqual(dynamic_op_cfg.act_dtype, op_cfg.act_dtype)
+        self.assertEqual(op_cfg.op_quant_mode, 'static')
+        self.assertEqual(pickle.loads(pickle.dumps(op_cfg)), op_cfg)
+
+    def test_tuning_cfg_overlay(self):
+        base = {'op1': 1, 'op2': 2}
+        tune_cfg = TuningCfgOverlay(base)
+        tune_cfg['op2'] = 20
+        tune_cfg['calib_sampling_size'] = 10
+        self.assertEqual(list(tune_cfg.items()), [('op1', 1), ('op2', 20), ('calib_sampling_size', 10)])
+        self.assertEqual(len(tune_cfg), 3)
+        self.assertEqual(base, {'op1': 1, 'op2': 2})
+        # the copies share the base and do not change each other
+        for new_tune_cfg in [TuningCfgOverlay(tune_cfg), tune_cfg.copy(), deepcopy(tune_cfg)]:
+            self.assertIs(new_tune_cfg._base, base)
+            new_tune_cfg['op1'] = 10
+            self.assertEqual(tune_cfg['op1'], 1)
+            self.assertEqual(dict(new_tune_cfg), {'op1': 10, 'op2': 20, 'calib_sampling_size': 10})
+        del tune_cfg['op1']
+        self.assertEqual(dict(tune_cfg), {'op2': 20, 'calib_sampling_size': 10})
+        self.assertEqual(base, {'op1': 1, 'op2': 2})
+        self.assertEqual(pickle.loads(pickle.dumps(tune_cfg)), tune_cfg)
+
 if __name__ == "__main__":
     unittest.main()
@@ -367,6 +367,40 @@ class TestTuningSampler(unittest.TestCase):
                     break
         self.assertTrue(found_per_tensor)
 
+    def test_tuning_space_shared_capability(self):
+        # the ops share the capability list as queried from the adaptors
+        shared_cap = op_cap[('op_name1', 'op_type1')]
+        capability = {
+            'calib': {'calib_sampling_size': [1]},
+            'op': {('op_name%d' % i, 'op_type1'): shared_cap for i in range(4)}
+        }
+        origin_cap = deepcopy(shared_cap)
+        conf = {
+            'usr_cfg': {
+                'quantization': {
+                    'model_wise': self.model_wise_user_config,
+                    'op_wise': {
+                        'op_name1': {'activation': {'algorithm': ['kl']}},
+                        'op_name2': {'activation': {'dtype': ['fp32']}},
+                    }
+                }
+            }
+        }
+        tuning_space = TuningSpace(capability, DotDict(conf))
+        self.assertEqual(shared_cap, origin_cap)
+        algorithm = lambda op_name: tuning_space.query_quant_mode_item(
+            (op_name, 'op_type1'), 'static').get_option_by_name(('activation', 'algorithm')).options
+        self.assertEqual(algorithm('op_name0'), ['minmax', 'kl'])
+        self.assertEqual(algorithm('op_name1'), ['kl'])
+        self.assertEqual(algorithm('op_name3'), ['minmax', 'kl'])
+        # the ops with the same merged capability share the quant mode items
+        self.assertIs(tuning_space.query_quant_mode_item(('op_name0', 'op_type1'), 'static'),
+                      tuning_space.query_quant_mode_item(('op_name3', 'op_type1'), 'static'))
+        static_items_name = [item.name for item in tuning_space.query_items_by_quant_mode('static')]
+        self.assertEqual(static_items_name, [('op_name0', 'op_type1'), ('op_name1', 'op_type1'),
+                                             ('op_name3', 'op_type1')])
+        self.assertEqual(len(tuning_space.query_items_by_quant_mode('fp32')), 4)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,58 @@
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+from neural_compressor.utils.tensor_store import TensorStore
+
+
+class TestTensorStore(unittest.TestCase):
+    path = './tensor_store_test'
+
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_write_and_read(self):
+        tensors = [{'conv': {'conv.output0': np.random.random((2, 4, 3, 3)).astype(np.float32)},
+                    'fc': {'fc.output0': np.random.random((2, 10)), 'fc.output1': np.zeros((0, 3))}}
+                   for _ in range(3)]
+        weights = {'conv': {'conv.weight': np.ones((4, 3, 1, 1), dtype=np.int8)}}
+        with TensorStore(self.path, 'w', max_pending=2) as store:
+            for i, summary in enumerate(tensors):
+                for op_name, op_tensors in summary.items():
+                    store.put(i, op_name, op_tensors)
+            store.put('weight', 'conv', weights['conv'])
+            # readable before closing
+            self.assertTrue(np.array_equal(store.get(2, 'fc', 'fc.output0'), tensors[2]['fc']['fc.output0']))
+        self.assertTrue(os.path.exists(os.path.join(self.path, 'index.json')))
+
+        store = TensorStore(self.path)
+        self.assertEqual(store.iterations(), [0, 1, 2, 'weight'])
+        self.assertEqual(store.op_names(1), ['conv', 'fc'])
+        summary = store.load(1)
+        self.assertEqual(list(summary.keys()), ['conv', 'fc'])
+        self.assertEqual(list(summary['fc'].keys()), ['fc.output0', 'fc.output1'])
+        self.assertIsInstance(summary['conv']['conv.output0'], np.memmap)
+        self.assertTrue(np.array_equal(summary['conv']['conv.output0'], tensors[1]['conv']['conv.output0']))
+        self.assertEqual(summary['fc']['fc.output1'].shape, (0, 3))
+        weight = store.load('weight')['conv']['conv.weight']
+        self.assertEqual(weight.dtype, np.int8)
+        self.assertTrue(np.array_equal(weight, weights['conv']['conv.weight']))
+        self.assertEqual(len(store.load(5)), 0)
+        with self.assertRaises(KeyError):
+            summary['relu']
+
+        # a new store replaces the old one, the stale lazy dicts do not read its tensors
+        with TensorStore(self.path, 'w') as new_store:
+            new_store.put(1, 'conv', {'conv.output0': np.zeros((2, 4, 3, 3), dtype=np.float32)})
+        with self.assertRaises(FileNotFoundError):
+            summary['conv']['conv.output0']
+        TensorStore(self.path, 'w').close()
+        self.assertEqual(TensorStore(self.path).iterations(), [])
+        self.assertEqual([name for name in os.listdir(self.path) if name.endswith('.npy')], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
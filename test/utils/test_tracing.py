@@ -0,0 +1,151 @@
+"""Tests for the tracing of the tuning stages"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from neural_compressor.utils.tracing import TRACER, current_span, span, trace, traced, \
+    traced_iter
+from neural_compressor.utils.utility import dump_elapsed_time
+
+
+def build_conv_model():
+    from onnx import helper, numpy_helper, TensorProto
+    weight = numpy_helper.from_array(np.random.randn(4, 4, 3, 3).astype(np.float32), 'W')
+    conv = helper.make_node('Conv', ['input', 'W'], ['conv'], name='conv', pads=[1, 1, 1, 1])
+    relu = helper.make_node('Relu', ['conv'], ['output'], name='relu')
+    graph = helper.make_graph(
+        [conv, relu], 'test_graph',
+        [helper.make_tensor_value_info('input', TensorProto.FLOAT, ['N', 4, 8, 8])],
+        [helper.make_tensor_value_info('output', TensorProto.FLOAT, ['N', 4, 8, 8])],
+        [weight])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 7
+    return model
+
+
+class TestTracing(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.workspace = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def tearDown(self):
+        TRACER.stop()
+        TRACER.events = []
+
+    def test_disabled(self):
+        with span('stage', ops=1) as stage:
+            self.assertFalse(stage)
+            stage.add('batches')
+        self.assertFalse(current_span())
+        self.assertEqual(TRACER.events, [])
+
+    def test_nested_spans(self):
+        TRACER.start()
+        with span('trial', 'strategy', trial=1) as trial:
+            self.assertIs(current_span(), trial)
+            for _ in range(2):
+                with span('quantize', 'adaptor') as quantize:
+                    quantize.add('ops', 3)
+                    time.sleep(0.01)
+            with span('evaluate'):
+                current_span().add('batches', 4)
+        TRACER.stop()
+        self.assertEqual([e['name'] for e in TRACER.events],
+                         ['quantize', 'quantize', 'evaluate', 'trial'])
+        self.assertEqual(sorted(trial.children), ['evaluate', 'quantize'])
+        self.assertGreater(trial.children['quantize'], 0.02)
+        self.assertEqual(TRACER.events[0]['args'], {'ops': 3})
+        self.assertEqual(TRACER.events[2]['args'], {'batches': 4})
+        self.assertEqual(TRACER.events[3]['args'], {'trial': 1})
+        self.assertEqual(TRACER.events[3]['cat'], 'strategy')
+        summary = TRACER.summary()
+        self.assertEqual(summary['quantize']['count'], 2)
+        self.assertGreater(summary['trial']['duration'], summary['quantize']['duration'])
+
+    def test_unclosed_span(self):
+        from contextlib import ExitStack
+        self.assertEqual(len(span('stage').children), 0)
+        with self.assertRaises(TypeError):
+            span('stage').children['stage'] = 1.
+        TRACER.start()
+        with span('traverse') as traverse:
+            trial_spans = ExitStack()
+            trial_spans.enter_context(span('trial'))
+            span('evaluate').__enter__()
+        self.assertFalse(current_span())
+        self.assertEqual([e['name'] for e in TRACER.events], ['traverse'])
+        self.assertEqual(traverse.children, {})
+
+    def test_traced(self):
+        @traced('double', 'adaptor')
+        def double(x):
+            return 2 * x
+
+        @dump_elapsed_time('Pass dummy')
+        def dummy():
+            return double(1)
+
+        self.assertEqual(dummy(), 2)
+        self.assertEqual(TRACER.events, [])
+        TRACER.start()
+        self.assertEqual(dummy(), 2)
+        self.assertEqual(list(traced_iter(range(3), 'next')), [0, 1, 2])
+        TRACER.stop()
+        self.assertEqual([e['name'] for e in TRACER.events],
+                         ['double', 'Pass dummy', 'next', 'next', 'next', 'next'])
+        self.assertEqual(TRACER.events[1]['cat'], 'elapsed')
+
+    def test_trace(self):
+        path = os.path.join(self.workspace, 'trace.json')
+        with trace(path):
+            with span('stage', bytes=16):
+                pass
+        self.assertFalse(TRACER.enabled)
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+        self.assertEqual(events[0]['ph'], 'M')
+        self.assertEqual(events[1]['name'], 'stage')
+        self.assertEqual(events[1]['ph'], 'X')
+        self.assertEqual(events[1]['args'], {'bytes': 16})
+        self.assertGreaterEqual(events[1]['dur'], 0)
+
+    def test_tuning_trace(self):
+        from neural_compressor import quantization, set_profiling, set_workspace
+        from neural_compressor.config import PostTrainingQuantConfig, TuningCriterion, options
+        from neural_compressor.data import Datasets, DATALOADERS
+        dataset = Datasets('onnxrt_qlinearops')['dummy'](shape=(4, 4, 8, 8), label=True)
+        dataloader = DATALOADERS['onnxrt_qlinearops'](dataset, batch_size=2)
+        workspace = options.workspace
+        set_workspace(self.workspace)
+        set_profiling(True)
+        try:
+            quantization.fit(build_conv_model(),
+                             PostTrainingQuantConfig(
+                                 calibration_sampling_size=[4],
+                                 tuning_criterion=TuningCriterion(max_trials=1)),
+                             calib_dataloader=dataloader, eval_func=lambda model: 1.)
+        finally:
+            set_profiling(False)
+            set_workspace(workspace)
+        with open(os.path.join(self.workspace, 'tuning_trace.json')) as f:
+            events = json.load(f)['traceEvents']
+        names = {e['name'] for e in events}
+        for name in ['pre_optimize', 'trial', 'quantize', 'calibration', 'inference',
+                     'quantize_model', 'evaluate', 'save']:
+            self.assertIn(name, names)
+        inference = [e for e in events if e['name'] == 'inference'][0]
+        self.assertEqual(inference['args']['batches'], 2)
+        self.assertGreater([e for e in events if e['name'] == 'save'][0]['args']['bytes'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,11 +14,14 @@
 # limitations under the License.
 """Test Edge."""
 
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
 from neural_compressor.ux.components.graph.graph import Graph
-from neural_compressor.ux.components.graph.graph_reader import GraphReader
+from neural_compressor.ux.components.graph.graph_reader import GraphReader, graph_cache
+from neural_compressor.ux.components.graph.node import Node
 
 
 class TestGraphReader(unittest.TestCase):
@@ -56,6 +59,69 @@ class TestGraphReader(unittest.TestCase):
         mocked_collapser.assert_called_once_with(expanded_groups)
         mocked_collapser.return_value.collapse.assert_called_once_with(model_graph)
 
+    @patch("neural_compressor.ux.components.graph.graph_reader.ModelRepository")
+    def test_read_uses_cached_graph(self, mocked_model_repository: MagicMock) -> None:
+        """Test that model is parsed again only when model file changes."""
+        graph_cache.clear()
+        mocked_model = mocked_model_repository.return_value.get_model.return_value
+        mocked_model.get_model_graph.side_effect = lambda: self._get_sequential_graph()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            model_path = os.path.join(temp_dir, "model.onnx")
+            with open(model_path, "w") as model_file:
+                model_file.write("model")
+
+            graph_reader = GraphReader()
+            graph_reader.read(model_path, [])
+            graph_reader.read(model_path, ["a"])
+            self.assertEqual(1, mocked_model.get_model_graph.call_count)
+
+            with open(model_path, "a") as model_file:
+                model_file.write("changed")
+            graph_reader.read(model_path, [])
+            self.assertEqual(2, mocked_model.get_model_graph.call_count)
+        graph_cache.clear()
+
+    @patch("neural_compressor.ux.components.graph.graph_reader.ModelRepository")
+    def test_find_pattern_does_not_modify_cached_graph(
+        self,
+        mocked_model_repository: MagicMock,
+    ) -> None:
+        """Test that highlighting pattern is not visible in later reads."""
+        graph_cache.clear()
+        mocked_model = mocked_model_repository.return_value.get_model.return_value
+        mocked_model.get_model_graph.return_value = self._get_sequential_graph()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            model_path = os.path.join(temp_dir, "model.onnx")
+            with open(model_path, "w") as model_file:
+                model_file.write("model")
+
+            graph_reader = GraphReader()
+            graph, groups = graph_reader.find_pattern_in_graph(model_path, "a/conv", ["Conv", "Relu"])
+            self.assertEqual(["a"], groups)
+            self.assertTrue(graph.get_node("a/conv").highlight)
+            self.assertTrue(graph.get_node("a/relu").highlight)
+
+            graph = graph_reader.read(model_path, ["node_group_a"])
+            self.assertFalse(graph.get_node("a/conv").highlight)
+            self.assertFalse(graph.get_node("a/relu").highlight)
+            self.assertEqual(1, mocked_model.get_model_graph.call_count)
+        graph_cache.clear()
+
+    @staticmethod
+    def _get_sequential_graph() -> Graph:
+        """Create graph with single group."""
+        graph = Graph()
+        graph.add_node(Node(id="input", label="Input"))
+        graph.add_node(Node(id="a/conv", label="Conv", groups=["a"]))
+        graph.add_node(Node(id="a/relu", label="Relu", groups=["a"]))
+        graph.add_node(Node(id="output", label="Output"))
+        graph.add_edge("input", "a/conv")
+        graph.add_edge("a/conv", "a/relu")
+        graph.add_edge("a/relu", "output")
+        return graph
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2022 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test jobs manager."""
+
+import os
+import shutil
+import subprocess
+import unittest
+import uuid
+from threading import Event
+from typing import List, Tuple
+
+from neural_compressor.ux.components.jobs_management.jobs_control_queue import _JobsControlQueue
+from neural_compressor.ux.components.jobs_management.jobs_manager import _JobsManager
+from neural_compressor.ux.components.jobs_management.request import _RequestType
+from neural_compressor.ux.components.jobs_management.resources import (
+    _CpuTopology,
+    _parse_cpu_list,
+    _ResourcePool,
+)
+from neural_compressor.ux.utils.proc import bind_to_cores
+
+TIMEOUT_PERIOD = 2
+
+
+def _get_random_string() -> str:
+    """Create random string to be used."""
+    return uuid.uuid4().hex
+
+
+def _get_topology() -> _CpuTopology:
+    """Create 2 socket topology with 4 cores per socket."""
+    return _CpuTopology({0: [0, 1, 2, 3], 1: [4, 5, 6, 7]})
+
+
+class TestResourcePool(unittest.TestCase):
+    """Test _ResourcePool class."""
+
+    def test_parse_cpu_list(self) -> None:
+        """Test parsing cpu list in kernel format."""
+        self.assertEqual(_parse_cpu_list("0-3,8,10-11\n"), [0, 1, 2, 3, 8, 10, 11])
+
+    def test_bind_to_cores(self) -> None:
+        """Test that command is prefixed with taskset for the slice cores."""
+        self.assertEqual(
+            bind_to_cores(["python", "main.py"], (2, 3)),
+            ["taskset", "-c", "2,3", "python", "main.py"],
+        )
+        self.assertEqual(
+            bind_to_cores("cd dir && python main.py", (0,)),
+            "taskset -c 0 /bin/sh -c 'cd dir && python main.py'",
+        )
+
+    @unittest.skipUnless(shutil.which("taskset"), "taskset is not available")
+    def test_bound_process_affinity(self) -> None:
+        """Test that process started with bound command runs on the slice cores."""
+        core = min(os.sched_getaffinity(0))
+        cmd = bind_to_cores("grep Cpus_allowed_list /proc/self/status", (core,))
+        output = subprocess.check_output(cmd, shell=True, universal_newlines=True)  # nosec
+        self.assertEqual(_parse_cpu_list(output.split(":")[1]), [core])
+
+    def test_default_slices_are_numa_nodes(self) -> None:
+        """Test that by default each job gets whole NUMA node."""
+        pool = _ResourcePool(_get_topology())
+        first = pool.allocate()
+        second = pool.allocate()
+        self.assertEqual(first.cores, (0, 1, 2, 3))
+        self.assertEqual(second.cores, (4, 5, 6, 7))
+        self.assertEqual(first.nodes, (0,))
+        self.assertEqual(second.nodes, (1,))
+        self.assertIsNone(pool.allocate())
+
+        pool.release(first)
+        self.assertEqual(pool.allocate().cores, (0, 1, 2, 3))
+
+    def test_slices_are_disjoint(self) -> None:
+        """Test allocating slices of requested size."""
+        pool = _ResourcePool(_get_topology(), max_parallel_jobs=4)
+        slices = [pool.allocate(2) for _ in range(4)]
+        cores = [core for resources in slices for core in resources.cores]
+        self.assertEqual(sorted(cores), list(range(8)))
+        for resources in slices:
+            self.assertEqual(len(resources.nodes), 1)
+        self.assertIsNone(pool.allocate(1))
+
+    def test_slice_spanning_nodes(self) -> None:
+        """Test allocating slice bigger than single NUMA node."""
+        pool = _ResourcePool(_get_topology(), max_parallel_jobs=2)
+        resources = pool.allocate(6)
+        self.assertEqual(len(resources.cores), 6)
+        self.assertEqual(sorted(resources.nodes), [0, 1])
+        self.assertEqual(resources.env, {"OMP_NUM_THREADS": "6"})
+        self.assertIsNone(pool.allocate(4))
+        self.assertEqual(len(pool.allocate(2).cores), 2)
+
+
+class TestJobsManager(unittest.TestCase):
+    """Test _JobsManager class."""
+
+    def setUp(self) -> None:
+        """Create test environment."""
+        self.queue = _JobsControlQueue()
+        self.manager = _JobsManager(self.queue, topology=_get_topology())
+        self.started: List[str] = []
+        self.release = Event()
+
+    def _schedule(self, priority: int = 0) -> str:
+        """Schedule job that waits for release event."""
+        job_id = _get_random_string()
+
+        def target(_args: Tuple) -> None:
+            self.started.append(job_id)
+            self.release.wait(TIMEOUT_PERIOD)
+
+        self.queue.schedule_job(target, (None,), job_id, _get_random_string(), priority)
+        self.manager.process_request(self.queue._get())
+        return job_id
+
+    def _process_end(self) -> str:
+        """Process single end of job notification."""
+        request = self.queue._get()
+        self.assertEqual(request.type, _RequestType.DELETE_JOB)
+        self.manager.process_request(request)
+        return request.job_id
+
+    def test_parallel_jobs(self) -> None:
+        """Test that jobs run in parallel on disjoint resources."""
+        first = self._schedule()
+        second = self._schedule()
+        third = self._schedule()
+
+        running = [job for job in self.manager._jobs.values() if job.is_alive()]
+        self.assertEqual(len(running), 2)
+        self.assertIsNone(self.manager._jobs[third].resources)
+        self.assertFalse(
+            set(self.manager._jobs[first].resources.cores)
+            & set(self.manager._jobs[second].resources.cores),
+        )
+
+        self.release.set()
+        for _ in range(3):
+            self._process_end()
+        self.assertEqual(len(self.manager._jobs), 0)
+        self.assertCountEqual(self.started, [first, second, third])
+
+    def test_priority(self) -> None:
+        """Test that waiting job with higher priority is started first."""
+        self._schedule()
+        self._schedule()
+        low = self._schedule(priority=0)
+        high = self._schedule(priority=10)
+
+        self.release.set()
+        self._process_end()
+        self.assertIsNotNone(self.manager._jobs[high].resources)
+        self.assertIsNone(self.manager._jobs[low].resources)
+        for _ in range(3):
+            self._process_end()
+        self.assertLess(self.started.index(high), self.started.index(low))
+
+    def test_abort_waiting_job(self) -> None:
+        """Test that aborting job waiting for resources removes it from queue."""
+        self._schedule()
+        self._schedule()
+        waiting = self._schedule()
+
+        self.queue.abort_job(waiting)
+        self.manager.process_request(self.queue._get())
+        self.assertNotIn(waiting, self.manager._jobs)
+
+        self.release.set()
+        for _ in range(2):
+            self._process_end()
+        self.assertNotIn(waiting, self.started)
+
+
+if __name__ == "__main__":
+    unittest.main()